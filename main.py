@@ -1,6 +1,11 @@
 import sys
 import json
 import os
+
+# --profile-startup 需在导入其它模块之前启用，才能统计到它们的导入耗时
+from src import startup_profile as SP
+SP.enable_from_argv(sys.argv)
+
 from src import app_config as CFG
 
 
@@ -199,6 +204,8 @@ def main():
         print("3. 🗺️ 选择地图组")
         print("4. 🔄 重新载入场景列表")
         print("5. 🚪 退出")
+        # --profile-startup：菜单首次输出完成即视为首帧
+        SP.first_frame()
         choice = input("请输入选择 (1/2/3/4/5): ").strip()
 
         if choice == '1':
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import sys
 from typing import Optional
 
-from src.ui.pyqt.qt_compat import QtWidgets  # type: ignore
-
-from src.ui.pyqt.app import GameQtApp
-from src.ui.pyqt.menu_window import MenuWindow
+# --profile-startup 需在导入界面/引擎模块之前启用，才能统计到它们的导入耗时
+from src import startup_profile as SP
 
 
 def run_qt(player_name: str = "玩家", initial_scene: Optional[str] = None) -> None:
+    # Qt 界面栈延后到此处导入；游戏引擎在开局时才加载
+    from src.ui.pyqt.qt_compat import QtCore  # type: ignore
+    from src.ui.pyqt.app import GameQtApp
+    from src.ui.pyqt.menu_window import MenuWindow
+    SP.mark('ui_imported')
+
     ctx = GameQtApp(player_name=player_name, initial_scene=initial_scene)
     menu = MenuWindow(ctx)
     menu.show()
+    if SP.enabled():
+        QtCore.QTimer.singleShot(0, SP.first_frame)
     # 仅 PyQt6：事件循环使用 exec()
     ctx.app.exec()
 
 
 if __name__ == '__main__':
+    SP.enable_from_argv(sys.argv)
     run_qt()
-
-
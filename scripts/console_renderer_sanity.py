@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+"""
+快速验证控制台增量渲染（不依赖真实终端）：
+- 用内存流模拟 80x24 终端，回放 ConsoleRenderer 输出的光标定位序列，得到屏幕内容
+- 中间区块缩短/增长后，其下未变的区块必须移动到新行，旧内容被清除
+运行：python scripts/console_renderer_sanity.py
+"""
+
+import io
+import os
+import re
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ['COLUMNS'] = '80'
+os.environ['LINES'] = '24'
+
+from src.ui.console_renderer import ConsoleRenderer
+
+
+class Term(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def screen(data: str, rows: int = 24):
+    """回放 ESC[H / ESC[2J / ESC[r;1H / ESC[K / ESC[J 与换行，返回各行文本。"""
+    grid = [''] * rows
+    y, x = 0, 0
+    for tok in re.findall(r'\x1b\[(\d*)(?:;(\d+))?([HJK])|(\n)|([^\x1b\n]+)', data):
+        n, _col, cmd, nl, text = tok
+        if nl:
+            y, x = y + 1, 0
+        elif text:
+            grid[y] = grid[y][:x] + text
+            x += len(text)
+        elif cmd == 'H':
+            y, x = (int(n) - 1 if n else 0), 0
+        elif cmd == 'K':
+            grid[y] = grid[y][:x]
+        elif cmd == 'J':
+            if n == '2':
+                grid = [''] * rows
+            else:
+                grid[y] = grid[y][:x]
+                for k in range(y + 1, rows):
+                    grid[k] = ''
+    return grid
+
+
+def check(frames):
+    t = Term()
+    r = ConsoleRenderer(stream=t, separator='--')
+    r.ansi = True
+    for secs in frames:
+        r.render(secs)
+        want, _o, _f = r._compose(secs)
+        got = screen(t.getvalue())
+        assert got[:len(want)] == want and not any(got[len(want):]), (secs, got[:len(want) + 2])
+    return r
+
+
+def main():
+    # 中间区块缩短（如敌人阵亡）：下方区块上移
+    check([[('a', 'x\nY'), ('b', 'z')], [('a', 'x'), ('b', 'z')]])
+    check([[('a', '1'), ('b', 'e1\ne2\ne3'), ('c', 'p1\np2')], [('a', '1'), ('b', 'e1\ne3'), ('c', 'p1\np2')]])
+    # 中间区块增长、区块消失/出现
+    check([[('a', '1'), ('b', 'e1'), ('c', 'p1\np2')], [('a', '1'), ('b', 'e1\ne2'), ('c', 'p1\np2')]])
+    check([[('a', '1'), ('b', 'e1'), ('c', 'p')], [('a', '1'), ('c', 'p')], [('a', '1'), ('b', 'e1'), ('c', 'p')]])
+    # 未变化的帧不写任何行
+    r = check([[('a', 'x'), ('b', 'z')], [('a', 'x'), ('b', 'z')]])
+    assert r.rows_written == 3, r.rows_written
+    print('console renderer sanity: ok')
+
+
+if __name__ == '__main__':
+    main()
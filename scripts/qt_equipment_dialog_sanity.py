@@ -13,6 +13,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.ui.pyqt.qt_compat import QtWidgets
 from src.ui.pyqt.dialogs.equipment_dialog import EquipmentDialog
 from src.systems.inventory import Inventory
+from src.core.zone import ObservableList
 from src.systems.equipment_system import EquipmentSystem, WeaponItem, ArmorItem, ShieldItem
 
 
@@ -26,11 +27,14 @@ class Member:
 class Player:
     def __init__(self):
         self.inventory = Inventory(max_slots=16)
+        # 与真实 Player 一致：棋盘为 ObservableList（实体注册表观察该列表，只能原地修改）
+        self.board = ObservableList()
         # 添加一些装备
         self.inventory.slots.append(type('S', (), {'item': WeaponItem('短剑', '单手', 80, attack=3, defense=0, slot_type='right_hand', is_two_handed=False), 'quantity': 1, 'remove': lambda self, n: None, 'is_empty': lambda self: False})())
         self.inventory.slots.append(type('S', (), {'item': ShieldItem('木盾', '左手', 60, defense=2), 'quantity': 1, 'remove': lambda self, n: None, 'is_empty': lambda self: False})())
         self.inventory.slots.append(type('S', (), {'item': ArmorItem('皮甲', '护甲', 60, defense=2), 'quantity': 1, 'remove': lambda self, n: None, 'is_empty': lambda self: False})())
         self.inventory.slots.append(type('S', (), {'item': WeaponItem('大剑', '双手', 100, attack=6, defense=0, slot_type='left_hand', is_two_handed=True), 'quantity': 1, 'remove': lambda self, n: None, 'is_empty': lambda self: False})())
+        self.inventory.reindex()
 
 class Game:
     def __init__(self):
@@ -50,8 +54,8 @@ def main():
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
     ctx = Ctx()
     m = Member()
-    # 假设成员在 board[0]
-    ctx.controller.game.player.board = [m]
+    # 假设成员在 board[0]（reset 原地替换内容，不替换列表对象）
+    ctx.controller.game.player.board.reset([m])
 
     for slot in ('left', 'armor', 'right'):
         dlg = EquipmentDialog(ctx, None, 1, slot)
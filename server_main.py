@@ -0,0 +1,6 @@
+"""无界面多会话服务器入口：python server_main.py [--port 8765 | --unix /tmp/pyhs.sock]"""
+from src.game_modes.headless_server import main
+
+
+if __name__ == "__main__":
+    main()
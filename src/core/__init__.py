@@ -1,3 +1,19 @@
 # Core package - 核心游戏组件包
-from .player import *
-from .cards import *
+# 包级名称（原 `from .player import *` / `from .cards import *`）改为首次访问时导入，
+# 使 `src.core.events` 等轻量子模块的导入不再连带加载卡牌/玩家模块。
+# `from src.core import events` 之类的子模块导入直接加载该子模块，不经由 cards/player。
+import importlib
+import importlib.util
+
+
+def __getattr__(name):
+    if name.startswith('_'):
+        raise AttributeError(name)
+    if importlib.util.find_spec(f'{__name__}.{name}') is not None:
+        return importlib.import_module(f'{__name__}.{name}')
+    for sub in ('cards', 'player'):
+        mod = importlib.import_module(f'{__name__}.{sub}')
+        exported = getattr(mod, '__all__', None)
+        if (exported is None or name in exported) and hasattr(mod, name):
+            return getattr(mod, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
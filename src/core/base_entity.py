@@ -1,35 +1,54 @@
 """
 基础实体类 - 统一管理攻击力、防御力、生命值等基础属性
 消除各个实体类中的重复代码
+
+实体使用 __slots__（无实例 __dict__）：新增实例字段时需在所属类的 __slots__ 中声明。
+tags/passive/skills 默认指向共享的不可变空值，赋值或 add_tag 时才持有自己的容器；
+装备系统在首次访问 `equipment` 时创建（`equipment_of()` 读取而不创建）。
 """
 
 from abc import ABC, abstractmethod
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from src.systems.equipment_system import EquipmentSystem
 
+# 共享的不可变空默认值
+_NO_TAGS: tuple = ()
+_NO_PASSIVE = MappingProxyType({})
+_NO_SKILLS: tuple = ()
+
 
 class BaseEntity(ABC):
     """基础实体抽象类，提供通用的属性和方法"""
-    
+
+    __slots__ = (
+        'base_atk', '_hp', 'max_hp', 'can_attack', '_equipment',
+        'tags', 'passive', 'skills', 'dnd', 'profession', 'race',
+        'display_name', 'name', 'stamina', 'stamina_max',
+        # 数组化战场（src.core.combat_arrays）：绑定后生命存于所属数组的 hp 列，实体只保留槽位
+        '_soa', '_soa_i',
+        # 存档令牌（save_state）与视图模型行 id（inventory_model）的缓存
+        '_save_token', '_vm_id',
+        # passives_system 以弱引用索引实体
+        '__weakref__',
+    )
+
     def __init__(self, atk: int, hp: int, *, name: str | None = None, 
                  profession: str | None = None, race: str | None = None):
+        self._soa = None
+        self._soa_i = 0
         self.base_atk = int(atk)
         self.hp = int(hp)
         self.max_hp = int(hp)
         self.can_attack = False
         
-        # 装备系统
-        self.equipment = EquipmentSystem()
-        try:
-            # 让装备系统能在事件中回溯归属对象
-            setattr(self.equipment, 'owner', self)
-        except Exception:
-            pass
+        # 装备系统：首次访问 equipment 时创建
+        self._equipment = None
         
-        # 可选拓展字段（默认空）
-        self.tags = []          # e.g. ["healer","mage","tank"]
-        self.passive = {}       # e.g. {"no_counter":true}
-        self.skills = []        # e.g. [{"name":"治疗","heal":4}]
+        # 可选拓展字段（默认共享空值）
+        self.tags = _NO_TAGS          # e.g. ["healer","mage","tank"]
+        self.passive = _NO_PASSIVE    # e.g. {"no_counter":true}
+        self.skills = _NO_SKILLS      # e.g. [{"name":"治疗","heal":4}]
         
         # DnD 数据（可选）：{'level':1,'attrs':{'str':10,...},'ac':None,'bonuses':{}}
         self.dnd = None
@@ -48,7 +67,7 @@ class BaseEntity(ABC):
         # 体力系统：由 settings.rules.stamina.base 控制回合上限
         try:
             from src import settings as S
-            base = int(getattr(S, 'stamina_base')())
+            base = S.current().stamina_base
         except Exception:
             base = 3
         self.stamina_max = int(base)
@@ -59,6 +78,8 @@ class BaseEntity(ABC):
         try:
             t = str(tag).lower()
             if t not in self.tags:
+                if not isinstance(self.tags, list):
+                    self.tags = list(self.tags)
                 self.tags.append(t)
         except Exception:
             pass
@@ -68,6 +89,8 @@ class BaseEntity(ABC):
         try:
             t = str(tag).lower()
             if t in self.tags:
+                if not isinstance(self.tags, list):
+                    self.tags = list(self.tags)
                 self.tags.remove(t)
         except Exception:
             pass
@@ -79,14 +102,42 @@ class BaseEntity(ABC):
         except Exception:
             return False
 
+    @property
+    def hp(self) -> int:
+        soa = self._soa
+        return self._hp if soa is None else soa.hp[self._soa_i]
+
+    @hp.setter
+    def hp(self, value) -> None:
+        soa = self._soa
+        if soa is None:
+            self._hp = value
+        else:
+            soa.hp[self._soa_i] = int(value)
+
+    @property
+    def equipment(self) -> EquipmentSystem:
+        """装备系统（首次访问时创建，并记录归属对象供事件回溯）"""
+        eq = self._equipment
+        if eq is None:
+            eq = self._equipment = EquipmentSystem()
+            eq.owner = self
+        return eq
+
+    @equipment.setter
+    def equipment(self, value) -> None:
+        self._equipment = value
+
     # 动态数值（含装备）
     def get_total_attack(self) -> int:
         """获取总攻击力（基础攻击力 + 装备加成）"""
-        return int(self.base_atk) + int(self.equipment.get_total_attack() if self.equipment else 0)
+        eq = self._equipment
+        return int(self.base_atk) + (int(eq.get_total_attack()) if eq else 0)
 
     def get_total_defense(self) -> int:
         """获取总防御力（装备加成）"""
-        return int(self.equipment.get_total_defense() if self.equipment else 0)
+        eq = self._equipment
+        return int(eq.get_total_defense()) if eq else 0
 
     @property
     def attack(self) -> int:
@@ -193,3 +244,10 @@ class BaseEntity(ABC):
 
     def __repr__(self):
         return self.__str__()
+
+
+def equipment_of(entity) -> Optional[EquipmentSystem]:
+    """读取实体的装备系统而不触发创建（从未装备过的实体返回 None）。"""
+    if isinstance(entity, BaseEntity):
+        return entity._equipment
+    return getattr(entity, 'equipment', None)
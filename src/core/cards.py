@@ -4,6 +4,7 @@ from .base_entity import BaseEntity
 from src.core.event_manager import safe_publish_event
 
 class Card(BaseEntity):
+    __slots__ = ('atk', 'attacks')
     weight = 1  # 抽牌权重
 
     def __init__(self, atk, hp):
@@ -51,6 +52,7 @@ class Card(BaseEntity):
         return self.__str__()
 
 class NormalCard(Card):
+    __slots__ = ()
     weight = 1
     def __init__(self, atk, hp, *, name: str | None = None, tags=None, passive=None, skills=None):
         super().__init__(atk, hp)
@@ -67,6 +69,7 @@ class NormalCard(Card):
             except Exception: pass
 
 class DrawCard(Card):
+    __slots__ = ()
     weight = 3
     def on_play(self, game, owner, target=None):
         card = game.draw(owner) if hasattr(game, 'draw') else None
@@ -79,6 +82,7 @@ class DrawCard(Card):
         return f"攻击 {self.atk}，生命 {self.hp}/{self.max_hp}，类型 抽牌随从，效果 召唤后抽一张牌"
 
 class WindfuryCard(Card):
+    __slots__ = ('windfury',)
     weight = 3
     def __init__(self, atk, hp):
         super().__init__(atk, hp)
@@ -91,6 +95,7 @@ class WindfuryCard(Card):
         return f"攻击 {self.atk}，生命 {self.hp}/{self.max_hp}，类型 风怒随从，效果 每回合可额外攻击一次"
 
 class BattlecryCard(Card):
+    __slots__ = ()
     weight = 3
     requires_target = True
     def on_play(self, game, owner, target=None):
@@ -137,7 +142,7 @@ class BattlecryCard(Card):
                                     game_ref.enemy_zone.remove(target)
                                     removed = True
                             try:
-                                safe_publish_event('enemy_died', {'enemy': target, 'scene_changed': False})
+                                safe_publish_event('enemy_died', {'game': game_ref, 'enemy': target, 'scene_changed': False})
                             except Exception:
                                 pass
                             if not removed and hasattr(game_ref, 'boss') and target is getattr(game_ref, 'boss') and getattr(target, 'hp', 1) <= 0:
@@ -159,7 +164,7 @@ class BattlecryCard(Card):
                             game._handle_enemy_death(target)
                         else:
                             try:
-                                safe_publish_event('enemy_died', {'enemy': target, 'scene_changed': False})
+                                safe_publish_event('enemy_died', {'game': game, 'enemy': target, 'scene_changed': False})
                             except Exception:
                                 pass
                 except Exception:
@@ -180,6 +185,7 @@ class BattlecryCard(Card):
         return f"攻击 {total_atk}，生命 {self.hp}/{self.max_hp}，防御 {defense}，类型 战吼随从，效果 召唤时对一个目标造成攻击力点伤害{equipment_info}"
 
 class CombinedCard(Card):
+    __slots__ = ('windfury',)
     weight = 5
     requires_target = True
     def __init__(self, atk, hp):
@@ -234,7 +240,7 @@ class CombinedCard(Card):
                                     game_ref.enemy_zone.remove(target)
                                     removed = True
                             try:
-                                safe_publish_event('enemy_died', {'enemy': target, 'scene_changed': False})
+                                safe_publish_event('enemy_died', {'game': game_ref, 'enemy': target, 'scene_changed': False})
                             except Exception:
                                 pass
                             if not removed and hasattr(game_ref, 'boss') and target is getattr(game_ref, 'boss') and getattr(target, 'hp', 1) <= 0:
@@ -255,7 +261,7 @@ class CombinedCard(Card):
                             game._handle_enemy_death(target)
                         else:
                             try:
-                                safe_publish_event('enemy_died', {'enemy': target, 'scene_changed': False})
+                                safe_publish_event('enemy_died', {'game': game, 'enemy': target, 'scene_changed': False})
                             except Exception:
                                 pass
                 except Exception:
@@ -275,6 +281,7 @@ class CombinedCard(Card):
         return f"攻击 {total_atk}，生命 {self.hp}/{self.max_hp}，防御 {defense}，类型 3合一随从，效果 召唤后抽牌+风怒+战吼{equipment_info}"
 
 class DeathrattleCard(Card):
+    __slots__ = ()
     weight = 1
     def __init__(self, atk=2, hp=1):
         super().__init__(atk, hp)
@@ -296,6 +303,7 @@ class DeathrattleCard(Card):
 
 class RewardSwordCard(Card):
     """奖励木剑的随从 - 为PvE模式优化"""
+    __slots__ = ()
     weight = 2
     def __init__(self, atk=1, hp=3):
         super().__init__(atk, hp)
@@ -0,0 +1,305 @@
+"""数组化战场（大规模战斗：一侧单位数超过阈值时启用）
+
+把一侧单位的热数据放进平行数组（`array('l')`）：
+
+    hp      当前生命（权威存储：绑定后实体的 `hp` 读写直接落到数组，实体只保留 `_soa`/`_soa_i`）
+    max_hp  最大生命（缓存）
+    atk     总攻击（含装备，缓存）
+    ac      不含光环的 AC = 10 + 防御 + DEX 调整 + 自身 bonuses.ac（缓存；光环加值查询时叠加）
+    flags   F_PLAIN_DAMAGE / F_AURA / F_REGEN
+
+缓存列在绑定、`equipment_changed` 时按单位刷新。群体技能与被动按列做整段遍历：
+
+    arr = arrays_for(game, 'enemy')       # 未超过阈值返回 None（调用方走逐个对象的旧路径）
+    if arr is not None:
+        idx = arr.alive()                  # 存活槽位
+        hits = arr.damage(idx, 3)          # 一次遍历扣血，返回 [(槽位, 扣前, 扣后)]
+
+单位离场（死亡移除）时调用 `detach(entity)` 把生命写回实体并释放槽位；空槽过多时 `sync` 压缩。
+阈值与数量上限见 settings `rules.limits`（场景 JSON 的 `limits` 可覆盖）。
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 标志位
+F_PLAIN_DAMAGE = 1   # take_damage 为 Enemy 的默认实现（无防御），批量扣血可直接写数组
+F_AURA = 2           # 持有光环被动
+F_REGEN = 4          # 持有回合开始回复被动
+
+DEFAULT_ARRAYS_ABOVE = 32
+_ATTR = {'enemy': 'enemy_arrays', 'ally': 'board_arrays'}
+
+
+def _units_of(game: Any, side: str):
+    if side == 'enemy':
+        return getattr(game, 'enemies', None)
+    return getattr(getattr(game, 'player', None), 'board', None)
+
+
+def _bindable(u: Any) -> bool:
+    return hasattr(type(u), '_soa') and hasattr(u, '_hp')
+
+
+class CombatArrays:
+    """一侧单位的平行数组；槽位在单位离场后置空，直到压缩。"""
+
+    def __init__(self, game: Any, side: str):
+        self.game = game
+        self.side = side
+        self.units: List[Optional[Any]] = []
+        self.hp = array('l')
+        self.max_hp = array('l')
+        self.atk = array('l')
+        self.ac = array('l')
+        self.flags = array('l')
+        self.free = 0
+        self.version = 0
+        self._aura: Optional[Tuple[int, Dict[str, int]]] = None
+        try:
+            from src.core.events import subscribe
+            subscribe('equipment_changed', self._on_equipment_changed)
+        except Exception:
+            pass
+
+    def __len__(self) -> int:
+        return len(self.units) - self.free
+
+    # --- 绑定 ---
+    def bind(self, u: Any) -> int:
+        i = len(self.units)
+        self.units.append(u)
+        self.hp.append(int(u._hp))
+        self.max_hp.append(0)
+        self.atk.append(0)
+        self.ac.append(0)
+        self.flags.append(0)
+        u._soa = self
+        u._soa_i = i
+        self.refresh(i)
+        return i
+
+    def detach(self, u: Any) -> None:
+        """单位离场：生命写回实体，槽位置空。"""
+        if getattr(u, '_soa', None) is not self:
+            return
+        i = u._soa_i
+        u._hp = self.hp[i]
+        u._soa = None
+        self.units[i] = None
+        self.hp[i] = 0
+        self.flags[i] = 0
+        self.free += 1
+        self.version += 1
+
+    def release(self) -> None:
+        """解除全部绑定并取消订阅（场景切换或回落到阈值以下时）。"""
+        for u in self.units:
+            if u is not None:
+                self.detach(u)
+        self.units = []
+        for col in (self.hp, self.max_hp, self.atk, self.ac, self.flags):
+            del col[:]
+        self.free = 0
+        try:
+            from src.core.events import unsubscribe
+            unsubscribe('equipment_changed', self._on_equipment_changed)
+        except Exception:
+            pass
+
+    def sync(self, units: Iterable[Any]) -> None:
+        """与当前单位列表对齐：绑定新单位，释放已不在列表中的单位，空槽过半时压缩。"""
+        units = list(units)
+        bound = 0
+        for u in units:
+            if getattr(u, '_soa', None) is self:
+                bound += 1
+            elif _bindable(u) and getattr(u, '_soa', None) is None:
+                self.bind(u)
+                bound += 1
+        if bound != len(self):
+            keep = {id(u) for u in units}
+            for u in list(self.units):
+                if u is not None and id(u) not in keep:
+                    self.detach(u)
+        if self.free > 8 and self.free * 2 > len(self.units):
+            self.compact()
+
+    def compact(self) -> None:
+        live = [i for i, u in enumerate(self.units) if u is not None]
+        self.units = [self.units[i] for i in live]
+        for name in ('hp', 'max_hp', 'atk', 'ac', 'flags'):
+            col = getattr(self, name)
+            setattr(self, name, array('l', (col[i] for i in live)))
+        for j, u in enumerate(self.units):
+            u._soa_i = j
+        self.free = 0
+        self.version += 1
+
+    # --- 缓存列 ---
+    def refresh(self, i: int) -> None:
+        u = self.units[i]
+        if u is None:
+            return
+        try:
+            self.max_hp[i] = int(getattr(u, 'max_hp', 0) or 0)
+        except Exception:
+            pass
+        try:
+            self.atk[i] = int(u.get_total_attack())
+        except Exception:
+            self.atk[i] = int(getattr(u, 'attack', 0) or 0)
+        self.ac[i] = _base_ac(u)
+        f = 0
+        try:
+            from src.game_modes.entities import Enemy
+            if getattr(type(u), 'take_damage', None) is Enemy.take_damage:
+                f |= F_PLAIN_DAMAGE
+        except Exception:
+            pass
+        try:
+            from src.systems import passives_system as PS
+            hooks = PS.hooks_for(u)
+            if 'aura' in hooks:
+                f |= F_AURA
+            if 'turn_start' in hooks:
+                f |= F_REGEN
+        except Exception:
+            pass
+        self.flags[i] = f
+        self.version += 1
+
+    def _on_equipment_changed(self, _evt: str, payload: dict) -> None:
+        owner = (payload or {}).get('owner')
+        if getattr(owner, '_soa', None) is self:
+            try:
+                from src.systems import passives_system as PS
+                PS.reindex(owner)
+            except Exception:
+                pass
+            self.refresh(owner._soa_i)
+
+    # --- 整段遍历 ---
+    def alive(self) -> List[int]:
+        """存活槽位（按绑定顺序，即单位列表顺序）。"""
+        hp = self.hp
+        units = self.units
+        return [i for i in range(len(units)) if hp[i] > 0 and units[i] is not None]
+
+    def with_flag(self, flag: int) -> List[int]:
+        fl = self.flags
+        return [i for i in range(len(fl)) if fl[i] & flag]
+
+    def damage(self, idx: Iterable[int], amount: int) -> List[Tuple[int, int, int]]:
+        """对一组槽位各扣 amount（与 Enemy.take_damage 相同：不抵扣防御，可降到负数）。"""
+        d = max(0, int(amount))
+        hp = self.hp
+        out = []
+        for i in idx:
+            prev = hp[i]
+            hp[i] = prev - d
+            out.append((i, prev, prev - d))
+        return out
+
+    def aura_totals(self) -> Dict[str, int]:
+        """本侧全部光环加值之和（按版本缓存）。"""
+        cached = self._aura
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        tot: Dict[str, int] = {}
+        try:
+            from src.systems import passives_system as PS
+            for i in self.with_flag(F_AURA):
+                for k, v in (PS._AURAS.get(self.units[i]) or {}).items():
+                    tot[k] = tot.get(k, 0) + v
+        except Exception:
+            pass
+        self._aura = (self.version, tot)
+        return tot
+
+    def aura_for(self, u: Any) -> Dict[str, int]:
+        """同侧其他单位提供的光环加值（扣除自身光环）。"""
+        tot = self.aura_totals()
+        if not tot:
+            return {}
+        if not (self.flags[u._soa_i] & F_AURA):
+            return dict(tot)
+        try:
+            from src.systems import passives_system as PS
+            own = PS._AURAS.get(u) or {}
+        except Exception:
+            own = {}
+        return {k: v - own.get(k, 0) for k, v in tot.items()}
+
+    def ac_of(self, i: int) -> int:
+        """含光环的 AC（命中检定直接使用，不再为目标构造角色卡）。"""
+        if self.flags[i] & F_AURA:
+            return self.ac[i] + int(self.aura_for(self.units[i]).get('ac', 0))
+        return self.ac[i] + int(self.aura_totals().get('ac', 0))
+
+
+def _base_ac(u: Any) -> int:
+    """与 _to_character_sheet + get_ac 一致（不含光环）：10 + 防御 + DEX 调整 + bonuses.ac。"""
+    try:
+        dfn = int(u.get_total_defense()) if hasattr(u, 'get_total_defense') else int(getattr(u, 'defense', 0) or 0)
+    except Exception:
+        dfn = 0
+    dex = 10
+    bonus = 0
+    dnd = getattr(u, 'dnd', None)
+    if isinstance(dnd, dict):
+        attrs = dnd.get('attrs') or dnd.get('attributes') or {}
+        try:
+            dex = int(attrs.get('dex', attrs.get('DEX', 10) or 10))
+        except Exception:
+            dex = 10
+        try:
+            bonus = int((dnd.get('bonuses') or {}).get('ac', 0) or 0)
+        except Exception:
+            bonus = 0
+    return 10 + dfn + (dex - 10) // 2 + bonus
+
+
+def threshold(game: Any) -> int:
+    try:
+        return int(getattr(game, 'arrays_above', DEFAULT_ARRAYS_ABOVE))
+    except Exception:
+        return DEFAULT_ARRAYS_ABOVE
+
+
+def arrays_for(game: Any, side: str) -> Optional[CombatArrays]:
+    """该侧单位数超过阈值时返回（并对齐）数组表示，否则返回 None 并释放已有数组。"""
+    attr = _ATTR[side]
+    units = _units_of(game, side)
+    arr = getattr(game, attr, None)
+    if units is None or len(units) <= threshold(game):
+        if arr is not None:
+            arr.release()
+            setattr(game, attr, None)
+        return None
+    if arr is None:
+        arr = CombatArrays(game, side)
+        setattr(game, attr, arr)
+    arr.sync(units)
+    return arr
+
+
+def update(game: Any) -> None:
+    """按当前单位数为双方建立/释放数组（场景加载完成后调用）。"""
+    for side in _ATTR:
+        try:
+            arrays_for(game, side)
+        except Exception:
+            pass
+
+
+def detach(entity: Any) -> None:
+    """单位离场（死亡移除）时调用；未绑定时为空操作。"""
+    arr = getattr(entity, '_soa', None)
+    if arr is not None:
+        arr.detach(entity)
+
+
+__all__ = ['CombatArrays', 'arrays_for', 'update', 'detach', 'threshold',
+           'F_PLAIN_DAMAGE', 'F_AURA', 'F_REGEN']
@@ -0,0 +1,130 @@
+"""战斗日志记录（有界缓冲 + 按需渲染文本）
+
+`SimplePvEGame.log` / `record` 写入 `LogRecord`：类型化字段（kind、施放者/目标及其注册表 id、
+骰点、数值）加模板与参数，文本只在消费方读取 `rec.text`（或 `to_dict()`）时才格式化并去除 ANSI：
+
+    game.record('attack', _fmt_attack, {'m': m, 'e': e.name}, actor=m, target=e, roll=th, amount=dealt, meta={...})
+    game.log({'type': 'skill', 'text': '...', 'meta': {...}})    # 旧接口：已是字符串，仅延迟去色
+    for rec in game.pop_records():                               # LogRecord（不触发格式化）
+        rec.kind, rec.actor_id, rec.amount
+    game.pop_logs()                                              # [{type, text, meta}]（渲染文本，旧格式）
+
+缓冲为定长 deque（settings `perf.log_buffer`，默认 2000 条），未被取走的旧记录自动丢弃。
+`CombatLog.enabled = False`（settings `perf.log_mode = "off"`，或 headless 模拟直接关闭）时
+`record/log` 在入口处返回，不构造记录也不拼接文本。
+
+模板可以是 str（`template.format(**args)`）或可调用对象（`fn(rec) -> str`）。`game.record` 在记录时把
+args 中的实体转为显示文本快照（如随从的 `名称[攻/血]`），数值字段同样为记录时的值；延迟到读取时的只有
+模板拼接与去色，历史日志不会显示单位之后的状态。
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+DEFAULT_BUFFER = 2000
+
+Fmt = Union[str, Callable[['LogRecord'], str], None]
+
+
+class LogRecord:
+    __slots__ = ('kind', 'actor', 'target', 'actor_id', 'target_id', 'roll', 'amount',
+                 'meta', 'args', '_fmt', '_text')
+
+    def __init__(self, kind: str, fmt: Fmt = None, args: Optional[Dict[str, Any]] = None, *,
+                 actor: Any = None, target: Any = None, actor_id: Optional[int] = None,
+                 target_id: Optional[int] = None, roll: Any = None, amount: Optional[int] = None,
+                 meta: Optional[Dict[str, Any]] = None) -> None:
+        self.kind = kind or 'info'
+        self.actor = actor
+        self.target = target
+        self.actor_id = actor_id
+        self.target_id = target_id
+        self.roll = roll
+        self.amount = amount
+        self.meta = meta
+        self.args = args
+        self._fmt = fmt
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        t = self._text
+        if t is None:
+            f = self._fmt
+            try:
+                if callable(f):
+                    raw = f(self)
+                elif self.args:
+                    raw = str(f).format(**self.args)
+                else:
+                    raw = '' if f is None else str(f)
+            except Exception:
+                raw = str(f)
+            try:
+                from src.ui import colors as C
+                t = C.strip(raw)
+            except Exception:
+                t = raw
+            self._text = t
+            # 渲染后释放模板参数与实体引用（数值字段保留）
+            self._fmt = self.args = None
+            self.actor = self.target = None
+        return t
+
+    def to_dict(self) -> Dict[str, Any]:
+        """旧的日志字典格式 {type, text, meta}。"""
+        return {'type': self.kind, 'text': self.text, 'meta': self.meta or {}}
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.kind!r}, {self.text!r})"
+
+
+class CombatLog:
+    """有界日志缓冲；enabled 为 False 时丢弃一切写入。"""
+
+    __slots__ = ('enabled', '_buf', 'dropped')
+
+    def __init__(self, maxlen: int = DEFAULT_BUFFER, enabled: bool = True) -> None:
+        self.enabled = bool(enabled)
+        self._buf: Deque[LogRecord] = deque(maxlen=max(1, int(maxlen)))
+        self.dropped = 0
+
+    def append(self, rec: LogRecord) -> None:
+        buf = self._buf
+        if len(buf) == buf.maxlen:
+            self.dropped += 1
+        buf.append(rec)
+
+    def pop_all(self) -> List[LogRecord]:
+        out = list(self._buf)
+        self._buf.clear()
+        return out
+
+    def clear(self) -> None:
+        self._buf.clear()
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def __iter__(self):
+        return iter(self._buf)
+
+    def __getitem__(self, i):
+        return self._buf[i]
+
+
+def from_settings() -> CombatLog:
+    """按 settings `perf.log_buffer` / `perf.log_mode` 创建缓冲。"""
+    size, mode = DEFAULT_BUFFER, 'full'
+    try:
+        from src.core import perf as P
+        cfg = P.config()
+        size = int(cfg.get('log_buffer', DEFAULT_BUFFER) or DEFAULT_BUFFER)
+        mode = str(cfg.get('log_mode', 'full') or 'full')
+    except Exception:
+        pass
+    return CombatLog(size, enabled=(mode != 'off'))
+
+
+__all__ = ['LogRecord', 'CombatLog', 'from_settings', 'DEFAULT_BUFFER']
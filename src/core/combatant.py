@@ -10,6 +10,8 @@ class Combatant(BaseEntity):
     - 注意：take_damage 留给子类自定义返回值（随从不返回、敌人返回是否死亡）
     """
 
+    __slots__ = ()
+
     def __init__(self, atk: int, hp: int, *, name: str | None = None, profession: str | None = None, race: str | None = None):
         super().__init__(atk, hp, name=name, profession=profession, race=race)
 
@@ -0,0 +1,192 @@
+"""实体注册表（每局游戏一个：`game.registry`）
+
+为场上单位分配稳定 id，并维护 id -> 实体、实体 -> (阵营, 位置) 映射。映射由 `ObservableList`
+的观察者回调（append/insert/remove/pop/clear/reset/切片赋值）同步更新，不再在每次事件里
+对 `game.enemies` / `player.board` 做线性成员检查：
+
+    reg = game.registry
+    reg.resolve('e3')        # 第 3 个敌人；'m2' 第 2 个随从；'#17' 稳定 id 17（不随列表重排变化）
+    reg.side_of(unit)        # 'enemy' | 'ally' | None（不在场上）
+    reg.index_of(unit)       # 1-based 当前位置；reg.token_of(unit) -> 'e3' / 'm2'
+    reg.id_of(unit)          # 稳定 id；单位离场后 id 作废且不复用
+
+界面事件处理用模块函数 `side_of(game, unit)`（无注册表的游戏对象退回成员检查）。
+
+位置映射在追加/末尾移除时就地维护，其它会移动后续单位的变更只置脏标记，下一次查询时按该侧重建
+（一次 O(n)，之后查询 O(1)）。实体按对象身份登记（`id(obj)`），与 `__eq__` 无关。
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+# 令牌前缀 -> 阵营
+PREFIX = {'e': 'enemy', 'm': 'ally'}
+_TOKEN = {v: k for k, v in PREFIX.items()}
+
+
+class EntityRegistry:
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._by_id: Dict[int, Any] = {}
+        self._id_of: Dict[int, int] = {}          # id(obj) -> 稳定 id
+        self._side_of: Dict[int, str] = {}        # id(obj) -> 阵营
+        self._lists: Dict[str, Any] = {}
+        self._cbs: Dict[str, Any] = {}
+        self._pos: Dict[str, Dict[int, int]] = {}  # 阵营 -> {id(obj): 0-based 位置}
+        self._dirty: Dict[str, bool] = {}
+
+    # --- 绑定 ---
+    def attach(self, side: str, lst: Any) -> None:
+        """登记一侧的单位列表（ObservableList）；重复调用会替换旧列表。"""
+        self.detach(side)
+        self._lists[side] = lst
+        self._pos[side] = {}
+        cb = lambda op, i, item, _s=side: self._on_change(_s, op, i, item)  # noqa: E731
+        self._cbs[side] = cb
+        try:
+            lst.observe(cb)
+        except Exception:
+            pass
+        self._sync(side)
+
+    def detach(self, side: str) -> None:
+        lst = self._lists.pop(side, None)
+        cb = self._cbs.pop(side, None)
+        if lst is not None and cb is not None:
+            try:
+                lst.unobserve(cb)
+            except Exception:
+                pass
+        for k in [k for k, s in self._side_of.items() if s == side]:
+            self._forget(k)
+        self._pos.pop(side, None)
+        self._dirty.pop(side, None)
+
+    # --- 维护 ---
+    def _register(self, side: str, obj: Any) -> None:
+        k = id(obj)
+        if k not in self._id_of:
+            eid = next(self._ids)
+            self._id_of[k] = eid
+            self._by_id[eid] = obj
+        self._side_of[k] = side
+
+    def _forget(self, k: int) -> None:
+        eid = self._id_of.pop(k, None)
+        if eid is not None:
+            self._by_id.pop(eid, None)
+        self._side_of.pop(k, None)
+
+    def _sync(self, side: str) -> None:
+        """按列表当前内容重建该侧登记与位置映射（reset/切片赋值后调用）。"""
+        lst = self._lists.get(side)
+        items = list(lst or [])
+        keep = {id(o) for o in items}
+        for k in [k for k, s in self._side_of.items() if s == side and k not in keep]:
+            self._forget(k)
+        for o in items:
+            self._register(side, o)
+        self._pos[side] = {id(o): i for i, o in enumerate(items)}
+        self._dirty[side] = False
+
+    def _on_change(self, side: str, op: str, index: int, item: Any) -> None:
+        pos = self._pos.get(side)
+        if op == 'reset' or pos is None:
+            self._sync(side)
+            return
+        lst = self._lists.get(side)
+        n = len(lst) if lst is not None else 0
+        if op == 'add':
+            self._register(side, item)
+            if index == n - 1 and not self._dirty.get(side):
+                pos[id(item)] = index
+            else:
+                self._dirty[side] = True
+        elif op == 'remove':
+            k = id(item)
+            pos.pop(k, None)
+            self._forget(k)
+            if index != n:
+                self._dirty[side] = True
+        elif op == 'set':
+            self._sync(side)
+
+    def _positions(self, side: str) -> Dict[int, int]:
+        if self._dirty.get(side, True):
+            lst = self._lists.get(side)
+            self._pos[side] = {id(o): i for i, o in enumerate(list(lst or []))}
+            self._dirty[side] = False
+        return self._pos[side]
+
+    # --- 查询 ---
+    def get(self, eid: int) -> Any:
+        return self._by_id.get(int(eid))
+
+    def id_of(self, obj: Any) -> Optional[int]:
+        return self._id_of.get(id(obj))
+
+    def side_of(self, obj: Any) -> Optional[str]:
+        return self._side_of.get(id(obj))
+
+    def index_of(self, obj: Any) -> Optional[int]:
+        """1-based 当前位置；不在场上返回 None。"""
+        side = self._side_of.get(id(obj))
+        if side is None:
+            return None
+        i = self._positions(side).get(id(obj))
+        return None if i is None else i + 1
+
+    def locate(self, obj: Any) -> Optional[Tuple[str, int]]:
+        side = self._side_of.get(id(obj))
+        if side is None:
+            return None
+        i = self.index_of(obj)
+        return None if i is None else (side, i)
+
+    def token_of(self, obj: Any) -> Optional[str]:
+        loc = self.locate(obj)
+        if loc is None:
+            return None
+        return f"{_TOKEN.get(loc[0], loc[0])}{loc[1]}"
+
+    def units(self, side: str) -> List[Any]:
+        return list(self._lists.get(side) or [])
+
+    def resolve(self, token: Any) -> Any:
+        """'eN' / 'mN'（1-based 位置）或 '#N'（稳定 id）-> 实体；无效或越界返回 None。"""
+        t = str(token or '').strip().lower()
+        if len(t) < 2:
+            return None
+        head, num = t[0], t[1:]
+        if not num.isdigit():
+            return None
+        n = int(num)
+        if head == '#':
+            return self._by_id.get(n)
+        side = PREFIX.get(head)
+        lst = self._lists.get(side) if side else None
+        if lst is None or not (1 <= n <= len(lst)):
+            return None
+        return lst[n - 1]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def side_of(game: Any, obj: Any) -> Optional[str]:
+    """单位所在阵营：有注册表时 O(1) 查询，否则退回列表成员检查（旧模型/测试替身）。"""
+    reg = getattr(game, 'registry', None)
+    if reg is not None:
+        return reg.side_of(obj)
+    try:
+        if obj in (getattr(game, 'enemies', None) or []):
+            return 'enemy'
+        if obj in (getattr(getattr(game, 'player', None), 'board', None) or []):
+            return 'ally'
+    except Exception:
+        pass
+    return None
+
+
+__all__ = ['EntityRegistry', 'PREFIX', 'side_of']
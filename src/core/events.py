@@ -6,19 +6,48 @@
 
 事件命名建议：小写+下划线，如 'enemy_damaged'、'enemy_died'、'scene_changed'。
 payload 结构不做强约束，推荐携带发生实体与少量上下文。
+
+界面订阅与后台执行：
+- 界面（Tk/Qt 视图）用 `subscribe_ui` 订阅；引擎内部（被动、合成、数组战场等）仍用 `subscribe`。
+- 后台线程在 `with capture() as evts:` 内执行命令时，引擎订阅者照常同步执行，界面订阅者的事件
+  只记入 `evts`；命令结束后由界面线程调用 `dispatch(evts)` 按原顺序补发（只发给界面订阅者），
+  其中 `COALESCE` 内的“状态已变、按当前状态重绘”类事件按 (事件, 单位) 合并为最后一条。
+- `STREAM` 内的事件（场景加载进度）不必等命令结束：记录时回调 `capture(on_stream)`，执行器在命令
+  执行期间即把它们交给界面线程补发（处理函数只更新遮罩，不读取正在变化的游戏状态）。
+- 未处于 capture 的线程（含界面线程直接执行命令）行为不变：所有订阅者同步执行。
 """
 from __future__ import annotations
-from typing import Callable, List, DefaultDict
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, DefaultDict, Iterator, Tuple
 from collections import defaultdict
 
+from src.core import perf as _perf
+
+
+# 界面只按当前状态重绘的事件：补发时按 (事件, 单位) 只保留最后一条
+COALESCE = frozenset({
+    'enemies_changed', 'resources_changed', 'inventory_changed', 'resource_changed',
+    'stamina_changed', 'hp_changed', 'scene_loading',
+})
+
+# 命令执行期间即可补发给界面的事件
+STREAM = frozenset({'scene_loading'})
+
+Captured = List[Tuple[str, dict]]
+
 
 class _EventBus:
     def __init__(self) -> None:
         self._subs: DefaultDict[str, List[Callable[[str, dict], None]]] = defaultdict(list)
+        self._ui: set = set()  # {(event, cb)}：界面订阅者
+        self._local = threading.local()
 
-    def subscribe(self, event: str, cb: Callable[[str, dict], None]) -> Callable[[str, dict], None]:
+    def subscribe(self, event: str, cb: Callable[[str, dict], None], ui: bool = False) -> Callable[[str, dict], None]:
         try:
             self._subs[event].append(cb)
+            if ui:
+                self._ui.add((event, cb))
         except Exception:
             pass
         return cb
@@ -27,6 +56,8 @@ class _EventBus:
         try:
             if event in self._subs and cb in self._subs[event]:
                 self._subs[event].remove(cb)
+                if cb not in self._subs[event]:
+                    self._ui.discard((event, cb))
         except Exception:
             pass
 
@@ -35,12 +66,79 @@ class _EventBus:
             listeners = list(self._subs.get(event, []))
         except Exception:
             listeners = []
+        buf = getattr(self._local, 'buf', None)
+        t0 = _perf.now() if _perf.ON else 0.0
+        deferred = False
         for cb in listeners:
+            if buf is not None and (event, cb) in self._ui:
+                deferred = True
+                continue
             try:
                 cb(event, payload or {})
             except Exception:
                 # 防御性：单个订阅者异常不影响其他订阅者
                 continue
+        if deferred:
+            buf.append((event, payload or {}))
+            if event in STREAM:
+                cb = getattr(self._local, 'on_stream', None)
+                if cb is not None:
+                    try:
+                        cb()
+                    except Exception:
+                        pass
+        if t0:
+            # 按事件名计时，计数器累计扇出的订阅者数
+            _perf.record('event', event, _perf.now() - t0)
+            _perf.count('event', event, len(listeners))
+
+    @contextmanager
+    def capture(self, on_stream: Callable[[], None] | None = None) -> Iterator[Captured]:
+        prev = getattr(self._local, 'buf', None)
+        prev_cb = getattr(self._local, 'on_stream', None)
+        buf: Captured = []
+        self._local.buf = buf
+        self._local.on_stream = on_stream
+        try:
+            yield buf
+        finally:
+            self._local.buf = prev
+            self._local.on_stream = prev_cb
+
+    def dispatch(self, events: Captured) -> None:
+        for event, payload in _coalesce(events):
+            try:
+                listeners = [cb for cb in self._subs.get(event, []) if (event, cb) in self._ui]
+            except Exception:
+                listeners = []
+            t0 = _perf.now() if _perf.ON else 0.0
+            for cb in listeners:
+                try:
+                    cb(event, payload)
+                except Exception:
+                    continue
+            if t0:
+                _perf.record('event', event, _perf.now() - t0)
+                _perf.count('event', event, len(listeners))
+
+
+def _coalesce(events: Captured) -> Captured:
+    """合并 COALESCE 事件：同一 (事件, 单位) 只保留最后一次出现的位置。"""
+    if not any(e in COALESCE for e, _ in events):
+        return list(events)
+    seen = set()
+    out: Captured = []
+    for event, payload in reversed(events):
+        if event in COALESCE:
+            p = payload if isinstance(payload, dict) else {}
+            owner = p.get('owner') or p.get('card') or p.get('enemy')
+            key = (event, id(owner) if owner is not None else None)
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append((event, payload))
+    out.reverse()
+    return out
 
 
 _BUS = _EventBus()
@@ -50,9 +148,27 @@ def subscribe(event: str, cb: Callable[[str, dict], None]):
     return _BUS.subscribe(event, cb)
 
 
+def subscribe_ui(event: str, cb: Callable[[str, dict], None]):
+    """界面订阅：在后台执行的命令中产生时，延后到界面线程 `dispatch` 时才回调。"""
+    return _BUS.subscribe(event, cb, ui=True)
+
+
 def unsubscribe(event: str, cb: Callable[[str, dict], None]):
     return _BUS.unsubscribe(event, cb)
 
 
 def publish(event: str, payload: dict | None = None):
     return _BUS.publish(event, payload)
+
+
+def capture(on_stream: Callable[[], None] | None = None):
+    """当前线程内发布的事件：界面订阅者部分记入返回的列表，由界面线程 `dispatch`。
+
+    on_stream 在记录到 `STREAM` 事件时（于发布线程）调用，用于唤醒界面线程提前补发。
+    """
+    return _BUS.capture(on_stream)
+
+
+def dispatch(events: Captured) -> None:
+    """在界面线程补发 capture 记录的事件（合并 COALESCE 事件）。"""
+    _BUS.dispatch(events)
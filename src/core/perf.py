@@ -0,0 +1,213 @@
+"""热点路径计时/计数（性能浮层与 `perf dump` 的数据源）
+
+埋点位置：命令分派（GameController.process_command）、技能执行（注册表 execute）、
+事件发布（按事件名）、存档写入（SaveManager.save）、视图渲染（Tk/Qt 主要视图）。
+
+用法：
+    from src.core import perf as P
+    with P.span('cmd', 'a'):          # 未启用时返回共享的空上下文
+        ...
+    if P.ON:                           # 极热路径：先判断开关再计时，未启用时只多一次全局读取
+        t0 = P.now(); ...; P.record('event', name, P.now() - t0)
+    P.count('event', name)
+
+    @P.timed('render', 'resources')   # 装饰器：未启用时直接调用原函数
+    def render(self): ...
+
+- 每次计时写入环形缓冲（deque(maxlen)，默认 4096 条，记录 (时间戳, 类别, 名称, 微秒)）；
+  同时按 (类别, 名称) 累计次数/总耗时/最大耗时，供浮层显示。
+- `summary()` 返回聚合表；`dump(path=None)` 把聚合与最近记录写成 JSON（默认日志目录 perf_*.json）。
+- 开关：settings `perf.enabled`（启动时生效）、界面 F3 浮层、命令 `perf on|off`。
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 全局开关：热路径直接读取该模块属性
+ON = False
+DEFAULT_BUFFER = 4096
+
+now = time.perf_counter
+
+_RING: Deque[Tuple[float, str, str, float]] = deque(maxlen=DEFAULT_BUFFER)
+# (类别, 名称) -> [次数, 总秒, 最大秒, 计数器]
+_STATS: Dict[Tuple[str, str], List[float]] = {}
+_T0 = time.time()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('cat', 'name', 't0')
+
+    def __init__(self, cat: str, name: str):
+        self.cat = cat
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = now()
+        return self
+
+    def __exit__(self, *_exc):
+        record(self.cat, self.name, now() - self.t0)
+        return False
+
+
+def span(cat: str, name: str):
+    """计时上下文；未启用时返回共享空对象（不分配、不计时）。"""
+    if not ON:
+        return _NULL
+    return _Span(cat, str(name))
+
+
+def timed(cat: str, name: str):
+    """装饰器版 span：按固定 (类别, 名称) 计时整个函数。"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ON:
+                return fn(*args, **kwargs)
+            t0 = now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(cat, name, now() - t0)
+        return wrapper
+    return deco
+
+
+def record(cat: str, name: str, dt: float) -> None:
+    """记录一次耗时（秒）。"""
+    if not ON:
+        return
+    _RING.append((time.time(), cat, name, dt * 1e6))
+    st = _STATS.get((cat, name))
+    if st is None:
+        _STATS[(cat, name)] = [1, dt, dt, 0]
+    else:
+        st[0] += 1
+        st[1] += dt
+        if dt > st[2]:
+            st[2] = dt
+
+
+def count(cat: str, name: str, n: int = 1) -> None:
+    """仅计数（不计时），例如事件订阅者扇出数量。"""
+    if not ON:
+        return
+    st = _STATS.get((cat, name))
+    if st is None:
+        _STATS[(cat, name)] = [0, 0.0, 0.0, n]
+    else:
+        st[3] += n
+
+
+def enable(on: bool = True, buffer: Optional[int] = None) -> None:
+    global ON, _RING
+    if buffer and int(buffer) != _RING.maxlen:
+        _RING = deque(_RING, maxlen=max(16, int(buffer)))
+    ON = bool(on)
+
+
+def toggle() -> bool:
+    enable(not ON)
+    return ON
+
+
+def reset() -> None:
+    global _T0
+    _RING.clear()
+    _STATS.clear()
+    _T0 = time.time()
+
+
+def config() -> Dict[str, Any]:
+    """settings `perf` 分区（enabled/buffer/overlay_ms）；读取失败返回空 dict。"""
+    try:
+        from src import settings as S
+        return dict(S.current().raw.get('perf') or {})
+    except Exception:
+        return {}
+
+
+def configure_from_settings() -> None:
+    """按 settings `perf` 分区设置开关与缓冲大小（界面启动时调用）。"""
+    cfg = config()
+    try:
+        enable(bool(cfg.get('enabled', False)) or ON, int(cfg.get('buffer') or DEFAULT_BUFFER))
+    except Exception:
+        pass
+
+
+def summary(cat: Optional[str] = None) -> List[Dict[str, Any]]:
+    """聚合表：按总耗时降序 [{cat, name, calls, total_ms, avg_us, max_us, count}]。"""
+    rows = []
+    for (c, n), (calls, total, mx, cnt) in list(_STATS.items()):
+        if cat and c != cat:
+            continue
+        rows.append({
+            'cat': c, 'name': n, 'calls': int(calls),
+            'total_ms': round(total * 1000, 3),
+            'avg_us': round(total * 1e6 / calls, 1) if calls else 0.0,
+            'max_us': round(mx * 1e6, 1),
+            'count': int(cnt),
+        })
+    rows.sort(key=lambda r: (r['total_ms'], r['count']), reverse=True)
+    return rows
+
+
+def recent(n: int = 100) -> List[Dict[str, Any]]:
+    items = list(_RING)[-max(0, int(n)):]
+    return [{'t': round(t, 6), 'cat': c, 'name': nm, 'us': round(us, 1)} for t, c, nm, us in items]
+
+
+def overlay_lines(top: int = 12) -> List[str]:
+    """浮层文本：每类一行合计，再列出总耗时最高的若干项。"""
+    rows = summary()
+    if not rows:
+        return ['perf: 暂无数据' if ON else 'perf: 未启用（F3 开启）']
+    by_cat: Dict[str, List[float]] = {}
+    for r in rows:
+        acc = by_cat.setdefault(r['cat'], [0, 0.0])
+        acc[0] += r['calls'] or r['count']
+        acc[1] += r['total_ms']
+    lines = ['  '.join(f"{c} {int(v[0])}次/{v[1]:.1f}ms" for c, v in sorted(by_cat.items()))]
+    for r in rows[:top]:
+        if r['calls']:
+            lines.append(f"{r['cat']:<6} {r['name'][:22]:<22} {r['calls']:>5} avg {r['avg_us']:>8.1f}us max {r['max_us']:>8.1f}us")
+        else:
+            lines.append(f"{r['cat']:<6} {r['name'][:22]:<22} ×{r['count']}")
+    return lines
+
+
+def dump(path: Optional[str] = None) -> str:
+    """写出 JSON（聚合 + 环形缓冲内容），返回文件路径。"""
+    if not path:
+        from src import app_config as CFG
+        path = os.path.join(CFG.log_dir(), time.strftime('perf_%Y%m%d_%H%M%S.json'))
+    doc = {
+        'enabled': ON,
+        'since': _T0,
+        'buffer': _RING.maxlen,
+        'summary': summary(),
+        'recent': recent(len(_RING)),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    return path
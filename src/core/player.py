@@ -1,6 +1,7 @@
 from .cards import draw_card, BattlecryCard, CombinedCard, WindfuryCard
 from src.systems.inventory import Inventory
 from src.core.event_manager import safe_publish_event
+from src.core.zone import ObservableList
 
 class Player:
     def __init__(self, name, is_me=True, game=None, inventory_size=20):
@@ -9,7 +10,7 @@ class Player:
         self.hand = []
         self.hp = 30  # 每个玩家自己的生命值
         self.max_hp = 30
-        self.board = []  # PvE模式的简化战场列表
+        self.board = ObservableList()  # PvE模式的简化战场列表（不发布总线事件，仅供注册表观察）
         self.game = game  # 添加对Game的引用
         self.inventory = Inventory(inventory_size)  # 添加背包系统
 
@@ -27,8 +28,8 @@ class Player:
 
         card = self.hand[card_idx]
 
-        # 简化的出牌逻辑，直接添加到战场
-        if len(self.board) < 15:  # 最多15张牌
+        # 简化的出牌逻辑，直接添加到战场（上限见 game.max_board，默认 15）
+        if len(self.board) < int(getattr(self.game, 'max_board', 15) or 15):
             self.board.append(card)
             self.hand.pop(card_idx)
             # 发布新增卡牌事件，便于 GUI 盟友区即时刷新
@@ -75,15 +76,15 @@ class Player:
             for c in dead:
                 safe_publish_event('card_will_die', {'card': c})
             
-            # 实际移除
+            # 实际移除（原地重置，保留列表对象与其观察者）
             try:
-                self.board = [card for card in (self.board or []) if getattr(card, 'hp', 0) > 0]
+                self.board.reset([card for card in (self.board or []) if getattr(card, 'hp', 0) > 0])
             except Exception:
-                self.board = [card for card in self.board if card and getattr(card, 'hp', 0) > 0]
+                self.board.reset([card for card in self.board if card and getattr(card, 'hp', 0) > 0])
             
             # 再发布 died（视图据此重渲染并销毁控件）
             for c in dead:
-                safe_publish_event('card_died', {'card': c})
+                safe_publish_event('card_died', {'player': self, 'card': c})
 
     def take_damage(self, damage):
         """受到伤害"""
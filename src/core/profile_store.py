@@ -0,0 +1,218 @@
+"""SQLite 存档库（可选后端）
+
+所有玩家存档放在 `CFG.user_data_dir()/profiles.db` 一个库中（WAL 模式）：
+- profiles：玩家名、更新时间（带索引，供菜单按最近游玩排序列出）与其余字段的 JSON；
+- scene_progress：(玩家, 场景, 类别 e/r, 令牌) -> 计数；击杀/拾取时单条 UPSERT，无需重写整个存档；
+- inventory / party：背包与队伍快照，仅在内容变化时整体替换（单事务）。
+
+SaveManager 在 settings `saves.backend == "sqlite"` 时经由本模块读写；首次打开时自动导入
+用户目录中尚未入库的 save_*.json / save_*.sav（原文件保留不动）。
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src import app_config as CFG
+
+
+DB_NAME = 'profiles.db'
+_KINDS = {'enemies_killed': 'e', 'resources_collected': 'r'}
+_KIND_KEYS = {v: k for k, v in _KINDS.items()}
+# profiles.extra 中不存放的键（各有独立表）
+_SPLIT_KEYS = ('scenes', 'inventory', 'party')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles(
+    name TEXT PRIMARY KEY,
+    updated REAL NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS ix_profiles_updated ON profiles(updated DESC);
+CREATE TABLE IF NOT EXISTS scene_progress(
+    profile TEXT NOT NULL,
+    scene TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    token TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY(profile, scene, kind, token)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inventory(
+    profile TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    spec TEXT NOT NULL,
+    PRIMARY KEY(profile, pos)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS party(
+    profile TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    token TEXT,
+    spec TEXT NOT NULL,
+    PRIMARY KEY(profile, pos)
+) WITHOUT ROWID;
+"""
+
+
+def _dumps(v: Any) -> str:
+    return json.dumps(v, ensure_ascii=False, separators=(',', ':'))
+
+
+class ProfileStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CFG.user_data_dir(), DB_NAME)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+
+    # --- 事务 ---
+    def _tx(self, fn) -> Any:
+        with self._lock:
+            cur = self._db.cursor()
+            cur.execute('BEGIN IMMEDIATE')
+            try:
+                out = fn(cur)
+                cur.execute('COMMIT')
+                return out
+            except Exception:
+                cur.execute('ROLLBACK')
+                raise
+
+    # --- 查询 ---
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            row = self._db.execute('SELECT 1 FROM profiles WHERE name=?', (name,)).fetchone()
+        return row is not None
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """按最近更新时间列出 [{name, updated}]（走 ix_profiles_updated 索引，不读存档内容）。"""
+        with self._lock:
+            rows = self._db.execute('SELECT name, updated FROM profiles ORDER BY updated DESC').fetchall()
+        return [{'name': n, 'updated': u} for n, u in rows]
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """读取为与 JSON 存档一致的 dict 结构；不存在返回 None。"""
+        with self._lock:
+            row = self._db.execute('SELECT extra FROM profiles WHERE name=?', (name,)).fetchone()
+            if row is None:
+                return None
+            prog = self._db.execute('SELECT scene, kind, token, count FROM scene_progress WHERE profile=?', (name,)).fetchall()
+            inv = self._db.execute('SELECT spec FROM inventory WHERE profile=? ORDER BY pos', (name,)).fetchall()
+            party = self._db.execute('SELECT spec FROM party WHERE profile=? ORDER BY pos', (name,)).fetchall()
+        try:
+            data = json.loads(row[0]) if row[0] else {}
+        except Exception:
+            data = {}
+        scenes: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for scene, kind, token, count in prog:
+            key = _KIND_KEYS.get(kind)
+            if key:
+                scenes.setdefault(scene, {}).setdefault(key, {})[token] = int(count)
+        data['scenes'] = scenes
+        if inv:
+            data['inventory'] = [json.loads(s) for (s,) in inv]
+        if party:
+            data['party'] = [json.loads(s) for (s,) in party]
+        return data
+
+    # --- 写入 ---
+    def bump(self, name: str, scene: str, kind_key: str, token: str, delta: int = 1) -> None:
+        """单条进度计数 +delta（击杀/拾取时调用，独立事务）。"""
+        kind = _KINDS.get(kind_key, kind_key)
+        now = time.time()
+
+        def _do(cur):
+            cur.execute('INSERT INTO profiles(name, updated) VALUES(?, ?) ON CONFLICT(name) DO UPDATE SET updated=excluded.updated', (name, now))
+            cur.execute('INSERT INTO scene_progress(profile, scene, kind, token, count) VALUES(?,?,?,?,?) '
+                        'ON CONFLICT(profile, scene, kind, token) DO UPDATE SET count=count+excluded.count',
+                        (name, scene, kind, token, int(delta)))
+        self._tx(_do)
+
+    def save_sections(self, name: str, data: Dict[str, Any], sections: List[str]) -> None:
+        """写入 profiles.extra 以及指定的快照分区（'inventory'/'party'），单事务。"""
+        now = time.time()
+        extra = _dumps({k: v for k, v in data.items() if k not in _SPLIT_KEYS})
+
+        def _do(cur):
+            cur.execute('INSERT INTO profiles(name, updated, extra) VALUES(?,?,?) '
+                        'ON CONFLICT(name) DO UPDATE SET updated=excluded.updated, extra=excluded.extra', (name, now, extra))
+            if 'inventory' in sections:
+                cur.execute('DELETE FROM inventory WHERE profile=?', (name,))
+                cur.executemany('INSERT INTO inventory(profile, pos, spec) VALUES(?,?,?)',
+                                [(name, i, _dumps(s)) for i, s in enumerate(data.get('inventory') or [])])
+            if 'party' in sections:
+                cur.execute('DELETE FROM party WHERE profile=?', (name,))
+                cur.executemany('INSERT INTO party(profile, pos, token, spec) VALUES(?,?,?,?)',
+                                [(name, i, (s or {}).get('token'), _dumps(s)) for i, s in enumerate(data.get('party') or [])])
+        self._tx(_do)
+
+    def replace_progress(self, name: str, scenes: Dict[str, Any]) -> None:
+        """整体替换某玩家的场景进度（导入 JSON 存档时使用）。"""
+        rows = []
+        for scene, sc in (scenes or {}).items():
+            for key, kind in _KINDS.items():
+                for token, count in ((sc or {}).get(key) or {}).items():
+                    try:
+                        rows.append((name, scene, kind, str(token), int(count)))
+                    except Exception:
+                        continue
+
+        def _do(cur):
+            cur.execute('DELETE FROM scene_progress WHERE profile=?', (name,))
+            cur.executemany('INSERT INTO scene_progress(profile, scene, kind, token, count) VALUES(?,?,?,?,?)', rows)
+        self._tx(_do)
+
+    # --- 导入 ---
+    def import_json_saves(self, directory: Optional[str] = None) -> List[str]:
+        """导入目录中尚未入库的 save_*.json / save_*.sav，返回导入的玩家名列表。"""
+        from src.core.save_codec import read_save_file
+        udir = directory or CFG.user_data_dir()
+        done: List[str] = []
+        try:
+            names = sorted(os.listdir(udir))
+        except Exception:
+            return done
+        for fn in names:
+            if not (fn.startswith('save_') and fn.endswith(('.json', '.sav'))):
+                continue
+            try:
+                data = read_save_file(os.path.join(udir, fn))
+                if not isinstance(data, dict):
+                    continue
+                name = str((data.get('player') or {}).get('name') or os.path.splitext(fn)[0][len('save_'):])
+                if self.exists(name):
+                    continue
+                self.save_sections(name, data, ['inventory', 'party'])
+                self.replace_progress(name, data.get('scenes') or {})
+                done.append(name)
+            except Exception:
+                continue
+        return done
+
+
+_STORE: Optional[ProfileStore] = None
+
+
+def get_store() -> Optional[ProfileStore]:
+    """打开（并在首次打开时导入旧 JSON 存档）全局存档库；失败返回 None。"""
+    global _STORE
+    if _STORE is None:
+        try:
+            store = ProfileStore()
+            store.import_json_saves()
+            _STORE = store
+        except Exception:
+            return None
+    return _STORE
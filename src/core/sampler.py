@@ -0,0 +1,222 @@
+"""主线程采样分析器（`prof start/stop`）
+
+后台线程按固定间隔读取主线程当前栈（`sys._current_frames()`），累计为折叠栈：
+
+    scene:<场景>;cmd:<命令>;main (tk_main.py:12);...;_sweep (src/systems/skills_engine.py:88) 42
+
+每行 = 以 ';' 连接的栈帧（根在前）+ 空格 + 采样次数，可直接交给 flamegraph.pl / speedscope / inferno。
+栈根前缀场景与正在执行的命令（无命令时为 `cmd:-`），便于区分“哪个场景、哪条命令”里的热点。
+
+用法：
+    from src.core import sampler as SP
+    SP.start(seconds=10, scene='forest')   # 到时自动停止并写文件；seconds=None 时需手动 stop（上限 perf.sample_max_s）
+    SP.tag_command('skill')                # 命令分派时打标（GameController 已接入）
+    path = SP.stop()                       # 写入 CFG.log_dir()/prof_*.folded，返回路径
+
+采样线程只读栈帧，不注入 trace 钩子；间隔默认 5ms（settings `perf.sample_interval_ms`）。
+界面把命令交给后台执行器时，执行器线程经 `add_thread` 登记，与主线程一并采样。
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 由分派/场景事件更新的标签（采样线程读取）
+_CMD: Optional[str] = None
+_SCENE: Optional[str] = None
+# 除主线程外一并采样的线程（命令执行器的工作线程）
+_THREADS: set = set()
+
+DEFAULT_INTERVAL_MS = 5.0
+DEFAULT_MAX_S = 120.0
+
+
+def tag_command(cmd: Optional[str]) -> None:
+    global _CMD
+    _CMD = cmd
+
+
+def tag_scene(scene: Optional[str]) -> None:
+    global _SCENE
+    _SCENE = scene
+
+
+def add_thread(ident: Optional[int]) -> None:
+    if ident:
+        _THREADS.add(ident)
+
+
+def _on_scene_changed(_evt: str, payload: dict) -> None:
+    p = payload or {}
+    tag_scene(p.get('scene_title') or (os.path.basename(str(p.get('scene_path') or '')) or None))
+
+
+class SamplingProfiler:
+    """对单个线程（默认主线程）做定时栈采样，结果为 折叠栈 -> 次数。"""
+
+    def __init__(self, interval_ms: float = DEFAULT_INTERVAL_MS, thread_id: Optional[int] = None):
+        self.interval = max(0.001, float(interval_ms) / 1000.0)
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.path: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._deadline: Optional[float] = None
+        self._labels: Dict[Any, str] = {}
+        self._root = ''
+        try:
+            from src import app_config as CFG
+            self._root = CFG.base_dir()
+        except Exception:
+            pass
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _label(self, code) -> str:
+        lab = self._labels.get(code)
+        if lab is None:
+            fn = code.co_filename
+            if self._root and fn.startswith(self._root):
+                fn = os.path.relpath(fn, self._root).replace(os.sep, '/')
+            else:
+                fn = os.path.basename(fn)
+            # 折叠格式以 ';' 分隔帧、以行尾最后一个空格分隔计数：帧名内的空格无妨，只需替换 ';' 与换行
+            lab = f"{code.co_name} ({fn}:{code.co_firstlineno})"
+            lab = self._labels[code] = lab.replace(';', ':').replace('\n', ' ')
+        return lab
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        self._sample_frame(frames.get(self.thread_id))
+        # 工作线程只在执行命令期间采样（空闲时停在队列等待上，不计入）
+        if _CMD is None:
+            return
+        for ident in list(_THREADS):
+            if ident != self.thread_id:
+                self._sample_frame(frames.get(ident))
+
+    def _sample_frame(self, frame) -> None:
+        if frame is None:
+            return
+        parts = []
+        while frame is not None:
+            parts.append(self._label(frame.f_code))
+            frame = frame.f_back
+        parts.append(f"cmd:{_CMD or '-'}")
+        parts.append(f"scene:{_SCENE or '-'}")
+        key = ';'.join(reversed(parts))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        wait = self._stop.wait
+        while not wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                pass
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                break
+        self.elapsed = time.perf_counter() - self.started
+        try:
+            self.path = self.write()
+        except Exception:
+            self.path = None
+        try:
+            from src.core.events import publish, unsubscribe
+            unsubscribe('scene_changed', _on_scene_changed)
+            publish('profiler_stopped', {'path': self.path, 'samples': self.samples, 'seconds': self.elapsed})
+        except Exception:
+            pass
+
+    def start(self, seconds: Optional[float] = None) -> None:
+        self.started = time.perf_counter()
+        self._deadline = self.started + float(seconds) if seconds else None
+        try:
+            from src.core.events import subscribe
+            subscribe('scene_changed', _on_scene_changed)
+        except Exception:
+            pass
+        self._thread = threading.Thread(target=self._run, name='pyhs-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> Optional[str]:
+        self._stop.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout)
+        return self.path
+
+    def write(self, path: Optional[str] = None) -> str:
+        if not path:
+            from src import app_config as CFG
+            path = os.path.join(CFG.log_dir(), time.strftime('prof_%Y%m%d_%H%M%S.folded'))
+        rows = sorted(self.stacks.items(), key=lambda kv: kv[1], reverse=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, n in rows:
+                f.write(f"{stack} {n}\n")
+        return path
+
+    def top(self, n: int = 10) -> list:
+        """按叶子帧（自身）合计的前 n 个热点 [(帧, 次数)]。"""
+        leaf: Dict[str, int] = {}
+        for stack, c in self.stacks.items():
+            k = stack.rsplit(';', 1)[-1]
+            leaf[k] = leaf.get(k, 0) + c
+        return sorted(leaf.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+_CURRENT: Optional[SamplingProfiler] = None
+_LAST: Optional[SamplingProfiler] = None
+
+
+def running() -> bool:
+    return _CURRENT is not None and _CURRENT.running
+
+
+def start(seconds: Optional[float] = None, scene: Optional[str] = None,
+          interval_ms: Optional[float] = None) -> bool:
+    """开始采样主线程；已在运行时返回 False。seconds 为空时运行到 stop()（不超过 perf.sample_max_s）。"""
+    global _CURRENT, _LAST
+    if running():
+        return False
+    from src.core import perf as P
+    cfg = P.config()
+    try:
+        max_s = float(cfg.get('sample_max_s', DEFAULT_MAX_S))
+    except Exception:
+        max_s = DEFAULT_MAX_S
+    try:
+        iv = float(interval_ms or cfg.get('sample_interval_ms', DEFAULT_INTERVAL_MS))
+    except Exception:
+        iv = DEFAULT_INTERVAL_MS
+    if scene is not None:
+        tag_scene(scene)
+    prof = SamplingProfiler(iv)
+    prof.start(min(float(seconds), max_s) if seconds else max_s)
+    _CURRENT = _LAST = prof
+    return True
+
+
+def stop() -> Optional[SamplingProfiler]:
+    """停止当前采样并写文件；返回该次采样（含 path/samples），未在运行返回 None。"""
+    global _CURRENT
+    prof = _CURRENT
+    _CURRENT = None
+    if prof is None:
+        return None
+    prof.stop()
+    return prof
+
+
+def last() -> Optional[SamplingProfiler]:
+    """最近一次采样（可能已因到时自动结束）。"""
+    return _LAST
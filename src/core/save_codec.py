@@ -0,0 +1,278 @@
+"""紧凑二进制存档格式（.sav）
+
+布局（整数均为无符号 LEB128 varint，字符串为 varint 长度 + UTF-8）：
+
+    b'PYSV' | u8 格式版本 | u8 标志(bit0: JSON 分区经 zlib 压缩)
+    varint 分区数 N
+    N × (分区名, 偏移, 长度)            # 偏移相对于头部结束处
+    分区数据 ...
+
+分区：
+- meta / inventory / party：JSON（可压缩），启动时只读取这三个小分区；
+- strings：驻留字符串表（场景键与令牌各只存一次；可压缩）；
+- scene_index：varint 场景数，每项 (场景键串号, 块偏移, 块长度)，偏移相对于 scenes 分区；
+- scenes：逐场景的进度块 = varint 击杀条数 + (令牌串号, 计数)* + varint 拾取条数 + (令牌串号, 计数)*。
+  块本身不压缩，可按索引单独读取。
+
+`encode(data)` 生成字节串；`SaveReader(path)` 只解析头部，按需读取分区或单个场景块。
+"""
+from __future__ import annotations
+
+import io
+import json
+import sys
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MAGIC = b'PYSV'
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+
+_PROGRESS_KINDS = ('enemies_killed', 'resources_collected')
+
+
+# --- varint / 字符串 ---
+def _put_uint(buf: bytearray, n: int) -> None:
+    n = max(0, int(n))
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            buf.append(b | 0x80)
+        else:
+            buf.append(b)
+            return
+
+
+def _put_str(buf: bytearray, s: str) -> None:
+    raw = s.encode('utf-8')
+    _put_uint(buf, len(raw))
+    buf += raw
+
+
+class _Cursor:
+    __slots__ = ('b', 'i')
+
+    def __init__(self, b: bytes, i: int = 0):
+        self.b = b
+        self.i = i
+
+    def uint(self) -> int:
+        n = shift = 0
+        b = self.b
+        while True:
+            x = b[self.i]
+            self.i += 1
+            n |= (x & 0x7F) << shift
+            if not x & 0x80:
+                return n
+            shift += 7
+
+    def str(self) -> str:
+        n = self.uint()
+        s = self.b[self.i:self.i + n].decode('utf-8')
+        self.i += n
+        return s
+
+
+# --- 编码 ---
+def encode(data: Dict[str, Any], compress: bool = True) -> bytes:
+    """把 SaveManager.data 编码为 .sav 字节串。"""
+    flags = FLAG_ZLIB if compress else 0
+
+    def blob(raw: bytes) -> bytes:
+        return zlib.compress(raw, 6) if compress else raw
+
+    strings: List[str] = []
+    ids: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(strings)
+            strings.append(s)
+        return i
+
+    scenes_buf = bytearray()
+    index_rows: List[Tuple[int, int, int]] = []
+    for key, sc in (data.get('scenes') or {}).items():
+        start = len(scenes_buf)
+        for kind in _PROGRESS_KINDS:
+            rows = [(intern(str(t)), int(c)) for t, c in ((sc or {}).get(kind) or {}).items() if int(c or 0) > 0]
+            _put_uint(scenes_buf, len(rows))
+            for tid, cnt in rows:
+                _put_uint(scenes_buf, tid)
+                _put_uint(scenes_buf, cnt)
+        index_rows.append((intern(str(key)), start, len(scenes_buf) - start))
+
+    index_buf = bytearray()
+    _put_uint(index_buf, len(index_rows))
+    for sid, off, ln in index_rows:
+        _put_uint(index_buf, sid)
+        _put_uint(index_buf, off)
+        _put_uint(index_buf, ln)
+
+    str_buf = bytearray()
+    _put_uint(str_buf, len(strings))
+    for s in strings:
+        _put_str(str_buf, s)
+
+    meta = {k: v for k, v in data.items() if k not in ('scenes', 'inventory', 'party')}
+    sections: List[Tuple[str, bytes]] = [
+        ('meta', blob(json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))),
+        ('inventory', blob(json.dumps(data.get('inventory') or [], ensure_ascii=False, separators=(',', ':')).encode('utf-8'))),
+        ('party', blob(json.dumps(data.get('party') or [], ensure_ascii=False, separators=(',', ':')).encode('utf-8'))),
+        ('strings', blob(bytes(str_buf))),
+        ('scene_index', bytes(index_buf)),
+        ('scenes', bytes(scenes_buf)),
+    ]
+
+    head = bytearray(MAGIC)
+    head.append(FORMAT_VERSION)
+    head.append(flags)
+    _put_uint(head, len(sections))
+    off = 0
+    for name, payload in sections:
+        _put_str(head, name)
+        _put_uint(head, off)
+        _put_uint(head, len(payload))
+        off += len(payload)
+    out = io.BytesIO()
+    out.write(bytes(head))
+    for _name, payload in sections:
+        out.write(payload)
+    return out.getvalue()
+
+
+def is_compact(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except Exception:
+        return False
+
+
+# --- 读取 ---
+class SaveReader:
+    """只解析头部的 .sav 读取器；分区与场景块按需从文件读取。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            # 头部很小：分区表之前最多几十字节，按需扩读
+            raw = f.read(256)
+            if raw[:len(MAGIC)] != MAGIC:
+                raise ValueError('not a compact save')
+            self.version = raw[len(MAGIC)]
+            if self.version > FORMAT_VERSION:
+                raise ValueError(f'unsupported save format {self.version}')
+            self.flags = raw[len(MAGIC) + 1]
+            while True:
+                try:
+                    cur = _Cursor(raw, len(MAGIC) + 2)
+                    n = cur.uint()
+                    table: Dict[str, Tuple[int, int]] = {}
+                    for _ in range(n):
+                        name = cur.str()
+                        table[name] = (cur.uint(), cur.uint())
+                    break
+                except IndexError:
+                    more = f.read(4096)
+                    if not more:
+                        raise ValueError('truncated save header')
+                    raw += more
+        self._body = cur.i
+        self._table = table
+        self._strings: Optional[List[str]] = None
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def _read(self, name: str) -> bytes:
+        ent = self._table.get(name)
+        if ent is None:
+            return b''
+        off, ln = ent
+        with open(self.path, 'rb') as f:
+            f.seek(self._body + off)
+            return f.read(ln)
+
+    def _blob(self, name: str) -> bytes:
+        raw = self._read(name)
+        if raw and self.flags & FLAG_ZLIB:
+            raw = zlib.decompress(raw)
+        return raw
+
+    def read_json(self, name: str) -> Any:
+        raw = self._blob(name)
+        return json.loads(raw.decode('utf-8')) if raw else None
+
+    def read_head(self) -> Dict[str, Any]:
+        """读取 meta/inventory/party，组装为不含 scenes 的存档 dict。"""
+        data = dict(self.read_json('meta') or {})
+        for key in ('inventory', 'party'):
+            val = self.read_json(key)
+            if val:
+                data[key] = val
+        return data
+
+    def _load_index(self) -> Dict[str, Tuple[int, int]]:
+        if self._index is None:
+            cur = _Cursor(self._blob('strings'))
+            # 驻留：与实体上缓存的令牌共享同一字符串对象，字典查找走指针比较
+            self._strings = [sys.intern(cur.str()) for _ in range(cur.uint())] if cur.b else []
+            idx: Dict[str, Tuple[int, int]] = {}
+            raw = self._read('scene_index')
+            if raw:
+                cur = _Cursor(raw)
+                for _ in range(cur.uint()):
+                    sid = cur.uint()
+                    idx[self._strings[sid]] = (cur.uint(), cur.uint())
+            self._index = idx
+        return self._index
+
+    def scene_keys(self) -> List[str]:
+        return list(self._load_index())
+
+    def read_scene(self, key: str) -> Optional[Dict[str, Dict[str, int]]]:
+        """读取单个场景的进度块；不存在返回 None。"""
+        ent = self._load_index().get(key)
+        if ent is None:
+            return None
+        off, ln = ent
+        base = self._table.get('scenes', (0, 0))[0]
+        with open(self.path, 'rb') as f:
+            f.seek(self._body + base + off)
+            cur = _Cursor(f.read(ln))
+        strings = self._strings or []
+        out: Dict[str, Dict[str, int]] = {}
+        for kind in _PROGRESS_KINDS:
+            n = cur.uint()
+            if n:
+                m = out[kind] = {}
+                for _ in range(n):
+                    tid = cur.uint()
+                    m[strings[tid]] = cur.uint()
+        return out
+
+    def read_all(self) -> Dict[str, Any]:
+        data = self.read_head()
+        data['scenes'] = {k: self.read_scene(k) or {} for k in self.scene_keys()}
+        return data
+
+
+def read_save_meta(path: str) -> Optional[Dict[str, Any]]:
+    """读取存档文件（.sav 或旧 .json）的 meta 部分（含 player），供存档列表使用。"""
+    if is_compact(path):
+        return SaveReader(path).read_json('meta')
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else None
+
+
+def read_save_file(path: str) -> Optional[Dict[str, Any]]:
+    """完整读取存档文件（.sav 或旧 .json）为 dict。"""
+    if is_compact(path):
+        return SaveReader(path).read_all()
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else None
@@ -8,13 +8,19 @@ from __future__ import annotations
 
 注意：本模块当前只做“敌人与资源不重生”的持久化；
 后续可扩展背包/队伍快照等功能。
+
+存储后端由 settings `saves.backend` 决定：默认每个玩家一个 save_*.json；
+设为 "sqlite" 时改用 `profile_store`（单库 profiles.db），击杀/拾取标记逐条增量写入，
+save() 只重写内容有变化的背包/队伍分区。
 """
 
 import json
 import os
+import sys
 from typing import Dict, Any, List
 
 from src import app_config as CFG
+from src.core import perf as P
 
 
 def _safe_int(v: Any, default: int = 0) -> int:
@@ -24,10 +30,44 @@ def _safe_int(v: Any, default: int = 0) -> int:
         return int(default)
 
 
+# 实体上缓存令牌的属性名（首次计算后写入；实体定义 __slots__ 时需包含该槽）
+TOKEN_ATTR = '_save_token'
+
+
+def _remember(ent: Any, tok: str) -> str:
+    tok = sys.intern(tok)
+    try:
+        setattr(ent, TOKEN_ATTR, tok)
+    except Exception:
+        pass
+    return tok
+
+
+def _unit_token(ent: Any, fallback: str) -> str:
+    """敌人/随从令牌 "名称|基础攻击|最大生命"；每个实体只计算一次。"""
+    tok = getattr(ent, TOKEN_ATTR, None)
+    if tok is not None:
+        return tok
+    try:
+        name = getattr(ent, 'name', None) or getattr(ent, 'display_name', None) or str(ent)
+    except Exception:
+        name = fallback
+    try:
+        base_atk = _safe_int(getattr(ent, 'base_atk', getattr(ent, 'attack', 0)))
+    except Exception:
+        base_atk = 0
+    try:
+        max_hp = _safe_int(getattr(ent, 'max_hp', getattr(ent, 'hp', 0)))
+    except Exception:
+        max_hp = 0
+    return _remember(ent, f"{name}|{base_atk}|{max_hp}")
+
+
 class SaveManager:
     def __init__(self, player_name: str):
         self.player_name = str(player_name or 'player')
         self.path = self._default_save_path(self.player_name)
+        self.compact_path = self._default_save_path(self.player_name, '.sav')
         self.data: Dict[str, Any] = {
             'version': 1,
             'player': {
@@ -39,44 +79,165 @@ class SaveManager:
             # 'inventory': [ {spec}+qty ],
             # 'party': [ { token, name, base_atk, hp, max_hp, equipment:{...} } ]
         }
+        # SQLite 后端（None 表示使用存档文件）与上次写入的分区内容（用于跳过未变化分区）
+        self._store = None
+        self._saved: Dict[str, str] = {}
+        # .sav 读取器：尚未读入 data['scenes'] 的场景进度在首次访问时按需读取
+        self._lazy = None
+        # 队伍快照按令牌的索引（apply_party_snapshot_to_board 复用）
+        self._party_idx = None
 
     # --- 路径/加载/保存 ---
     @staticmethod
-    def _default_save_path(player_name: str) -> str:
+    def _default_save_path(player_name: str, ext: str = '.json') -> str:
         base = CFG.user_data_dir()
         safe = ''.join(ch for ch in player_name if ch.isalnum() or ch in ('_', '-')) or 'player'
-        return os.path.join(base, f'save_{safe}.json')
+        return os.path.join(base, f'save_{safe}{ext}')
+
+    @staticmethod
+    def _backend() -> str:
+        try:
+            from src import settings as S
+            return S.saves_backend()
+        except Exception:
+            return 'binary'
+
+    @classmethod
+    def _open_store(cls):
+        try:
+            if cls._backend() != 'sqlite':
+                return None
+            from src.core.profile_store import get_store
+            return get_store()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return -1.0
 
     @classmethod
     def load(cls, player_name: str) -> 'SaveManager':
         mgr = cls(player_name)
+        store = cls._open_store()
+        if store is not None:
+            try:
+                data = store.load(mgr.player_name)
+                if data is not None:
+                    mgr.data.update(data)
+                    mgr._store = store
+                    mgr._saved = {k: mgr._section_text(k) for k in ('inventory', 'party')}
+                    return mgr
+                mgr._store = store
+            except Exception:
+                mgr._store = None
         try:
-            if os.path.isfile(mgr.path):
+            # .sav 与旧 .json 同时存在时取较新的一份（切换过后端的情况）
+            if cls._mtime(mgr.compact_path) >= cls._mtime(mgr.path) and os.path.isfile(mgr.compact_path):
+                from src.core.save_codec import SaveReader
+                reader = SaveReader(mgr.compact_path)
+                if mgr._store is not None:
+                    mgr.data.update(reader.read_all())
+                else:
+                    # 启动时只读 meta/背包/队伍分区，场景进度按需读取
+                    mgr.data.update(reader.read_head())
+                    mgr._lazy = reader
+            elif os.path.isfile(mgr.path):
                 with open(mgr.path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 if isinstance(data, dict):
                     mgr.data.update(data)
+            else:
+                return mgr
+            if mgr._store is not None:
+                # 库中尚无该玩家：把存档文件整体导入
+                mgr._store.replace_progress(mgr.player_name, mgr.data.get('scenes') or {})
+                mgr.save()
         except Exception:
             # 坏档不阻断运行，使用内置默认
             pass
         return mgr
 
-    def save(self) -> None:
+    def _section_text(self, key: str) -> str:
+        try:
+            return json.dumps(self.data.get(key) or [], ensure_ascii=False, sort_keys=True)
+        except Exception:
+            return ''
+
+    def _scene(self, key: str) -> Dict[str, Any]:
+        """取（必要时从 .sav 按需读入）某场景的进度字典；key 需已标准化。"""
+        scenes = self.data.setdefault('scenes', {})
+        sc = scenes.get(key)
+        if sc is None:
+            sc = {}
+            if self._lazy is not None:
+                try:
+                    sc = self._lazy.read_scene(key) or {}
+                except Exception:
+                    sc = {}
+            scenes[key] = sc
+        return sc
+
+    def _materialize(self) -> None:
+        """读入所有尚未加载的场景进度（重写存档前调用）。"""
+        if self._lazy is None:
+            return
+        try:
+            for key in self._lazy.scene_keys():
+                self._scene(key)
+        except Exception:
+            pass
+        self._lazy = None
+
+    @staticmethod
+    def _atomic_write(path: str, payload: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        # 原子替换（尽力而为）
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            tmp = self.path + '.tmp'
-            with open(tmp, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            # 原子替换（尽力而为）
+            if os.path.exists(path):
+                os.replace(tmp, path)
+            else:
+                os.rename(tmp, path)
+        except Exception:
+            # 回退直接写
+            with open(path, 'wb') as f:
+                f.write(payload)
+
+    def save(self) -> None:
+        if not P.ON:
+            return self._save()
+        with P.span('save', 'sqlite' if self._store is not None else self._backend()):
+            self._save()
+
+    def _save(self) -> None:
+        if self._store is not None:
             try:
-                if os.path.exists(self.path):
-                    os.replace(tmp, self.path)
-                else:
-                    os.rename(tmp, self.path)
+                changed = []
+                for k in ('inventory', 'party'):
+                    txt = self._section_text(k)
+                    if txt != self._saved.get(k):
+                        changed.append(k)
+                        self._saved[k] = txt
+                if changed or not self._store.exists(self.player_name):
+                    self._store.save_sections(self.player_name, self.data, changed)
+                return
             except Exception:
-                # 回退直接写
-                with open(self.path, 'w', encoding='utf-8') as f:
-                    json.dump(self.data, f, ensure_ascii=False, indent=2)
+                # 库不可用时回退存档文件
+                self._store = None
+        try:
+            self._materialize()
+            if self._backend() == 'json':
+                payload = json.dumps(self.data, ensure_ascii=False, indent=2).encode('utf-8')
+                self._atomic_write(self.path, payload)
+            else:
+                from src.core.save_codec import encode
+                self._atomic_write(self.compact_path, encode(self.data))
         except Exception:
             # 静默失败，不影响游戏
             pass
@@ -91,22 +252,13 @@ class SaveManager:
 
     @staticmethod
     def enemy_token(enemy) -> str:
-        try:
-            name = getattr(enemy, 'name', None) or getattr(enemy, 'display_name', None) or str(enemy)
-        except Exception:
-            name = 'enemy'
-        try:
-            base_atk = _safe_int(getattr(enemy, 'base_atk', getattr(enemy, 'attack', 0)))
-        except Exception:
-            base_atk = 0
-        try:
-            max_hp = _safe_int(getattr(enemy, 'max_hp', getattr(enemy, 'hp', 0)))
-        except Exception:
-            max_hp = 0
-        return f"{name}|{base_atk}|{max_hp}"
+        return _unit_token(enemy, 'enemy')
 
     @staticmethod
     def resource_token(res) -> str:
+        tok = getattr(res, TOKEN_ATTR, None)
+        if tok is not None:
+            return tok
         try:
             name = getattr(res, 'name', None) or str(res)
         except Exception:
@@ -119,64 +271,108 @@ class SaveManager:
             val = _safe_int(getattr(res, 'effect_value', 0))
         except Exception:
             val = 0
-        return f"{name}|{item_type}|{val}"
+        return _remember(res, f"{name}|{item_type}|{val}")
+
+    @classmethod
+    def stamp_tokens(cls, enemies=(), resources=(), members=()) -> None:
+        """场景构建完成后为实体一次性计算并缓存令牌（之后的过滤/标记/快照都直接取缓存）。"""
+        for e in enemies or ():
+            _unit_token(e, 'enemy')
+        for r in resources or ():
+            cls.resource_token(r)
+        for m in members or ():
+            _unit_token(m, 'ally')
 
     # --- 应用进度：过滤已清除对象 ---
-    def apply_scene_progress(self, scene_key: str, enemies_list: List[Any], resources_list: List[Any]) -> None:
-        """根据已记录的击杀/采集计数，原地过滤掉不应再出现的敌人与资源。"""
-        key = self.normalize_scene_key(scene_key)
-        sc = self.data.setdefault('scenes', {}).setdefault(key, {})
-        killed: Dict[str, int] = dict(sc.get('enemies_killed', {}))
-        taken: Dict[str, int] = dict(sc.get('resources_collected', {}))
-
-        # 过滤敌人：按计数“消费”
-        if enemies_list:
-            consumed: Dict[str, int] = {}
-            remain = []
-            for e in list(enemies_list):
-                tok = self.enemy_token(e)
-                used = consumed.get(tok, 0)
-                quota = _safe_int(killed.get(tok, 0))
-                if used < quota:
-                    # 标记为已消耗，不加入剩余
-                    consumed[tok] = used + 1
-                    continue
-                remain.append(e)
-            # 就地替换
+    @staticmethod
+    def _consume(items: List[Any], quota: Dict[str, int], token_of) -> None:
+        """按计数“消费”：每个令牌最多过滤掉 quota[tok] 个实体，原地替换列表。"""
+        if not items or not quota:
+            return
+        consumed: Dict[str, int] = {}
+        remain = []
+        for it in items:
+            tok = token_of(it)
+            used = consumed.get(tok, 0)
+            if used < _safe_int(quota.get(tok, 0)):
+                consumed[tok] = used + 1
+                continue
+            remain.append(it)
+        if len(remain) != len(items):
             try:
-                enemies_list.clear(); enemies_list.extend(remain)
+                items[:] = remain
             except Exception:
                 pass
 
-        # 过滤资源：按计数“消费”
-        if resources_list:
-            consumed_r: Dict[str, int] = {}
-            remain_r = []
-            for r in list(resources_list):
-                tok = self.resource_token(r)
-                used = consumed_r.get(tok, 0)
-                quota = _safe_int(taken.get(tok, 0))
-                if used < quota:
-                    consumed_r[tok] = used + 1
-                    continue
-                remain_r.append(r)
+    def apply_scene_progress(self, scene_key: str, enemies_list: List[Any], resources_list: List[Any]) -> None:
+        """根据已记录的击杀/采集计数，原地过滤掉不应再出现的敌人与资源。
+
+        只查该场景的计数表（按令牌哈希查找，不复制），开销与场景内实体数相关，与存档历史长度无关。
+        """
+        sc = self._scene(self.normalize_scene_key(scene_key))
+        self._consume(enemies_list, sc.get('enemies_killed') or {}, self.enemy_token)
+        self._consume(resources_list, sc.get('resources_collected') or {}, self.resource_token)
+
+    # --- 标记事件 ---
+    def _mark(self, scene_key: str, kind: str, token: str) -> None:
+        key = self.normalize_scene_key(scene_key)
+        sc = self._scene(key)
+        m = sc.setdefault(kind, {})
+        m[token] = _safe_int(m.get(token, 0)) + 1
+        if self._store is not None:
+            # 单条增量写入（独立事务），不必等到 save() 重写整个存档
             try:
-                resources_list.clear(); resources_list.extend(remain_r)
+                self._store.bump(self.player_name, key, kind, token)
             except Exception:
                 pass
 
-    # --- 标记事件 ---
     def mark_enemy_killed(self, scene_key: str, token: str) -> None:
-        key = self.normalize_scene_key(scene_key)
-        sc = self.data.setdefault('scenes', {}).setdefault(key, {})
-        m = sc.setdefault('enemies_killed', {})
-        m[token] = _safe_int(m.get(token, 0)) + 1
+        self._mark(scene_key, 'enemies_killed', token)
 
     def mark_resource_collected(self, scene_key: str, token: str) -> None:
-        key = self.normalize_scene_key(scene_key)
-        sc = self.data.setdefault('scenes', {}).setdefault(key, {})
-        m = sc.setdefault('resources_collected', {})
-        m[token] = _safe_int(m.get(token, 0)) + 1
+        self._mark(scene_key, 'resources_collected', token)
+
+    # --- 存档列表（菜单用） ---
+    @classmethod
+    def list_saves(cls) -> List[Dict[str, Any]]:
+        """列出已有存档 [{name, path, label}]；SQLite 后端按最近游玩排序且不读取存档内容。"""
+        store = cls._open_store()
+        if store is not None:
+            try:
+                out = []
+                for rec in store.list_profiles():
+                    name = rec['name']
+                    out.append({'name': name, 'path': store.path, 'label': name})
+                return out
+            except Exception:
+                pass
+        # 同名的 .sav 与 .json 只列较新的一份；.sav 只读 meta 分区
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            from src.core.save_codec import read_save_meta
+            udir = CFG.user_data_dir()
+            for fn in sorted(os.listdir(udir)):
+                if not (fn.startswith('save_') and fn.endswith(('.json', '.sav'))):
+                    continue
+                path = os.path.join(udir, fn)
+                name = None
+                try:
+                    name = ((read_save_meta(path) or {}).get('player') or {}).get('name')
+                except Exception:
+                    pass
+                if not name:
+                    name = os.path.splitext(fn)[0][len('save_'):]
+                mtime = cls._mtime(path)
+                prev = found.get(str(name))
+                if prev is None or mtime > prev['_mtime']:
+                    found[str(name)] = {'name': str(name), 'path': path, 'label': f"{name}  ({fn})", '_mtime': mtime}
+        except Exception:
+            pass
+        out = []
+        for ent in found.values():
+            ent.pop('_mtime', None)
+            out.append(ent)
+        return out
 
     # --- 背包快照/恢复 ---
     def snapshot_inventory(self, inventory) -> None:
@@ -251,6 +447,7 @@ class SaveManager:
             except Exception:
                 try:
                     inventory.slots.clear()
+                    inventory.reindex()
                 except Exception:
                     pass
             for spec in items:
@@ -358,25 +555,34 @@ class SaveManager:
             except Exception:
                 continue
         self.data['party'] = out
+        self._party_idx = None
+
+    def _party_index(self) -> Dict[str, List[Dict[str, Any]]]:
+        """令牌 -> 快照条目列表（支持重复角色）；随快照变化失效，多次进入场景复用。"""
+        idx = self._party_idx
+        if idx is None:
+            idx = {}
+            for ent in self.data.get('party', []) or []:
+                tok = ent.get('token')
+                if tok:
+                    idx.setdefault(sys.intern(str(tok)), []).append(ent)
+            self._party_idx = idx
+        return idx
 
     def apply_party_snapshot_to_board(self, board: List[Any]) -> None:
-        saved: List[Dict[str, Any]] = list(self.data.get('party', []) or [])
-        if not saved:
+        idx = self._party_index()
+        if not idx:
             return
-        # 构建 token -> entries list 映射，以支持重复角色
-        buckets: Dict[str, List[Dict[str, Any]]] = {}
-        for ent in saved:
-            tok = ent.get('token')
-            if not tok:
-                continue
-            buckets.setdefault(tok, []).append(ent)
+        used: Dict[str, int] = {}
         # 逐个棋子应用
         for m in board or []:
             tok = self._member_token(m)
-            lst = buckets.get(tok)
-            if not lst:
+            lst = idx.get(tok)
+            n = used.get(tok, 0)
+            if not lst or n >= len(lst):
                 continue
-            ent = lst.pop(0)
+            used[tok] = n + 1
+            ent = lst[n]
             # 恢复 HP（不动体力）
             try:
                 mhp = _safe_int(ent.get('max_hp', getattr(m, 'max_hp', 0)))
@@ -393,19 +599,7 @@ class SaveManager:
                 pass
 
     def _member_token(self, m) -> str:
-        try:
-            name = getattr(m, 'name', None) or getattr(m, 'display_name', None) or str(m)
-        except Exception:
-            name = 'ally'
-        try:
-            base_atk = _safe_int(getattr(m, 'base_atk', getattr(m, 'attack', 0)))
-        except Exception:
-            base_atk = 0
-        try:
-            max_hp = _safe_int(getattr(m, 'max_hp', getattr(m, 'hp', 0)))
-        except Exception:
-            max_hp = 0
-        return f"{name}|{base_atk}|{max_hp}"
+        return _unit_token(m, 'ally')
 
     def _apply_equipment_spec(self, entity, eq_spec: Dict[str, Any]) -> None:
         try:
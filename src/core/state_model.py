@@ -0,0 +1,192 @@
+"""版本化状态模型：按动作产出紧凑增量（实体 id, 字段, 旧值, 新值）
+
+用法：
+- vs = VersionedState(game)        # game 需提供 player.board / enemies / resources / player.inventory / turn
+- deltas = vs.commit()             # 每次动作后调用；有变化则版本 +1，返回本次增量
+- vs.since(v)                      # 客户端带上已知版本取增量；版本过旧时返回全量快照（reset=True）
+- vs.group_version('enemies')      # 某个分组最近一次变化的版本，供视图做分区缓存
+
+说明：
+- 部分技能会直接改写 hp 而不发事件，因此这里不依赖事件脏标记，而是对已跟踪单位做字段级比对；
+  单位数量很小（场上 ≤15+15），比逐区重建字符串/字典便宜得多。
+- 实体 id 在首次出现时分配（u1/u2...，资源 r1/r2...），单位离场后 id 作废不复用。
+"""
+from __future__ import annotations
+
+from collections import deque
+from itertools import count
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 单位的被跟踪字段（读取失败时记为 None）
+UNIT_FIELDS: Tuple[str, ...] = ('name', 'hp', 'max_hp', 'attack', 'defense', 'stamina', 'stamina_max', 'equip')
+RESOURCE_FIELDS: Tuple[str, ...] = ('name', 'type', 'value')
+# 分组：视图按分组决定是否需要重渲染
+GROUPS: Tuple[str, ...] = ('game', 'board', 'enemies', 'resources', 'inventory')
+
+
+def _unit_field(u: Any, f: str) -> Any:
+    try:
+        if f == 'name':
+            return str(getattr(u, 'display_name', None) or getattr(u, 'name', None) or u.__class__.__name__)
+        if f == 'equip':
+            from src.core.base_entity import equipment_of
+            eq = equipment_of(u)
+            if not eq:
+                return None
+            return tuple(getattr(getattr(eq, s, None), 'name', None) for s in ('left_hand', 'right_hand', 'armor'))
+        if f == 'defense':
+            if hasattr(u, 'get_total_defense'):
+                return int(u.get_total_defense())
+        v = getattr(u, f, None)
+        return int(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else v
+    except Exception:
+        return None
+
+
+def _resource_field(r: Any, f: str) -> Any:
+    try:
+        if f == 'name':
+            return str(getattr(r, 'name', r))
+        if f == 'type':
+            return getattr(r, 'item_type', None)
+        return getattr(r, 'effect_value', None)
+    except Exception:
+        return None
+
+
+class VersionedState:
+    """对一个游戏实例维护“最后已知值”，每次 commit 只产出差异。"""
+
+    def __init__(self, game: Any, max_history: int = 2048):
+        self.game = game
+        self.version = 0
+        # 增量环形缓冲：元素为 dict(v, id, f, old, new)
+        self._log: Deque[Dict[str, Any]] = deque(maxlen=int(max_history))
+        # 最后已知值：(eid, field) -> value
+        self._values: Dict[Tuple[str, str], Any] = {}
+        # 对象 -> eid（以 id(obj) 为键，同时持有对象引用避免 id 复用）
+        self._eids: Dict[int, Tuple[str, Any]] = {}
+        self._unit_ids = count(1)
+        self._res_ids = count(1)
+        self._group_versions: Dict[str, int] = {g: 0 for g in GROUPS}
+        # eid -> 所属分组（上一次 commit 时）
+        self._groups: Dict[str, str] = {}
+
+    # --- id 分配 ---
+    def entity_id(self, obj: Any, kind: str = 'u') -> str:
+        rec = self._eids.get(id(obj))
+        if rec is not None and rec[1] is obj:
+            return rec[0]
+        eid = f"{kind}{next(self._unit_ids if kind == 'u' else self._res_ids)}"
+        self._eids[id(obj)] = (eid, obj)
+        return eid
+
+    # --- 读取当前值 ---
+    def _read_game(self) -> Dict[str, Any]:
+        g = self.game
+        return {
+            'turn': getattr(g, 'turn', None),
+            'scene': getattr(g, 'current_scene', None),
+            'scene_title': getattr(g, 'current_scene_title', None),
+            'player_hp': getattr(getattr(g, 'player', None), 'hp', None),
+            'hand': len(getattr(getattr(g, 'player', None), 'hand', None) or []),
+        }
+
+    def _read_inventory(self) -> Optional[tuple]:
+        try:
+            return tuple((s.item.name, int(s.quantity)) for s in self.game.player.inventory.slots)
+        except Exception:
+            return None
+
+    # --- 提交 ---
+    def commit(self) -> List[Dict[str, Any]]:
+        """比对当前状态与最后已知值，产出本次增量；无变化时版本不变并返回 []。"""
+        changes: List[Tuple[str, str, str, Any, Any]] = []  # (group, eid, field, old, new)
+        vals = self._values
+
+        def put(group: str, eid: str, field: str, new: Any) -> None:
+            key = (eid, field)
+            old = vals.get(key)
+            if key not in vals or old != new:
+                vals[key] = new
+                changes.append((group, eid, field, old, new))
+
+        for f, v in self._read_game().items():
+            put('game', 'game', f, v)
+
+        live: Dict[str, str] = {}  # eid -> group
+        try:
+            sides = (('board', list(self.game.player.board)), ('enemies', list(self.game.enemies)))
+        except Exception:
+            sides = ()
+        for group, units in sides:
+            ids = []
+            for u in units:
+                eid = self.entity_id(u, 'u')
+                ids.append(eid)
+                live[eid] = group
+                for f in UNIT_FIELDS:
+                    put(group, eid, f, _unit_field(u, f))
+            put(group, group, 'ids', tuple(ids))
+        try:
+            res = list(self.game.resources)
+        except Exception:
+            res = []
+        rids = []
+        for r in res:
+            eid = self.entity_id(r, 'r')
+            rids.append(eid)
+            live[eid] = 'resources'
+            for f in RESOURCE_FIELDS:
+                put('resources', eid, f, _resource_field(r, f))
+        put('resources', 'resources', 'ids', tuple(rids))
+        put('inventory', 'inventory', 'slots', self._read_inventory())
+
+        # 离场实体：清理最后已知值与 id 映射，发一条 removed 增量
+        gone = set(self._groups) - set(live)
+        if gone:
+            for key in [k for k in vals if k[0] in gone]:
+                del vals[key]
+            for oid, (eid, _obj) in list(self._eids.items()):
+                if eid in gone:
+                    del self._eids[oid]
+            for eid in sorted(gone):
+                changes.append((self._groups.get(eid, 'resources'), eid, 'removed', False, True))
+        self._groups = live
+
+        if not changes:
+            return []
+        self.version += 1
+        v = self.version
+        out: List[Dict[str, Any]] = []
+        for group, eid, field, old, new in changes:
+            d = {'v': v, 'id': eid, 'f': field, 'old': old, 'new': new}
+            self._log.append(d)
+            out.append(d)
+            self._group_versions[group] = v
+        return out
+
+    # --- 查询 ---
+    def since(self, version: int) -> Dict[str, Any]:
+        """返回 version 之后的所有增量；若缓冲已不覆盖该版本，则返回全量快照。"""
+        self.commit()
+        try:
+            version = int(version)
+        except Exception:
+            version = -1
+        if version >= self.version:
+            return {'version': self.version, 'deltas': []}
+        oldest = self._log[0]['v'] if self._log else self.version + 1
+        if version < 0 or version + 1 < oldest:
+            return {'version': self.version, 'reset': True, 'state': self.snapshot()}
+        return {'version': self.version, 'deltas': [d for d in self._log if d['v'] > version]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """按实体分组的全量值（基于最后一次 commit）。"""
+        ents: Dict[str, Dict[str, Any]] = {}
+        for (eid, f), v in self._values.items():
+            ents.setdefault(eid, {})[f] = v
+        return ents
+
+    def group_version(self, group: str) -> int:
+        return int(self._group_versions.get(group, 0))
@@ -7,6 +7,10 @@ T = TypeVar('T')
 class ObservableList(Generic[T]):
     """一个带事件的列表代理。常用方法（append/remove/pop/clear/extend/insert）会发布事件。
     事件字段：on_add/on_remove/on_clear/on_reset/on_change（可选，统一变更通知）
+
+    观察者：`observe(cb)` 注册本列表专属的同步回调 cb(op, index, item)，op 为
+    'add' | 'remove' | 'set' | 'reset'（reset 时 index/item 为 0/None）。与事件总线不同，
+    观察者只接收这一个列表的变化（同一进程多局游戏互不干扰），供实体注册表等索引结构维护映射。
     """
     def __init__(self,
                  initial: Optional[Iterable[T]] = None,
@@ -24,6 +28,25 @@ class ObservableList(Generic[T]):
         self._on_reset = on_reset
         self._on_change = on_change
         self._to_payload = to_payload or (lambda x: x)
+        self._observers: list[Callable[[str, int, object], None]] = []
+
+    # --- 观察者 ---
+    def observe(self, cb: Callable[[str, int, object], None]) -> None:
+        if cb not in self._observers:
+            self._observers.append(cb)
+
+    def unobserve(self, cb: Callable[[str, int, object], None]) -> None:
+        try:
+            self._observers.remove(cb)
+        except ValueError:
+            pass
+
+    def _notify(self, op: str, index: int, item: object) -> None:
+        for cb in list(self._observers):
+            try:
+                cb(op, index, item)
+            except Exception:
+                pass
 
     # --- 事件帮助 ---
     def _emit(self, evt: Optional[str], payload: dict | None = None):
@@ -42,6 +65,8 @@ class ObservableList(Generic[T]):
     # --- 列表接口 ---
     def append(self, item: T):
         self._data.append(item)
+        if self._observers:
+            self._notify('add', len(self._data) - 1, item)
         self._emit(self._on_add, {'item': self._to_payload(item)})
         return None
 
@@ -51,17 +76,28 @@ class ObservableList(Generic[T]):
         return None
 
     def insert(self, index: int, item: T):
+        n = len(self._data)
         self._data.insert(index, item)
+        if self._observers:
+            i = index if index >= 0 else max(0, n + index)
+            self._notify('add', min(i, n), item)
         self._emit(self._on_add, {'item': self._to_payload(item), 'index': index})
         return None
 
     def remove(self, item: T):
-        self._data.remove(item)
+        if self._observers:
+            i = self._data.index(item)
+            del self._data[i]
+            self._notify('remove', i, item)
+        else:
+            self._data.remove(item)
         self._emit(self._on_remove, {'item': self._to_payload(item)})
         return None
 
     def pop(self, index: int = -1) -> T:
         it = self._data.pop(index)
+        if self._observers:
+            self._notify('remove', index if index >= 0 else len(self._data) + 1 + index, it)
         self._emit(self._on_remove, {'item': self._to_payload(it), 'index': index})
         return it
 
@@ -69,11 +105,15 @@ class ObservableList(Generic[T]):
         if not self._data:
             return None
         self._data.clear()
+        if self._observers:
+            self._notify('reset', 0, None)
         self._emit(self._on_clear, {})
         return None
 
     def reset(self, items: Iterable[T]):
         self._data = list(items)
+        if self._observers:
+            self._notify('reset', 0, None)
         self._emit(self._on_reset, {'size': len(self._data)})
         return None
 
@@ -89,15 +129,28 @@ class ObservableList(Generic[T]):
 
     def __setitem__(self, idx, value):
         self._data[idx] = value
+        if self._observers:
+            if isinstance(idx, slice):
+                self._notify('reset', 0, None)
+            else:
+                self._notify('set', idx if idx >= 0 else len(self._data) + idx, value)
         self._emit(self._on_change, {'index': idx})
 
     def __delitem__(self, idx):
         it = self._data[idx]
         del self._data[idx]
+        if self._observers:
+            if isinstance(idx, slice):
+                self._notify('reset', 0, None)
+            else:
+                self._notify('remove', idx if idx >= 0 else len(self._data) + 1 + idx, it)
         self._emit(self._on_remove, {'item': self._to_payload(it), 'index': idx})
 
     def __contains__(self, item: object) -> bool:
         return item in self._data
 
+    def index(self, item: object) -> int:
+        return self._data.index(item)
+
     def to_list(self) -> list[T]:
         return list(self._data)
@@ -13,6 +13,8 @@ from src.core.events import publish as publish_event
 class ResourceItem:
     """资源物品"""
 
+    __slots__ = ('name', 'item_type', 'effect_value', '_save_token', '_vm_id')
+
     def __init__(self, name: str, item_type: str, effect_value: int):
         self.name = name
         self.item_type = item_type  # 'weapon', 'potion', 'armor', etc.
@@ -25,6 +27,9 @@ class ResourceItem:
 class Enemy(Combatant):
     """敌人单位（继承 Combatant，统一接口）"""
 
+    # drops/on_death_data/passives 由 MVC 模型按场景数据写入
+    __slots__ = ('death_effect', 'drops', 'on_death_data', 'passives')
+
     def __init__(
         self,
         name: str,
@@ -0,0 +1,495 @@
+"""
+无界面多会话游戏服务器（asyncio + JSON-lines）
+
+- 一个进程内托管多个 `SimplePvEGame` 会话，供压测与机器人接入；
+- 协议：每行一个 JSON 对象，支持 TCP 或 Unix socket；
+- 命令语言与 `GameController.process_command` 一致（a/skill/end/take/use/equip/s/back...）；
+- 每条命令执行期间产生的结构化日志与事件以独立帧推送，最后返回 result 帧；
+- CPU 密集任务（整场模拟/AI 推演）交给进程池，避免阻塞事件循环。
+
+请求示例：
+    {"id": 1, "op": "open", "name": "bot1", "scene": "dungeon_pack/xxx.json"}
+    {"id": 2, "op": "cmd", "session": "s1", "line": "a m1 e1"}
+    {"id": 3, "op": "state", "session": "s1"}
+    {"id": 3, "op": "since", "session": "s1", "version": 12}
+    {"id": 4, "op": "sim", "scene": "default_scene.json", "runs": 20, "turns": 30, "seed": 7}
+    {"id": 5, "op": "close", "session": "s1"}
+
+响应帧：
+    {"type": "log", "session": "s1", "entry": {...}}
+    {"type": "event", "session": "s1", "event": "enemy_damaged", "data": {...}}
+    {"type": "result", "id": 2, "ok": true, "session": "s1", "output": [...], "quit": false, "version": 13, "deltas": [...]}
+    {"type": "error", "id": 2, "error": "..."}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mvc import GameController, GameView
+
+
+# 推送给客户端的事件（与 docs/events.md 保持一致）
+STREAM_EVENTS: Tuple[str, ...] = (
+    'card_added', 'card_damaged', 'card_healed', 'card_died',
+    'enemy_added', 'enemy_removed', 'enemies_changed', 'enemies_reset', 'enemies_cleared',
+    'enemy_damaged', 'enemy_died', 'enemies_died',
+    'resource_added', 'resource_removed', 'resources_changed', 'resources_reset', 'resources_cleared',
+    'equipment_changed', 'stamina_changed', 'inventory_changed',
+    'attack_resolved', 'counter_resolved', 'scene_changed',
+)
+
+
+# 载荷中仅用于区分所属局的字段（不推送给客户端）
+_OWNER_KEYS = ('game', 'inventory', 'player')
+
+
+def _brief(obj: Any) -> Any:
+    """把事件载荷里的实体压缩成可 JSON 序列化的小字典。"""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [_brief(x) for x in obj[:32]]
+    if isinstance(obj, dict):
+        return {str(k): _brief(v) for k, v in list(obj.items())[:32]}
+    out: Dict[str, Any] = {}
+    try:
+        out['name'] = getattr(obj, 'display_name', None) or getattr(obj, 'name', None) or obj.__class__.__name__
+        for k in ('hp', 'max_hp', 'stamina'):
+            v = getattr(obj, k, None)
+            if isinstance(v, (int, float)):
+                out[k] = v
+    except Exception:
+        out = {'repr': str(obj)}
+    return out
+
+
+def snapshot_state(game) -> Dict[str, Any]:
+    """会话状态快照（供 open/state/result 帧使用）。"""
+    def _unit(tok: str, u) -> Dict[str, Any]:
+        d = {'token': tok, 'name': getattr(u, 'display_name', None) or getattr(u, 'name', str(u))}
+        for k in ('hp', 'max_hp', 'attack', 'stamina', 'stamina_max'):
+            try:
+                d[k] = int(getattr(u, k))
+            except Exception:
+                pass
+        return d
+    try:
+        inv = game.player.inventory
+        inventory = [{'token': f'i{i}', 'name': s.item.name, 'qty': s.quantity} for i, s in enumerate(inv.slots, 1)]
+    except Exception:
+        inventory = []
+    return {
+        'turn': getattr(game, 'turn', 0),
+        'scene': getattr(game, 'current_scene', None),
+        'scene_title': getattr(game, 'current_scene_title', None),
+        'board': [_unit(f'm{i}', m) for i, m in enumerate(game.player.board, 1)],
+        'enemies': [_unit(f'e{i}', e) for i, e in enumerate(game.enemies, 1)],
+        'resources': [{'token': f'r{i}', 'name': getattr(r, 'name', str(r))} for i, r in enumerate(game.resources, 1)],
+        'inventory': inventory,
+    }
+
+
+class EngineCommandController(GameController):
+    """沿用 GameController 的命令语言，但把战斗/回合/拾取/返回落到 SimplePvEGame 引擎上。"""
+
+    def _cmd_attack(self, args: List[str]) -> Tuple[List[str], bool]:
+        if len(args) < 2:
+            return ['用法: a <队伍序号|mN> e<敌人序号>'], False
+        try:
+            first = args[0].lower()
+            m_idx = int(first[1:] if first.startswith('m') else first) - 1
+            tgt = args[1].lower()
+            if not tgt.startswith('e'):
+                return ['目标格式: eN (如 e1)'], False
+            e_idx = int(tgt[1:]) - 1
+        except ValueError:
+            return ['序号格式错误'], False
+        ok, msg = self.model.attack_enemy(m_idx, e_idx)
+        text = str(msg or ('攻击完成' if ok else '攻击失败'))
+        self.view.add_history(text)
+        return [text], False
+
+    def _cmd_end_turn(self, args: List[str]) -> Tuple[List[str], bool]:
+        self.model.end_turn()
+        msg = f"进入回合 {self.model.turn}"
+        self.view.add_history(msg)
+        return [msg], False
+
+    def _cmd_take_resource(self, args: List[str]) -> Tuple[List[str], bool]:
+        if not args:
+            return ['用法: take <资源序号|rN>'], False
+        try:
+            arg = args[0].lower()
+            idx = int(arg[1:] if arg.startswith('r') else arg) - 1
+        except ValueError:
+            return ['资源序号格式错误'], False
+        if not (0 <= idx < len(self.model.resources)):
+            return ['无效的资源序号'], False
+        res = self.model.resources.pop(idx)
+        try:
+            from src.systems.inventory import ConsumableItem, MaterialItem
+            name = getattr(res, 'name', str(res))
+            if getattr(res, 'item_type', '') == 'potion':
+                item = ConsumableItem(name=name, description=f"恢复{getattr(res, 'effect_value', 0)}点生命值")
+            else:
+                item = MaterialItem(name=name, description=f"材料物品，价值{getattr(res, 'effect_value', 0)}")
+            self.model.player.inventory.add_item(item)
+        except Exception:
+            pass
+        try:
+            from src.core.save_state import SaveManager
+            prof = getattr(self.model, 'profile', None)
+            if prof and self.model.current_scene:
+                prof.mark_resource_collected(self.model.current_scene, SaveManager.resource_token(res))
+                prof.save()
+        except Exception:
+            pass
+        msg = f"拾取资源: {getattr(res, 'name', res)}"
+        self.view.add_history(msg)
+        return [msg], False
+
+    def _cmd_back(self, args: List[str]) -> Tuple[List[str], bool]:
+        if self.model.navigate_back():
+            return [f"返回: {self.model.current_scene_title or self.model.current_scene}"], False
+        return ['当前场景没有上一级'], False
+
+    def _cmd_help(self, args: List[str]) -> Tuple[List[str], bool]:
+        # 服务器模式不能 print，直接返回文本
+        return [self.help_text], False
+
+
+class GameSession:
+    """单个会话：一个 SimplePvEGame + 命令控制器 + 会话级锁。"""
+
+    def __init__(self, sid: str, player_name: str, scene: Optional[str] = None):
+        from .simple_pve_game import SimplePvEGame
+        self.sid = sid
+        self.game = SimplePvEGame(player_name)
+        if scene:
+            try:
+                self.game.load_scene(scene, keep_board=False)
+            except Exception:
+                pass
+        self.view = GameView()
+        self.controller = EngineCommandController(self.game, self.view)
+        from src.core.state_model import VersionedState
+        self.state = VersionedState(self.game)
+        self.state.commit()
+        self.lock = asyncio.Lock()
+        self.closed = False
+        # 当前命令执行期间捕获到的事件
+        self._events: List[Dict[str, Any]] = []
+
+    def capture(self, evt: str, payload: dict) -> None:
+        try:
+            data = {k: v for k, v in (payload or {}).items() if k not in _OWNER_KEYS}
+            self._events.append({'event': evt, 'data': _brief(data)})
+        except Exception:
+            pass
+
+    def execute(self, line: str) -> Dict[str, Any]:
+        """同步执行一条命令，返回 output/logs/events 与本次状态增量。"""
+        self._events = []
+        try:
+            output, quit_ = self.controller.process_command(line)
+        except Exception as e:
+            output, quit_ = [f"命令执行错误: {e}"], False
+        try:
+            logs = self.game.pop_logs()
+        except Exception:
+            logs = []
+        events, self._events = self._events, []
+        return {
+            'output': [str(x) for x in (output or [])],
+            'quit': bool(quit_),
+            'logs': logs,
+            'events': events,
+            'deltas': self.state.commit(),
+            'version': self.state.version,
+        }
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            from src.core.events import unsubscribe as unsubscribe_event
+            for evt, cb in list(getattr(self.game, '_subs', []) or []):
+                unsubscribe_event(evt, cb)
+            self.game._subs = []
+        except Exception:
+            pass
+        try:
+            prof = getattr(self.game, 'profile', None)
+            if prof:
+                prof.snapshot_inventory(self.game.player.inventory)
+                prof.snapshot_party(self.game.player.board)
+                prof.save()
+        except Exception:
+            pass
+
+
+# --- 进程池任务（必须为模块级函数，便于 pickle） ---
+
+def simulate_scene(scene: str, runs: int = 10, turns: int = 30, seed: Optional[int] = None) -> Dict[str, Any]:
+    """在子进程中跑若干局自动战斗：每回合每个随从攻击首个敌人，直到清场或回合耗尽。"""
+    from .simple_pve_game import SimplePvEGame
+    rng = random.Random(seed)
+    wins = 0
+    turns_used: List[int] = []
+    for _ in range(max(1, int(runs))):
+        random.seed(rng.random())
+        # 模拟不读写存档/世界进度（避免“已击杀”过滤影响后续局，也不留下 __sim_ 存档）；也不需要战斗日志文本
+        g = SimplePvEGame(f"__sim_{os.getpid()}", persist=False)
+        g.combat_log.enabled = False
+        g.load_scene(scene, keep_board=False)
+        g.start_turn()
+        start_scene = g.current_scene
+        t = 0
+        while t < int(turns) and g.enemies and g.player.board and g.current_scene == start_scene:
+            for mi in range(len(g.player.board)):
+                if not g.enemies or g.current_scene != start_scene:
+                    break
+                g.attack_enemy(mi, 0)
+            g.end_turn()
+            t += 1
+        if not g.enemies or g.current_scene != start_scene:
+            wins += 1
+        turns_used.append(t)
+        try:
+            from src.core.events import unsubscribe as unsubscribe_event
+            for evt, cb in list(g._subs):
+                unsubscribe_event(evt, cb)
+        except Exception:
+            pass
+    n = len(turns_used)
+    return {
+        'scene': scene,
+        'runs': n,
+        'wins': wins,
+        'win_rate': wins / n if n else 0.0,
+        'avg_turns': sum(turns_used) / n if n else 0.0,
+    }
+
+
+class HeadlessGameServer:
+    """asyncio 服务器：多会话托管 + JSON-lines 协议。"""
+
+    def __init__(self, max_sessions: int = 256, workers: Optional[int] = None):
+        self.max_sessions = int(max_sessions)
+        self.sessions: Dict[str, GameSession] = {}
+        self._ids = itertools.count(1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = workers
+        self._active: Optional[GameSession] = None
+        self._subs: List[Tuple[str, Any]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # --- 生命周期 ---
+    def _mount_events(self) -> None:
+        if self._subs:
+            return
+        from src.core.events import subscribe as subscribe_event
+
+        def _on_evt(evt, payload):
+            # 引擎逻辑在事件循环线程中同步执行，同一时刻只有一个活跃会话
+            s = self._active
+            if s is not None:
+                s.capture(evt, payload)
+        for name in STREAM_EVENTS:
+            self._subs.append((name, subscribe_event(name, _on_evt)))
+
+    def _unmount_events(self) -> None:
+        try:
+            from src.core.events import unsubscribe as unsubscribe_event
+            for evt, cb in self._subs:
+                unsubscribe_event(evt, cb)
+        except Exception:
+            pass
+        self._subs = []
+
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        return self._pool
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None):
+        self._mount_events()
+        if unix_path:
+            try:
+                if os.path.exists(unix_path):
+                    os.remove(unix_path)
+            except Exception:
+                pass
+            self._server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    async def serve_forever(self, **kw) -> None:
+        server = await self.start(**kw)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        for s in list(self.sessions.values()):
+            s.close()
+        self.sessions.clear()
+        self._unmount_events()
+        if self._pool is not None:
+            try:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+            self._pool = None
+
+    # --- 连接处理 ---
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        owned: List[str] = []
+        send_lock = asyncio.Lock()
+
+        async def send(frame: Dict[str, Any]) -> None:
+            data = (json.dumps(frame, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+            async with send_lock:
+                writer.write(data)
+                await writer.drain()
+
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    req = json.loads(raw.decode('utf-8'))
+                    if not isinstance(req, dict):
+                        raise ValueError('请求必须是 JSON 对象')
+                except Exception as e:
+                    await send({'type': 'error', 'id': None, 'error': f'bad request: {e}'})
+                    continue
+                try:
+                    await self.dispatch(req, send, owned)
+                except Exception as e:
+                    await send({'type': 'error', 'id': req.get('id'), 'error': str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # 断开连接时回收该连接创建的会话
+            for sid in owned:
+                s = self.sessions.pop(sid, None)
+                if s:
+                    s.close()
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def dispatch(self, req: Dict[str, Any], send, owned: List[str]) -> None:
+        op = str(req.get('op') or '').lower()
+        rid = req.get('id')
+        if op == 'ping':
+            await send({'type': 'result', 'id': rid, 'ok': True, 'pong': True})
+        elif op == 'open':
+            if len(self.sessions) >= self.max_sessions:
+                await send({'type': 'error', 'id': rid, 'error': '会话数已达上限'})
+                return
+            sid = f"s{next(self._ids)}"
+            name = str(req.get('name') or f"bot-{sid}")
+            self._active = None
+            s = GameSession(sid, name, req.get('scene'))
+            s.game.pop_logs()
+            self.sessions[sid] = s
+            owned.append(sid)
+            await send({'type': 'result', 'id': rid, 'ok': True, 'session': sid,
+                        'version': s.state.version, 'state': snapshot_state(s.game)})
+        elif op == 'list':
+            await send({'type': 'result', 'id': rid, 'ok': True, 'sessions': sorted(self.sessions.keys())})
+        elif op in ('cmd', 'state', 'since', 'close'):
+            s = self.sessions.get(str(req.get('session')))
+            if s is None:
+                await send({'type': 'error', 'id': rid, 'error': '会话不存在'})
+                return
+            if op == 'state':
+                s.state.commit()
+                await send({'type': 'result', 'id': rid, 'ok': True, 'session': s.sid,
+                            'version': s.state.version, 'state': snapshot_state(s.game)})
+                return
+            if op == 'since':
+                await send({'type': 'result', 'id': rid, 'ok': True, 'session': s.sid,
+                            **s.state.since(req.get('version', -1))})
+                return
+            if op == 'close':
+                self.sessions.pop(s.sid, None)
+                s.close()
+                await send({'type': 'result', 'id': rid, 'ok': True, 'session': s.sid, 'closed': True})
+                return
+            await self._run_command(s, rid, str(req.get('line') or ''), send)
+        elif op == 'sim':
+            loop = asyncio.get_running_loop()
+            res = await loop.run_in_executor(
+                self.pool(), simulate_scene,
+                str(req.get('scene') or 'default_scene.json'),
+                int(req.get('runs', 10) or 10), int(req.get('turns', 30) or 30), req.get('seed'),
+            )
+            await send({'type': 'result', 'id': rid, 'ok': True, 'sim': res})
+        else:
+            await send({'type': 'error', 'id': rid, 'error': f'未知 op: {op}'})
+
+    async def _run_command(self, s: GameSession, rid: Any, line: str, send) -> None:
+        async with s.lock:
+            self._active = s
+            try:
+                res = s.execute(line)
+            finally:
+                self._active = None
+            for entry in res['logs']:
+                await send({'type': 'log', 'session': s.sid, 'entry': entry})
+            for ev in res['events']:
+                await send({'type': 'event', 'session': s.sid, **ev})
+            await send({
+                'type': 'result', 'id': rid, 'ok': True, 'session': s.sid,
+                'output': res['output'], 'quit': res['quit'],
+                'version': res['version'], 'deltas': res['deltas'],
+            })
+            if res['quit']:
+                self.sessions.pop(s.sid, None)
+                s.close()
+
+
+def run_server(host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+               max_sessions: int = 256, workers: Optional[int] = None) -> None:
+    """阻塞运行服务器（Ctrl+C 退出）。"""
+    srv = HeadlessGameServer(max_sessions=max_sessions, workers=workers)
+    try:
+        asyncio.run(srv.serve_forever(host=host, port=port, unix_path=unix_path))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    ap = argparse.ArgumentParser(description='PYHS 无界面多会话服务器 (JSON-lines)')
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--unix', default=None, help='Unix socket 路径（指定后忽略 host/port）')
+    ap.add_argument('--max-sessions', type=int, default=256)
+    ap.add_argument('--workers', type=int, default=None, help='模拟任务进程池大小')
+    ns = ap.parse_args(argv)
+    print(f"headless server: {'unix:' + ns.unix if ns.unix else f'{ns.host}:{ns.port}'}")
+    run_server(ns.host, ns.port, ns.unix, ns.max_sessions, ns.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,13 @@
 负责处理玩家输入的命令和游戏逻辑
 """
 
+import os
 from typing import List, Tuple, Any, Optional
 from .model import GameModel
 from .view import GameView
-from src.systems.skill_strategy import get_skill, list_available_skills
+from src.systems.skill_registry import get_registry
+from src.core import perf as P
+from src.core import sampler as SP
 
 
 class GameController:
@@ -34,6 +37,8 @@ class GameController:
             'b': self._cmd_back,
             'i': self._cmd_inventory,
             'inv': self._cmd_inventory,
+            'perf': self._cmd_perf,
+            'prof': self._cmd_prof,
         }
         
         # 帮助信息
@@ -42,7 +47,9 @@ class GameController:
             "s 5 : 查看信息摘要  |  s 3 : 查看最近战斗日志\n"
             "a <mN> e<N> : 用我方单位攻击指定敌人\n"
             "skill <name> <mN> [targets...] : 释放技能（体力消耗见 UI 提示）\n"
-            "end : 结束回合  |  h : 帮助  |  q : 退出"
+            "end : 结束回合  |  h : 帮助  |  q : 退出\n"
+            "perf on|off|show|dump [路径]|reset : 性能计时开关/查看/导出 JSON\n"
+            "prof start [秒]|stop|status : 主线程采样分析，结果写入日志目录（折叠栈/火焰图格式）"
         )
     
     def process_command(self, command_line: str) -> Tuple[List[str], bool]:
@@ -60,8 +67,16 @@ class GameController:
             return [], False
         
         cmd = parts[0].lower()
-        args = parts[1:]
-        
+        # 采样分析按命令打标（未采样时仅是一次赋值）
+        SP.tag_command(cmd)
+        try:
+            with P.span('cmd', cmd):
+                return self._dispatch(cmd, parts[1:])
+        finally:
+            SP.tag_command(None)
+    
+    def _dispatch(self, cmd: str, args: List[str]) -> Tuple[List[str], bool]:
+        """按命令词分派（process_command 在外层计时）"""
         # 检查是否是已知命令
         if cmd in self.commands:
             try:
@@ -73,8 +88,8 @@ class GameController:
         if cmd.startswith('c') and len(cmd) > 1 and cmd[1:].isdigit():
             return self._cmd_craft_by_index(int(cmd[1:]))
         
-        # 检查是否是技能命令
-        if cmd in ['skill', 'sk', 'sweep', 'basic_heal', 'drain', 'taunt', 'arcane_missiles']:
+        # 检查是否是技能命令（skill/sk 前缀，或直接以技能 id/名称开头；注册表 O(1) 查询）
+        if cmd in ('skill', 'sk') or cmd in get_registry():
             return self._cmd_skill(cmd, args)
         
         return ['未知指令，h 查看帮助'], False
@@ -227,10 +242,9 @@ class GameController:
                     return ['无效的物品索引'], False
             else:
                 # 按名称查找物品
-                for slot in self.model.player.inventory.slots:
-                    if hasattr(slot.item, 'name') and slot.item.name == item_name:
-                        item = slot.item
-                        break
+                stacks = self.model.player.inventory.find_stacks(item_name)
+                if stacks:
+                    item = stacks[0].item
             
             if not item:
                 return [f'未找到物品: {item_name}'], False
@@ -243,11 +257,11 @@ class GameController:
             try:
                 success = target.equipment.equip(item, game=self.model)
                 if success:
-                    # 从背包移除物品
-                    # 找到对应的slot并移除
-                    for i, slot in enumerate(self.model.player.inventory.slots):
+                    # 从背包移除物品（经由背包方法以同步名称/类型索引）
+                    inv = self.model.player.inventory
+                    for slot in inv.find_stacks(item.name):
                         if slot.item == item:
-                            self.model.player.inventory.slots.pop(i)
+                            inv.remove_stack(slot)
                             break
                     msg = f"成功装备 {item} 到 {target}"
                     self.view.add_history(msg)
@@ -313,20 +327,24 @@ class GameController:
         
         if args[0].isdigit():
             return self._cmd_craft_by_index(int(args[0]))
-        else:
-            recipe_name = args[0]
-            # 这里可以添加合成逻辑
-            msg = f"合成 {recipe_name}"
-            self.view.add_history(msg)
-            return [msg], False
+        book = getattr(self.model, 'crafting', None)
+        if book is None:
+            return ['当前模式不支持合成'], False
+        ok, msg = book.craft(' '.join(args), game=self.model)
+        self.view.add_history(msg)
+        return [msg], False
     
     def _cmd_craft_by_index(self, idx: int) -> Tuple[List[str], bool]:
-        """按索引合成"""
+        """按索引合成（索引对应背包区“可合成”清单中的 cN）"""
         if idx <= 0:
             return ['索引应为正整数'], False
-        
-        # 这里可以添加按索引合成的逻辑
-        msg = f"合成配方 #{idx}"
+        book = getattr(self.model, 'crafting', None)
+        if book is None:
+            return ['当前模式不支持合成'], False
+        craftable = book.craftable()
+        if idx > len(craftable):
+            return [f'无效的配方序号: c{idx}'], False
+        ok, msg = book.craft(craftable[idx - 1], game=self.model)
         self.view.add_history(msg)
         return [msg], False
     
@@ -342,50 +360,109 @@ class GameController:
         content = self.view.render_section('inventory', self.model)
         return [content], False
     
+    def _cmd_perf(self, args: List[str]) -> Tuple[List[str], bool]:
+        """性能计时命令：perf on|off|show|dump [路径]|reset"""
+        sub = args[0].lower() if args else 'show'
+        if sub == 'on':
+            P.enable(True)
+            return ['性能计时已开启'], False
+        if sub == 'off':
+            P.enable(False)
+            return ['性能计时已关闭'], False
+        if sub == 'reset':
+            P.reset()
+            return ['性能计时已清空'], False
+        if sub == 'dump':
+            try:
+                path = P.dump(args[1] if len(args) >= 2 else None)
+            except Exception as e:
+                return [f'导出失败: {e}'], False
+            return [f'性能数据已导出: {path}'], False
+        if sub == 'show':
+            return ['\n'.join(P.overlay_lines(20))], False
+        return ['用法: perf on|off|show|dump [路径]|reset'], False
+    
+    def _cmd_prof(self, args: List[str]) -> Tuple[List[str], bool]:
+        """采样分析命令：prof start [秒]|stop|status"""
+        sub = args[0].lower() if args else 'status'
+        if sub == 'start':
+            try:
+                secs = float(args[1]) if len(args) >= 2 else None
+            except ValueError:
+                return ['用法: prof start [秒]'], False
+            scene = getattr(self.model, 'current_scene_title', None) or getattr(self.model, 'current_scene', None)
+            if not SP.start(secs, scene=os.path.basename(str(scene)) if scene else None):
+                return ['采样已在进行中（prof stop 结束）'], False
+            return [f"开始采样{f' {secs:g} 秒' if secs else '（prof stop 结束）'}"], False
+        if sub == 'stop':
+            prof = SP.stop()
+            if prof is None:
+                return ['当前没有进行中的采样'], False
+            return [self._prof_summary(prof)], False
+        if sub == 'status':
+            if SP.running():
+                return ['采样进行中'], False
+            prof = SP.last()
+            return [self._prof_summary(prof) if prof else '尚未采样'], False
+        return ['用法: prof start [秒]|stop|status'], False
+    
+    @staticmethod
+    def _prof_summary(prof) -> str:
+        lines = [f'采样 {prof.samples} 次 / {prof.elapsed:.1f} 秒，已写入: {prof.path or "-"}']
+        for frame, n in prof.top(5):
+            lines.append(f'  {n:>5}  {frame}')
+        return '\n'.join(lines)
+    
     def _cmd_skill(self, skill_name: str, args: List[str]) -> Tuple[List[str], bool]:
-        """技能命令"""
+        """技能命令：skill <name> <source mN> [target] 或 <name> <source mN> [target]"""
+        if skill_name in ('skill', 'sk'):
+            if not args:
+                return ['用法: skill <name> <source mN> [target]'], False
+            skill_name, args = args[0], args[1:]
         if not args:
             return ['用法: skill <name> <source mN> [target]'], False
         
-        source_tok = args[0]
+        source_tok = args[0].lower()
         if not source_tok.startswith('m'):
             return ['来源需为随从标记 mN'], False
         
+        registry = get_registry()
+        skill = registry.resolve(skill_name)
+        if skill is None or not skill.active:
+            return [f'未知技能: {skill_name}'], False
+        
         try:
             src_idx = int(source_tok[1:]) - 1
-            if 0 <= src_idx < len(self.model.player.board):
-                source = self.model.player.board[src_idx]
-                
-                # 获取技能策略
-                skill = get_skill(skill_name)
-                if not skill:
-                    return [f'未知技能: {skill_name}'], False
-                
-                # 解析目标（如果有）
-                target = None
-                if len(args) >= 2:
-                    target = self._resolve_target_token(args[1])
-                
-                # 执行技能
-                success, msg = skill.execute(self.model, source, target)
-                
-                if success:
-                    self.view.add_history(f"{source} 使用技能 {skill_name}: {msg}")
-                    # 标记已攻击
-                    if hasattr(source, 'can_attack'):
-                        source.can_attack = False
-                else:
-                    self.view.add_info(f"技能失败: {msg}")
-                
-                return [msg], False
-            else:
-                return ['无效的来源序号'], False
         except ValueError:
             return ['来源序号格式错误'], False
+        if not (0 <= src_idx < len(self.model.player.board)):
+            return ['无效的来源序号'], False
+        source = self.model.player.board[src_idx]
+        tgt_tok = args[1].lower() if len(args) >= 2 else None
+        
+        # 引擎模型自带 use_skill（含清场跳转等收尾）；否则直接经注册表执行
+        if hasattr(self.model, 'use_skill'):
+            success, msg = self.model.use_skill(skill.id, src_idx + 1, tgt_tok)
+        else:
+            target = self._resolve_target_token(tgt_tok) if tgt_tok else None
+            success, msg = registry.execute(self.model, skill.id, source, target)
+        
+        if success:
+            self.view.add_history(f"{source} 使用技能 {skill.label}: {msg}")
+            # 标记已攻击
+            if hasattr(source, 'can_attack'):
+                source.can_attack = False
+        else:
+            self.view.add_info(f"技能失败: {msg}")
+        
+        return [msg], False
     
     def _resolve_target_token(self, token: str) -> Any:
         """解析目标令牌"""
         token = token.lower()
+        reg = getattr(self.model, 'registry', None)
+        if reg is not None:
+            return reg.resolve(token)
         
         # 敌人: e1/e2...
         if token.startswith('e'):
@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional
 from src.core.player import Player
 from src.core.zone import ObservableList
 from src.core.save_state import SaveManager
+from src.core.state_model import VersionedState
 
 
 class GameModel:
@@ -53,7 +54,7 @@ class GameModel:
         # 启用被动系统
         try:
             from src.systems import passives_system as PS
-            PS.setup()
+            PS.setup(self)
         except Exception:
             pass
         
@@ -68,6 +69,15 @@ class GameModel:
         
         # 订阅事件
         self._setup_event_subscriptions()
+        
+        # 版本化状态：每次动作后 commit 产出增量；查询接口按版本缓存
+        self.state = VersionedState(self)
+        self._memo: Dict[str, tuple] = {}
+        
+        # 合成：配方随场景包加载，可合成列表随 inventory_changed 增量更新
+        from src.systems.crafting import CraftingBook
+        self.crafting = CraftingBook(self.player.inventory)
+        self._subs.append(('inventory_changed', self.crafting._sub))
     
     def _init_board(self):
         """初始化玩家队伍"""
@@ -101,6 +111,9 @@ class GameModel:
     def _on_inventory_changed(self, event_name: str, payload: Dict[str, Any]):
         """处理背包变化事件"""
         try:
+            inv = (payload or {}).get('inventory')
+            if inv is not None and inv is not self.player.inventory:
+                return
             if self.profile:
                 self.profile.snapshot_inventory(self.player.inventory)
                 self.profile.save()
@@ -116,9 +129,32 @@ class GameModel:
         except Exception:
             pass
     
+    # --- 版本化状态 ---
+    def commit_state(self) -> List[Dict[str, Any]]:
+        """比对并提交本次动作产生的增量（无变化返回 []）"""
+        return self.state.commit()
+    
+    def state_since(self, version: int) -> Dict[str, Any]:
+        """获取指定版本之后的增量；版本过旧时返回全量快照"""
+        return self.state.since(version)
+    
+    def _cached(self, key: str, build):
+        """状态版本未变化时直接复用上次构建结果"""
+        self.state.commit()
+        v = self.state.version
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == v:
+            return hit[1]
+        val = build()
+        self._memo[key] = (v, val)
+        return val
+    
     # --- 游戏状态查询方法 ---
     def get_state(self) -> Dict[str, Any]:
         """获取游戏状态摘要"""
+        return self._cached('state', self._build_state)
+    
+    def _build_state(self) -> Dict[str, Any]:
         return {
             'turn': self.turn,
             'player': {
@@ -137,6 +173,9 @@ class GameModel:
     
     def get_player_info(self) -> Dict[str, Any]:
         """获取玩家详细信息"""
+        return self._cached('player', self._build_player_info)
+    
+    def _build_player_info(self) -> Dict[str, Any]:
         return {
             'name': self.player.name,
             'hp': self.player.hp,
@@ -148,6 +187,9 @@ class GameModel:
     
     def get_enemies_info(self) -> List[Dict[str, Any]]:
         """获取敌人信息"""
+        return self._cached('enemies', self._build_enemies_info)
+    
+    def _build_enemies_info(self) -> List[Dict[str, Any]]:
         enemies_info = []
         for enemy in self.enemies:
             try:
@@ -187,6 +229,11 @@ class GameModel:
                 card.can_attack = True
             except Exception:
                 pass
+        try:
+            from src.core.events import publish as publish_event
+            publish_event('turn_start', {'game': self, 'turn': self.turn})
+        except Exception:
+            pass
     
     def end_turn(self):
         """结束当前回合"""
@@ -222,8 +269,31 @@ class GameModel:
             print(f"读取场景失败: {e}")
             return False
 
+        # 加载进度（scene_loading 事件，界面遮罩显示“已构建/总数”；按批发布，不逐个单位发布）
+        try:
+            total = sum(len(data.get(k) or []) for k in ('board', 'enemies', 'resources', 'inventory_equipment'))
+        except Exception:
+            total = 0
+        loaded = [0]
+
+        def _progress(n: int = 0, force: bool = False) -> None:
+            before = loaded[0]
+            loaded[0] += n
+            if force or loaded[0] // 32 != before // 32:
+                try:
+                    from src.core.events import publish as publish_event
+                    publish_event('scene_loading', {'scene_path': scene_path, 'done': loaded[0], 'total': total})
+                except Exception:
+                    pass
+
+        _progress(force=True)
+
         # 记录当前场景
         self.current_scene = scene_path
+        try:
+            self.crafting.load_for_scene(scene_path)
+        except Exception:
+            pass
         
         # 记录友好场景标题
         try:
@@ -278,6 +348,7 @@ class GameModel:
                         from src.core.cards import NormalCard
                         card = NormalCard(atk, hp, name=name)
                         self.player.board.append(card)
+                        _progress(1)
                         
                         # 处理随从装备
                         # 支持两种格式：equip.items 和 equipment 数组
@@ -378,6 +449,7 @@ class GameModel:
                             enemy.race = enemy_data['race']
                         
                         self.enemies.append(enemy)
+                        _progress(1)
                         
                 except Exception as e:
                     print(f"创建敌人失败: {e}")
@@ -488,6 +560,8 @@ class GameModel:
         except Exception as e:
             print(f"加载场景内容失败: {e}")
         
+        loaded[0] = total
+        _progress(force=True)
         return True
     
     def _equip_enemy_from_json(self, enemy, equip_data):
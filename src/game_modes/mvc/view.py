@@ -13,6 +13,8 @@ class GameView:
     def __init__(self):
         self.history = []  # 操作历史
         self.info = []     # 信息区
+        # 分区缓存：section -> (状态分组版本, 文本)；仅当模型提供 VersionedState 时启用
+        self._section_cache: Dict[str, tuple] = {}
     
     def add_history(self, line: str):
         """添加历史记录"""
@@ -33,35 +35,75 @@ class GameView:
     def render_full_view(self, model) -> str:
         """渲染完整游戏视图"""
         sep = C.dim('────────────────────────────────')
-        parts: List[str] = []
+        return f"\n{sep}\n".join(text for name, text in self.render_sections(model) if text or name != 'scene')
+    
+    def render_sections(self, model) -> List[tuple]:
+        """按显示顺序返回 [(区块名, 文本)]：scene/info/player/enemy/resources/inventory/history。
+        控制台增量渲染器（src.ui.console_renderer）按区块比对上一帧；无场景标题时 scene 为空串。"""
+        sections: List[tuple] = []
         
         # 场景标题
+        title_text = ''
         try:
             scene_name = getattr(model, 'current_scene_title', None) or model.current_scene
             if scene_name:
                 import os
                 title = scene_name if getattr(model, 'current_scene_title', None) else os.path.basename(scene_name)
-                parts.append(C.heading(f"【场景】{title}"))
-                parts.append(sep)
+                title_text = C.heading(f"【场景】{title}")
         except Exception:
             pass
+        sections.append(('scene', title_text))
         
         # 信息区置顶
-        parts.append(self._render_info_section(model))
-        parts.append(sep)
+        sections.append(('info', self._render_info_section(model)))
         
-        # 队伍 -> 敌人 -> 资源 -> 背包 -> 历史
-        parts.append(self._render_player_section(model))
-        parts.append(sep)
-        parts.append(self._render_enemy_section(model))
-        parts.append(sep)
-        parts.append(self._render_resources_section(model))
-        parts.append(sep)
-        parts.append(self._render_inventory_section(model))
-        parts.append(sep)
-        parts.append(self._render_history_section(model))
+        # 队伍 -> 敌人 -> 资源 -> 背包 -> 历史（先统一提交一次状态，再按分组版本复用缓存）
+        try:
+            state = getattr(model, 'state', None)
+            if state is not None:
+                state.commit()
+        except Exception:
+            pass
+        for name in ('player', 'enemy', 'resources', 'inventory'):
+            sections.append((name, self._render_cached(name, model, commit=False)))
+        sections.append(('history', self._render_history_section(model)))
         
-        return "\n".join(parts)
+        return sections
+    
+    # 区块 -> 所依赖的状态分组
+    _SECTION_GROUPS = {
+        'player': 'board',
+        'enemy': 'enemies',
+        'resources': 'resources',
+        'inventory': 'inventory',
+    }
+    
+    def _render_cached(self, section: str, model, commit: bool = True) -> str:
+        """依据状态分组版本复用区块文本；模型无版本化状态时直接渲染"""
+        render = {
+            'player': self._render_player_section,
+            'enemy': self._render_enemy_section,
+            'resources': self._render_resources_section,
+            'inventory': self._render_inventory_section,
+        }[section]
+        state = getattr(model, 'state', None)
+        if state is None or not hasattr(state, 'group_version'):
+            return render(model)
+        try:
+            if commit:
+                state.commit()
+            v = state.group_version(self._SECTION_GROUPS[section])
+            if section == 'inventory':
+                # 可合成清单还取决于配方集（切换场景包时变化）
+                v = (v, getattr(getattr(model, 'crafting', None), 'version', 0))
+        except Exception:
+            return render(model)
+        hit = self._section_cache.get(section)
+        if hit is not None and hit[0] == v:
+            return hit[1]
+        text = render(model)
+        self._section_cache[section] = (v, text)
+        return text
     
     def _render_info_section(self, model) -> str:
         """渲染信息区"""
@@ -267,9 +309,14 @@ class GameView:
         return [f"  {t.ljust(w)}{gap}{s}" for t, s in pairs]
     
     def _get_craftable_recipes(self, model) -> List[Dict[str, Any]]:
-        """获取可合成的配方"""
-        # 这里可以添加合成配方的逻辑
-        return []
+        """获取可合成的配方（配方簿按 inventory_changed 增量维护，这里直接读取）"""
+        book = getattr(model, 'crafting', None)
+        if book is None:
+            return []
+        try:
+            return [r.to_dict() for r in book.craftable()]
+        except Exception:
+            return []
     
     def render_section(self, section_name: str, model) -> str:
         """渲染指定区域"""
@@ -282,6 +329,8 @@ class GameView:
             'info': self._render_info_section
         }
         
+        if section_name in self._SECTION_GROUPS:
+            return self._render_cached(section_name, model)
         render_func = section_map.get(section_name)
         if render_func:
             return render_func(model)
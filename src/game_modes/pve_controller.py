@@ -5,6 +5,8 @@
 - 删除CLI相关代码，专注于核心游戏逻辑
 """
 
+import contextlib
+import io
 from typing import Callable, List, Tuple, Optional, Any
 from .mvc import GameModel, GameView, GameController
 from src.ui import colors as C
@@ -31,6 +33,9 @@ class SimplePvEController:
         self.view = GameView()
         self.controller = GameController(self.model, self.view)
         
+        # 控制台增量渲染器（由 start_simple_pve_game 设置；Tkinter UI 不使用）
+        self.renderer = None
+        
         # 指定初始场景（若提供）
         if initial_scene:
             try:
@@ -118,8 +123,13 @@ class SimplePvEController:
                 for msg in messages:
                     self.view.add_history(msg)
             
-            # 返回Tkinter UI期望的格式
-            return messages, {}
+            # 返回Tkinter UI期望的格式；数据字典附带本次动作的状态增量
+            try:
+                deltas = self.model.commit_state()
+                data = {'version': self.model.state.version, 'deltas': deltas}
+            except Exception:
+                data = {}
+            return messages, data
             
         except Exception as e:
             error_msg = f"命令处理错误: {e}"
@@ -152,6 +162,10 @@ class SimplePvEController:
         """获取敌人信息"""
         return self.model.get_enemies_info()
     
+    def get_state_delta(self, since: int) -> dict:
+        """获取 since 版本之后的状态增量（{'version', 'deltas'} 或 {'version', 'reset', 'state'}）"""
+        return self.model.state_since(since)
+    
     def get_resources_info(self) -> list:
         """获取资源信息"""
         return self.model.get_resources_info()
@@ -248,29 +262,22 @@ class SimplePvEController:
         """获取完整游戏视图"""
         return self.view.render_full_view(self.model)
     
-    def refresh_view(self):
-        """刷新视图"""
-        # 视图会自动更新，这里只是占位符
-        pass
+    def refresh_view(self, output: str = ''):
+        """刷新视图：控制台模式下经增量渲染器只改写变化的区块；Tkinter UI 自行刷新，这里无操作"""
+        r = self.renderer
+        if r is None:
+            return
+        sections = list(self.view.render_sections(self.model))
+        sections.append(('output', output))
+        r.render(sections)
     
     # --- 技能名称缓存（保持原有功能） ---
     
     def _load_skill_names(self):
-        """加载技能名称缓存"""
-        import json as _json, os as _os
+        """加载技能名称缓存（来自统一技能注册表）"""
         try:
-            base = _os.path.dirname(_os.path.dirname(__file__))  # src/
-            path = _os.path.join(base, 'systems', 'skills_catalog.json')
-            with open(path, 'r', encoding='utf-8') as f:
-                data = _json.load(f)
-            names = set()
-            for it in data:
-                if isinstance(it, dict):
-                    ncn = it.get('name_cn'); nen = it.get('name_en'); nid = it.get('id')
-                    if ncn: names.add(str(ncn))
-                    if nen: names.add(str(nen))
-                    if nid: names.add(str(nid))
-            self._skill_names = set(names)
+            from src.systems.skill_registry import get_registry
+            self._skill_names = set(get_registry().names())
         except Exception:
             self._skill_names = set()
     
@@ -341,3 +348,29 @@ class SimplePvEController:
     def running(self):
         """游戏运行状态 - 兼容性访问器"""
         return self.model.running
+
+
+def start_simple_pve_game(name: str | None = None, scene: str | None = None) -> None:
+    """控制台前端主循环：渲染 -> 读命令 -> 执行，直到退出或输入结束（EOF/Ctrl+C）"""
+    from src.ui.console_renderer import ConsoleRenderer
+    game = SimplePvEController(name, scene)
+    renderer = ConsoleRenderer()
+    game.renderer = renderer
+    output = C.dim("输入 h 查看帮助")
+    while True:
+        game.refresh_view(output)
+        try:
+            line = renderer.prompt('> ').strip()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if not line:
+            output = ''
+            continue
+        # 帮助/装备等命令直接 print：收集起来并入输出区块，避免打乱屏幕上的帧
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            lines, should_exit = game.process_command(line)
+        if should_exit:
+            break
+        printed = buf.getvalue().rstrip('\n')
+        output = '\n'.join([x for x in [printed] + [str(m) for m in (lines or [])] if x])
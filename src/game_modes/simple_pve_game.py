@@ -16,17 +16,53 @@ from src.core.cards import NormalCard
 from src.ui import colors as C
 from src.core.events import publish as publish_event
 from src.core.zone import ObservableList
+from src.core.entity_registry import EntityRegistry
+from src.core.combat_log import LogRecord, from_settings as _combat_log_from_settings
 from src.core.save_state import SaveManager
+from src.systems.skill_registry import get_registry
+from src.systems.crafting import CraftingBook
+
+
+def _fmt_attack(rec: LogRecord) -> str:
+    """普通攻击日志文本：命中检定、伤害与目标生命合并为一行（读取日志时调用）。
+    攻击者/目标的显示文本取记录时的快照（args 的 m/e），不读取实体的当前状态。"""
+    a, th = rec.args or {}, rec.roll
+    meta = rec.meta or {}
+    m = a.get('m', rec.actor)
+    tname = a.get('e', getattr(rec.target, 'name', rec.target))
+    if th:
+        roll = th.get('roll'); total = th.get('total'); need = th.get('needed')
+        bonus = (total - roll) if isinstance(roll, int) and isinstance(total, int) else None
+        hit_line = f"d20={roll} + 加值{bonus} = {total} vs AC {need}" if bonus is not None else f"d20={roll} vs AC {need}"
+        if not th.get('hit'):
+            return f"{m} 攻击 {tname}: 未命中；{hit_line}"
+        dealt = rec.amount
+        dmg_r = meta.get('damage')
+        if dmg_r:
+            dice_total = dmg_r.get('dice_total'); bonus_dmg = dmg_r.get('bonus')
+            dmg_line = f"伤害 {dice_total}+{bonus_dmg}={dealt}" if isinstance(dice_total, int) and isinstance(bonus_dmg, int) else f"伤害 {dealt}"
+        else:
+            dmg_line = f"伤害 {dealt}"
+        tgt = meta.get('target') or {}
+        hp_line = f"HP {tgt.get('hp_before')} → {tgt.get('hp_after')}"
+        crit_note = "（致命一击）" if th.get('critical') else ""
+        return f"{m} 攻击 {tname}: 命中{crit_note}；{hit_line}；{dmg_line}；{hp_line}"
+    tgt = meta.get('target') or {}
+    return f"{m} 攻击 {tname}，造成 {rec.amount} 伤害（{tgt.get('hp_after')}/{tgt.get('max_hp')}）"
 
 
 class SimplePvEGame:
-    def __init__(self, player_name: str):
+    def __init__(self, player_name: str, persist: bool = True):
+        """persist=False：不读写存档与世界进度（模拟/基准测试），磁盘上不会留下该玩家的存档。"""
         # 基本状态
         self.player = Player(player_name, is_me=True, game=self)
         self.turn = 1
         self.running = True
         # 事件订阅句柄
         self._subs = []
+        # 合成：配方随场景包加载，可合成列表随 inventory_changed 增量更新
+        self.crafting = CraftingBook(self.player.inventory)
+        self._subs.append(('inventory_changed', self.crafting._sub))
         self.enemies: ObservableList = ObservableList(
             [],
             on_add='enemy_added', on_remove='enemy_removed', on_clear='enemies_cleared', on_reset='enemies_reset', on_change='enemies_changed',
@@ -37,8 +73,18 @@ class SimplePvEGame:
             on_add='resource_added', on_remove='resource_removed', on_clear='resources_cleared', on_reset='resources_reset', on_change='resources_changed',
             to_payload=lambda r: getattr(r, 'name', str(r))
         )
-        # 日志缓冲（控制器会读取并清空）
-        self._log_buffer: list[str] = []
+        # 实体注册表：稳定 id 与阵营/位置映射，随两侧列表变更同步（令牌解析与阵营判断 O(1)）
+        self.registry = EntityRegistry()
+        self.registry.attach('enemy', self.enemies)
+        self.registry.attach('ally', self.player.board)
+        # 日志缓冲（控制器会读取并清空）：有界的类型化记录，文本在读取时才格式化
+        self.combat_log = _combat_log_from_settings()
+        # 单位数量上限与数组化战场（settings rules.limits，场景 JSON 的 limits 可覆盖）
+        self.max_board = self.max_enemies = 15
+        self.arrays_above = 32
+        self.enemy_arrays = None
+        self.board_arrays = None
+        self._apply_limits(None)
         # 场景管理：兼容源码与打包路径
         # 优先使用 <pkg>/scenes (源码运行常见)，其次使用 <pkg父>/scenes（GUI 打包可能放到根 scenes）
         pkg_base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -67,15 +113,17 @@ class SimplePvEGame:
         self.players = {self.player.name: self.player}
         # 初始化默认场景
         # 存档/世界进度
-        try:
-            self.profile = SaveManager.load(self.player.name)
-        except Exception:
-            self.profile = None
+        self.profile = None
+        if persist:
+            try:
+                self.profile = SaveManager.load(self.player.name)
+            except Exception:
+                self.profile = None
         self._init_board()
         # 启用被动系统（事件驱动）
         try:
             from src.systems import passives_system as PS
-            PS.setup()
+            PS.setup(self)
         except Exception:
             pass
         # 将当前初始背包/队伍拍快照
@@ -97,14 +145,14 @@ class SimplePvEGame:
             from src.core.events import subscribe as subscribe_event
             def _snap_any(_e, _p):
                 try:
-                    if self.profile:
+                    if self.profile and self._owns_event(_p):
                         self.profile.snapshot_inventory(self.player.inventory)
                         self.profile.snapshot_party(self.player.board)
                         self.profile.save()
                 except Exception:
                     pass
             for evt in (
-                'inventory_changed','equipment_changed','card_damaged','card_healed','card_died','enemy_died','resource_changed'
+                'inventory_changed','equipment_changed','card_damaged','card_healed','card_died','enemy_died','enemies_died','resource_changed'
             ):
                 try:
                     self._subs.append((evt, subscribe_event(evt, _snap_any)))
@@ -112,27 +160,6 @@ class SimplePvEGame:
                     pass
         except Exception:
             pass
-        # skill dispatch map
-        self.skill_map = {
-            'sweep': self._skill_sweep,
-            'basic_heal': self._skill_basic_heal,
-            'drain': self._skill_drain,
-            'taunt': self._skill_taunt,
-            'arcane_missiles': self._skill_arcane_missiles,
-            # 新增技能（英文 key，对应外置 JSON 的 id）
-            'power_slam': self._skill_power_slam,
-            'bloodlust_priority': self._skill_bloodlust_priority,
-            'execute_mage': self._skill_execute_mage,
-            'mass_intimidate': self._skill_mass_intimidate,
-            'precise_strike': self._skill_precise_strike,
-            'disarm': self._skill_disarm,
-            'shield_breaker': self._skill_shield_breaker,
-            'dual_wield_bane': self._skill_dual_wield_bane,
-            'mind_over_matter': self._skill_mind_over_matter,
-            'trial_of_wisdom': self._skill_trial_of_wisdom,
-            'execute_wounded': self._skill_execute_wounded,
-            'fair_distribution': self._skill_fair_distribution,
-        }
 
     # 调试用：返回内部候选场景根（按优先级）
     def _debug_scene_candidates(self) -> list[str]:
@@ -234,6 +261,10 @@ class SimplePvEGame:
 
         # 记录当前场景
         self.current_scene = scene_path
+        try:
+            self.crafting.load_for_scene(scene_path)
+        except Exception:
+            pass
         # 记录友好场景标题
         try:
             base = os.path.splitext(os.path.basename(scene_path))[0]
@@ -273,11 +304,28 @@ class SimplePvEGame:
         self.player.board.clear()
         self.player.hand.clear()  # 场景模式不自动发起手牌
 
-    # 敌人（最多 15）
-        for ed in data.get('enemies', [])[:15]:
-            e = self._make_enemy(ed)
-            if e is not None:
-                self.enemies.append(e)
+        # 数量上限：先恢复 settings 默认，再叠加本场景 limits
+        self._apply_limits(data.get('limits'))
+
+    # 敌人（最多 max_enemies；条目可带 count 批量生成同名敌人）
+        spawned = []
+        for ed in data.get('enemies', []):
+            n = 1
+            if isinstance(ed, dict):
+                try:
+                    n = max(1, int(ed.get('count', 1)))
+                except Exception:
+                    n = 1
+            for _ in range(n):
+                if len(spawned) >= self.max_enemies:
+                    break
+                e = self._make_enemy(ed)
+                if e is not None:
+                    spawned.append(e)
+            if len(spawned) >= self.max_enemies:
+                break
+        if spawned:
+            self.enemies.reset(spawned)
 
     # 资源
         for rd in data.get('resources', []):
@@ -285,6 +333,12 @@ class SimplePvEGame:
             if r is not None:
                 self.resources.append(r)
 
+        # 场景构建时一次性计算并缓存实体令牌（进度过滤/击杀标记直接复用）
+        try:
+            SaveManager.stamp_tokens(enemies=self.enemies, resources=self.resources)
+        except Exception:
+            pass
+
         # 应用世界进度：过滤已被清除的敌人与资源
         try:
             if self.profile and self.current_scene:
@@ -292,24 +346,26 @@ class SimplePvEGame:
         except Exception:
             pass
 
-        # 我方随从（最多 15）
+        # 我方随从（最多 max_board）
+        cap = self.max_board
         if eff_keep and preserved_board:
             # 保留旧随从，忽略新场景 board
-            self.player.board.extend(preserved_board[:15])
+            self.player.board.extend(preserved_board[:cap])
         else:
-            for md in data.get('board', [])[:15]:
+            for md in data.get('board', [])[:cap]:
                 m = self._make_minion(md)
                 if m is not None:
-                    if len(self.player.board) < 15:
+                    if len(self.player.board) < cap:
                         self.player.board.append(m)
                     else:
                         break
-        # 再次裁剪，确保不超过 15
-        if len(self.player.board) > 15:
-            self.player.board[:] = self.player.board[:15]
+        # 再次裁剪，确保不超过上限
+        if len(self.player.board) > cap:
+            self.player.board[:] = self.player.board[:cap]
 
         # 应用队伍快照（恢复 HP/装备，不含体力）
         try:
+            SaveManager.stamp_tokens(members=self.player.board)
             if self.profile:
                 self.profile.apply_party_snapshot_to_board(self.player.board)
         except Exception:
@@ -334,9 +390,16 @@ class SimplePvEGame:
         except Exception:
             pass
 
+        # 单位数超过阈值的一侧改用数组化表示（未超过时释放旧数组）
+        try:
+            from src.core import combat_arrays as CA
+            CA.update(self)
+        except Exception:
+            pass
+
         # 通知资源区已重置（UI 只订阅 resource_changed）
         try:
-            publish_event('resource_changed', {'action': 'reset', 'size': len(self.resources)})
+            publish_event('resource_changed', {'game': self, 'action': 'reset', 'size': len(self.resources)})
         except Exception:
             pass
 
@@ -345,6 +408,24 @@ class SimplePvEGame:
         self.log(f"进入场景: {shown}")
         return True
 
+    def _apply_limits(self, override) -> None:
+        """单位数量上限：settings rules.limits（board/enemies/arrays_above），再叠加场景 limits。"""
+        lim = {}
+        try:
+            from src import settings as S
+            lim.update(S.current().rules.get('limits') or {})
+        except Exception:
+            pass
+        if isinstance(override, dict):
+            lim.update(override)
+        try:
+            self.max_board = max(1, int(lim.get('board', 15)))
+            self.max_enemies = max(1, int(lim.get('enemies', 15)))
+            self.arrays_above = max(0, int(lim.get('arrays_above', 32)))
+        except Exception:
+            self.max_board = self.max_enemies = 15
+            self.arrays_above = 32
+
     # --- 导航：返回上一级 ---
     def can_navigate_back(self) -> bool:
         try:
@@ -366,6 +447,11 @@ class SimplePvEGame:
 
     def transition_to_scene(self, scene_name_or_path: str, preserve_board: bool = False):
         """场景切换：按需保留随从区"""
+        # 先通知界面进入加载（遮罩/进度），加载完成后再发布 scene_changed
+        try:
+            publish_event('scene_loading', {'scene_path': scene_name_or_path, 'done': 0, 'total': 0})
+        except Exception:
+            pass
         ok = self.load_scene(scene_name_or_path, keep_board=preserve_board)
         if ok:
             # 切换场景后，回合不变，仅刷新随从可攻击标记
@@ -398,6 +484,11 @@ class SimplePvEGame:
             except Exception:
                 pass
             c.can_attack = True
+        # 回合开始被动（turn_start 钩子）
+        try:
+            publish_event('turn_start', {'game': self, 'turn': self.turn})
+        except Exception:
+            pass
 
     def _to_character_sheet(self, entity):
         """Map a Combatant-like entity to a minimal CharacterSheet for DND computations."""
@@ -427,6 +518,13 @@ class SimplePvEGame:
                 # dex modifier will be computed below once attrs are available
             else:
                 cs = CharacterSheet(name)
+            # 同侧光环加值（无光环时直接返回空）
+            try:
+                from src.systems.passives_system import aura_bonuses
+                for k, v in aura_bonuses(entity, self).items():
+                    cs.bonuses[k] = int(cs.bonuses.get(k, 0) or 0) + v
+            except Exception:
+                pass
             # 若未指定 AC，则用 10 + defense 作为基础（DEX 修正由 get_ac 再叠加，避免重复）
             try:
                 dfn = int(entity.get_total_defense()) if hasattr(entity, 'get_total_defense') else int(getattr(entity, 'defense', 0))
@@ -456,11 +554,7 @@ class SimplePvEGame:
             return False, '敌人序号无效'
         m = self.player.board[minion_idx]
         # 新规则：攻击消耗体力（默认1），不足则不可攻击
-        try:
-            from src import settings as S
-            cost = int(getattr(S, 'get_skill_cost')('attack', 1))
-        except Exception:
-            cost = 1
+        cost = get_registry().cost('attack', 1)
         if getattr(m, 'stamina', 0) < cost:
             return False, '体力不足，无法攻击'
         e = self.enemies[enemy_idx]
@@ -484,12 +578,9 @@ class SimplePvEGame:
             th = self._enrich_to_hit(th, att_sheet, def_sheet, weapon_bonus=weapon_bonus, is_proficient=is_proficient, use_str=True, defender_entity=e)
             # 暂不单独输出 to_hit 行，改为合并到攻击摘要里；meta 仍携带
             if not th.get('hit'):
-                # 汇总一条更可读的未命中信息
-                roll = th.get('roll'); total = th.get('total'); need = th.get('needed')
-                bonus = (total - roll) if isinstance(roll, int) and isinstance(total, int) else None
-                hit_line = f"d20={roll} + 加值{bonus} = {total} vs AC {need}" if bonus is not None else f"d20={roll} vs AC {need}"
-                text = f"{m} 攻击 {getattr(e,'name',e)}: 未命中；{hit_line}"
-                self.log({'type': 'attack', 'text': text, 'meta': {'to_hit': th}})
+                # 汇总一条更可读的未命中信息（文本在读取日志时才拼接）
+                self.record('attack', _fmt_attack, {'m': m, 'e': getattr(e, 'name', e)},
+                            actor=m, target=e, roll=th, amount=0, meta={'to_hit': th})
                 try:
                     m.spend_stamina(cost)
                 except Exception:
@@ -509,43 +600,32 @@ class SimplePvEGame:
         prev_e = getattr(e, 'hp', 0)
         dead = e.take_damage(dealt)
         dealt = max(0, prev_e - getattr(e, 'hp', 0))
-        # 组合为一条更可读的攻击信息
-        if th:
-            roll = th.get('roll'); total = th.get('total'); need = th.get('needed'); crit = th.get('critical')
-            bonus = (total - roll) if isinstance(roll, int) and isinstance(total, int) else None
-            hit_line = f"d20={roll} + 加值{bonus} = {total} vs AC {need}" if bonus is not None else f"d20={roll} vs AC {need}"
-            if dmg_r:
-                dice_rolls = dmg_r.get('dice_rolls'); dice_total = dmg_r.get('dice_total'); bonus_dmg = dmg_r.get('bonus')
-                dmg_line = f"伤害 {dice_total}+{bonus_dmg}={dealt}" if isinstance(dice_total, int) and isinstance(bonus_dmg, int) else f"伤害 {dealt}"
-            else:
-                dmg_line = f"伤害 {dealt}"
-            hp_line = f"HP {prev_e} → {getattr(e,'hp',0)}"
-            crit_note = "（致命一击）" if crit else ""
-            text = f"{m} 攻击 {getattr(e,'name',e)}: 命中{crit_note}；{hit_line}；{dmg_line}；{hp_line}"
-        else:
-            text = f"{m} 攻击 {getattr(e,'name',e)}，造成 {dealt} 伤害（{getattr(e,'hp',0)}/{getattr(e,'max_hp',0)}）"
-        # 附带来源信息
-        src_info = {
-            'name': getattr(m, 'name', str(m)),
-            'attack': int(getattr(m, 'get_total_attack')() if hasattr(m, 'get_total_attack') else getattr(m, 'attack', 0)),
-        }
-        try:
-            eq = getattr(m, 'equipment', None)
-            if eq:
-                src_info['equipment'] = {
-                    'left_hand': getattr(getattr(eq, 'left_hand', None), 'name', None),
-                    'right_hand': getattr(getattr(eq, 'right_hand', None), 'name', None),
-                    'armor': getattr(getattr(eq, 'armor', None), 'name', None),
-                }
-        except Exception:
-            pass
-        tgt_info = {
-            'name': getattr(e, 'name', str(e)),
-            'defense': int(getattr(e, 'get_total_defense')() if hasattr(e, 'get_total_defense') else getattr(e, 'defense', 0)),
-            'hp_before': prev_e,
-            'hp_after': getattr(e, 'hp', 0),
-        }
-        self.log({'type': 'attack', 'text': text, 'meta': {'to_hit': th, 'damage': dmg_r, 'target': tgt_info, 'sources': {'attacker': src_info}}})
+        # 组合为一条更可读的攻击信息（文本由 _fmt_attack 在读取日志时生成；关闭日志时不收集来源信息）
+        if self.combat_log.enabled:
+            src_info = {
+                'name': getattr(m, 'name', str(m)),
+                'attack': int(getattr(m, 'get_total_attack')() if hasattr(m, 'get_total_attack') else getattr(m, 'attack', 0)),
+            }
+            try:
+                eq = getattr(m, 'equipment', None)
+                if eq:
+                    src_info['equipment'] = {
+                        'left_hand': getattr(getattr(eq, 'left_hand', None), 'name', None),
+                        'right_hand': getattr(getattr(eq, 'right_hand', None), 'name', None),
+                        'armor': getattr(getattr(eq, 'armor', None), 'name', None),
+                    }
+            except Exception:
+                pass
+            tgt_info = {
+                'name': getattr(e, 'name', str(e)),
+                'defense': int(getattr(e, 'get_total_defense')() if hasattr(e, 'get_total_defense') else getattr(e, 'defense', 0)),
+                'hp_before': prev_e,
+                'hp_after': getattr(e, 'hp', 0),
+                'max_hp': getattr(e, 'max_hp', 0),
+            }
+            self.record('attack', _fmt_attack, {'m': m, 'e': getattr(e, 'name', e)},
+                        actor=m, target=e, roll=th, amount=dealt,
+                        meta={'to_hit': th, 'damage': dmg_r, 'target': tgt_info, 'sources': {'attacker': src_info}})
 
         # 触发事件：攻击结算（供被动系统监听）
         try:
@@ -566,7 +646,9 @@ class SimplePvEGame:
                 m.take_damage(getattr(e, 'attack', 0))
                 back = max(0, prev_m - m.hp)
                 if back > 0:
-                    self.log(f"{e.name} 反击 {m}，造成 {back} 伤害（{m.hp}/{m.max_hp}）")
+                    self.record('info', "{e} 反击 {m}，造成 {back} 伤害（{hp}/{max_hp}）",
+                                {'e': e.name, 'm': m, 'back': back, 'hp': m.hp, 'max_hp': m.max_hp},
+                                actor=e, target=m, amount=back)
                     try:
                         publish_event('counter_resolved', {
                             'attacker': e,
@@ -594,53 +676,22 @@ class SimplePvEGame:
                 return True, '攻击成功'
         return True, '攻击成功'
 
-    # --- 技能入口（集中到 systems.skills_engine 执行） ---
+    # --- 技能入口（集中到 systems.skill_registry 执行） ---
     def use_skill(self, skill_name: str, source_idx: int, target_token: str = None):
         """Public entry to invoke a named skill from a minion (1-based index).      
         skill_name: 名称，如 'sweep'、'basic_heal' 等
         source_idx: minion index (1-based)
-        target_token: 'eN' or 'mN' 或 None
+        target_token: 'eN' / 'mN' / '#id'（稳定 id）或 None
         """
         try:
             # resolve source
             if not (1 <= source_idx <= len(self.player.board)):
                 return False, '随从索引无效'
             src = self.player.board[source_idx - 1]
-            # resolve target
-            tgt = None
-            if target_token:
-                if target_token.startswith('e') and target_token[1:].isdigit():
-                    ei = int(target_token[1:]) - 1
-                    if 0 <= ei < len(self.enemies):
-                        tgt = self.enemies[ei]
-                if target_token.startswith('m') and target_token[1:].isdigit():
-                    mi = int(target_token[1:]) - 1
-                    if 0 <= mi < len(self.player.board):
-                        tgt = self.player.board[mi]
-            # 体力消耗：从配置读取，默认 1；若不足则直接失败
-            try:
-                from src import settings as S
-                cost = int(getattr(S, 'get_skill_cost')(skill_name, 1))
-            except Exception:
-                cost = 1
-            if getattr(src, 'stamina', 0) < cost:
-                return False, '体力不足'
-            # 统一经由 skills_engine 执行
-            try:
-                from src.systems import skills_engine as SE
-                ok, msg = SE.execute(self, skill_name, src, tgt)
-            except Exception:
-                # 兼容旧版：若注册表模块不可用，尝试回退到本类映射
-                func = getattr(self, 'skill_map', {}).get(skill_name)
-                if not func:
-                    return False, f'未知技能: {skill_name}'
-                ok, msg = func(src, tgt)
-            # 仅当执行成功时扣除体力
-            if ok:
-                try:
-                    src.spend_stamina(cost)
-                except Exception:
-                    pass
+            # resolve target（eN / mN / #id，经实体注册表）
+            tgt = self.registry.resolve(target_token) if target_token else None
+            # 统一注册表：校验体力 → 执行 → 成功后扣除体力（消耗来自 settings.rules.skill_costs）
+            ok, msg = get_registry().execute(self, skill_name, src, tgt)
             # 技能结束后若清场，触发场景切换（如有定义）。放在所有结算（含体力扣除）之后。
             try:
                 if not self.enemies:
@@ -670,13 +721,34 @@ class SimplePvEGame:
         return int(default)
 
     # --- 盟友死亡集中处理 ---
+    def _owns_event(self, payload: dict) -> bool:
+        """事件是否来自本局：事件总线为进程级，多个会话（headless_server）共用同一总线。
+        载荷带 game / inventory / player 时按对象身份判断；否则看 card/owner/enemy 是否在本局场上；
+        没有任何归属信息的载荷视为本局。
+        """
+        p = payload if isinstance(payload, dict) else {}
+        g = p.get('game')
+        if g is not None:
+            return g is self
+        inv = p.get('inventory')
+        if inv is not None:
+            return inv is self.player.inventory
+        pl = p.get('player')
+        if pl is not None:
+            return pl is self.player
+        for k in ('card', 'owner', 'enemy'):
+            u = p.get(k)
+            if u is not None:
+                return self.registry.side_of(u) is not None
+        return True
+
     def _on_card_died(self, _evt: str, payload: dict):
         """当任意 Card 死亡时：若在我方棋盘上，则触发其亡语（若有）并安全移除。
         说明：Card.take_damage 会同步发布该事件，因此无需在各处手动 remove，避免重复移除。
         """
         try:
             c = (payload or {}).get('card')
-            if not c:
+            if not c or not self._owns_event(payload):
                 return
             # 触发亡语（若卡牌实现了 on_death(game, owner)）
             try:
@@ -690,6 +762,11 @@ class SimplePvEGame:
                     self.player.board.remove(c)
             except Exception:
                 pass
+            try:
+                from src.core import combat_arrays as CA
+                CA.detach(c)
+            except Exception:
+                pass
         except Exception:
             pass
 
@@ -740,7 +817,7 @@ class SimplePvEGame:
                 try:
                     self.resource_zone.append(it)
                     try:
-                        publish_event('resource_changed', {'action': 'add', 'resource': str(it)})
+                        publish_event('resource_changed', {'game': self, 'action': 'add', 'resource': str(it)})
                     except Exception:
                         pass
                 except Exception:
@@ -838,7 +915,7 @@ class SimplePvEGame:
         # 若期间发生场景切换，直接返回
         if self.current_scene != prev_scene:
             try:
-                publish_event('enemy_died', {'enemy': enemy, 'scene_changed': True})
+                publish_event('enemy_died', {'game': self, 'enemy': enemy, 'scene_changed': True})
             except Exception:
                 pass
             return True
@@ -848,6 +925,11 @@ class SimplePvEGame:
                 self.enemies.remove(enemy)
         except Exception:
             pass
+        try:
+            from src.core import combat_arrays as CA
+            CA.detach(enemy)
+        except Exception:
+            pass
         # 标记持久进度
         try:
             if self.profile and prev_scene:
@@ -862,614 +944,77 @@ class SimplePvEGame:
             pass
         # 发布事件
         try:
-            publish_event('enemy_died', {'enemy': enemy, 'scene_changed': False})
+            publish_event('enemy_died', {'game': self, 'enemy': enemy, 'scene_changed': False})
         except Exception:
             pass
         return False
 
-    def _skill_sweep(self, src, tgt):
-        """横扫：对所有敌人进行一次攻击判定并造成源攻击力的一半伤害（向下取整）。"""
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        hits = []
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        dmg_each = max(0, atk_val // 2)
-        for i, e in enumerate(list(self.enemies)):
-            # simple to-hit
-            hit = True
-            meta = {}
-            th = None  # ensure defined even if roll_damage exists but to_hit_roll is None
-            if to_hit_roll:
-                att = self._to_character_sheet(src)
-                dfn = self._to_character_sheet(e)
-                th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False)
-                th = self._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=e)
-                hit = th['hit']
-                meta['to_hit'] = th
-            if hit:
-                prev = e.hp
-                # 用 DND 掷骰描述伤害（1d(dmg_each)）
-                dmg_r = None
-                if roll_damage and dmg_each > 0:
-                    att = self._to_character_sheet(src)
-                    dmg_r = roll_damage(att, dice=(1, max(1, dmg_each)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-                    dmg_r = self._enrich_damage(dmg_r, att, (1, max(1, dmg_each)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-                    amount = int(dmg_r['total'])
-                else:
-                    amount = dmg_each
-                dead = e.take_damage(amount)
-                dealt = max(0, prev - e.hp)
-                meta['damage'] = dmg_r
-                meta['target'] = {'hp_before': prev, 'hp_after': e.hp}
-                self.log({'type': 'skill', 'text': f"{src} 使用 横扫 对 {e.name} 造成 {dealt} 伤害", 'meta': meta})
-                if dead:
-                    changed = self._handle_enemy_death(e)
-                    if changed:
-                        src.can_attack = False
-                        return True, '横扫 执行完毕'
-                    # 若清场（所有敌人被横扫击杀），立即按 on_clear 跳转
-                    try:
-                        if not self.enemies and self._check_on_clear_transition():
-                            src.can_attack = False
-                            return True, '横扫 执行完毕'
-                    except Exception:
-                        pass
-            else:
-                self.log({'type': 'skill', 'text': f"{src} 使用 横扫 未命中 {e.name}", 'meta': meta})
-        # 兼容旧规则：使用技能后视为已行动一次（仅保留 UI 提示）
-        src.can_attack = False
-        return True, '横扫 执行完毕'
-
-    def _skill_basic_heal(self, src, tgt):
-        """基础治疗：对目标恢复固定生命（例如 3 点）。"""
-        if tgt is None:
-            return False, '未选择目标'
-        heal = 3
-        prev = getattr(tgt, 'hp', 0)
-        try:
-            tgt.heal(heal)
-        except Exception:
-            try:
-                tgt.hp = min(getattr(tgt, 'max_hp', prev), prev + heal)
-            except Exception:
-                pass
-        self.log({'type': 'skill', 'text': f"{src} 对 {getattr(tgt, 'name', tgt)} 恢复 {heal} 点生命", 'meta': {'heal': heal, 'target': {'hp_before': prev, 'hp_after': getattr(tgt, 'hp', prev)}}})
-        return True, '治疗完成'
-
-    def _skill_drain(self, src, tgt):
-        """汲取：对单体命中造成伤害并将伤害值转化为自身生命恢复。"""
-        if tgt is None:
-            return False, '未选择目标'
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            att = self._to_character_sheet(src)
-            dfn = self._to_character_sheet(tgt)
-            th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False)
-            th = self._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 汲取 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        prev = getattr(tgt, 'hp', 0)
-        # 用 DND 掷骰造成伤害：1dATK
-        dmg_r = roll_damage(self._to_character_sheet(src), dice=(1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False) if roll_damage else None
-        if dmg_r:
-            att = self._to_character_sheet(src)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-        amount = int(dmg_r['total']) if dmg_r else atk_val
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        # 恢复自身
-        try:
-            src.heal(dealt)
-        except Exception:
-            try:
-                src.hp = min(getattr(src, 'max_hp', getattr(src, 'hp', 0) + dealt), getattr(src, 'hp', 0) + dealt)
-            except Exception:
-                pass
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '汲取完成'
-        meta['damage'] = dmg_r
-        meta['lifesteal'] = dealt
-        meta['target'] = {'hp_before': prev, 'hp_after': getattr(tgt, 'hp', prev)}
-        self.log({'type': 'skill', 'text': f"{src} 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 汲取伤害并恢复 {dealt} 点生命", 'meta': meta})
-        return True, '汲取完成'
-
-    def _skill_taunt(self, src, tgt):
-        """嘲讽：为自己添加 taunt 标记（仇恨），使敌人偏向攻击该目标（场景模式暂不实现复杂 AI）。"""
-        try:
-            src.add_tag('taunt')
-        except Exception:
-            try:
-                if not hasattr(src, 'tags'):
-                    src.tags = set()
-                src.tags.add('taunt')
-            except Exception:
-                pass
-        self.log({'type': 'skill', 'text': f"{src} 施放 嘲讽，吸引仇恨", 'meta': {'tags_added': ['taunt']}})
-        return True, '嘲讽已施放'
-
-    def _skill_arcane_missiles(self, src, tgt):
-        """奥术飞弹：对单体或随机敌人造成 1d4+1 的魔法伤害，分多次命中。
-        为简化，向目标投掷 3 次 1d4+1，每次独立判定与伤害。
-        """
-        import random
-        try:
-            from src.systems.dnd_rules import roll_damage
-        except Exception:
-            roll_damage = None
-        try:
-            if tgt is None:
-                if not self.enemies:
-                    return False, '无敌人'
-                tgt = random.choice(self.enemies)
-            total = 0
-            meta_all = {'bolts': []}
-            att = self._to_character_sheet(src)
-            for _ in range(3):
-                prev = getattr(tgt, 'hp', 0)
-                if roll_damage:
-                    dmg_r = roll_damage(att, dice=(1, 4), damage_bonus=1, critical=False)
-                    dmg_r = self._enrich_damage(dmg_r, att, (1, 4), damage_bonus=1, critical=False, use_str_for_damage=True)
-                    amount = int(dmg_r['total'])
-                else:
-                    r = random.randint(1, 4) + 1
-                    dmg_r = {'total': r, 'dice_rolls': [], 'dice_total': 0, 'bonus': 0}
-                    amount = r
-                dead = tgt.take_damage(amount)
-                dealt = max(0, prev - getattr(tgt, 'hp', prev))
-                total += dealt
-                bolt_meta = {'damage': dmg_r, 'target': {'hp_before': prev, 'hp_after': getattr(tgt, 'hp', prev)}}
-                meta_all['bolts'].append(bolt_meta)
-                self.log({'type': 'skill', 'text': f"{src} 的 奥术飞弹 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 点伤害", 'meta': bolt_meta})
-                if dead:
-                    if tgt in self.enemies:
-                        changed = self._handle_enemy_death(tgt)
-                        if changed:
-                            return True, '奥术飞弹 完成'
-                    break
-            meta_all['total'] = total
-            self.log({'type': 'skill', 'text': f"奥术飞弹 总计造成 {total} 点伤害", 'meta': meta_all})
-            return True, '奥术飞弹 完成'
-        except Exception:
-            return False, '奥术飞弹 失败'
-
-    # --- 新技能实现 ---
-    def _skill_power_slam(self, src, tgt):
-        """力量猛击：基于力量的重击；命中后造成 1d(ATK+STR修正) 伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        str_mod = (self._get_attr(src, 'str') - 10) // 2
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            th = to_hit_roll(self._to_character_sheet(src), self._to_character_sheet(tgt), use_str=True, weapon_bonus=0, is_proficient=False)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 力量猛击 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        dmg_r = None
-        amount = max(1, atk_val + max(0, str_mod))
-        if roll_damage:
-            dmg_r = roll_damage(self._to_character_sheet(src), dice=(1, max(1, amount)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-            amount = int(dmg_r.get('total', amount))
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 使用 力量猛击 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '力量猛击 完成'
-        return True, '力量猛击 完成'
-
-    def _skill_bloodlust_priority(self, src, tgt):
-        """血腥优先：若未选目标，则自动选择当前生命最低的敌人；命中后造成 1dATK 伤害，若击杀，治疗自身2点。"""
-        import math
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        # 自动选择
-        if tgt is None and self.enemies:
-            tgt = min(self.enemies, key=lambda e: getattr(e, 'hp', 0))
-        if tgt is None:
-            return False, '无可选目标'
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            th = to_hit_roll(self._to_character_sheet(src), self._to_character_sheet(tgt), use_str=True, weapon_bonus=0, is_proficient=False)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 血腥优先 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        dmg_r = None
-        if roll_damage:
-            dmg_r = roll_damage(self._to_character_sheet(src), dice=(1, max(1, atk_val)), damage_bonus=1, critical=th.get('critical', False) if isinstance(th, dict) else False)
-            amount = int(dmg_r.get('total', atk_val))
-        else:
-            amount = atk_val + 1
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 的 血腥优先 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '血腥优先 完成'
-            # 击杀回复
+    def _handle_enemy_deaths(self, enemies) -> bool:
+        """批量处理一组敌人死亡（群体技能结算完毕后调用）：依次触发亡语/掉落，随后一次性移除、
+        写一次进度、记一条日志并发布一次 enemies_died。返回 True 表示亡语期间发生了场景切换。"""
+        reg = getattr(self, 'registry', None)
+        seen = set()
+        dead = []
+        for e in enemies or []:
+            on_field = reg.side_of(e) == 'enemy' if reg is not None else e in self.enemies
+            if on_field and id(e) not in seen:
+                seen.add(id(e))
+                dead.append(e)
+        if not dead:
+            return False
+        if len(dead) == 1:
+            return self._handle_enemy_death(dead[0])
+        prev_scene = self.current_scene
+        for k, e in enumerate(dead):
             try:
-                src.heal(2)
+                e.on_death(self)
             except Exception:
                 pass
-            self.log({'type': 'skill', 'text': f"{src} 因击杀而恢复 2 点生命", 'meta': {}})
-        return True, '血腥优先 完成'
-
-    def _skill_execute_mage(self, src, tgt):
-        """斩杀法师：对法师型目标造成高额伤害；非法师仅造成较低伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        # 判定是否法师
-        is_mage = False
+            if self.current_scene != prev_scene:
+                # 之前已结算亡语的单位仍计为击杀（与逐个处理时一致），旧场景的列表已被替换，无需移除
+                if k:
+                    self._record_kills(dead[:k], prev_scene, scene_changed=True)
+                try:
+                    publish_event('enemy_died', {'game': self, 'enemy': e, 'scene_changed': True})
+                except Exception:
+                    pass
+                return True
+        # 一次性移除（单次 enemies_reset，而不是每个敌人一组 remove/change 事件）
         try:
-            tags = [str(t).lower() for t in (getattr(tgt, 'tags', []) or [])]
-            if 'mage' in tags or 'wizard' in tags:
-                is_mage = True
-            else:
-                is_mage = self._get_attr(tgt, 'int', 10) >= 12
+            self.enemies.reset([e for e in self.enemies if id(e) not in seen])
         except Exception:
             pass
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            th = to_hit_roll(self._to_character_sheet(src), self._to_character_sheet(tgt), use_str=True, weapon_bonus=0, is_proficient=False)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 斩杀法师 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        base = atk_val * (2 if is_mage else 1)
-        bonus = 2 if is_mage else -1
-        dmg_r = None
-        if roll_damage:
-            dmg_r = roll_damage(self._to_character_sheet(src), dice=(1, max(1, base)), damage_bonus=max(0, bonus), critical=th.get('critical', False) if isinstance(th, dict) else False)
-            amount = int(dmg_r.get('total', base))
-        else:
-            amount = max(1, base + max(0, bonus))
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 的 斩杀法师 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '斩杀法师 完成'
-        return True, '斩杀法师 完成'
-
-    def _skill_mass_intimidate(self, src, tgt):
-        """群体恐吓：对所有敌人进行一次对抗检定（CHA vs WIS），成功则记录其被震慑。"""
-        try:
-            from src.systems.dnd_rules import roll_d20
-        except Exception:
-            roll_d20 = None
-        cha_mod = (self._get_attr(src, 'cha') - 10) // 2
-        for e in list(self.enemies):
-            wis_mod = (self._get_attr(e, 'wis') - 10) // 2
-            if roll_d20:
-                a, _ = roll_d20()
-                d, _ = roll_d20()
-                success = (a + max(0, cha_mod)) >= (10 + max(0, wis_mod))
-            else:
-                success = (cha_mod >= wis_mod)
-            if success:
-                # 仅记录效果（暂不实现数值减益）
-                self.log({'type': 'skill', 'text': f"{src} 的 群体恐吓 震慑了 {getattr(e,'name',e)}", 'meta': {}})
-            else:
-                self.log({'type': 'skill', 'text': f"{getattr(e,'name',e)} 抵抗了 群体恐吓", 'meta': {}})
-        return True, '群体恐吓 完成'
-
-    def _skill_precise_strike(self, src, tgt):
-        """精准打击：优势命中，造成 1dATK 伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
         try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
+            from src.core import combat_arrays as CA
+            for e in dead:
+                CA.detach(e)
         except Exception:
-            to_hit_roll = roll_damage = None
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            att = self._to_character_sheet(src)
-            dfn = self._to_character_sheet(tgt)
-            th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False, advantage=True)
-            th = self._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 精准打击 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        dmg_r = None
-        if roll_damage:
-            att = self._to_character_sheet(src)
-            dmg_r = roll_damage(att, dice=(1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-            amount = int(dmg_r.get('total', atk_val))
-        else:
-            amount = atk_val
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 的 精准打击 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '精准打击 完成'
-        return True, '精准打击 完成'
-
-    def _skill_disarm(self, src, tgt):
-        """缴械：尝试卸下目标的武器（优先右手，其次左手），将装备转入我方背包。"""
-        if tgt is None:
-            return False, '未选择目标'
-        # 命中检定（可选）
-        try:
-            from src.systems.dnd_rules import to_hit_roll
-        except Exception:
-            to_hit_roll = None
-        hit = True
-        th = None
-        if to_hit_roll:
-            th = to_hit_roll(self._to_character_sheet(src), self._to_character_sheet(tgt), use_str=True)
-            hit = th.get('hit', True)
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 缴械 未能成功作用于 {getattr(tgt,'name',tgt)}", 'meta': {'to_hit': th}})
-            return True, '未命中'
-        # 尝试卸下
-        if self._unequip_and_loot(tgt, 'right_hand'):
-            self.log({'type': 'skill', 'text': f"{src} 缴械成功：{getattr(tgt,'name',tgt)} 右手装备被卸下", 'meta': {}})
-            return True, '缴械成功'
-        if self._unequip_and_loot(tgt, 'left_hand'):
-            self.log({'type': 'skill', 'text': f"{src} 缴械成功：{getattr(tgt,'name',tgt)} 左手装备被卸下", 'meta': {}})
-            return True, '缴械成功'
-        self.log({'type': 'skill', 'text': f"{src} 尝试缴械，但 {getattr(tgt,'name',tgt)} 无可卸下装备", 'meta': {}})
-        return True, '无可缴械'
-
-    def _skill_shield_breaker(self, src, tgt):
-        """破盾：若目标持盾，移除其盾牌并造成额外伤害；否则造成轻微伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            att = self._to_character_sheet(src)
-            dfn = self._to_character_sheet(tgt)
-            th = to_hit_roll(att, dfn, use_str=True)
-            th = self._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 破盾 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        bonus = 3 if self._has_shield(tgt) else 0
-        if bonus > 0:
-            # 先卸下盾
-            if self._unequip_and_loot(tgt, 'left_hand'):
-                self.log({'type': 'skill', 'text': f"{src} 击碎了 {getattr(tgt,'name',tgt)} 的盾牌!", 'meta': {}})
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        dmg_r = None
-        amount = max(1, atk_val // 2 + bonus)
-        if roll_damage:
-            att = self._to_character_sheet(src)
-            dmg_r = roll_damage(att, dice=(1, max(1, amount)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, max(1, amount)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-            amount = int(dmg_r.get('total', amount))
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 的 破盾 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '破盾 完成'
-        return True, '破盾 完成'
-
-    def _skill_dual_wield_bane(self, src, tgt):
-        """双刀克星：若目标为双持，则优势命中并造成额外伤害；否则普通伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
-        try:
-            from src.systems.dnd_rules import to_hit_roll, roll_damage
-        except Exception:
-            to_hit_roll = roll_damage = None
-        dual = self._has_dual_wield(tgt)
-        meta = {}
-        hit = True
-        th = None
-        if to_hit_roll:
-            att = self._to_character_sheet(src)
-            dfn = self._to_character_sheet(tgt)
-            th = to_hit_roll(att, dfn, use_str=True, advantage=dual)
-            th = self._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-            hit = th.get('hit', True)
-            meta['to_hit'] = th
-        if not hit:
-            self.log({'type': 'skill', 'text': f"{src} 的 双刀克星 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-            return True, '未命中'
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        bonus = 2 if dual else 0
-        dmg_r = None
-        if roll_damage:
-            att = self._to_character_sheet(src)
-            dmg_r = roll_damage(att, dice=(1, max(1, atk_val)), damage_bonus=bonus, critical=th.get('critical', False) if isinstance(th, dict) else False)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, max(1, atk_val)), damage_bonus=bonus, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-            amount = int(dmg_r.get('total', atk_val + bonus))
-        else:
-            amount = atk_val + bonus
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        meta['damage'] = dmg_r
-        self.log({'type': 'skill', 'text': f"{src} 的 双刀克星 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '双刀克星 完成'
-        return True, '双刀克星 完成'
-
-    def _skill_mind_over_matter(self, src, tgt):
-        """强于心智：精神打击，不进行命中检定，造成 INT 修正+2 的伤害（至少 1）。"""
-        if tgt is None:
-            return False, '未选择目标'
-        int_mod = (self._get_attr(src, 'int') - 10) // 2
-        amount = max(1, int_mod + 2)
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        self.log({'type': 'skill', 'text': f"{src} 的 强于心智 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 精神伤害", 'meta': {'psychic': True}})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '强于心智 完成'
-        return True, '强于心智 完成'
+            pass
+        self._record_kills(dead, prev_scene)
+        return False
 
-    def _skill_trial_of_wisdom(self, src, tgt):
-        """智慧试炼：若施法者 INT 不低于目标，则造成 1d6+INT修正 伤害；否则无效果。"""
-        if tgt is None:
-            return False, '未选择目标'
+    def _record_kills(self, dead: list, prev_scene, scene_changed: bool = False) -> None:
+        """批量击杀的收尾：写一次进度、记一条日志、发布一次 enemies_died。"""
         try:
-            from src.systems.dnd_rules import roll_damage
+            if self.profile and prev_scene:
+                for e in dead:
+                    self.profile.mark_enemy_killed(prev_scene, SaveManager.enemy_token(e))
+                self.profile.save()
         except Exception:
-            roll_damage = None
-        if self._get_attr(src, 'int') < self._get_attr(tgt, 'int'):
-            self.log({'type': 'skill', 'text': f"{src} 的 智慧试炼 被 {getattr(tgt,'name',tgt)} 识破，未起效果", 'meta': {}})
-            return True, '未起效果'
-        int_mod = (self._get_attr(src, 'int') - 10) // 2
-        dmg_r = None
-        if roll_damage:
-            att = self._to_character_sheet(src)
-            dmgb = max(0, int_mod)
-            dmg_r = roll_damage(att, dice=(1, 6), damage_bonus=dmgb, critical=False)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, 6), damage_bonus=dmgb, critical=False, use_str_for_damage=True)
-            amount = int(dmg_r.get('total', 1 + dmgb))
-        else:
-            amount = 1 + max(0, int_mod)
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        self.log({'type': 'skill', 'text': f"{src} 的 智慧试炼 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': {'damage': dmg_r}})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '智慧试炼 完成'
-        return True, '智慧试炼 完成'
-
-    def _skill_execute_wounded(self, src, tgt):
-        """重伤补刀：若目标生命≤30%最大值，直接处决；否则造成中等伤害。"""
-        if tgt is None:
-            return False, '未选择目标'
+            pass
         try:
-            mhp = int(getattr(tgt, 'max_hp', getattr(tgt, 'hp', 1)))
-            hp = int(getattr(tgt, 'hp', 0))
+            counts: dict = {}
+            for e in dead:
+                n = str(getattr(e, 'name', e))
+                counts[n] = counts.get(n, 0) + 1
+            names = '、'.join(n if c == 1 else f"{n}×{c}" for n, c in counts.items())
+            self.log({'type': 'info', 'text': f"{names} 被消灭", 'meta': {'killed': len(dead)}})
         except Exception:
-            mhp = 1; hp = 0
-        threshold = max(1, (mhp * 3) // 10)
-        if hp <= threshold:
-            # 处决
-            prev = hp
-            try:
-                tgt.take_damage(hp)
-            except Exception:
-                tgt.hp = 0
-            self.log({'type': 'skill', 'text': f"{src} 的 重伤补刀 处决了 {getattr(tgt,'name',tgt)}", 'meta': {'execute': True, 'hp_before': prev}})
-            if tgt in self.enemies:
-                changed = self._handle_enemy_death(tgt)
-                if changed:
-                    return True, '处决完成'
-            return True, '处决完成'
-        # 否则造成中等伤害：ATK 的一半 +1
+            pass
         try:
-            from src.systems.dnd_rules import roll_damage
+            publish_event('enemies_died', {'game': self, 'enemies': dead, 'scene_changed': scene_changed})
         except Exception:
-            roll_damage = None
-        atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-        base = max(1, atk_val // 2 + 1)
-        dmg_r = None
-        if roll_damage:
-            att = self._to_character_sheet(src)
-            dmg_r = roll_damage(att, dice=(1, base), damage_bonus=0, critical=False)
-            dmg_r = self._enrich_damage(dmg_r, att, (1, base), damage_bonus=0, critical=False, use_str_for_damage=True)
-            amount = int(dmg_r.get('total', base))
-        else:
-            amount = base
-        prev = getattr(tgt, 'hp', 0)
-        dead = tgt.take_damage(amount)
-        dealt = max(0, prev - getattr(tgt, 'hp', prev))
-        self.log({'type': 'skill', 'text': f"{src} 的 重伤补刀 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': {'damage': dmg_r}})
-        if dead and tgt in self.enemies:
-            changed = self._handle_enemy_death(tgt)
-            if changed:
-                return True, '重伤补刀 完成'
-        return True, '重伤补刀 完成'
-
-    def _skill_fair_distribution(self, src, tgt):
-        """公平分配：将自身总攻击力平均分配对所有敌人造成伤害（向下取整）。"""
-        if not self.enemies:
-            return False, '无敌人'
-        total = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 0))
-        n = len(self.enemies)
-        if n <= 0 or total <= 0:
-            self.log({'type': 'skill', 'text': f"{src} 的 公平分配 未造成伤害", 'meta': {}})
-            return True, '无伤害'
-        each = max(1, total // n)
-        for e in list(self.enemies):
-            prev = getattr(e, 'hp', 0)
-            dead = e.take_damage(each)
-            dealt = max(0, prev - getattr(e, 'hp', prev))
-            self.log({'type': 'skill', 'text': f"{src} 的 公平分配 对 {getattr(e,'name',e)} 造成 {dealt} 伤害", 'meta': {'each': each}})
-            if dead:
-                changed = self._handle_enemy_death(e)
-                if changed:
-                    return True, '公平分配 完成'
-        return True, '公平分配 完成'
+            pass
 
     # Boss 攻击逻辑已移除（场景模式无 Boss）
 
@@ -1481,33 +1026,51 @@ class SimplePvEGame:
     def log(self, entry):
         """Append a structured log entry.
 
-        Accepts either a string (back-compat) or a dict with optional fields:
+        Accepts either a string (back-compat), a LogRecord, or a dict with optional fields:
         { 'type': 'info'|'to_hit'|'damage'|'heal'|'skill', 'text': str, 'meta': {...} }
+        ANSI stripping is deferred until the entry is rendered (see src.core.combat_log).
         """
+        cl = self.combat_log
+        if not cl.enabled:
+            return
         try:
-            if isinstance(entry, str):
-                clean = C.strip(entry)
-                self._log_buffer.append({'type': 'info', 'text': clean, 'meta': {}})
+            if isinstance(entry, LogRecord):
+                rec = entry
             elif isinstance(entry, dict):
-                # ensure text and type exist
-                t = entry.get('text') if isinstance(entry.get('text'), str) else str(entry)
-                typ = entry.get('type') or 'info'
-                meta = entry.get('meta') or {}
-                self._log_buffer.append({'type': typ, 'text': C.strip(t), 'meta': meta})
+                t = entry.get('text')
+                rec = LogRecord(entry.get('type') or 'info', t if isinstance(t, str) else str(entry),
+                                meta=entry.get('meta') or None)
             else:
-                # fallback to str
-                self._log_buffer.append({'type': 'info', 'text': C.strip(str(entry)), 'meta': {}})
+                rec = LogRecord('info', entry if isinstance(entry, str) else str(entry))
+            cl.append(rec)
         except Exception:
-            try:
-                self._log_buffer.append({'type': 'info', 'text': C.strip(str(entry)), 'meta': {}})
-            except Exception:
-                # last resort: append raw
-                self._log_buffer.append({'type': 'info', 'text': str(entry), 'meta': {}})
+            pass
+
+    def record(self, kind: str, fmt, args=None, *, actor=None, target=None, roll=None, amount=None, meta=None):
+        """写入一条类型化日志记录；fmt 为模板字符串（配合 args）或 fn(rec)，文本在读取时才生成。
+        args 中的实体在此处取 str() 快照（卡牌的 `名称[攻/血]` 随后续战斗变化，历史日志不能读当前状态）。
+        日志关闭时直接返回 None，调用方无需再判断。"""
+        cl = self.combat_log
+        if not cl.enabled:
+            return None
+        if args:
+            args = {k: v if v is None or isinstance(v, (str, int, float, bool)) else str(v)
+                    for k, v in args.items()}
+        reg = self.registry
+        rec = LogRecord(kind, fmt, args, actor=actor, target=target,
+                        actor_id=reg.id_of(actor) if actor is not None else None,
+                        target_id=reg.id_of(target) if target is not None else None,
+                        roll=roll, amount=amount, meta=meta)
+        cl.append(rec)
+        return rec
+
+    def pop_records(self) -> list:
+        """取走全部日志记录（LogRecord，不触发文本格式化）。"""
+        return self.combat_log.pop_all()
 
     def pop_logs(self) -> list:
-        logs = self._log_buffer[:]
-        self._log_buffer.clear()
-        return logs
+        """取走全部日志并渲染为旧格式字典 [{type, text, meta}]。"""
+        return [r.to_dict() for r in self.combat_log.pop_all()]
 
     # --- 构造辅助 ---
     def _make_enemy(self, ed):
@@ -1571,7 +1134,7 @@ class SimplePvEGame:
                                 try:
                                     game.resource_zone.append(res)
                                     try:
-                                        publish_event('resource_changed', {'action': 'add', 'resource': str(res)})
+                                        publish_event('resource_changed', {'game': self, 'action': 'add', 'resource': str(res)})
                                     except Exception:
                                         pass
                                 except Exception:
@@ -1689,30 +1252,13 @@ class SimplePvEGame:
                     if isinstance(md, dict):
                         prof = md.get('profession') or md.get('class') or md.get('job')
                     if prof:
-                        try:
-                            # 集中配置的职业技能映射表
-                            ppath = CFG.profession_skills_path()
-                            # try package-local first
-                            pj = CFG.profession_skills_path()
-                            data = None
+                        # 职业默认技能来自统一注册表（启动时已读取 profession_skills.json）
+                        sks = get_registry().skills_for_profession(prof)
+                        if sks:
                             try:
-                                with open(pj, 'r', encoding='utf-8') as f:
-                                    data = json.load(f)
+                                m.skills = list(sks)
                             except Exception:
-                                try:
-                                    with open(CFG.profession_skills_path(), 'r', encoding='utf-8') as f:
-                                        data = json.load(f)
-                                except Exception:
-                                    data = None
-                            if isinstance(data, dict):
-                                sks = data.get(str(prof).lower())
-                                if sks and isinstance(sks, list):
-                                    try:
-                                        m.skills = list(sks)
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            pass
+                                pass
                 except Exception:
                     pass
                 # 初始装备（来自场景）：支持 equip / equipment 两种字段
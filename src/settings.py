@@ -3,6 +3,10 @@
 - 从 `app_config.user_config_path()` 指向的 JSON 读取用户配置并与此处默认值“深度合并”。
 	- 也就是说：用户 JSON 里写什么就覆盖什么；没写的键继续用这里的默认。
 - 提供便捷函数获取嵌套配置（ui_cfg/anim_cfg/tk_cfg/rules_cfg），避免在业务处硬编码常量。
+- 合并结果编译为只读的 `Settings`（`current()`）：各分区为只读 `FrozenDict`（支持属性访问），
+	体力上限/技能消耗/存档后端等常用字段预先取好；`version` 只在配置内容实际变化时递增。
+- 热重载：`check_reload()` 按配置文件修改时间判断是否重读（Tk 界面在 hot_reload.enabled 时定时调用），
+	变化后发布 `settings_changed`；技能注册表等缓存比较 `version()` 决定是否重建。
 - `apply_to_tk_app(app)` 会把常用 UI 参数注入到 Tk App（如卡片尺寸、边框、调色板、
 	过场动画时间、体力显示配置、ttk 样式），做到“改 setting 即改 UI 行为”。
 
@@ -13,6 +17,10 @@
 - 想改卡片尺寸、边框粗细：改 ui.tk.card.width/height 与 ui.tk.border.*。
 - 想改体力显示开关与颜色：改 ui.tk.stamina.*（此处仅影响显示，不改变规则）。
 - 想改规则（体力上限/消耗）：改 rules.stamina.base、rules.skill_costs；若不写某个技能的消耗，默认 1。
+- 想放开单位数量上限：改 rules.limits.board/enemies（或在场景 JSON 写 limits 只对该场景生效）。
+- 想改完配置不重启就生效：设置 hot_reload.enabled 为 true（interval_ms 为检查间隔）。
+- 想换存档格式：设置 saves.backend 为 "binary"（默认）/"json"/"sqlite"。
+- 想看热点耗时：设置 perf.enabled 为 true（或界面按 F3 显示性能浮层，Ctrl+F3 导出 JSON）。
 
 注意：你不需要拷贝本文件到用户配置；只需在用户 JSON 写上需要覆盖的那几个键即可。
 示例（user_config.json）：
@@ -26,6 +34,7 @@
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any, Dict
 import copy
 import json
@@ -39,6 +48,8 @@ DEFAULTS: Dict[str, Any] = {
 	"console": {
 		# 控制台配色主题（仅影响命令行/日志的着色，不影响 Tk 界面）
 		"theme": "default",  # 可选: default | mono | high-contrast
+		# 增量重绘：只用光标定位改写变化的行；False 时每条命令后顺序打印整帧（终端不支持控制序列时也会自动退回）
+		"incremental": True,
 	},
 	"ui": {
 		"tk": {
@@ -75,8 +86,8 @@ DEFAULTS: Dict[str, Any] = {
 				"fade_step": 0.1,
 			},
 			"scene_transition": {
-				# 切换前延迟重建视图（留时间显示死亡/浮字）
-				"delay_ms": 1500,
+				# 遮罩最短展示时间（毫秒）：让死亡/飘字动画播完；新场景在后台加载，加载完成且满足该时间后立即切换
+				"min_ms": 400,
 			},
 			"tooltip": {
 				# 悬浮提示刷新的轮询间隔（越小越灵敏）
@@ -129,7 +140,7 @@ DEFAULTS: Dict[str, Any] = {
 				"text": "#ffffff"          # 覆盖文字颜色
 			},
 			"equipment": {
-				# 装备窗口/网格配置（PyQt）
+				# 装备窗口/网格配置（PyQt 对话框尺寸；grid/rarity_colors Tk 与 PyQt 共用）
 				"dialog": { "width": 640, "height": 520, "layout": "vertical" },
 				"rarity_colors": {
 					"common": "#BDBDBD",
@@ -155,6 +166,18 @@ DEFAULTS: Dict[str, Any] = {
 				}
 			},
 		},
+		"battlefield": {
+			# 一侧单位数超过该值时，战场视图改为按名称聚合的滚动列表（Tk/PyQt 共用）
+			"aggregate_above": 15
+		},
+		"executor": {
+			# Tk/PyQt 命令在后台线程执行；False 时退回在界面线程同步执行
+			"enabled": True,
+			# 命令超过该毫秒数仍未完成时，界面进入忙碌（禁用输入）状态
+			"busy_ms": 150,
+			# Tk 轮询命令结果的间隔（毫秒）
+			"poll_ms": 8
+		},
 		"animations": {
 			"enabled": True,  # 全局开关（False 时不触发动画），如需彻底关闭浮字/闪烁/抖动等，改为 False 即可
 			"colors": {
@@ -193,12 +216,147 @@ DEFAULTS: Dict[str, Any] = {
 			"taunt": 1,
 			"arcane_missiles": 1
 			# 其他未列出的技能默认 1（可在用户配置中覆盖）
+		},
+		"limits": {
+			# 单位数量上限（场景 JSON 的 "limits" 可按场景覆盖，如大规模战斗场景）
+			"board": 15,
+			"enemies": 15,
+			# 一侧单位数超过该值时启用数组化战场（src/core/combat_arrays.py）
+			"arrays_above": 32
 		}
+	},
+	"hot_reload": {
+		# 运行中监视用户配置文件，修改后自动重新读取（界面按新配置刷新）
+		"enabled": False,
+		"interval_ms": 1000
+	},
+	"saves": {
+		# 存档后端：binary（每个玩家一个紧凑的 save_*.sav，场景进度按需读取）、
+		# json（旧版 save_*.json，便于手工查看）或 sqlite（用户目录下 profiles.db，启用时自动导入旧存档）
+		"backend": "binary"
+	},
+	"perf": {
+		# 热点计时（命令/技能/事件/存档/渲染）：启动即开启（默认关闭，界面 F3 或命令 perf on 临时开启）
+		"enabled": False,
+		"buffer": 4096,        # 环形缓冲保留的最近记录条数
+		"overlay_ms": 500,     # 性能浮层刷新间隔
+		# 采样分析（prof start/stop）：采样间隔与单次最长时长
+		"sample_interval_ms": 5,
+		"sample_max_s": 120,
+		# 战斗日志（src/core/combat_log.py）：缓冲保留的最近记录条数；log_mode 为 "off" 时不记录日志
+		"log_buffer": 2000,
+		"log_mode": "full"
 	}
 }
 
 
-_CACHED: Dict[str, Any] | None = None
+class FrozenDict(dict):
+	"""只读配置字典：支持属性访问（cfg.tk.card.width），修改会抛 TypeError；需要可变副本时用 dict(...)。"""
+
+	__slots__ = ()
+
+	def __getattr__(self, key: str) -> Any:
+		try:
+			return self[key]
+		except KeyError:
+			raise AttributeError(key) from None
+
+	def _readonly(self, *_a, **_k):
+		raise TypeError("settings are read-only")
+
+	__setitem__ = __delitem__ = __setattr__ = __delattr__ = _readonly
+	clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+	def __copy__(self) -> Dict[str, Any]:
+		return dict(self)
+
+	def __deepcopy__(self, memo) -> Dict[str, Any]:
+		return thaw(self)
+
+	def __reduce__(self):
+		return (dict, (thaw(self),))
+
+
+def freeze(v: Any) -> Any:
+	if isinstance(v, dict):
+		return FrozenDict((k, freeze(x)) for k, x in v.items())
+	if isinstance(v, list):
+		return tuple(freeze(x) for x in v)
+	return v
+
+
+def thaw(v: Any) -> Any:
+	if isinstance(v, dict):
+		return {k: thaw(x) for k, x in v.items()}
+	if isinstance(v, tuple):
+		return [thaw(x) for x in v]
+	return v
+
+
+@dataclass(frozen=True)
+class Settings:
+	"""编译后的只读配置：各分区与常用字段在编译时一次性取好，访问均为属性读取。
+
+	version 在配置内容实际变化时递增；依赖配置的缓存（技能注册表、卡片样式等）比较版本号决定是否刷新。
+	"""
+	version: int
+	raw: FrozenDict
+	ui: FrozenDict
+	console: FrozenDict
+	rules: FrozenDict
+	saves: FrozenDict
+	anim: FrozenDict
+	tk: FrozenDict
+	stamina_base: int
+	skill_costs: FrozenDict
+	saves_backend: str
+	console_theme: str
+	hot_reload: bool
+	hot_reload_ms: int
+
+
+def _int(v: Any, default: int) -> int:
+	try:
+		return int(v)
+	except Exception:
+		return int(default)
+
+
+def _compile(raw: FrozenDict, version: int) -> Settings:
+	ui = raw.get("ui") or FrozenDict()
+	rules = raw.get("rules") or FrozenDict()
+	saves = raw.get("saves") or FrozenDict()
+	console = raw.get("console") or FrozenDict()
+	hr = raw.get("hot_reload") or FrozenDict()
+	costs = {}
+	for k, v in (rules.get("skill_costs") or {}).items():
+		try:
+			costs[str(k)] = int(v)
+		except Exception:
+			continue
+	backend = str(saves.get("backend", "binary")).lower()
+	return Settings(
+		version=version,
+		raw=raw,
+		ui=ui,
+		console=console,
+		rules=rules,
+		saves=saves,
+		anim=ui.get("animations") or FrozenDict(),
+		tk=ui.get("tk") or FrozenDict(),
+		stamina_base=_int((rules.get("stamina") or {}).get("base", 3), 3),
+		skill_costs=FrozenDict(costs),
+		saves_backend=backend if backend in ("binary", "json", "sqlite") else "binary",
+		console_theme=str(console.get("theme", "default")),
+		hot_reload=bool(hr.get("enabled", False)),
+		hot_reload_ms=max(100, _int(hr.get("interval_ms", 1000), 1000)),
+	)
+
+
+_CURRENT: Settings | None = None
+# 上次读取时用户配置文件的修改时间（-1 表示不存在）
+_MTIME: float = -1.0
+_WATCH: Dict[str, Any] = {}
 
 
 def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
@@ -210,6 +368,13 @@ def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
 	return dst
 
 
+def _file_mtime() -> float:
+	try:
+		return os.path.getmtime(CFG.user_config_path())
+	except OSError:
+		return -1.0
+
+
 def _load_file() -> Dict[str, Any]:
 	path = CFG.user_config_path()
 	try:
@@ -222,71 +387,128 @@ def _load_file() -> Dict[str, Any]:
 	return {}
 
 
-def get_settings() -> Dict[str, Any]:
-	global _CACHED
-	if _CACHED is not None:
-		return _CACHED
+def _build_raw() -> FrozenDict:
 	data = _load_file()
 	merged = copy.deepcopy(DEFAULTS)
 	if isinstance(data, dict):
-		# new settings live under `ui` and `console`; accept at root for forward compat
-		root_ui = data.get("ui") if isinstance(data.get("ui"), dict) else {}
-		root_console = data.get("console") if isinstance(data.get("console"), dict) else {}
-		# Build a small map to merge into defaults
+		# 只合并默认值中已有的顶层分区（ui/console/rules/saves/hot_reload/perf）
 		ext: Dict[str, Any] = {}
-		if root_ui:
-			ext["ui"] = root_ui
-		if root_console:
-			ext["console"] = root_console
+		for key in DEFAULTS:
+			if isinstance(data.get(key), dict) and data.get(key):
+				ext[key] = data[key]
 		_deep_merge(merged, ext)
-	_CACHED = merged
-	return merged
+	return freeze(merged)
+
+
+def current() -> Settings:
+	"""当前编译好的配置（首次调用时读取用户配置）。"""
+	global _CURRENT, _MTIME
+	cur = _CURRENT
+	if cur is None:
+		_MTIME = _file_mtime()
+		cur = _CURRENT = _compile(_build_raw(), 1)
+	return cur
+
+
+def version() -> int:
+	return current().version
+
+
+def get_settings() -> Dict[str, Any]:
+	return current().raw
+
+
+def reload() -> bool:
+	"""重新读取用户配置；内容确有变化时版本号 +1 并发布 `settings_changed`，返回是否变化。"""
+	global _CURRENT, _MTIME
+	if _CURRENT is None:
+		current()
+		return False
+	_MTIME = _file_mtime()
+	raw = _build_raw()
+	if raw == _CURRENT.raw:
+		return False
+	_CURRENT = _compile(raw, _CURRENT.version + 1)
+	try:
+		from src.core.events import publish as publish_event
+		publish_event("settings_changed", {"version": _CURRENT.version})
+	except Exception:
+		pass
+	return True
 
 
-def reload() -> None:
-	global _CACHED
-	_CACHED = None
+def check_reload() -> bool:
+	"""用户配置文件修改时间变化时才重新读取（供 UI 定时轮询）。"""
+	current()
+	if _file_mtime() == _MTIME:
+		return False
+	return reload()
+
+
+def start_watch(interval_s: float | None = None) -> None:
+	"""后台线程定时 check_reload（无界面模式用；Tk/Qt 请在主线程用定时器调用 check_reload）。"""
+	if _WATCH.get("thread") is not None:
+		return
+	import threading
+	stop = threading.Event()
+	iv = float(interval_s) if interval_s else current().hot_reload_ms / 1000.0
+
+	def _loop():
+		while not stop.wait(iv):
+			try:
+				check_reload()
+			except Exception:
+				pass
+
+	t = threading.Thread(target=_loop, name="settings-watch", daemon=True)
+	_WATCH.update(thread=t, stop=stop)
+	t.start()
+
+
+def stop_watch() -> None:
+	stop = _WATCH.pop("stop", None)
+	_WATCH.pop("thread", None)
+	if stop is not None:
+		stop.set()
 
 
 def ui_cfg() -> Dict[str, Any]:
-	return get_settings().get("ui", {})
+	return current().ui
 
 
 def anim_cfg() -> Dict[str, Any]:
-	return ui_cfg().get("animations", {})
+	return current().anim
 
 
 def tk_cfg() -> Dict[str, Any]:
-	return ui_cfg().get("tk", {})
+	return current().tk
 
 
 def rules_cfg() -> Dict[str, Any]:
 	"""返回玩法规则配置（含体力与技能消耗）。"""
-	return get_settings().get("rules", {})
+	return current().rules
+
+
+def saves_backend() -> str:
+	"""存档后端：'binary'（默认）、'json' 或 'sqlite'。"""
+	return current().saves_backend
 
 
 def stamina_base() -> int:
-	try:
-		return int((rules_cfg().get("stamina") or {}).get("base", 3))
-	except Exception:
-		return 3
+	return current().stamina_base
 
 
 def get_skill_cost(name: str, default: int = 1) -> int:
 	"""查询技能体力消耗；未定义则返回默认值。"""
-	try:
-		costs = rules_cfg().get("skill_costs", {}) or {}
-		v = costs.get(str(name), None)
-		return int(v) if v is not None else int(default)
-	except Exception:
-		return int(default)
+	v = current().skill_costs.get(str(name))
+	return v if v is not None else int(default)
 
 
 def apply_console_theme() -> None:
 	"""Apply console color theme to src.ui.colors if available."""
 	try:
 		from .ui import colors as C
-		theme = get_settings().get("console", {}).get("theme", "default")
+		theme = current().console_theme
 		C.set_theme(theme)
 	except Exception:
 		pass
@@ -375,7 +597,7 @@ def apply_to_tk_app(app) -> None:
 		}
 	except Exception:
 		pass
-	# expose equipment config (PyQt dialogs)
+	# expose equipment config (PyQt/Tk equipment dialogs)
 	try:
 		eq = cfg_tk.get("equipment", {}) or {}
 		app._equipment_cfg = {
@@ -424,7 +646,8 @@ def apply_to_tk_app(app) -> None:
 	except Exception:
 		pass
 	try:
-		app._scene_switch_delay_ms = int(cfg_tk.get("scene_transition", {}).get("delay_ms", 250))
+		st = cfg_tk.get("scene_transition", {}) or {}
+		app._scene_min_ms = int(st.get("min_ms", st.get("delay_ms", 400)))
 	except Exception:
 		pass
 	# emit ttk styles from config if Style is available
@@ -0,0 +1,150 @@
+"""启动耗时分析（`--profile-startup`）。
+
+入口脚本在导入任何界面/引擎模块之前调用 `enable_from_argv(sys.argv)`：
+- 命令行含 `--profile-startup` 时，在 sys.meta_path 最前面挂一个计时查找器，记录每个模块执行的
+  累计耗时与自身耗时（扣除其间导入的子模块）；同时从 argv 中移除该参数，不影响后续解析；
+- 可选 `--startup-budget=毫秒`（默认 1500）：首帧时间超出预算时在报告中标出；
+- 界面首帧绘制完成时调用 `first_frame()`：输出报告到 stderr，并写入日志目录下的 startup_profile.json。
+
+未启用时 `mark()`/`first_frame()` 均为空操作，可放心留在启动路径中。
+"""
+from __future__ import annotations
+
+import importlib.abc
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+FLAG = '--profile-startup'
+BUDGET_FLAG = '--startup-budget='
+DEFAULT_BUDGET_MS = 1500.0
+
+_T0: Optional[float] = None
+_BUDGET_MS = DEFAULT_BUDGET_MS
+# 模块名 -> [累计秒, 自身秒]
+_MODULES: Dict[str, List[float]] = {}
+_MARKS: List[Tuple[str, float]] = []
+_STACK: List[List[float]] = []
+_DONE = False
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, inner: Any, name: str):
+        self._inner = inner
+        self._name = name
+
+    def create_module(self, spec):
+        return self._inner.create_module(spec)
+
+    def exec_module(self, module):
+        # 栈帧：[开始时间, 子模块累计]
+        frame = [time.perf_counter(), 0.0]
+        _STACK.append(frame)
+        try:
+            self._inner.exec_module(module)
+        finally:
+            _STACK.pop()
+            total = time.perf_counter() - frame[0]
+            _MODULES[self._name] = [total, max(0.0, total - frame[1])]
+            if _STACK:
+                _STACK[-1][1] += total
+
+    def __getattr__(self, item):
+        return getattr(self._inner, item)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find = getattr(finder, 'find_spec', None)
+            if find is None:
+                continue
+            spec = find(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            if loader is not None and hasattr(loader, 'exec_module'):
+                spec.loader = _TimedLoader(loader, fullname)
+            return spec
+        return None
+
+
+def enabled() -> bool:
+    return _T0 is not None
+
+
+def enable_from_argv(argv: List[str]) -> bool:
+    """命令行含 --profile-startup 时启用计时（并从 argv 中移除相关参数）。"""
+    global _T0, _BUDGET_MS
+    if FLAG not in argv:
+        return False
+    for a in list(argv):
+        if a == FLAG:
+            argv.remove(a)
+        elif a.startswith(BUDGET_FLAG):
+            argv.remove(a)
+            try:
+                _BUDGET_MS = float(a[len(BUDGET_FLAG):])
+            except ValueError:
+                pass
+    if _T0 is None:
+        _T0 = time.perf_counter()
+        sys.meta_path.insert(0, _TimingFinder())
+    return True
+
+
+def mark(label: str) -> None:
+    """记录一个启动阶段时间点（相对启用时刻）。"""
+    if _T0 is not None:
+        _MARKS.append((str(label), time.perf_counter() - _T0))
+
+
+def report(top: int = 25) -> Dict[str, Any]:
+    t_now = time.perf_counter() - (_T0 or time.perf_counter())
+    mods = sorted(_MODULES.items(), key=lambda kv: kv[1][0], reverse=True)
+    # 各模块自身耗时之和即导入总耗时（不重复计算嵌套导入）
+    import_total = sum(v[1] for v in _MODULES.values())
+    first = next((t for name, t in _MARKS if name == 'first_frame'), t_now)
+    return {
+        'first_frame_ms': round(first * 1000, 1),
+        'budget_ms': _BUDGET_MS,
+        'over_budget': first * 1000 > _BUDGET_MS,
+        'import_ms': round(import_total * 1000, 1),
+        'modules': len(_MODULES),
+        'marks': [{'label': n, 'ms': round(t * 1000, 1)} for n, t in _MARKS],
+        'top': [{'module': n, 'cumulative_ms': round(v[0] * 1000, 2), 'self_ms': round(v[1] * 1000, 2)}
+                for n, v in mods[:top]],
+    }
+
+
+def first_frame() -> None:
+    """首帧完成：记录时间并输出报告（只输出一次）。"""
+    global _DONE
+    if _T0 is None or _DONE:
+        return
+    _DONE = True
+    mark('first_frame')
+    rep = report()
+    out = sys.stderr
+    try:
+        out.write('\n[startup] 首帧 %.1f ms（预算 %.0f ms%s），导入 %d 个模块共 %.1f ms\n' % (
+            rep['first_frame_ms'], rep['budget_ms'], '，超出预算' if rep['over_budget'] else '',
+            rep['modules'], rep['import_ms']))
+        for m in rep['marks']:
+            out.write('[startup]   %-24s %8.1f ms\n' % (m['label'], m['ms']))
+        out.write('[startup] 累计耗时最高的模块：\n')
+        for m in rep['top']:
+            out.write('[startup]   %8.2f ms  (自身 %7.2f)  %s\n' % (m['cumulative_ms'], m['self_ms'], m['module']))
+        out.flush()
+    except Exception:
+        pass
+    try:
+        from src import app_config as CFG
+        with open(os.path.join(CFG.log_dir(), 'startup_profile.json'), 'w', encoding='utf-8') as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
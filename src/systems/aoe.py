@@ -0,0 +1,92 @@
+"""群体技能结算批次（横扫/群体恐吓/公平分配/奥术飞弹等）
+
+结算分三段：先为全部目标投骰，再逐个扣血，最后一次性处理死亡、掉落与清场检查：
+
+    batch = AoeBatch(game, src)
+    for t in targets:
+        ...                                   # 命中检定、t.take_damage(...)
+        batch.log(tpl, meta, tgt=t, dealt=n)  # 同一批次的日志带相同 meta['aoe']，界面可折叠为一组
+        if dead:
+            batch.kill(t)
+    if batch.finish():                        # True：亡语或清场导致了场景切换
+        return True, '...'
+
+`finish` 调用 `game._handle_enemy_deaths`：移除、进度写入、死亡日志与 `enemies_died` 事件各一次，
+而不是每个阵亡单位各触发一组 remove/change 事件与一次存档。
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, List, Optional
+
+_IDS = itertools.count(1)
+
+
+class AoeBatch:
+    def __init__(self, game: Any, src: Any = None) -> None:
+        self.game = game
+        self.src = src
+        self.group = next(_IDS)
+        self.dead: List[Any] = []
+        self._seen = set()
+        self.changed = False
+        self._done = False
+        # 日志关闭（headless 模拟）时调用方可跳过 meta 构造
+        self.on = bool(getattr(getattr(game, 'combat_log', None), 'enabled', True))
+
+    def log(self, fmt: str, meta: Optional[Dict[str, Any]] = None, kind: str = 'skill', **args: Any) -> None:
+        """写一条本批次日志；args 非空时 fmt 为模板，文本在读取日志时才格式化。"""
+        if not self.on:
+            return
+        m = dict(meta or {})
+        m['aoe'] = self.group
+        try:
+            rec = getattr(self.game, 'record', None)
+            if rec is not None:
+                rec(kind, fmt, args or None, meta=m)
+            else:
+                self.game.log({'type': kind, 'text': fmt.format(**args) if args else fmt, 'meta': m})
+        except Exception:
+            pass
+
+    def kill(self, enemy: Any) -> None:
+        """记录阵亡单位（扣血阶段不立即移除，保持目标列表与数组槽位稳定）。"""
+        if id(enemy) not in self._seen:
+            self._seen.add(id(enemy))
+            self.dead.append(enemy)
+
+    def finish(self, clear_check: bool = True) -> bool:
+        """统一处理死亡与清场；返回是否发生了场景切换。重复调用返回首次结果。"""
+        if self._done:
+            return self.changed
+        self._done = True
+        g = self.game
+        if self.dead:
+            try:
+                batch = getattr(g, '_handle_enemy_deaths', None)
+                if batch is not None:
+                    self.changed = bool(batch(self.dead))
+                else:
+                    for e in self.dead:
+                        if e in g.enemies and g._handle_enemy_death(e):
+                            self.changed = True
+                            break
+            except Exception:
+                pass
+            if clear_check:
+                self.check_clear()
+        return self.changed
+
+    def check_clear(self) -> bool:
+        """本批次有击杀且敌人已清空时执行场景的 on_clear 跳转（每批次最多一次）。"""
+        g = self.game
+        if self.changed or not self.dead or g.enemies:
+            return self.changed
+        try:
+            self.changed = bool(g._check_on_clear_transition())
+        except Exception:
+            pass
+        return self.changed
+
+
+__all__ = ['AoeBatch']
@@ -0,0 +1,255 @@
+"""
+合成系统：配方来自场景包数据（包目录下的 recipes.json），按材料建立索引。
+
+recipes.json 结构：
+    {"recipes": [
+        {"id": "small_heal", "name": "小治疗药水",
+         "requires": ["配方: 小治疗药水"],          # 需持有但不消耗（可省略）
+         "ingredients": {"药草": 1, "空瓶": 1},      # 消耗的材料
+         "result": {"name": "小治疗药水", "type": "potion", "value": 3, "qty": 1, "desc": "..."}}
+    ]}
+
+CraftingBook 维护“材料名 → 涉及该材料的配方”索引与每个配方的可合成标记：
+- 订阅 inventory_changed，只重算载荷中变化物品所涉及的配方（clear/未知载荷时全量重算）；
+- craftable() 直接返回当前可合成列表，不再逐配方扫描背包。
+
+用法：
+    book = CraftingBook(player.inventory)
+    book.load_for_scene(game.current_scene)   # 切换到其他场景包时重新加载
+    book.craftable()                          # [Recipe, ...]
+    ok, msg = book.craft('小治疗药水', game=game)
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event
+except Exception:  # pragma: no cover
+    def subscribe_event(*_a, **_k):  # type: ignore
+        return None
+
+    def unsubscribe_event(*_a, **_k):  # type: ignore
+        return None
+
+
+RECIPES_FILE = 'recipes.json'
+
+
+@dataclass
+class Recipe:
+    id: str
+    name: str
+    ingredients: Dict[str, int] = field(default_factory=dict)
+    requires: List[str] = field(default_factory=list)
+    result: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def touches(self) -> List[str]:
+        """影响可合成性的全部物品名（材料 + 所需配方）。"""
+        return list(self.ingredients) + [r for r in self.requires if r not in self.ingredients]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name, 'ingredients': dict(self.ingredients),
+                'requires': list(self.requires), 'result': dict(self.result)}
+
+
+def _parse(rec: Dict[str, Any]) -> Optional[Recipe]:
+    try:
+        name = str(rec.get('name') or rec.get('id') or '')
+        if not name:
+            return None
+        ing = {str(k): max(1, int(v)) for k, v in (rec.get('ingredients') or {}).items()}
+        req = rec.get('requires') or []
+        if isinstance(req, str):
+            req = [req]
+        res = dict(rec.get('result') or {'name': name})
+        res.setdefault('name', name)
+        return Recipe(id=str(rec.get('id') or name), name=name, ingredients=ing,
+                      requires=[str(x) for x in req], result=res)
+    except Exception:
+        return None
+
+
+# 包目录 -> 配方列表（按文件修改时间失效）
+_CACHE: Dict[str, Tuple[float, List[Recipe]]] = {}
+
+
+def load_recipes(pack_dir: str) -> List[Recipe]:
+    """读取包目录下的 recipes.json；不存在或格式错误时返回空列表。"""
+    path = os.path.join(pack_dir, RECIPES_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return []
+    hit = _CACHE.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    out: List[Recipe] = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for rec in (data.get('recipes') if isinstance(data, dict) else data) or []:
+            r = _parse(rec) if isinstance(rec, dict) else None
+            if r is not None:
+                out.append(r)
+    except Exception:
+        out = []
+    _CACHE[path] = (mtime, out)
+    return out
+
+
+def make_item(result: Dict[str, Any]):
+    """按配方产物描述创建物品：potion/consumable 为可使用的回复药，其余为材料。"""
+    from src.systems.inventory import ConsumableItem, MaterialItem
+    name = str(result.get('name') or '物品')
+    t = str(result.get('type') or 'material').lower()
+    value = int(result.get('value', 0) or 0)
+    desc = str(result.get('desc') or '')
+    if t in ('potion', 'consumable'):
+        def _effect(_player, target, _v=value):
+            if target is not None and _v > 0 and hasattr(target, 'heal'):
+                target.heal(_v)
+        return ConsumableItem(name, desc or f"恢复{value}点生命值", max_stack=8, effect=_effect)
+    return MaterialItem(name, desc or '合成材料', max_stack=16)
+
+
+class CraftingBook:
+    """某个背包的配方簿：材料索引 + 增量维护的可合成标记。"""
+
+    def __init__(self, inventory: Any, recipes: Optional[List[Recipe]] = None):
+        self.inventory = inventory
+        self.pack_dir: Optional[str] = None
+        self.recipes: List[Recipe] = []
+        self._by_id: Dict[str, Recipe] = {}
+        self._by_ingredient: Dict[str, List[Recipe]] = {}
+        self._ok: Dict[str, bool] = {}
+        # 可合成列表或配方集变化时递增，供视图缓存判断
+        self.version = 0
+        self._sub = subscribe_event('inventory_changed', self._on_inventory_changed)
+        if recipes:
+            self.set_recipes(recipes)
+
+    # --- 配方集 ---
+    def set_recipes(self, recipes: List[Recipe]) -> None:
+        self.recipes = list(recipes)
+        self._by_id = {}
+        self._by_ingredient = {}
+        for r in self.recipes:
+            self._by_id[r.id] = r
+            self._by_id.setdefault(r.name, r)
+            for name in r.touches:
+                self._by_ingredient.setdefault(name, []).append(r)
+        self._ok = {}
+        self.refresh()
+
+    def load_for_scene(self, scene_path: Optional[str]) -> None:
+        """按场景所在包目录加载配方；包目录未变化时不做任何事。"""
+        if not scene_path:
+            return
+        pack_dir = os.path.dirname(os.path.abspath(scene_path))
+        if pack_dir == self.pack_dir:
+            return
+        self.pack_dir = pack_dir
+        self.set_recipes(load_recipes(pack_dir))
+
+    def close(self) -> None:
+        try:
+            if self._sub is not None:
+                unsubscribe_event('inventory_changed', self._sub)
+        except Exception:
+            pass
+        self._sub = None
+
+    # --- 可合成判定 ---
+    def can_craft(self, recipe: Recipe) -> bool:
+        inv = self.inventory
+        try:
+            for name in recipe.requires:
+                if not inv.has_item(name, 1):
+                    return False
+            for name, qty in recipe.ingredients.items():
+                if not inv.has_item(name, qty):
+                    return False
+            return True
+        except Exception:
+            return False
+
+    def _reeval(self, recipes) -> None:
+        changed = False
+        for r in recipes:
+            ok = self.can_craft(r)
+            if self._ok.get(r.id) != ok:
+                self._ok[r.id] = ok
+                changed = True
+        if changed:
+            self.version += 1
+
+    def refresh(self) -> None:
+        """全量重算（配方集变化或背包被清空/重建时）。"""
+        self._reeval(self.recipes)
+        self.version += 1
+
+    def _on_inventory_changed(self, _evt: str, payload: Dict[str, Any]) -> None:
+        if not self.recipes:
+            return
+        p = payload or {}
+        inv = p.get('inventory')
+        if inv is not None and inv is not self.inventory:
+            return  # 其它会话/背包的变化
+        names = []
+        if p.get('item') is not None:
+            names.append(getattr(p['item'], 'name', None))
+        if p.get('item_name'):
+            names.append(p['item_name'])
+        for entry in (p.get('items') or ()):
+            try:
+                names.append(entry[0])
+            except Exception:
+                pass
+        names = [n for n in names if n]
+        if not names:
+            self.refresh()
+            return
+        touched: Dict[str, Recipe] = {}
+        for n in names:
+            for r in self._by_ingredient.get(n, ()):
+                touched[r.id] = r
+        if touched:
+            self._reeval(touched.values())
+
+    # --- 查询 ---
+    def craftable(self) -> List[Recipe]:
+        ok = self._ok
+        return [r for r in self.recipes if ok.get(r.id)]
+
+    def resolve(self, key: Any) -> Optional[Recipe]:
+        if key is None:
+            return None
+        return self._by_id.get(str(key))
+
+    # --- 合成 ---
+    def craft(self, key: Any, game: Any = None) -> Tuple[bool, str]:
+        """合成指定配方（id/名称/Recipe）：扣除材料 → 放入产物；空间不足时退回材料。"""
+        r = key if isinstance(key, Recipe) else self.resolve(key)
+        if r is None:
+            return False, f'未知配方: {key}'
+        if not self.can_craft(r):
+            return False, f'材料不足，无法合成 {r.name}'
+        inv = self.inventory
+        originals = []
+        for name, qty in r.ingredients.items():
+            stacks = inv.find_stacks(name)
+            if stacks:
+                originals.append((stacks[0].item, qty))
+        inv.remove_many(dict(r.ingredients), game=game)
+        item = make_item(r.result)
+        qty = max(1, int(r.result.get('qty', 1) or 1))
+        added = inv.add_item(item, qty, game=game)
+        if added <= 0:
+            inv.add_many(originals, game=game)
+            return False, f'背包空间不足，无法合成 {r.name}'
+        return True, f'合成成功: {item.name} x{added}'
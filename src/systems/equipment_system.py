@@ -1,7 +1,12 @@
+from types import MappingProxyType
 from .inventory import EquipmentItem
 from src.core.events import publish as publish_event
 from src.ui import colors as C
 
+# 未配置主动技能/被动的装备共享的不可变空值
+_NO_SKILLS: tuple = ()
+_NO_PASSIVES = MappingProxyType({})
+
 class WeaponItem(EquipmentItem):
     """武器装备
 
@@ -9,6 +14,8 @@ class WeaponItem(EquipmentItem):
     - active_skills: [skill_id,...] 装备后可用的主动技能（会出现在操作栏）
     - passives: dict 被动效果声明（示例：{'lifesteal_on_attack_stat': 'str'}）
     """
+    __slots__ = ('attack', 'defense', 'slot_type', 'is_two_handed', 'active_skills', 'passives')
+
     def __init__(self, name, description="", durability=100, attack=0, defense=0, slot_type="right_hand", is_two_handed=False,
                  active_skills=None, passives=None, *, rarity: str = "common"):
         super().__init__(name, description, durability, rarity=rarity)
@@ -17,8 +24,8 @@ class WeaponItem(EquipmentItem):
         self.defense = defense
         self.slot_type = slot_type
         self.is_two_handed = is_two_handed
-        self.active_skills = list(active_skills or [])
-        self.passives = dict(passives or {})
+        self.active_skills = list(active_skills) if active_skills else _NO_SKILLS
+        self.passives = dict(passives) if passives else _NO_PASSIVES
     
     def __str__(self):
         parts = []
@@ -37,6 +44,8 @@ class ArmorItem(EquipmentItem):
     - {'heal_on_damaged_stat': 'wis'}    受伤时按 WIS 调整值治疗
     - {'reflect_on_damaged': 'stamina_cost_1'}   受伤时若有体力则消耗1并反伤
     """
+    __slots__ = ('attack', 'defense', 'slot_type', 'is_two_handed', 'active_skills', 'passives')
+
     def __init__(self, name, description: str = "", durability: int = 100, defense: int = 0, slot_type: str = "armor",
                  active_skills=None, passives=None, *, rarity: str = "common"):
         super().__init__(name, description, durability, rarity=rarity)
@@ -44,22 +53,24 @@ class ArmorItem(EquipmentItem):
         self.defense = defense
         self.slot_type = slot_type
         self.is_two_handed = False
-        self.active_skills = list(active_skills or [])
-        self.passives = dict(passives or {})
+        self.active_skills = list(active_skills) if active_skills else _NO_SKILLS
+        self.passives = dict(passives) if passives else _NO_PASSIVES
 
     def __str__(self):
         return C.resource(f"{self.name}(防具 +{self.defense}防)")
 
 class ShieldItem(EquipmentItem):
     """盾牌装备（左手）"""
+    __slots__ = ('attack', 'defense', 'slot_type', 'is_two_handed', 'active_skills', 'passives')
+
     def __init__(self, name, description="", durability=100, defense=0, attack=0, active_skills=None, passives=None, *, rarity: str = "common"):
         super().__init__(name, description, durability, rarity=rarity)
         self.attack = attack
         self.defense = defense
         self.slot_type = "left_hand"
         self.is_two_handed = False
-        self.active_skills = list(active_skills or [])
-        self.passives = dict(passives or {})
+        self.active_skills = list(active_skills) if active_skills else _NO_SKILLS
+        self.passives = dict(passives) if passives else _NO_PASSIVES
     
     def __str__(self):
         if self.attack > 0:
@@ -69,6 +80,8 @@ class ShieldItem(EquipmentItem):
 
 class EquipmentSystem:
     """装备系统"""
+    __slots__ = ('left_hand', 'right_hand', 'armor', 'owner')
+
     def __init__(self):
         self.left_hand = None
         self.right_hand = None
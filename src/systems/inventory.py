@@ -13,7 +13,11 @@ class Item:
 
     备注：从 JSON/YAML 加载物品时，如包含 `rarity` 字段，将自动保存在此处，
     供 UI（如 PyQt 装备对话框）进行着色或排序。
+
+    物品类使用 __slots__；子类新增字段需在自身 __slots__ 中声明。
     """
+    __slots__ = ('name', 'item_type', 'max_stack', 'description', 'rarity', '_save_token')
+
     def __init__(self, name, item_type="普通", max_stack=1, description="", rarity: str = "common"):
         self.name = name
         self.item_type = item_type  # 物品类型：装备、消耗品、材料等
@@ -38,6 +42,8 @@ class Item:
 
 class ItemStack:
     """物品堆叠类"""
+    __slots__ = ('item', 'quantity', '_vm_id')
+
     def __init__(self, item, quantity=1):
         self.item = item
         self.quantity = min(quantity, item.max_stack)
@@ -89,119 +95,257 @@ class ItemStack:
         return self.__str__()
 
 
+# 类型桶：UI 与合成按类别取物品时使用
+TYPE_BUCKETS = ('weapon', 'armor', 'consumable', 'material', 'other')
+
+# 类 -> 类型桶（首次遇到该类时判定一次）
+_BUCKET_OF = {}
+# 装备类（equipment_system 依赖本模块，首次需要时导入一次并缓存）
+_EQUIP_TYPES = None
+
+
+def _equip_types():
+    global _EQUIP_TYPES
+    if _EQUIP_TYPES is None:
+        try:
+            from .equipment_system import WeaponItem, ArmorItem, ShieldItem
+            _EQUIP_TYPES = (WeaponItem, ArmorItem, ShieldItem)
+        except Exception:
+            return (), (), ()
+    return _EQUIP_TYPES
+
+
+def item_bucket(item) -> str:
+    """物品所属类型桶：weapon/armor/consumable/material/other。"""
+    cls = type(item)
+    b = _BUCKET_OF.get(cls)
+    if b is None:
+        W, A, S = _equip_types()
+        if W and issubclass(cls, W):
+            b = 'weapon'
+        elif (A and issubclass(cls, A)) or (S and issubclass(cls, S)):
+            b = 'armor'
+        elif issubclass(cls, ConsumableItem):
+            b = 'consumable'
+        elif issubclass(cls, MaterialItem):
+            b = 'material'
+        else:
+            b = 'other'
+        _BUCKET_OF[cls] = b
+    return b
+
+
 class Inventory:
-    """背包类"""
+    """背包类
+
+    除按顺序存放的 `slots` 外，另维护三份索引（均由本类方法同步更新）：
+    - 名称 -> 堆叠列表（按槽位顺序），用于堆叠查找/移除/使用；
+    - 名称 -> 总数量，`get_item_count`/`has_item` 为 O(1)；
+    - 类型桶（weapon/armor/consumable/material/other）-> 堆叠列表。
+    外部若直接改写 `slots`，需随后调用 `reindex()`。
+    """
     def __init__(self, max_slots=20):
         self.max_slots = max_slots
         self.slots = []  # 存储ItemStack对象的列表
-    
-    def add_item(self, item, quantity=1, game=None):
-        """添加物品到背包，返回实际添加的数量。
-        若提供 game 且包含 log 方法，则通过 game.log 输出提示，避免直接打印。
-        """
-        remaining_quantity = quantity
-        
-        # 首先尝试添加到现有的堆叠中
+        self._by_name = {}
+        self._counts = {}
+        self._by_type = {b: [] for b in TYPE_BUCKETS}
+
+    # --- 索引维护 ---
+    def reindex(self):
+        """按 slots 重建全部索引。"""
+        self._by_name = {}
+        self._counts = {}
+        self._by_type = {b: [] for b in TYPE_BUCKETS}
         for slot in self.slots:
+            self._index_stack(slot)
+
+    def _index_stack(self, slot):
+        name = slot.item.name
+        self._by_name.setdefault(name, []).append(slot)
+        self._counts[name] = self._counts.get(name, 0) + slot.quantity
+        self._by_type[item_bucket(slot.item)].append(slot)
+
+    def _unindex_stack(self, slot):
+        """移除一个（已空的）堆叠及其索引。"""
+        name = slot.item.name
+        try:
+            self.slots.remove(slot)
+        except ValueError:
+            pass
+        stacks = self._by_name.get(name)
+        if stacks is not None:
+            try:
+                stacks.remove(slot)
+            except ValueError:
+                pass
+            if not stacks:
+                del self._by_name[name]
+                self._counts.pop(name, None)
+        try:
+            self._by_type[item_bucket(slot.item)].remove(slot)
+        except ValueError:
+            pass
+
+    def _adjust(self, name, delta):
+        n = self._counts.get(name, 0) + delta
+        if n > 0:
+            self._counts[name] = n
+        else:
+            self._counts.pop(name, None)
+
+    def _add(self, item, quantity):
+        """不发事件/不记日志的添加，返回实际添加数量。"""
+        remaining_quantity = quantity
+        # 首先尝试添加到现有的同名堆叠中
+        for slot in self._by_name.get(item.name, ()):
             if slot.can_add(item, remaining_quantity):
                 added = slot.add(remaining_quantity)
                 remaining_quantity -= added
+                self._adjust(item.name, added)
                 if remaining_quantity <= 0:
                     break
-        
         # 如果还有剩余物品，创建新的堆叠
         while remaining_quantity > 0 and len(self.slots) < self.max_slots:
             stack_size = min(remaining_quantity, item.max_stack)
             new_stack = ItemStack(item, stack_size)
             self.slots.append(new_stack)
+            self._index_stack(new_stack)
             remaining_quantity -= stack_size
-        
-        added_total = quantity - remaining_quantity
-        def _emit(msg: str):
+        return quantity - remaining_quantity
+
+    def _remove(self, item_name, quantity):
+        """不发事件/不记日志的移除，返回实际移除数量。"""
+        remaining_quantity = quantity
+        for slot in list(self._by_name.get(item_name, ())):
+            removed = slot.remove(remaining_quantity)
+            remaining_quantity -= removed
+            self._adjust(item_name, -removed)
+            if slot.is_empty():
+                self._unindex_stack(slot)
+            if remaining_quantity <= 0:
+                break
+        return quantity - remaining_quantity
+
+    @staticmethod
+    def _emit(game, msg: str):
+        try:
+            if game is not None and hasattr(game, 'log'):
+                game.log(msg)
+            else:
+                # 控制台回退（开发/测试场景）
+                print(msg)
+        except Exception:
             try:
-                if game is not None and hasattr(game, 'log'):
-                    game.log(msg)
-                else:
-                    # 控制台回退（开发/测试场景）
-                    print(msg)
+                print(msg)
             except Exception:
-                try:
-                    print(msg)
-                except Exception:
-                    pass
+                pass
+
+    # --- 增删 ---
+    def add_item(self, item, quantity=1, game=None):
+        """添加物品到背包，返回实际添加的数量。
+        若提供 game 且包含 log 方法，则通过 game.log 输出提示，避免直接打印。
+        """
+        added_total = self._add(item, quantity)
+        remaining_quantity = quantity - added_total
         if added_total > 0:
-            _emit(f"添加到背包: {item.name} x{added_total}")
+            self._emit(game, f"添加到背包: {item.name} x{added_total}")
             try:
-                publish_event('inventory_changed', {'action': 'add', 'item': item, 'quantity': added_total})
+                publish_event('inventory_changed', {'inventory': self, 'action': 'add', 'item': item, 'quantity': added_total})
             except Exception:
                 pass
         if remaining_quantity > 0:
-            _emit(f"背包空间不足，无法添加: {item.name} x{remaining_quantity}")
+            self._emit(game, f"背包空间不足，无法添加: {item.name} x{remaining_quantity}")
         
         return added_total
+
+    def add_many(self, entries, game=None):
+        """批量添加 [(item, quantity), ...]，只发布一次 inventory_changed。
+        返回 [(item, 实际添加数量), ...]。
+        """
+        out = []
+        for item, qty in entries:
+            out.append((item, self._add(item, int(qty)) if int(qty) > 0 else 0))
+        added = [(it.name, n) for it, n in out if n > 0]
+        failed = [(it.name, int(q) - n) for (it, q), (_i, n) in zip(entries, out) if int(q) - n > 0]
+        if added:
+            self._emit(game, "添加到背包: " + ", ".join(f"{n} x{q}" for n, q in added))
+            try:
+                publish_event('inventory_changed', {'inventory': self, 'action': 'add_many', 'items': added})
+            except Exception:
+                pass
+        if failed:
+            self._emit(game, "背包空间不足，无法添加: " + ", ".join(f"{n} x{q}" for n, q in failed))
+        return out
     
     def remove_item(self, item_name, quantity=1, game=None):
         """从背包中移除指定物品，返回实际移除的数量。
         若提供 game 则通过 game.log 输出提示，避免直接打印。
         """
-        remaining_quantity = quantity
-        slots_to_remove = []
-        
-        for i, slot in enumerate(self.slots):
-            if slot.item.name == item_name:
-                removed = slot.remove(remaining_quantity)
-                remaining_quantity -= removed
-                
-                if slot.is_empty():
-                    slots_to_remove.append(i)
-                
-                if remaining_quantity <= 0:
-                    break
-        
-        # 移除空的槽位（从后往前移除避免索引问题）
-        for i in reversed(slots_to_remove):
-            del self.slots[i]
-        
-        removed_total = quantity - remaining_quantity
+        removed_total = self._remove(item_name, quantity)
         if removed_total > 0:
+            self._emit(game, f"从背包移除: {item_name} x{removed_total}")
             try:
-                if game is not None and hasattr(game, 'log'):
-                    game.log(f"从背包移除: {item_name} x{removed_total}")
-                else:
-                    print(f"从背包移除: {item_name} x{removed_total}")
+                publish_event('inventory_changed', {'inventory': self, 'action': 'remove', 'item_name': item_name, 'quantity': removed_total})
             except Exception:
-                try:
-                    print(f"从背包移除: {item_name} x{removed_total}")
-                except Exception:
-                    pass
+                pass
+        return removed_total
+
+    def remove_many(self, entries, game=None):
+        """批量移除 {名称: 数量} 或 [(名称, 数量), ...]，只发布一次 inventory_changed。
+        返回 {名称: 实际移除数量}。
+        """
+        pairs = entries.items() if isinstance(entries, dict) else entries
+        out = {}
+        for name, qty in pairs:
+            out[name] = out.get(name, 0) + (self._remove(name, int(qty)) if int(qty) > 0 else 0)
+        removed = [(n, q) for n, q in out.items() if q > 0]
+        if removed:
+            self._emit(game, "从背包移除: " + ", ".join(f"{n} x{q}" for n, q in removed))
             try:
-                publish_event('inventory_changed', {'action': 'remove', 'item_name': item_name, 'quantity': removed_total})
+                publish_event('inventory_changed', {'inventory': self, 'action': 'remove_many', 'items': removed})
             except Exception:
                 pass
-        return removed_total
-    
+        return out
+
+    def remove_stack(self, slot, game=None):
+        """移除整个堆叠（如装备后从背包取出），返回移除数量。"""
+        if slot not in self._by_name.get(slot.item.name, ()):
+            return 0
+        qty = slot.quantity
+        self._adjust(slot.item.name, -qty)
+        slot.quantity = 0
+        self._unindex_stack(slot)
+        try:
+            publish_event('inventory_changed', {'inventory': self, 'action': 'remove', 'item_name': slot.item.name, 'quantity': qty})
+        except Exception:
+            pass
+        return qty
+
+    # --- 查询 ---
     def get_item_count(self, item_name):
         """获取指定物品的总数量"""
-        total = 0
-        for slot in self.slots:
-            if slot.item.name == item_name:
-                total += slot.quantity
-        return total
+        return self._counts.get(item_name, 0)
     
     def has_item(self, item_name, quantity=1):
         """检查是否有足够数量的指定物品"""
-        return self.get_item_count(item_name) >= quantity
+        return self._counts.get(item_name, 0) >= quantity
+
+    def find_stacks(self, item_name):
+        """指定名称的全部堆叠（按槽位顺序）。"""
+        return list(self._by_name.get(item_name, ()))
+
+    def by_type(self, bucket):
+        """某类型桶中的全部堆叠（按槽位顺序）：weapon/armor/consumable/material/other。"""
+        return list(self._by_type.get(bucket, ()))
+
+    def type_counts(self):
+        """各类型桶的物品总数量。"""
+        return {b: sum(s.quantity for s in stacks) for b, stacks in self._by_type.items()}
     
     def get_all_items(self):
         """获取背包中所有物品的字典，键为物品名称，值为数量"""
-        items = {}
-        for slot in self.slots:
-            item_name = slot.item.name
-            if item_name in items:
-                items[item_name] += slot.quantity
-            else:
-                items[item_name] = slot.quantity
-        return items
+        return dict(self._counts)
     
     def is_full(self):
         """检查背包是否已满"""
@@ -214,6 +358,7 @@ class Inventory:
     def clear(self, game=None):
         """清空背包"""
         self.slots.clear()
+        self.reindex()
         try:
             if game is not None and hasattr(game, 'log'):
                 game.log("背包已清空")
@@ -222,13 +367,14 @@ class Inventory:
         except Exception:
             pass
         try:
-            publish_event('inventory_changed', {'action': 'clear'})
+            publish_event('inventory_changed', {'inventory': self, 'action': 'clear'})
         except Exception:
             pass
     
     def sort_items(self):
         """按物品类型和名称排序"""
         self.slots.sort(key=lambda slot: (slot.item.item_type, slot.item.name))
+        self.reindex()
     
     def __str__(self):
         if not self.slots:
@@ -260,19 +406,11 @@ class Inventory:
         if amount <= 0:
             return False, "数量需大于0"
         used = 0
-        # 延迟导入，避免循环依赖
-        try:
-            from .equipment_system import WeaponItem, ArmorItem, ShieldItem
-        except Exception:
-            WeaponItem = ArmorItem = ShieldItem = tuple()
-
-        for slot in list(self.slots):
-            if slot.item.name != item_name:
-                continue
-
+        for slot in list(self._by_name.get(item_name, ())):
             item = slot.item
+            bucket = item_bucket(item)
             # 装备物品
-            if isinstance(item, (WeaponItem, ArmorItem, ShieldItem)):
+            if bucket in ('weapon', 'armor'):
                 if target is None or not hasattr(target, 'equipment'):
                     return False, "该物品需要目标(如 m1)来装备"
                 # 执行装备（若 player.game 存在则传入以统一日志管道）
@@ -281,21 +419,22 @@ class Inventory:
                 if not ok:
                     return False, "装备失败：槽位冲突或条件不满足"
                 slot.remove(1)
+                self._adjust(item_name, -1)
                 if slot.is_empty():
-                    self.slots.remove(slot)
+                    self._unindex_stack(slot)
                 # 返回包含装备属性的字符串
                 try:
                     pretty = str(item)
                 except Exception:
                     pretty = item.name
                 try:
-                    publish_event('inventory_changed', {'action': 'equip_use', 'item_name': item.name, 'target': target})
+                    publish_event('inventory_changed', {'inventory': self, 'action': 'equip_use', 'item_name': item.name, 'target': target})
                 except Exception:
                     pass
                 return True, f"为 {target} 装备了 {pretty}"
 
             # 消耗品
-            if isinstance(item, ConsumableItem):
+            if bucket == 'consumable':
                 times = min(amount - used, slot.quantity)
                 for _ in range(times):
                     if callable(getattr(item, 'effect', None)):
@@ -304,9 +443,10 @@ class Inventory:
                         except Exception:
                             pass
                     slot.remove(1)
+                    self._adjust(item_name, -1)
                     used += 1
                     if slot.is_empty():
-                        self.slots.remove(slot)
+                        self._unindex_stack(slot)
                         break
                 if used >= amount:
                     break
@@ -315,7 +455,7 @@ class Inventory:
 
         if used > 0:
             try:
-                publish_event('inventory_changed', {'action': 'use', 'item_name': item_name, 'quantity': used})
+                publish_event('inventory_changed', {'inventory': self, 'action': 'use', 'item_name': item_name, 'quantity': used})
             except Exception:
                 pass
             return True, f"已使用 {item_name} x{used}"
@@ -328,6 +468,8 @@ class EquipmentItem(Item):
 
     新增：支持稀有度 `rarity` 字段，默认 "common"，用于 UI 着色与排序。
     """
+    __slots__ = ('durability', 'max_durability')
+
     def __init__(self, name, description="", durability=100, *, rarity: str = "common"):
         # 透传 rarity 到基类，便于 UI 使用
         super().__init__(name, "装备", max_stack=1, description=description, rarity=rarity)
@@ -337,6 +479,8 @@ class EquipmentItem(Item):
 
 class ConsumableItem(Item):
     """消耗品物品（可堆叠）"""
+    __slots__ = ('effect',)
+
     def __init__(self, name, description="", max_stack=4, effect=None):
         super().__init__(name, "消耗品", max_stack=max_stack, description=description)
         self.effect = effect  # 使用效果函数
@@ -344,6 +488,8 @@ class ConsumableItem(Item):
 
 class MaterialItem(Item):
     """材料物品（高度堆叠）"""
+    __slots__ = ()
+
     def __init__(self, name, description="", max_stack=16):
         super().__init__(name, "材料", max_stack=max_stack, description=description)
 
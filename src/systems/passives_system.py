@@ -1,16 +1,31 @@
 """
 事件驱动的被动系统：集中订阅战斗事件，根据装备声明的 passives 触发效果。
 
-支持示例：
-- lifesteal_on_attack_stat: 按指定属性调整值在攻击命中后为攻击者治疗（如 'str'/'wis'）
-- heal_on_damaged_stat: 受伤后按指定属性调整值自疗（如 'wis'）
-- reflect_on_damaged: 受伤后若有体力则消耗1反弹同等伤害到攻击者
+按实体维护“触发时机 → 钩子列表”的索引（装备变化时重建），事件到来时只对确实挂有该时机钩子的实体分派，
+不再在每次攻击/反击时遍历全部装备做字典查找。
 
-用法：在游戏初始化后调用 setup() 一次（UI 或控制器启动时）。
+触发时机：
+- on_hit：攻击命中后（攻击者）
+- on_kill：攻击击杀目标后（攻击者）
+- on_damaged：受到攻击或反击伤害后（受击者，来源为对方）
+- turn_start：回合开始（`turn_start` 事件，作用于该局双方场上单位）
+- aura：持续光环，对同侧其他单位提供命中/伤害/AC 加值（由 aura_bonuses 查询，并入角色卡 bonuses）
+
+支持的装备被动：
+- lifesteal_on_attack_stat: 'str'   on_hit，按属性调整值为攻击者治疗
+- heal_on_damaged_stat: 'wis'       on_damaged，按属性调整值自疗
+- reflect_on_damaged: 任意真值       on_damaged，若有体力则消耗1反弹同等伤害到攻击者
+- heal_on_kill: 2                   on_kill，击杀后治疗自身
+- regen_turn_start: 1               turn_start，回合开始时治疗自身
+- aura_bonus: {'to_hit': 1, 'damage': 1, 'ac': 1}   aura
+
+用法：在游戏初始化后调用 setup(game) 一次（UI 或控制器启动时；重复调用只会为该局预建索引）。
+新增被动：在 _HANDLERS 中登记 键 → (时机, 工厂)，工厂接收配置值并返回钩子 hook(owner, ctx)。
 """
 from __future__ import annotations
 
-from typing import Dict
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 try:
     from src.core.events import subscribe as subscribe_event
@@ -19,9 +34,20 @@ except Exception:  # pragma: no cover
         return None
 
 
+TRIGGERS: Tuple[str, ...] = ('on_hit', 'on_kill', 'on_damaged', 'turn_start', 'aura')
+
+Hook = Callable[[Any, Dict[str, Any]], None]
+
 _SUBS = []
 _READY = False
 
+# 实体 -> {时机: [钩子]}；弱引用，单位离场后自动回收
+_INDEX: 'weakref.WeakKeyDictionary[Any, Dict[str, List[Hook]]]' = weakref.WeakKeyDictionary()
+# 时机 -> 挂有该时机钩子的实体集合
+_HOLDERS: Dict[str, 'weakref.WeakSet[Any]'] = {t: weakref.WeakSet() for t in TRIGGERS}
+# 光环实体 -> 加值字典（aura 钩子的数据，查询时直接求和）
+_AURAS: 'weakref.WeakKeyDictionary[Any, Dict[str, int]]' = weakref.WeakKeyDictionary()
+
 
 def _get_attr(entity, key: str) -> int:
     try:
@@ -37,88 +63,239 @@ def _get_attr(entity, key: str) -> int:
     return 10
 
 
+def _heal(entity, amount: int) -> None:
+    if amount <= 0:
+        return
+    try:
+        entity.heal(amount)
+    except Exception:
+        setattr(entity, 'hp', min(getattr(entity, 'hp', 0) + amount, getattr(entity, 'max_hp', getattr(entity, 'hp', 0) + amount)))
+
+
 def _iter_equipped_items(owner):
-    eq = getattr(owner, 'equipment', None)
+    from src.core.base_entity import equipment_of
+    eq = equipment_of(owner)  # 不为从未装备过的单位创建装备系统
     for it in (getattr(eq, 'left_hand', None), getattr(eq, 'right_hand', None), getattr(eq, 'armor', None)):
         if it:
             yield it
 
 
-def _on_attack_resolved(_evt: str, payload: Dict):
-    attacker = (payload or {}).get('attacker')
-    damage = int((payload or {}).get('damage', 0))
-    if not attacker or damage <= 0:
-        return
-    # lifesteal_on_attack_stat
+# --- 钩子工厂：配置值 -> hook(owner, ctx) ---
+def _mk_heal_by_stat(v) -> Hook:
+    stat = str(v).lower()
+
+    def hook(owner, ctx):
+        _heal(owner, max(0, (_get_attr(owner, stat) - 10) // 2))
+    return hook
+
+
+def _mk_reflect(_v) -> Hook:
+    def hook(owner, ctx):
+        other = ctx.get('other')
+        if other is None or getattr(owner, 'stamina', 0) <= 0:
+            return
+        if getattr(owner, 'spend_stamina', None) and owner.spend_stamina(1):
+            try:
+                # 由主流程处理死亡与清场切换；被动系统不负责。
+                other.take_damage(int(ctx.get('damage', 0)))
+            except Exception:
+                pass
+    return hook
+
+
+def _mk_flat_heal(v) -> Hook:
+    amt = int(v)
+
+    def hook(owner, ctx):
+        _heal(owner, amt)
+        game = ctx.get('game')
+        if game is not None and amt > 0:
+            try:
+                game.log(f"{owner} 的被动恢复 {amt} 点生命")
+            except Exception:
+                pass
+    return hook
+
+
+def _mk_aura(v) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    if isinstance(v, dict):
+        for k, x in v.items():
+            try:
+                out[str(k)] = int(x)
+            except Exception:
+                pass
+    return out
+
+
+# 被动键 -> (时机, 工厂)
+_HANDLERS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    'lifesteal_on_attack_stat': ('on_hit', _mk_heal_by_stat),
+    'heal_on_damaged_stat': ('on_damaged', _mk_heal_by_stat),
+    'reflect_on_damaged': ('on_damaged', _mk_reflect),
+    'heal_on_kill': ('on_kill', _mk_flat_heal),
+    'regen_turn_start': ('turn_start', _mk_flat_heal),
+    'aura_bonus': ('aura', _mk_aura),
+}
+
+
+# --- 索引 ---
+def reindex(owner) -> Dict[str, List[Hook]]:
+    """按当前装备重建某实体的钩子索引。同一被动键在多件装备上只取第一件（与旧行为一致）。"""
+    hooks: Dict[str, List[Hook]] = {}
+    aura: Dict[str, int] = {}
+    seen = set()
+    for it in _iter_equipped_items(owner):
+        for key, val in (getattr(it, 'passives', None) or {}).items():
+            h = _HANDLERS.get(key)
+            if h is None or not val or key in seen:
+                continue
+            seen.add(key)
+            trig, factory = h
+            try:
+                made = factory(val)
+            except Exception:
+                continue
+            if trig == 'aura':
+                for k, x in made.items():
+                    aura[k] = aura.get(k, 0) + x
+            else:
+                hooks.setdefault(trig, []).append(made)
+    if aura:
+        hooks['aura'] = []
     try:
-        stat = None
-        for it in _iter_equipped_items(attacker):
-            v = getattr(it, 'passives', {}).get('lifesteal_on_attack_stat')
-            if v:
-                stat = str(v).lower(); break
-        if stat:
-            mod = (_get_attr(attacker, stat) - 10) // 2
-            heal_amt = max(0, int(mod))
-            if heal_amt > 0:
-                prev = getattr(attacker, 'hp', 0)
-                try:
-                    attacker.heal(heal_amt)
-                except Exception:
-                    setattr(attacker, 'hp', min(getattr(attacker, 'hp', 0) + heal_amt, getattr(attacker, 'max_hp', getattr(attacker, 'hp', 0) + heal_amt)))
-                game = getattr(getattr(attacker, 'equipment', None), 'owner', None)
-                # 无法可靠取得 game 实例，这里仅依赖攻击流程已记录日志；跳过额外日志以简化。
-    except Exception:
+        _INDEX[owner] = hooks
+        for t in TRIGGERS:
+            if t in hooks:
+                _HOLDERS[t].add(owner)
+            else:
+                _HOLDERS[t].discard(owner)
+        if aura:
+            _AURAS[owner] = aura
+        else:
+            _AURAS.pop(owner, None)
+    except TypeError:
+        # 不可弱引用的对象：不缓存
         pass
+    return hooks
 
 
-def _on_counter_resolved(_evt: str, payload: Dict):
-    defender = (payload or {}).get('defender')
-    attacker = (payload or {}).get('attacker')
-    damage = int((payload or {}).get('damage', 0))
-    if not defender or damage <= 0:
-        return
-    # heal_on_damaged_stat
+def hooks_for(owner) -> Dict[str, List[Hook]]:
     try:
-        stat = None
-        for it in _iter_equipped_items(defender):
-            v = getattr(it, 'passives', {}).get('heal_on_damaged_stat')
-            if v:
-                stat = str(v).lower(); break
-        if stat:
-            mod = (_get_attr(defender, stat) - 10) // 2
-            amt = max(0, int(mod))
-            if amt > 0:
-                try:
-                    defender.heal(amt)
-                except Exception:
-                    setattr(defender, 'hp', min(getattr(defender, 'hp', 0) + amt, getattr(defender, 'max_hp', getattr(defender, 'hp', 0) + amt)))
-    except Exception:
-        pass
-    # reflect_on_damaged
+        hooks = _INDEX.get(owner)
+    except TypeError:
+        hooks = None
+    return hooks if hooks is not None else reindex(owner)
+
+
+def prime(units: Iterable[Any]) -> None:
+    """为一批实体预建索引（开局/切换场景时调用，保证 turn_start/aura 能找到持有者）。"""
+    for u in units:
+        hooks_for(u)
+
+
+def _fire(trigger: str, owner, ctx: Dict[str, Any]) -> None:
+    if owner is None:
+        return
+    for hook in hooks_for(owner).get(trigger, ()):
+        try:
+            hook(owner, ctx)
+        except Exception:
+            pass
+
+
+def aura_bonuses(entity, game) -> Dict[str, int]:
+    """同侧其他单位光环提供的加值（无光环时 O(1) 返回空）。"""
+    if not _AURAS:
+        return {}
+    arr = getattr(entity, '_soa', None)
+    if arr is not None:
+        # 数组化战场：同侧光环合计按版本缓存，不再逐个扫描
+        try:
+            return arr.aura_for(entity)
+        except Exception:
+            return {}
     try:
-        do_reflect = False
-        for it in _iter_equipped_items(defender):
-            if getattr(it, 'passives', {}).get('reflect_on_damaged'):
-                do_reflect = True; break
-        if do_reflect and attacker and getattr(defender, 'stamina', 0) > 0:
-            if getattr(defender, 'spend_stamina', None) and defender.spend_stamina(1):
-                try:
-                    prev = getattr(attacker, 'hp', 0)
-                    dead = attacker.take_damage(damage)
-                    # 由主流程处理死亡与清场切换；被动系统不负责。
-                except Exception:
-                    pass
+        board = getattr(getattr(game, 'player', None), 'board', None) or []
+        enemies = getattr(game, 'enemies', None) or []
+        side = board if any(u is entity for u in board) else (enemies if any(u is entity for u in enemies) else None)
+        if side is None:
+            return {}
+        out: Dict[str, int] = {}
+        for src, bon in list(_AURAS.items()):
+            if src is entity or not any(u is src for u in side):
+                continue
+            for k, v in bon.items():
+                out[k] = out.get(k, 0) + v
+        return out
     except Exception:
-        pass
+        return {}
+
+
+# --- 事件处理 ---
+def _on_equipment_changed(_evt: str, payload: Dict):
+    owner = (payload or {}).get('owner')
+    if owner is not None:
+        reindex(owner)
+
+
+def _on_attack_resolved(_evt: str, payload: Dict):
+    p = payload or {}
+    attacker = p.get('attacker')
+    defender = p.get('defender')
+    damage = int(p.get('damage', 0))
+    if not attacker or damage <= 0:
+        return
+    _fire('on_hit', attacker, {'other': defender, 'damage': damage})
+    if p.get('defender_dead'):
+        _fire('on_kill', attacker, {'other': defender, 'damage': damage})
+    elif defender is not None:
+        _fire('on_damaged', defender, {'other': attacker, 'damage': damage})
+
+
+def _on_counter_resolved(_evt: str, payload: Dict):
+    p = payload or {}
+    damage = int(p.get('damage', 0))
+    if not p.get('defender') or damage <= 0:
+        return
+    _fire('on_damaged', p.get('defender'), {'other': p.get('attacker'), 'damage': damage})
+
+
+def _on_turn_start(_evt: str, payload: Dict):
+    game = (payload or {}).get('game')
+    holders = _HOLDERS['turn_start']
+    if game is None or not holders:
+        return
+    ctx = {'game': game}
+    for side, units in (('ally', getattr(getattr(game, 'player', None), 'board', None)), ('enemy', getattr(game, 'enemies', None))):
+        arr = getattr(game, 'board_arrays' if side == 'ally' else 'enemy_arrays', None)
+        try:
+            if arr is not None:
+                # 数组化战场：只遍历带回复标志的槽位
+                from src.core.combat_arrays import F_REGEN
+                units = [arr.units[i] for i in arr.with_flag(F_REGEN)]
+            units = list(units or [])
+        except Exception:
+            continue
+        for u in units:
+            if u in holders:
+                _fire('turn_start', u, ctx)
 
 
-def setup():
+def setup(game=None):
     global _READY
+    if game is not None:
+        try:
+            prime(list(game.player.board) + list(getattr(game, 'enemies', []) or []))
+        except Exception:
+            pass
     if _READY:
         return
     try:
+        _SUBS.append(('equipment_changed', subscribe_event('equipment_changed', _on_equipment_changed)))
         _SUBS.append(('attack_resolved', subscribe_event('attack_resolved', _on_attack_resolved)))
         _SUBS.append(('counter_resolved', subscribe_event('counter_resolved', _on_counter_resolved)))
+        _SUBS.append(('turn_start', subscribe_event('turn_start', _on_turn_start)))
         _READY = True
     except Exception:
         pass
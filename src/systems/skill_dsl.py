@@ -0,0 +1,257 @@
+"""
+技能效果 DSL（skills_catalog.json 中的 `effect` 块）→ 专用闭包
+
+目录记录里写了 `effect` 的技能无需 Python 代码：注册表构建时调用 `compile_effect` 编译一次，
+得到签名与 skills_engine 一致的 impl(game, src, tgt) -> (ok, msg)。
+
+effect 字段（均可省略，括号内为默认值）：
+- target (single)：single 指定单体 / enemies 全体敌人 / lowest_hp 未指定时取血量最低的敌人 /
+  random 未指定时随机敌人
+- roll (normal)：normal 普通命中检定 / advantage 优势 / none 不检定（必中）
+- detail (false)：是否为命中与伤害补充 breakdown 明细（_enrich_to_hit/_enrich_damage）
+- damage：骰面 = max(min, base*mul//div + add + max(0, add_mod 调整值))，附加值 = bonus (+max(0, bonus_mod 调整值))
+    base ("atk")：'atk' 施放者总攻，或整数常量；min (1) 为 0 时骰面为 0 直接造成 0 伤害不投骰
+- hits (1)：对同一目标连续结算次数（目标死亡即停止），>1 时额外记一条总计日志
+- on_hit：[{"lifesteal": 1}] 按实际伤害比例为施放者回血
+- on_kill：[{"heal_self": 2}] 击杀（且未切换场景）后施放者回血
+- after：["exhaust"] 结算后施放者本回合不可再攻击
+- text：hit / miss / total / done 日志模板，可用 {src} {tgt} {dealt} {healed} {total} {name}
+
+阵亡单位在全部目标结算完毕后经 `AoeBatch`（src.systems.aoe）统一处理：移除、掉落、进度与清场检查各一次，
+同一次施放的日志带相同的 meta['aoe'] 分组号。
+
+编译期完成的工作：模板中的 {name} 替换、常量骰面/附加值折叠为元组、按 roll/detail/target 选择专用分支；
+运行期每次命中不再做 hasattr/getattr 探测与 kwargs 字典构造，施放者属性表每次施放只转换一次。
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.systems.aoe import AoeBatch
+from src.systems.dnd_rules import roll_damage, to_hit_roll
+
+
+Impl = Callable[[Any, Any, Any], Tuple[bool, str]]
+
+_TARGETS = ('single', 'enemies', 'lowest_hp', 'random')
+_ROLLS = ('normal', 'advantage', 'none')
+
+# 类型 -> 取总攻函数（首次遇到该类型时决定，避免每次 hasattr 探测）
+_ATK_GETTERS: Dict[type, Callable[[Any], int]] = {}
+
+
+def _atk_of(src: Any) -> int:
+    fn = _ATK_GETTERS.get(type(src))
+    if fn is None:
+        if hasattr(type(src), 'get_total_attack'):
+            fn = lambda s: int(s.get_total_attack())
+        else:
+            fn = lambda s: int(getattr(s, 'attack', 1))
+        _ATK_GETTERS[type(src)] = fn
+    return fn(src)
+
+
+def _mod(game: Any, ent: Any, attr: str) -> int:
+    return (game._get_attr(ent, attr) - 10) // 2
+
+
+def _heal(ent: Any, amount: int) -> None:
+    if amount <= 0:
+        return
+    try:
+        ent.heal(amount)
+    except Exception:
+        try:
+            ent.hp = min(getattr(ent, 'max_hp', ent.hp + amount), ent.hp + amount)
+        except Exception:
+            pass
+
+
+def _compile_sides(dmg: Dict[str, Any]) -> Tuple[Optional[int], Callable[[Any, Any], int]]:
+    """返回 (常量骰面或 None, 运行期计算骰面的函数)。"""
+    base = dmg.get('base', 'atk')
+    mul = int(dmg.get('mul', 1))
+    div = max(1, int(dmg.get('div', 1)))
+    add = int(dmg.get('add', 0))
+    lo = int(dmg.get('min', 1))
+    add_mod = dmg.get('add_mod')
+    if base != 'atk' and not add_mod:
+        const = max(lo, int(base) * mul // div + add)
+        return const, lambda game, src: const
+    if base == 'atk' and mul == 1 and div == 1 and add == 0 and not add_mod:
+        return None, lambda game, src: max(lo, _atk_of(src))
+    if add_mod:
+        if base == 'atk':
+            return None, lambda game, src: max(lo, _atk_of(src) * mul // div + add + max(0, _mod(game, src, add_mod)))
+        b = int(base) * mul // div + add
+        return None, lambda game, src: max(lo, b + max(0, _mod(game, src, add_mod)))
+    return None, lambda game, src: max(lo, _atk_of(src) * mul // div + add)
+
+
+def _compile_bonus(dmg: Dict[str, Any]) -> Tuple[Optional[int], Callable[[Any, Any], int]]:
+    bonus = int(dmg.get('bonus', 0))
+    bonus_mod = dmg.get('bonus_mod')
+    if not bonus_mod:
+        return bonus, lambda game, src: bonus
+    return None, lambda game, src: bonus + max(0, _mod(game, src, bonus_mod))
+
+
+def _enemy_arrays(game: Any):
+    try:
+        from src.core import combat_arrays as CA
+        return CA.arrays_for(game, 'enemy')
+    except Exception:
+        return None
+
+
+def compile_effect(sid: str, rec: Dict[str, Any]) -> Optional[Impl]:
+    """把目录记录中的 effect 块编译为技能实现；无 effect 或格式不合法时返回 None。"""
+    eff = rec.get('effect') if isinstance(rec, dict) else None
+    if not isinstance(eff, dict):
+        return None
+    target = str(eff.get('target', 'single'))
+    roll = str(eff.get('roll', 'normal'))
+    if target not in _TARGETS or roll not in _ROLLS:
+        return None
+    name = str(rec.get('name_cn') or rec.get('name_en') or sid)
+    detail = bool(eff.get('detail', False))
+    hits = max(1, int(eff.get('hits', 1)))
+    exhaust = 'exhaust' in (eff.get('after') or [])
+    lifesteal = 0.0
+    for e in (eff.get('on_hit') or []):
+        if isinstance(e, dict) and 'lifesteal' in e:
+            lifesteal += float(e['lifesteal'])
+    kill_heal = 0
+    for e in (eff.get('on_kill') or []):
+        if isinstance(e, dict) and 'heal_self' in e:
+            kill_heal += int(e['heal_self'])
+
+    text = dict(eff.get('text') or {})
+    t_hit = str(text.get('hit', '{src} 的 {name} 对 {tgt} 造成 {dealt} 伤害')).replace('{name}', name)
+    t_miss = str(text.get('miss', '{src} 的 {name} 未命中 {tgt}')).replace('{name}', name)
+    t_total = str(text.get('total', '{name} 总计造成 {total} 点伤害')).replace('{name}', name)
+    done = str(text.get('done', '{name} 完成')).replace('{name}', name)
+    t_kill = f"{{src}} 因击杀而恢复 {kill_heal} 点生命"
+
+    dmg = dict(eff.get('damage') or {})
+    const_sides, sides_of = _compile_sides(dmg)
+    const_bonus, bonus_of = _compile_bonus(dmg)
+    const_dice = (1, const_sides) if const_sides else None
+    advantage = roll == 'advantage'
+    multi = target == 'enemies'
+
+    # --- 命中检定（按 roll/detail 选择分支） ---
+    if roll == 'none':
+        def check(game, att, tgt):
+            return True, None
+    elif detail:
+        def check(game, att, tgt):
+            dfn = game._to_character_sheet(tgt)
+            th = to_hit_roll(att, dfn, use_str=True, advantage=advantage)
+            th = game._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
+            return th.get('hit', True), th
+    else:
+        def check(game, att, tgt):
+            th = to_hit_roll(att, game._to_character_sheet(tgt), use_str=True, advantage=advantage)
+            return th.get('hit', True), th
+
+    # 数组化战场：目标 AC 取自 ac 列，不再逐个构造目标角色卡（明细中的 AC 组成随之省略）
+    if roll == 'none':
+        def check_ac(game, att, tgt, ac):
+            return True, None
+    else:
+        def check_ac(game, att, tgt, ac):
+            th = to_hit_roll(att, None, use_str=True, advantage=advantage, target_ac_override=ac)
+            if detail:
+                th = game._enrich_to_hit(th, att, None, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
+            return th.get('hit', True), th
+
+    # --- 伤害 ---
+    def damage(game, att, src, crit, sides, bonus):
+        if sides <= 0:
+            return 0, None
+        dice = const_dice or (1, sides)
+        dmg_r = roll_damage(att, dice=dice, damage_bonus=bonus, critical=crit)
+        if detail:
+            dmg_r = game._enrich_damage(dmg_r, att, dice, damage_bonus=bonus, critical=crit, use_str_for_damage=True)
+        return int(dmg_r.get('total', sides + bonus)), dmg_r
+
+    # --- 目标 ---
+    def pick(game, tgt) -> Optional[List[Any]]:
+        if multi:
+            return list(game.enemies)
+        if tgt is None:
+            if target == 'lowest_hp' and game.enemies:
+                tgt = min(game.enemies, key=lambda e: getattr(e, 'hp', 0))
+            elif target == 'random' and game.enemies:
+                tgt = random.choice(game.enemies)
+        return [tgt] if tgt is not None else None
+
+    def impl(game, src, tgt) -> Tuple[bool, str]:
+        arr = _enemy_arrays(game) if multi else None
+        acs = None
+        if arr is not None:
+            idx = arr.alive()
+            targets = [arr.units[i] for i in idx]
+            acs = [arr.ac_of(i) for i in idx]
+        else:
+            targets = pick(game, tgt)
+        if targets is None:
+            return False, '无可选目标' if target != 'single' else '未选择目标'
+        att = game._to_character_sheet(src)
+        sides = const_sides if const_sides is not None else sides_of(game, src)
+        bonus = const_bonus if const_bonus is not None else bonus_of(game, src)
+        # 先结算全部目标的命中与伤害，阵亡单位在最后统一处理（见 src.systems.aoe）
+        batch = AoeBatch(game, src)
+        try:
+            for k, t in enumerate(targets):
+                tname = getattr(t, 'name', t)
+                total = 0
+                for _ in range(hits):
+                    hit, th = check(game, att, t) if acs is None else check_ac(game, att, t, acs[k])
+                    if not hit:
+                        batch.log(t_miss, {'to_hit': th}, src=src, tgt=tname)
+                        if not multi:
+                            return True, '未命中'
+                        break
+                    crit = th.get('critical', False) if th else False
+                    prev = t.hp
+                    amount, dmg_r = damage(game, att, src, crit, sides, bonus)
+                    dead = t.take_damage(amount)
+                    dealt = max(0, prev - t.hp)
+                    total += dealt
+                    healed = 0
+                    if lifesteal:
+                        healed = int(dealt * lifesteal)
+                        _heal(src, healed)
+                    if batch.on:
+                        meta = {'to_hit': th, 'damage': dmg_r, 'target': {'hp_before': prev, 'hp_after': t.hp}}
+                        if healed:
+                            meta['lifesteal'] = healed
+                        batch.log(t_hit, meta, src=src, tgt=tname, dealt=dealt, healed=healed)
+                    if dead:
+                        batch.kill(t)
+                        break
+                if hits > 1:
+                    batch.log(t_total, {'total': total, 'hits': hits}, total=total)
+            kills = len(batch.dead)
+            if batch.finish(clear_check=False):
+                return True, done
+            if kill_heal and kills:
+                _heal(src, kill_heal * kills)
+                for _ in range(kills):
+                    batch.log(t_kill, src=src)
+            if multi:
+                batch.check_clear()
+            return True, done
+        finally:
+            if exhaust:
+                src.can_attack = False
+
+    impl.__name__ = f'skill_{sid}'
+    impl.__doc__ = f'{name}（由 skills_catalog.json 的 effect 编译）'
+    return impl
+
+
+__all__ = ['compile_effect']
@@ -0,0 +1,332 @@
+"""
+统一技能注册表（启动时构建一次）
+
+把原先分散的四张分派表与三份元数据合并为单一入口：
+- 实现：`skills_catalog.json` 中的 `effect` 块（由 skill_dsl 编译为闭包，优先）+ `skills_engine.SKILLS`
+  （需特殊逻辑的完整引擎实现）+ `skill_strategy` 中的轻量策略（无引擎辅助方法的模型使用）；
+- 元数据：`skills_catalog.json`（名称/描述/目标规格）、`profession_skills.json`（职业默认技能）、
+  `settings.rules.skill_costs`（体力消耗）。
+
+用法：
+    from src.systems.skill_registry import get_registry
+    R = get_registry()
+    d = R.resolve('横扫')             # O(1)：id / 小写 id / 中文名 / 英文名
+    R.cost('sweep')                   # 体力消耗
+    ok, msg = R.execute(game, 'sweep', src, tgt)   # 校验体力 → 执行 → 扣体力 → 计数/计时
+    R.stats()                         # 每个技能的调用次数/成功次数/耗时
+
+控制器与 UI 只通过本注册表查询技能；settings 变化后调用 `reload_registry()` 重建。
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src import app_config as CFG
+from src.core import perf as P
+
+
+# 普通攻击也登记为一条（无 impl），便于 UI 统一查询体力消耗与目标规格
+ATTACK_ID = 'attack'
+_ATTACK_SPEC = {'team': 'enemy', 'select': 'single', 'min_targets': 1, 'max_targets': 1,
+                'predicates': ['is_alive', 'can_be_attacked']}
+
+
+@dataclass
+class SkillDef:
+    id: str
+    impl: Optional[Callable[[Any, Any, Any], Tuple[bool, str]]] = None
+    cost: int = 1
+    spec: Dict[str, Any] = field(default_factory=dict)
+    name_cn: str = ''
+    name_en: str = ''
+    desc: str = ''
+    # 轻量策略：模型缺少引擎辅助方法（_to_character_sheet 等）时使用
+    strategy: Any = None
+    # 原始目录记录（UI 读取 name_cn/desc 等字段）
+    record: Dict[str, Any] = field(default_factory=dict)
+    # 计数器
+    calls: int = 0
+    ok: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return self.name_cn or self.name_en or self.id
+
+    @property
+    def active(self) -> bool:
+        return self.impl is not None or self.strategy is not None
+
+
+class SkillRegistry:
+    """id → SkillDef 的单一注册表，附带别名索引与调用计数。"""
+
+    def __init__(self) -> None:
+        self._by_id: Dict[str, SkillDef] = {}
+        self._alias: Dict[str, SkillDef] = {}
+        self._professions: Dict[str, List[str]] = {}
+        self._catalog: Dict[str, Dict[str, Any]] = {}
+
+    # --- 构建 ---
+    def add(self, d: SkillDef) -> SkillDef:
+        self._by_id[d.id] = d
+        for key in (d.id, d.id.lower(), d.name_cn, d.name_en, (d.name_en or '').lower()):
+            if key:
+                self._alias[key] = d
+        rec = dict(d.record) if d.record else {}
+        rec.setdefault('id', d.id)
+        if d.name_cn:
+            rec.setdefault('name_cn', d.name_cn)
+        if d.name_en:
+            rec.setdefault('name_en', d.name_en)
+        if d.desc:
+            rec.setdefault('desc', d.desc)
+        self._catalog[d.id] = rec
+        return d
+
+    def register_strategy(self, sid: str, strategy: Any) -> SkillDef:
+        """注册外部策略对象（兼容 skill_strategy.register_skill）。"""
+        sid = str(sid).lower()
+        d = self._by_id.get(sid)
+        if d is None:
+            d = SkillDef(id=sid, cost=int(getattr(strategy, 'stamina_cost', 1) or 1),
+                         name_cn=str(getattr(strategy, 'name', '') or ''),
+                         desc=str(getattr(strategy, 'description', '') or ''))
+        d.strategy = strategy
+        try:
+            strategy.stamina_cost = d.cost
+        except Exception:
+            pass
+        return self.add(d)
+
+    # --- 查询 ---
+    def get(self, sid: str) -> Optional[SkillDef]:
+        return self._by_id.get(sid)
+
+    def resolve(self, name: Any) -> Optional[SkillDef]:
+        if not name:
+            return None
+        d = self._alias.get(name)
+        if d is None and isinstance(name, str):
+            d = self._alias.get(name.lower())
+        return d
+
+    def __contains__(self, name: Any) -> bool:
+        d = self.resolve(name)
+        return d is not None and d.active
+
+    def ids(self, active_only: bool = True) -> List[str]:
+        return [k for k, d in self._by_id.items() if d.active or not active_only]
+
+    def all(self) -> Iterable[SkillDef]:
+        return self._by_id.values()
+
+    def cost(self, name: Any, default: int = 1) -> int:
+        d = self.resolve(name)
+        return int(d.cost) if d is not None else int(default)
+
+    def label(self, name: Any) -> str:
+        d = self.resolve(name)
+        return d.label if d is not None else str(name)
+
+    def spec(self, name: Any) -> Dict[str, Any]:
+        d = self.resolve(name)
+        return dict(d.spec) if d is not None else {}
+
+    def catalog(self) -> Dict[str, Dict[str, Any]]:
+        """id -> 目录记录（与 skills_catalog.json 的记录结构一致）。"""
+        return self._catalog
+
+    def names(self) -> set:
+        """全部可显示名称（id/中文名/英文名），用于日志着色。"""
+        out = set()
+        for d in self._by_id.values():
+            for n in (d.id, d.name_cn, d.name_en):
+                if n:
+                    out.add(str(n))
+        return out
+
+    def skills_for_profession(self, prof: Any) -> List[str]:
+        try:
+            return list(self._professions.get(str(prof).lower(), []))
+        except Exception:
+            return []
+
+    # --- 执行 ---
+    def execute(self, game, name: Any, src, tgt=None, *, spend: bool = True) -> Tuple[bool, str]:
+        """校验体力 → 执行 → 成功后扣体力；全程计数/计时。"""
+        d = self.resolve(name)
+        if d is None or not d.active:
+            return False, f'未知技能：{name}'
+        use_engine = d.impl is not None and hasattr(game, '_to_character_sheet') and hasattr(game, '_handle_enemy_death')
+        if use_engine and spend and getattr(src, 'stamina', 0) < d.cost:
+            return False, '体力不足'
+        t0 = time.perf_counter()
+        ok, msg = False, ''
+        try:
+            if use_engine:
+                ok, msg = d.impl(game, src, tgt)
+                if ok and spend:
+                    try:
+                        src.spend_stamina(d.cost)
+                    except Exception:
+                        pass
+            elif d.strategy is not None:
+                # 策略对象自行校验/扣除体力（其 stamina_cost 已与注册表同步）
+                ok, msg = d.strategy.execute(game, src, tgt)
+            else:
+                ok, msg = False, f'技能不可用：{d.id}'
+        except Exception as e:
+            ok, msg = False, f'技能执行失败: {e}'
+        finally:
+            dt = time.perf_counter() - t0
+            d.calls += 1
+            d.total_s += dt
+            if dt > d.max_s:
+                d.max_s = dt
+            if ok:
+                d.ok += 1
+            P.record('skill', d.id, dt)
+        return ok, msg
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for d in self._by_id.values():
+            if not d.calls:
+                continue
+            out[d.id] = {
+                'calls': d.calls,
+                'ok': d.ok,
+                'total_ms': round(d.total_s * 1000.0, 3),
+                'avg_ms': round(d.total_s * 1000.0 / d.calls, 3),
+                'max_ms': round(d.max_s * 1000.0, 3),
+            }
+        return out
+
+    def reset_stats(self) -> None:
+        for d in self._by_id.values():
+            d.calls = d.ok = 0
+            d.total_s = d.max_s = 0.0
+
+
+def _load_json(path: str) -> Any:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def build_registry() -> SkillRegistry:
+    """读取实现与全部元数据，构建注册表。"""
+    R = SkillRegistry()
+    try:
+        from src.systems.skills_engine import SKILLS as impls
+    except Exception:
+        impls = {}
+    try:
+        from src.systems.skill_dsl import compile_effect
+    except Exception:
+        compile_effect = None
+    try:
+        from src.systems import skill_strategy as SS
+        strategies = {
+            'sweep': SS.SweepSkill(),
+            'basic_heal': SS.BasicHealSkill(),
+            'drain': SS.DrainSkill(),
+            'taunt': SS.TauntSkill(),
+            'arcane_missiles': SS.ArcaneMissilesSkill(),
+        }
+    except Exception:
+        strategies = {}
+    try:
+        from src import settings as S
+        costs = dict(S.current().skill_costs)
+    except Exception:
+        costs = {}
+    catalog: Dict[str, Dict[str, Any]] = {}
+    data = _load_json(CFG.skills_catalog_path())
+    if isinstance(data, dict):
+        for rec in (data.get('skills') or []):
+            if isinstance(rec, dict) and rec.get('id'):
+                catalog[str(rec['id'])] = rec
+
+    def _cost(sid: str) -> int:
+        try:
+            v = costs.get(sid)
+            return int(v) if v is not None else 1
+        except Exception:
+            return 1
+
+    R.add(SkillDef(id=ATTACK_ID, cost=_cost(ATTACK_ID), spec=dict(_ATTACK_SPEC), name_cn='攻击', name_en='Attack'))
+    for sid in list(dict.fromkeys(list(catalog.keys()) + list(impls.keys()) + list(strategies.keys()))):
+        rec = catalog.get(sid) or {}
+        impl = None
+        if compile_effect is not None and rec.get('effect'):
+            try:
+                impl = compile_effect(sid, rec)
+            except Exception:
+                impl = None
+        d = SkillDef(
+            id=sid,
+            impl=impl or impls.get(sid),
+            cost=_cost(sid),
+            spec=dict(rec.get('spec') or {}),
+            name_cn=str(rec.get('name_cn') or ''),
+            name_en=str(rec.get('name_en') or ''),
+            desc=str(rec.get('desc') or ''),
+            record=rec,
+        )
+        st = strategies.get(sid)
+        if st is not None:
+            d.strategy = st
+            try:
+                st.stamina_cost = d.cost
+            except Exception:
+                pass
+        R.add(d)
+
+    prof = _load_json(CFG.profession_skills_path())
+    if isinstance(prof, dict):
+        for k, v in prof.items():
+            if isinstance(v, list):
+                R._professions[str(k).lower()] = [str(x) for x in v]
+    return R
+
+
+_REGISTRY: Optional[SkillRegistry] = None
+
+
+# 构建注册表时的配置版本；配置热重载（版本变化）后下次 get_registry 自动重建
+_SETTINGS_VERSION = 0
+_SETTINGS_MOD = None
+
+
+def _settings_version() -> int:
+    global _SETTINGS_MOD
+    try:
+        if _SETTINGS_MOD is None:
+            from src import settings as S
+            _SETTINGS_MOD = S
+        return _SETTINGS_MOD.version()
+    except Exception:
+        return 0
+
+
+def get_registry() -> SkillRegistry:
+    global _REGISTRY
+    if _REGISTRY is None or _SETTINGS_VERSION != _settings_version():
+        reload_registry()
+    return _REGISTRY
+
+
+def reload_registry() -> SkillRegistry:
+    """配置/目录变化后重建（计数器随之清零）。"""
+    global _REGISTRY, _SETTINGS_VERSION
+    _SETTINGS_VERSION = _settings_version()
+    _REGISTRY = build_registry()
+    return _REGISTRY
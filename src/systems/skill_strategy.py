@@ -278,83 +278,35 @@ class ArcaneMissilesSkill(SkillStrategy):
         return True, f"{source} 使用 {self.name} 对 {target} 造成总计 {total_damage} 点伤害"
 
 
-# 技能注册表
-SKILL_REGISTRY = {
-    'sweep': SweepSkill(),
-    'basic_heal': BasicHealSkill(),
-    'drain': DrainSkill(),
-    'taunt': TauntSkill(),
-    'arcane_missiles': ArcaneMissilesSkill(),
-}
-
-# 从原技能系统导入更多技能
-try:
-    from src.systems.skills_engine import (
-        skill_sweep, skill_basic_heal, skill_drain, skill_taunt, skill_arcane_missiles,
-        skill_power_slam, skill_bloodlust_priority, skill_execute_mage, skill_mass_intimidate,
-        skill_precise_strike, skill_disarm, skill_shield_breaker, skill_dual_wield_bane,
-        skill_mind_over_matter, skill_trial_of_wisdom, skill_execute_wounded, skill_fair_distribution,
-        skill_destiny, skill_touch_of_undeath
-    )
-    
-    # 创建包装器类来适配原技能系统
-    class LegacySkillWrapper(SkillStrategy):
-        """原技能系统的包装器"""
-        
-        def __init__(self, name: str, skill_func, description: str = "", stamina_cost: int = 1):
-            super().__init__(name, description, stamina_cost)
-            self.skill_func = skill_func
-        
-        def execute(self, game, source, target=None) -> Tuple[bool, str]:
-            """执行原技能系统的技能"""
-            if not self.can_execute(source):
-                return False, f"{source} 体力不足，无法使用 {self.name}"
-            
-            # 消耗体力
-            if not self.consume_stamina(source):
-                return False, f"{source} 体力不足，无法使用 {self.name}"
-            
-            try:
-                # 调用原技能函数
-                success, msg = self.skill_func(game, source, target)
-                return success, msg
-            except Exception as e:
-                return False, f"技能执行失败: {e}"
+# 注册表：统一由 src.systems.skill_registry 维护；本模块只保留策略类与兼容接口
+class RegisteredSkill(SkillStrategy):
+    """统一注册表条目的策略适配器（体力校验/扣除由注册表负责）"""
     
-    # 注册更多技能
-    SKILL_REGISTRY.update({
-        'power_slam': LegacySkillWrapper("力量猛击", skill_power_slam, "基于力量的重击", 2),
-        'bloodlust_priority': LegacySkillWrapper("血腥优先", skill_bloodlust_priority, "自动优先攻击残血目标", 1),
-        'execute_mage': LegacySkillWrapper("斩杀法师", skill_execute_mage, "对法师型目标造成高额伤害", 3),
-        'mass_intimidate': LegacySkillWrapper("群体恐吓", skill_mass_intimidate, "群体对抗检定，震慑敌人", 2),
-        'precise_strike': LegacySkillWrapper("精准打击", skill_precise_strike, "优势命中的精确打击", 2),
-        'disarm': LegacySkillWrapper("缴械", skill_disarm, "卸下目标武器并据为己有", 2),
-        'shield_breaker': LegacySkillWrapper("破盾", skill_shield_breaker, "破坏盾牌并造成额外伤害", 2),
-        'dual_wield_bane': LegacySkillWrapper("双刀克星", skill_dual_wield_bane, "针对双持目标的克星攻击", 2),
-        'mind_over_matter': LegacySkillWrapper("强于心智", skill_mind_over_matter, "用心智打击对手", 1),
-        'trial_of_wisdom': LegacySkillWrapper("智慧试炼", skill_trial_of_wisdom, "以智取胜的试炼", 1),
-        'execute_wounded': LegacySkillWrapper("重伤补刀", skill_execute_wounded, "对重伤目标处决", 2),
-        'fair_distribution': LegacySkillWrapper("公平分配", skill_fair_distribution, "按总攻平分对群体伤害", 2),
-        'destiny': LegacySkillWrapper("命运", skill_destiny, "10次优势命中，命中则对目标造成等同于其当前生命的伤害", 5),
-        'touch_of_undeath': LegacySkillWrapper("亡灵之触", skill_touch_of_undeath, "召唤1个1生命的骷髅随从，攻3防3", 3),
-    })
+    def __init__(self, skill_def):
+        super().__init__(skill_def.label, skill_def.desc, skill_def.cost)
+        self.skill_id = skill_def.id
     
-except ImportError as e:
-    print(f"导入原技能系统失败: {e}")
-    # 如果导入失败，至少保留基础技能
-    pass
+    def execute(self, game, source, target=None) -> Tuple[bool, str]:
+        from src.systems.skill_registry import get_registry
+        return get_registry().execute(game, self.skill_id, source, target)
 
 
 def get_skill(skill_name: str) -> Optional[SkillStrategy]:
     """获取技能策略"""
-    return SKILL_REGISTRY.get(skill_name.lower())
+    from src.systems.skill_registry import get_registry
+    d = get_registry().resolve(skill_name)
+    if d is None or not d.active:
+        return None
+    return RegisteredSkill(d)
 
 
 def register_skill(skill_name: str, skill_strategy: SkillStrategy):
     """注册新技能"""
-    SKILL_REGISTRY[skill_name.lower()] = skill_strategy
+    from src.systems.skill_registry import get_registry
+    get_registry().register_strategy(skill_name, skill_strategy)
 
 
 def list_available_skills() -> List[str]:
     """列出所有可用技能"""
-    return list(SKILL_REGISTRY.keys())
+    from src.systems.skill_registry import get_registry
+    return get_registry().ids()
@@ -9,10 +9,14 @@
   - 返回 (ok, msg)
 
 添加新技能步骤：
+0) 若效果是“选目标 → 命中检定 → 伤害 → 吸血/击杀回血”这类流水线，优先在 skills_catalog.json 的
+   `effect` 块中声明（见 src.systems.skill_dsl），无需 Python 代码；横扫/汲取/奥术飞弹/力量猛击/
+   血腥优先/精准打击即由此定义。以下步骤用于需要特殊逻辑的技能。
 1) 在此文件新增函数 skill_your_skill(game, src, tgt)。
-2) 在 SKILLS 注册表中加入 'your_skill': skill_your_skill。
+2) 在 SKILLS 实现表中加入 'your_skill': skill_your_skill。
 3) 在 settings.rules.skill_costs 中配置体力消耗（未配置则默认 1）。
-4) 若需要在 UI 的技能目录中出现，请在相应 catalog/配置里添加名称与描述。
+4) 在 skills_catalog.json 中添加名称/描述/目标规格。
+以上由 src.systems.skill_registry 在启动时汇总为统一注册表，控制器与 UI 只经由注册表查询/执行。
 
 注意：本文件依赖 game 上的若干私有/辅助方法（_to_character_sheet/_enrich_to_hit/_enrich_damage/
 _handle_enemy_death/_has_shield/_unequip_and_loot/_get_attr 等），这些方法依然保留在游戏类中，
@@ -23,59 +27,6 @@ from __future__ import annotations
 from typing import Callable, Dict, Tuple
 
 
-def skill_sweep(game, src, tgt) -> Tuple[bool, str]:
-    """横扫：对所有敌人各进行一次命中与伤害（伤害=自身总攻一半，向下取整）。"""
-    try:
-        from src.systems.dnd_rules import to_hit_roll, roll_damage
-    except Exception:
-        to_hit_roll = roll_damage = None
-    hits = []
-    atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-    dmg_each = max(0, atk_val // 2)
-    for e in list(game.enemies):
-        hit = True
-        meta = {}
-        th = None
-        if to_hit_roll:
-            att = game._to_character_sheet(src)
-            dfn = game._to_character_sheet(e)
-            th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False)
-            th = game._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=e)
-            hit = th['hit']
-            meta['to_hit'] = th
-        if hit:
-            prev = e.hp
-            dmg_r = None
-            if roll_damage and dmg_each > 0:
-                att = game._to_character_sheet(src)
-                dmg_r = roll_damage(att, dice=(1, max(1, dmg_each)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-                dmg_r = game._enrich_damage(dmg_r, att, (1, max(1, dmg_each)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-                amount = int(dmg_r['total'])
-            else:
-                amount = dmg_each
-            dead = e.take_damage(amount)
-            dealt = max(0, prev - e.hp)
-            meta['damage'] = dmg_r
-            meta['target'] = {'hp_before': prev, 'hp_after': e.hp}
-            game.log({'type': 'skill', 'text': f"{src} 使用 横扫 对 {e.name} 造成 {dealt} 伤害", 'meta': meta})
-            if dead:
-                changed = game._handle_enemy_death(e)
-                if changed:
-                    src.can_attack = False
-                    return True, '横扫 执行完毕'
-                # 若清场则按 on_clear 跳转
-                try:
-                    if not game.enemies and game._check_on_clear_transition():
-                        src.can_attack = False
-                        return True, '横扫 执行完毕'
-                except Exception:
-                    pass
-        else:
-            game.log({'type': 'skill', 'text': f"{src} 使用 横扫 未命中 {e.name}", 'meta': meta})
-    src.can_attack = False
-    return True, '横扫 执行完毕'
-
-
 def skill_basic_heal(game, src, tgt) -> Tuple[bool, str]:
     if tgt is None:
         return False, '未选择目标'
@@ -92,52 +43,6 @@ def skill_basic_heal(game, src, tgt) -> Tuple[bool, str]:
     return True, '治疗完成'
 
 
-def skill_drain(game, src, tgt) -> Tuple[bool, str]:
-    if tgt is None:
-        return False, '未选择目标'
-    try:
-        from src.systems.dnd_rules import to_hit_roll, roll_damage
-    except Exception:
-        to_hit_roll = roll_damage = None
-    meta = {}
-    hit = True
-    th = None
-    if to_hit_roll:
-        att = game._to_character_sheet(src)
-        dfn = game._to_character_sheet(tgt)
-        th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False)
-        th = game._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-        hit = th.get('hit', True)
-        meta['to_hit'] = th
-    if not hit:
-        game.log({'type': 'skill', 'text': f"{src} 的 汲取 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-        return True, '未命中'
-    atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-    prev = getattr(tgt, 'hp', 0)
-    dmg_r = roll_damage(game._to_character_sheet(src), dice=(1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False) if roll_damage else None
-    if dmg_r:
-        att = game._to_character_sheet(src)
-        dmg_r = game._enrich_damage(dmg_r, att, (1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-    amount = int(dmg_r['total']) if dmg_r else atk_val
-    dead = tgt.take_damage(amount)
-    dealt = max(0, prev - getattr(tgt, 'hp', prev))
-    # lifesteal equal to dealt
-    try:
-        src.heal(dealt)
-    except Exception:
-        try:
-            src.hp = min(getattr(src, 'max_hp', getattr(src, 'hp', 0) + dealt), getattr(src, 'hp', 0) + dealt)
-        except Exception:
-            pass
-    if dead and tgt in game.enemies:
-        changed = game._handle_enemy_death(tgt)
-        if changed:
-            return True, '汲取完成'
-    meta['damage'] = dmg_r
-    meta['lifesteal'] = dealt
-    meta['target'] = {'hp_before': prev, 'hp_after': getattr(tgt, 'hp', prev)}
-    game.log({'type': 'skill', 'text': f"{src} 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 汲取伤害并恢复 {dealt} 点生命", 'meta': meta})
-    return True, '汲取完成'
 
 
 def skill_taunt(game, src, tgt) -> Tuple[bool, str]:
@@ -154,83 +59,8 @@ def skill_taunt(game, src, tgt) -> Tuple[bool, str]:
     return True, '嘲讽已施放'
 
 
-def skill_arcane_missiles(game, src, tgt) -> Tuple[bool, str]:
-    import random
-    try:
-        from src.systems.dnd_rules import roll_damage
-    except Exception:
-        roll_damage = None
-    try:
-        if tgt is None:
-            if not game.enemies:
-                return False, '无敌人'
-            tgt = random.choice(game.enemies)
-        total = 0
-        meta_all = {'bolts': []}
-        att = game._to_character_sheet(src)
-        for _ in range(3):
-            prev = getattr(tgt, 'hp', 0)
-            if roll_damage:
-                dmg_r = roll_damage(att, dice=(1, 4), damage_bonus=1, critical=False)
-                dmg_r = game._enrich_damage(dmg_r, att, (1, 4), damage_bonus=1, critical=False, use_str_for_damage=True)
-                amount = int(dmg_r['total'])
-            else:
-                r = random.randint(1, 4) + 1
-                dmg_r = {'total': r, 'dice_rolls': [], 'dice_total': 0, 'bonus': 0}
-                amount = r
-            dead = tgt.take_damage(amount)
-            dealt = max(0, prev - getattr(tgt, 'hp', prev))
-            total += dealt
-            bolt_meta = {'damage': dmg_r, 'target': {'hp_before': prev, 'hp_after': getattr(tgt, 'hp', prev)}}
-            meta_all['bolts'].append(bolt_meta)
-            game.log({'type': 'skill', 'text': f"{src} 的 奥术飞弹 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 点伤害", 'meta': bolt_meta})
-            if dead:
-                if tgt in game.enemies:
-                    changed = game._handle_enemy_death(tgt)
-                    if changed:
-                        return True, '奥术飞弹 完成'
-                break
-        meta_all['total'] = total
-        game.log({'type': 'skill', 'text': f"奥术飞弹 总计造成 {total} 点伤害", 'meta': meta_all})
-        return True, '奥术飞弹 完成'
-    except Exception:
-        return False, '奥术飞弹 失败'
 
 
-def skill_power_slam(game, src, tgt) -> Tuple[bool, str]:
-    if tgt is None:
-        return False, '未选择目标'
-    try:
-        from src.systems.dnd_rules import to_hit_roll, roll_damage
-    except Exception:
-        to_hit_roll = roll_damage = None
-    str_mod = (game._get_attr(src, 'str') - 10) // 2
-    atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-    meta = {}
-    hit = True
-    th = None
-    if to_hit_roll:
-        th = to_hit_roll(game._to_character_sheet(src), game._to_character_sheet(tgt), use_str=True, weapon_bonus=0, is_proficient=False)
-        hit = th.get('hit', True)
-        meta['to_hit'] = th
-    if not hit:
-        game.log({'type': 'skill', 'text': f"{src} 的 力量猛击 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-        return True, '未命中'
-    dmg_r = None
-    amount = max(1, atk_val + max(0, str_mod))
-    if roll_damage:
-        dmg_r = roll_damage(game._to_character_sheet(src), dice=(1, max(1, amount)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-        amount = int(dmg_r.get('total', amount))
-    prev = getattr(tgt, 'hp', 0)
-    dead = tgt.take_damage(amount)
-    dealt = max(0, prev - getattr(tgt, 'hp', prev))
-    meta['damage'] = dmg_r
-    game.log({'type': 'skill', 'text': f"{src} 使用 力量猛击 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-    if dead and tgt in game.enemies:
-        changed = game._handle_enemy_death(tgt)
-        if changed:
-            return True, '力量猛击 完成'
-    return True, '力量猛击 完成'
 
 
 def skill_destiny(game, src, tgt) -> Tuple[bool, str]:
@@ -320,7 +150,7 @@ def skill_touch_of_undeath(game, src, tgt) -> Tuple[bool, str]:
     # 放入我方棋盘
     try:
         board = getattr(game.player, 'board', [])
-        if len(board) < 15:
+        if len(board) < int(getattr(game, 'max_board', 15) or 15):
             board.append(sk)
             game.log({'type': 'skill', 'text': f"{src} 的 亡灵之触 召唤了 {sk}", 'meta': {}})
             try:
@@ -335,48 +165,6 @@ def skill_touch_of_undeath(game, src, tgt) -> Tuple[bool, str]:
         return False, '召唤失败'
 
 
-def skill_bloodlust_priority(game, src, tgt) -> Tuple[bool, str]:
-    import math
-    try:
-        from src.systems.dnd_rules import to_hit_roll, roll_damage
-    except Exception:
-        to_hit_roll = roll_damage = None
-    if tgt is None and game.enemies:
-        tgt = min(game.enemies, key=lambda e: getattr(e, 'hp', 0))
-    if tgt is None:
-        return False, '无可选目标'
-    meta = {}
-    hit = True
-    th = None
-    if to_hit_roll:
-        th = to_hit_roll(game._to_character_sheet(src), game._to_character_sheet(tgt), use_str=True, weapon_bonus=0, is_proficient=False)
-        hit = th.get('hit', True)
-        meta['to_hit'] = th
-    if not hit:
-        game.log({'type': 'skill', 'text': f"{src} 的 血腥优先 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-        return True, '未命中'
-    atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-    dmg_r = None
-    if roll_damage:
-        dmg_r = roll_damage(game._to_character_sheet(src), dice=(1, max(1, atk_val)), damage_bonus=1, critical=th.get('critical', False) if isinstance(th, dict) else False)
-        amount = int(dmg_r.get('total', atk_val))
-    else:
-        amount = atk_val + 1
-    prev = getattr(tgt, 'hp', 0)
-    dead = tgt.take_damage(amount)
-    dealt = max(0, prev - getattr(tgt, 'hp', prev))
-    meta['damage'] = dmg_r
-    game.log({'type': 'skill', 'text': f"{src} 的 血腥优先 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-    if dead and tgt in game.enemies:
-        changed = game._handle_enemy_death(tgt)
-        if changed:
-            return True, '血腥优先 完成'
-        try:
-            src.heal(2)
-        except Exception:
-            pass
-        game.log({'type': 'skill', 'text': f"{src} 因击杀而恢复 2 点生命", 'meta': {}})
-    return True, '血腥优先 完成'
 
 
 def skill_execute_mage(game, src, tgt) -> Tuple[bool, str]:
@@ -431,7 +219,10 @@ def skill_mass_intimidate(game, src, tgt) -> Tuple[bool, str]:
         from src.systems.dnd_rules import roll_d20
     except Exception:
         roll_d20 = None
+    from src.systems.aoe import AoeBatch
     cha_mod = (game._get_attr(src, 'cha') - 10) // 2
+    # 先为全部目标完成对抗检定，再按批次写日志
+    results = []
     for e in list(game.enemies):
         wis_mod = (game._get_attr(e, 'wis') - 10) // 2
         if roll_d20:
@@ -440,52 +231,16 @@ def skill_mass_intimidate(game, src, tgt) -> Tuple[bool, str]:
             success = (a + max(0, cha_mod)) >= (10 + max(0, wis_mod))
         else:
             success = (cha_mod >= wis_mod)
+        results.append((e, success))
+    batch = AoeBatch(game, src)
+    for e, success in results:
         if success:
-            game.log({'type': 'skill', 'text': f"{src} 的 群体恐惧 震慑了 {getattr(e,'name',e)}", 'meta': {}})
+            batch.log("{src} 的 群体恐惧 震慑了 {tgt}", src=src, tgt=getattr(e, 'name', e))
         else:
-            game.log({'type': 'skill', 'text': f"{getattr(e,'name',e)} 抵抗了 群体恐惧", 'meta': {}})
+            batch.log("{tgt} 抵抗了 群体恐惧", tgt=getattr(e, 'name', e))
     return True, '群体恐惧 完成'
 
 
-def skill_precise_strike(game, src, tgt) -> Tuple[bool, str]:
-    if tgt is None:
-        return False, '未选择目标'
-    try:
-        from src.systems.dnd_rules import to_hit_roll, roll_damage
-    except Exception:
-        to_hit_roll = roll_damage = None
-    meta = {}
-    hit = True
-    th = None
-    if to_hit_roll:
-        att = game._to_character_sheet(src)
-        dfn = game._to_character_sheet(tgt)
-        th = to_hit_roll(att, dfn, use_str=True, weapon_bonus=0, is_proficient=False, advantage=True)
-        th = game._enrich_to_hit(th, att, dfn, weapon_bonus=0, is_proficient=False, use_str=True, defender_entity=tgt)
-        hit = th.get('hit', True)
-        meta['to_hit'] = th
-    if not hit:
-        game.log({'type': 'skill', 'text': f"{src} 的 精准打击 未命中 {getattr(tgt,'name',tgt)}", 'meta': meta})
-        return True, '未命中'
-    atk_val = int(src.get_total_attack() if hasattr(src, 'get_total_attack') else getattr(src, 'attack', 1))
-    dmg_r = None
-    if roll_damage:
-        att = game._to_character_sheet(src)
-        dmg_r = roll_damage(att, dice=(1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False)
-        dmg_r = game._enrich_damage(dmg_r, att, (1, max(1, atk_val)), damage_bonus=0, critical=th.get('critical', False) if isinstance(th, dict) else False, use_str_for_damage=True)
-        amount = int(dmg_r.get('total', atk_val))
-    else:
-        amount = atk_val
-    prev = getattr(tgt, 'hp', 0)
-    dead = tgt.take_damage(amount)
-    dealt = max(0, prev - getattr(tgt, 'hp', prev))
-    meta['damage'] = dmg_r
-    game.log({'type': 'skill', 'text': f"{src} 的 精准打击 对 {getattr(tgt,'name',tgt)} 造成 {dealt} 伤害", 'meta': meta})
-    if dead and tgt in game.enemies:
-        changed = game._handle_enemy_death(tgt)
-        if changed:
-            return True, '精准打击 完成'
-    return True, '精准打击 完成'
 
 
 def skill_disarm(game, src, tgt) -> Tuple[bool, str]:
@@ -703,30 +458,62 @@ def skill_fair_distribution(game, src, tgt) -> Tuple[bool, str]:
         game.log({'type': 'skill', 'text': f"{src} 的 公平分配 未造成伤害", 'meta': {}})
         return True, '无伤害'
     each = max(1, total // n)
+    arr = None
+    try:
+        from src.core import combat_arrays as CA
+        arr = CA.arrays_for(game, 'enemy')
+    except Exception:
+        arr = None
+    from src.systems.aoe import AoeBatch
+    batch = AoeBatch(game, src)
+    if arr is not None:
+        return _fair_distribution_arrays(game, src, arr, each, batch)
     for e in list(game.enemies):
         prev = getattr(e, 'hp', 0)
         dead = e.take_damage(each)
         dealt = max(0, prev - getattr(e, 'hp', prev))
-        game.log({'type': 'skill', 'text': f"{src} 的 公平分配 对 {getattr(e,'name',e)} 造成 {dealt} 伤害", 'meta': {'each': each}})
+        batch.log("{src} 的 公平分配 对 {tgt} 造成 {dealt} 伤害", {'each': each}, src=src, tgt=getattr(e, 'name', e), dealt=dealt)
         if dead:
-            changed = game._handle_enemy_death(e)
-            if changed:
-                return True, '公平分配 完成'
+            batch.kill(e)
+    batch.finish()
+    return True, '公平分配 完成'
+
+
+def _fair_distribution_arrays(game, src, arr, each, batch) -> Tuple[bool, str]:
+    """数组化战场：普通敌人一次遍历扣血，自定义受伤逻辑的敌人仍逐个调用；死亡在扣血完成后统一处理。"""
+    from src.core.combat_arrays import F_PLAIN_DAMAGE
+    from src.core.events import publish as publish_event
+    alive = arr.alive()
+    fl = arr.flags
+    res = {i: (p, h) for i, p, h in arr.damage([i for i in alive if fl[i] & F_PLAIN_DAMAGE], each)}
+    for i in alive:
+        e = arr.units[i]
+        r = res.get(i)
+        if r is None:
+            prev = e.hp
+            if e.take_damage(each):
+                batch.kill(e)
+            dealt = max(0, prev - e.hp)
+        else:
+            prev, hp = r
+            try:
+                publish_event('enemy_damaged', {'enemy': e, 'amount': each, 'hp_before': prev, 'hp_after': hp})
+            except Exception:
+                pass
+            if hp <= 0:
+                batch.kill(e)
+            dealt = max(0, prev - hp)
+        batch.log("{src} 的 公平分配 对 {tgt} 造成 {dealt} 伤害", {'each': each}, src=src, tgt=getattr(e, 'name', e), dealt=dealt)
+    batch.finish()
     return True, '公平分配 完成'
 
 
-# 注册表：技能名 -> 实现函数
+# 实现表：技能名 -> 实现函数（由 skill_registry 汇总元数据后对外提供）
 SKILLS: Dict[str, Callable] = {
-    'sweep': skill_sweep,
     'basic_heal': skill_basic_heal,
-    'drain': skill_drain,
     'taunt': skill_taunt,
-    'arcane_missiles': skill_arcane_missiles,
-    'power_slam': skill_power_slam,
-    'bloodlust_priority': skill_bloodlust_priority,
     'execute_mage': skill_execute_mage,
     'mass_intimidate': skill_mass_intimidate,
-    'precise_strike': skill_precise_strike,
     'disarm': skill_disarm,
     'shield_breaker': skill_shield_breaker,
     'dual_wield_bane': skill_dual_wield_bane,
@@ -741,8 +528,6 @@ SKILLS: Dict[str, Callable] = {
 
 
 def execute(game, name: str, src, tgt) -> Tuple[bool, str]:
-    """执行技能：根据名字在注册表中查找并调用实现。未找到返回 False。"""
-    fn = SKILLS.get(name)
-    if not fn:
-        return False, f'未知技能：{name}'
-    return fn(game, src, tgt)
+    """执行技能（不扣体力）：经统一注册表分派，便于计数/计时。未找到返回 False。"""
+    from src.systems.skill_registry import get_registry
+    return get_registry().execute(game, name, src, tgt, spend=False)
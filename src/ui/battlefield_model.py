@@ -0,0 +1,80 @@
+"""战场分组视图模型（Tk 与 PyQt 共用）
+
+一侧单位数超过 settings `ui.battlefield.aggregate_above`（默认 15）时，战场不再为每个单位建卡片，
+而是按名称分组，每组一行放进滚动列表：
+
+    if len(units) > aggregate_above():
+        for g in aggregate(units):       # [UnitGroup]，按首次出现顺序
+            group_text(g)                 # '哥布林 ×120  攻3  HP 540/600'
+            g.first_alive                 # 组内第一个存活单位的 1-based 索引（点击分组即选中它，拼接 eN/mN）
+
+数组化战场（src.core.combat_arrays）下生命/攻击直接读数组列，不逐个调用实体方法。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+DEFAULT_AGGREGATE_ABOVE = 15
+
+
+@dataclass
+class UnitGroup:
+    name: str
+    count: int = 0
+    alive: int = 0
+    atk: int = 0          # 组内最高攻击
+    hp: int = 0           # 组内存活单位生命之和
+    max_hp: int = 0
+    first: int = 0        # 1-based
+    first_alive: int = 0  # 1-based；全组阵亡时为 0
+
+
+def aggregate_above() -> int:
+    try:
+        from src import settings as S
+        return int((S.current().ui.get('battlefield') or {}).get('aggregate_above', DEFAULT_AGGREGATE_ABOVE))
+    except Exception:
+        return DEFAULT_AGGREGATE_ABOVE
+
+
+def _stats(u: Any):
+    arr = getattr(u, '_soa', None)
+    if arr is not None:
+        i = u._soa_i
+        return arr.hp[i], arr.max_hp[i], arr.atk[i]
+    try:
+        atk = int(u.get_total_attack()) if hasattr(u, 'get_total_attack') else int(getattr(u, 'attack', 0) or 0)
+    except Exception:
+        atk = 0
+    return int(getattr(u, 'hp', 0) or 0), int(getattr(u, 'max_hp', 0) or 0), atk
+
+
+def aggregate(units) -> List[UnitGroup]:
+    groups: Dict[str, UnitGroup] = {}
+    for i, u in enumerate(list(units or []), 1):
+        name = str(getattr(u, 'name', u))
+        g = groups.get(name)
+        if g is None:
+            g = groups[name] = UnitGroup(name, first=i)
+        hp, mhp, atk = _stats(u)
+        g.count += 1
+        g.max_hp += mhp
+        if atk > g.atk:
+            g.atk = atk
+        if hp > 0:
+            g.alive += 1
+            g.hp += hp
+            if not g.first_alive:
+                g.first_alive = i
+    return list(groups.values())
+
+
+def group_text(g: UnitGroup) -> str:
+    s = f"{g.name} ×{g.count}  攻{g.atk}  HP {g.hp}/{g.max_hp}"
+    if g.alive < g.count:
+        s += f"  (存活 {g.alive})"
+    return s
+
+
+__all__ = ['UnitGroup', 'aggregate', 'aggregate_above', 'group_text']
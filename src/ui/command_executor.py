@@ -0,0 +1,231 @@
+"""后台命令执行器（Tk 与 PyQt 共用）
+
+命令（含其中的技能结算、场景切换、存档写入与日志文件写入）在单个工作线程中执行，界面线程只负责
+提交与落地结果：
+
+    ex = CommandExecutor(wake=None, on_busy=set_busy)
+    ex.submit(lambda: controller._process_command('a m1 e2'), done=after_cmd)
+    ...
+    ex.poll()          # 界面线程：补发事件、回调 done；仍有命令在执行时返回 True（Tk 用 after 轮询）
+    ex.check_busy()    # 界面线程：命令超过 busy_ms 仍未完成时 on_busy(True)，完成后 on_busy(False)
+
+- 同一时刻最多一条命令在执行（`busy` 为真时 `submit` 返回 False，界面忽略这次点击）：排队的命令
+  基于点击时的界面状态生成 eN/mN 令牌，上一条命令改变战场后可能指向别的单位。
+- 工作线程持有 `lock`（单写者）执行命令，并在 `events.capture()` 内运行：引擎订阅者同步执行，
+  界面订阅者的事件在 `poll` 中由界面线程补发（`events.dispatch`，状态类事件合并）。
+  界面线程需要直接改动游戏状态时（同步 `_send`、读档等）用 `with ex.lock:`。
+- `wake` 在工作线程完成命令时调用（Qt 传入跨线程信号的 emit；Tk 不传，用 after 轮询）。
+  命令执行中记录到 `events.STREAM` 事件（场景加载进度）时也会调用，`poll` 随即提前补发这些事件。
+- settings `ui.executor.enabled = False` 时退回同步执行：`submit` 在当前线程执行并立即回调。
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+DEFAULT_BUSY_MS = 150
+DEFAULT_POLL_MS = 8
+
+
+def config() -> dict:
+    """settings `ui.executor`：{enabled, busy_ms, poll_ms}。"""
+    cfg = {'enabled': True, 'busy_ms': DEFAULT_BUSY_MS, 'poll_ms': DEFAULT_POLL_MS}
+    try:
+        from src import settings as S
+        cfg.update(dict(S.current().ui.get('executor') or {}))
+    except Exception:
+        pass
+    return cfg
+
+
+class _Job:
+    __slots__ = ('fn', 'done', 'error', 'label', 'result', 'exc', 'events', 'scan', 't0')
+
+    def __init__(self, fn, done, error, label):
+        self.fn = fn
+        self.done = done
+        self.error = error
+        self.label = label
+        self.result = None
+        self.exc: Optional[BaseException] = None
+        self.events: list = []
+        self.scan = 0  # 已检查过 STREAM 事件的位置
+        self.t0 = time.perf_counter()
+
+
+class CommandExecutor:
+    def __init__(self, wake: Optional[Callable[[], None]] = None,
+                 on_busy: Optional[Callable[[bool], None]] = None,
+                 on_error: Optional[Callable[[BaseException, str], None]] = None,
+                 busy_ms: Optional[int] = None, threaded: Optional[bool] = None) -> None:
+        cfg = config()
+        self.wake = wake
+        self.on_busy = on_busy
+        self.on_error = on_error
+        self.busy_ms = int(busy_ms if busy_ms is not None else cfg.get('busy_ms', DEFAULT_BUSY_MS))
+        self.poll_ms = max(1, int(cfg.get('poll_ms', DEFAULT_POLL_MS) or DEFAULT_POLL_MS))
+        self.threaded = bool(cfg.get('enabled', True) if threaded is None else threaded)
+        self.lock = threading.RLock()
+        self._job: Optional[_Job] = None
+        self._done: 'queue.Queue[_Job]' = queue.Queue()
+        self._slow = False
+        self._jobs: 'queue.Queue[Optional[_Job]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._job is not None
+
+    def elapsed_ms(self) -> float:
+        j = self._job
+        return (time.perf_counter() - j.t0) * 1000.0 if j is not None else 0.0
+
+    # --- 界面线程 ---
+    def submit(self, fn: Callable[[], Any], done: Optional[Callable[[Any], None]] = None,
+               error: Optional[Callable[[BaseException], None]] = None, label: str = '') -> bool:
+        """提交一条命令；已有命令在执行时返回 False（不排队）。"""
+        if self._job is not None:
+            return False
+        job = _Job(fn, done, error, label)
+        self._job = job
+        if not self.threaded:
+            self._run(job, capture=False)
+            self._finish(self._done.get_nowait())
+            return True
+        self._ensure_thread()
+        self._jobs.put(job)
+        return True
+
+    def poll(self) -> bool:
+        """落地已完成的命令；返回是否仍有命令在执行。"""
+        while True:
+            try:
+                job = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(job)
+        job = self._job
+        if job is not None:
+            self._stream(job)
+        return self._job is not None
+
+    def _stream(self, job: _Job) -> None:
+        """命令执行中：提前补发已记录的 STREAM 事件（补发过的位置置 None，结束时跳过）。"""
+        evts = job.events
+        n = len(evts)
+        if job.scan >= n:
+            return
+        try:
+            from src.core import events as E
+            early = []
+            for i in range(job.scan, n):
+                item = evts[i]
+                if item is not None and item[0] in E.STREAM:
+                    early.append(item)
+                    evts[i] = None
+            job.scan = n
+            if early:
+                E.dispatch(early)
+        except Exception:
+            pass
+
+    def check_busy(self) -> None:
+        """命令执行超过 busy_ms 时进入“输入禁用”状态（由 submit 后的定时器调用）。"""
+        if self._job is not None and not self._slow and self.elapsed_ms() >= self.busy_ms:
+            self._slow = True
+            self._notify_busy(True)
+
+    def run_sync(self, fn: Callable[[], Any]) -> Any:
+        """在当前线程持锁执行（事件照常同步分发）。"""
+        with self.lock:
+            return fn()
+
+    def shutdown(self) -> None:
+        t = self._thread
+        self._thread = None
+        if t is not None:
+            self._jobs.put(None)
+
+    def _finish(self, job: _Job) -> None:
+        if self._job is job:
+            self._job = None
+        if self._slow:
+            self._slow = False
+            self._notify_busy(False)
+        if job.events:
+            try:
+                from src.core import events as E
+                E.dispatch([x for x in job.events if x is not None])
+            except Exception:
+                pass
+        if job.exc is not None:
+            cb = job.error
+            try:
+                if cb is not None:
+                    cb(job.exc)
+                elif self.on_error is not None:
+                    self.on_error(job.exc, job.label)
+            except Exception:
+                pass
+            return
+        if job.done is not None:
+            try:
+                job.done(job.result)
+            except Exception as e:
+                if self.on_error is not None:
+                    try:
+                        self.on_error(e, job.label)
+                    except Exception:
+                        pass
+
+    def _notify_busy(self, on: bool) -> None:
+        if self.on_busy is not None:
+            try:
+                self.on_busy(on)
+            except Exception:
+                pass
+
+    # --- 工作线程 ---
+    def _ensure_thread(self) -> None:
+        t = self._thread
+        if t is not None and t.is_alive():
+            return
+        t = threading.Thread(target=self._loop, name='pyhs-cmd', daemon=True)
+        self._thread = t
+        t.start()
+        try:
+            from src.core import sampler as SP
+            SP.add_thread(t.ident)
+        except Exception:
+            pass
+
+    def _loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            self._run(job, capture=True)
+            if self.wake is not None:
+                try:
+                    self.wake()
+                except Exception:
+                    pass
+
+    def _run(self, job: _Job, capture: bool) -> None:
+        try:
+            with self.lock:
+                if capture:
+                    from src.core import events as E
+                    with E.capture(self.wake) as evts:
+                        job.events = evts
+                        job.result = job.fn()
+                else:
+                    job.result = job.fn()
+        except BaseException as e:  # 工作线程内不向外抛出
+            job.exc = e
+        self._done.put(job)
+
+
+__all__ = ['CommandExecutor', 'config', 'DEFAULT_BUSY_MS', 'DEFAULT_POLL_MS']
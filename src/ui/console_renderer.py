@@ -0,0 +1,193 @@
+"""控制台增量渲染
+
+控制台前端每条命令后不再清屏重绘整页：渲染器保留上一帧（按区块记录各行文本），新一帧只用光标定位
+（`ESC[行;1H` + 行内容 + `ESC[K`）改写变化的行，末尾 `ESC[J` 清掉多余内容，再把光标放回提示符行：
+
+    r = ConsoleRenderer()
+    r.render([('scene', ...), ('info', ...), ('player', ...), ...])   # 区块名 -> 文本（可含 ANSI 颜色）
+    line = r.prompt('> ')
+
+行的物理高度按终端宽度与显示宽度（去 ANSI 后，CJK 宽字符计 2）计算。区块只在文本与物理起始行都未变时整块跳过；
+某区块增删行或某行折行数变化时，从第一个位置变化的行起其后的行整体改写。
+以下情况退回整页重绘（`ESC[H ESC[2J` 后输出全部内容）：首帧、终端尺寸变化、整帧高于终端、`invalidate()`。
+输出不是终端、`TERM=dumb` 或 settings `console.incremental` 为 false 时不使用任何控制序列，直接顺序打印整帧。
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.ui import colors as C
+
+CSI = '\033['
+
+
+def display_width(s: str) -> int:
+    """去掉 ANSI 后的显示宽度（东亚宽字符/全角计 2，组合字符计 0）。"""
+    w = 0
+    for ch in C.strip(s):
+        if unicodedata.combining(ch):
+            continue
+        w += 2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1
+    return w
+
+
+def _incremental_enabled() -> bool:
+    try:
+        from src import settings as S
+        return bool((S.current().console or {}).get('incremental', True))
+    except Exception:
+        return True
+
+
+class ConsoleRenderer:
+    def __init__(self, stream=None, separator: Optional[str] = None):
+        self.stream = stream or sys.stdout
+        self.separator = separator if separator is not None else C.dim('────────────────────────────────')
+        self._frame: Dict[str, List[str]] = {}   # 区块 -> 上一帧的行
+        self._order: List[str] = []
+        self._lines: List[str] = []              # 上一帧全部行（含分隔线）
+        self._rows: List[int] = []               # 每行起始的物理行号（0-based）
+        self._sec_rows: Dict[str, int] = {}      # 区块 -> 上一帧起始物理行号
+        self._height = 0                         # 上一帧物理行数
+        self._size: Optional[Tuple[int, int]] = None
+        self.full_redraws = 0
+        self.rows_written = 0
+        self.ansi = self._detect()
+
+    def _detect(self) -> bool:
+        try:
+            if not self.stream.isatty():
+                return False
+        except Exception:
+            return False
+        if os.environ.get('TERM', '') == 'dumb' or not _incremental_enabled():
+            return False
+        if os.name == 'nt':
+            # Windows 10+ 控制台：空命令即可开启 VT 序列处理
+            try:
+                os.system('')
+            except Exception:
+                return False
+        return True
+
+    def invalidate(self) -> None:
+        """丢弃上一帧（屏幕被其他输出弄乱后调用），下次渲染整页重绘。"""
+        self._frame = {}
+        self._order = []
+        self._lines = []
+        self._sec_rows = {}
+        self._size = None
+
+    # --- 帧构建 ---
+    def _compose(self, sections: Sequence[Tuple[str, str]]) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+        lines: List[str] = []
+        order: List[str] = []
+        frame: Dict[str, List[str]] = {}
+        for name, text in sections:
+            if text is None or text == '':
+                continue
+            if lines:
+                lines.append(self.separator)
+            body = str(text).split('\n')
+            frame[name] = body
+            order.append(name)
+            lines.extend(body)
+        return lines, order, frame
+
+    def render(self, sections: Sequence[Tuple[str, str]]) -> None:
+        lines, order, frame = self._compose(sections)
+        if not self.ansi:
+            self._write('\n'.join(lines) + '\n')
+            self._lines = lines
+            return
+        cols, rows = shutil.get_terminal_size((80, 24))
+        cols = max(1, cols)
+        heights = [max(1, -(-display_width(l) // cols)) for l in lines]
+        starts: List[int] = []
+        y = 0
+        for h in heights:
+            starts.append(y)
+            y += h
+        total = y
+        if (self._size != (cols, rows) or not self._lines or total + 1 > rows
+                or self._height + 1 > rows):
+            self._full(lines)
+        else:
+            self._diff(lines, starts, order, frame, total)
+        sec_rows: Dict[str, int] = {}
+        i = 0
+        for name in order:
+            if i > 0:
+                i += 1
+            sec_rows[name] = starts[i]
+            i += len(frame[name])
+        self._frame, self._order, self._sec_rows = frame, order, sec_rows
+        self._lines, self._rows, self._height = lines, starts, total
+        self._size = (cols, rows)
+
+    def _full(self, lines: List[str]) -> None:
+        self.full_redraws += 1
+        self.rows_written += len(lines)
+        self._write(f"{CSI}H{CSI}2J" + '\n'.join(lines) + '\n')
+
+    def _diff(self, lines: List[str], starts: List[int], order: List[str],
+              frame: Dict[str, List[str]], total: int) -> None:
+        old, old_starts = self._lines, self._rows
+        out: List[str] = []
+        shifted = False  # 已出现位置变化的行：其后全部改写
+
+        def keep(k: int) -> bool:
+            nonlocal shifted
+            if shifted:
+                return False
+            if k >= len(old) or old_starts[k] != starts[k]:
+                shifted = True
+                return False
+            return old[k] == lines[k]
+
+        i = 0
+        for name in order:
+            if i > 0:
+                if not keep(i):
+                    out.append(self._row(starts[i], lines[i]))
+                i += 1  # 分隔线
+            n = len(frame[name])
+            # 区块文本与物理起始行（按区块名记录）都未变：整块跳过，不逐行比对
+            if not shifted and self._frame.get(name) == frame[name] \
+                    and self._sec_rows.get(name) == starts[i] and i < len(old_starts) \
+                    and old_starts[i] == starts[i]:
+                i += n
+                continue
+            if self._sec_rows.get(name) != starts[i]:
+                shifted = True
+            for k in range(i, i + n):
+                if not keep(k):
+                    out.append(self._row(starts[k], lines[k]))
+            i += n
+        self.rows_written += len(out)
+        # 清除旧帧多出的部分与上次的提示符/输入行，光标停在帧下一行
+        out.append(f"{CSI}{total + 1};1H{CSI}J")
+        self._write(''.join(out))
+
+    def _row(self, y: int, text: str) -> str:
+        # 折行的长行：从起始行写入，清除到屏幕行尾；后续折行被新内容覆盖
+        return f"{CSI}{y + 1};1H{text}{CSI}K"
+
+    def _write(self, s: str) -> None:
+        try:
+            self.stream.write(s)
+            self.stream.flush()
+        except Exception:
+            pass
+
+    # --- 输入 ---
+    def prompt(self, text: str = '> ') -> str:
+        """在帧下方读取一行输入；EOF/中断向上抛出，由调用方决定退出。"""
+        return input(text)
+
+
+__all__ = ['ConsoleRenderer', 'display_width']
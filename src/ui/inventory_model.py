@@ -0,0 +1,223 @@
+"""背包/资源区视图模型（Tk 与 PyQt 共用）
+
+直接读取模型对象（背包堆叠、配方簿、场景资源），生成带稳定 id 的行；`refresh()` 与上一次的行列表
+比对，产出逐行变更，界面只改动变化的行，而不是渲染整段控制台文本再拆行回填。
+
+    vm = InventoryViewModel()
+    vm.set_game(game)
+    for op, index, row in vm.refresh():     # ('insert' | 'update' | 'remove', 位置, Row)
+        ...
+    vm.rows                                 # 当前行（界面首次填充时使用）
+
+变更按顺序应用到界面列表即可与 `rows` 保持一致：remove/insert 会移动后续行，update 只改该行文本。
+
+行 id 在对象生命周期内稳定：背包堆叠与场景资源以对象身份分配（写在对象的 `_vm_id` 上），
+配方以名称区分；令牌（iN/cN/rN）按位置给出，用于拼接命令。
+"""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.ui import colors as C
+
+# 对象上缓存行 id 的属性名（定义 __slots__ 的实体需包含该槽）
+ID_ATTR = '_vm_id'
+_IDS = itertools.count(1)
+
+Change = Tuple[str, int, 'Row']
+
+
+@dataclass(frozen=True)
+class Row:
+    id: str
+    kind: str            # 'item' | 'recipe' | 'resource' | 'empty'
+    token: str           # iN / cN / rN（位置相关，供拼接命令）；占位行为空
+    text: str            # 显示文本（无 ANSI）
+    qty: int = 0
+    bucket: str = ''     # 物品类型桶 / 资源类型
+    rarity: str = ''
+
+
+def _obj_id(obj: Any, prefix: str) -> str:
+    vid = getattr(obj, ID_ATTR, None)
+    if vid is None:
+        vid = f"{prefix}{next(_IDS)}"
+        try:
+            setattr(obj, ID_ATTR, vid)
+        except Exception:
+            # 无法写属性（如内建类型）：退回对象身份
+            vid = f"{prefix}@{id(obj)}"
+    return vid
+
+
+def diff_rows(old: List[Row], new: List[Row]) -> List[Change]:
+    """生成把 old 变为 new 的逐行变更（按顺序应用）。
+
+    先删除 new 中不存在的行（从后往前），再按 new 的顺序逐位对齐：id 相同则比较内容，
+    不同则在该位置插入（若该 id 在后面已存在，先移除原位置）。常见的追加/删除/数量变化均为 O(n)。
+    """
+    changes: List[Change] = []
+    keep = {r.id for r in new}
+    cur = list(old)
+    for i in range(len(cur) - 1, -1, -1):
+        if cur[i].id not in keep:
+            changes.append(('remove', i, cur[i]))
+            del cur[i]
+    for i, row in enumerate(new):
+        if i < len(cur) and cur[i].id == row.id:
+            if cur[i] != row:
+                changes.append(('update', i, row))
+                cur[i] = row
+            continue
+        for j in range(i + 1, len(cur)):
+            if cur[j].id == row.id:
+                changes.append(('remove', j, cur[j]))
+                del cur[j]
+                break
+        changes.append(('insert', i, row))
+        cur.insert(i, row)
+    return changes
+
+
+class _RowsModel:
+    def __init__(self) -> None:
+        self.game: Any = None
+        self.rows: List[Row] = []
+
+    def set_game(self, game: Any) -> bool:
+        """切换数据来源；返回 True 表示旧行已失效（界面需清空后按下一次 refresh 全量填充）。"""
+        if game is self.game:
+            return False
+        self.game = game
+        self.rows = []
+        return True
+
+    def token_of(self, row_id: str) -> Optional[str]:
+        """行 id 当前对应的令牌（点击回调按 id 绑定，令牌随位置变化）。"""
+        for r in self.rows:
+            if r.id == row_id:
+                return r.token
+        return None
+
+    def build(self) -> List[Row]:  # pragma: no cover - 子类实现
+        raise NotImplementedError
+
+    def refresh(self) -> List[Change]:
+        try:
+            new = self.build()
+        except Exception:
+            return []
+        changes = diff_rows(self.rows, new)
+        self.rows = new
+        return changes
+
+
+class InventoryViewModel(_RowsModel):
+    """背包堆叠 + 可合成配方（与控制台背包分区的条目一致，不含 ANSI 与分区标题）。"""
+
+    def build(self) -> List[Row]:
+        g = self.game
+        player = getattr(g, 'player', None)
+        inv = getattr(player, 'inventory', None)
+        if inv is None:
+            return []
+        try:
+            from src.systems.inventory import item_bucket
+        except Exception:
+            item_bucket = None  # type: ignore
+        rows: List[Row] = []
+        if inv.slots:
+            for i, slot in enumerate(inv.slots, 1):
+                it = slot.item
+                q = int(getattr(slot, 'quantity', 1) or 0)
+                label = f"{it.name}({it.item_type})" + (f" x{q}" if q != 1 else '')
+                rows.append(Row(_obj_id(slot, 's'), 'item', f"i{i}", f"i{i}  {label}", q,
+                                item_bucket(it) if item_bucket else '', str(getattr(it, 'rarity', '') or '')))
+        else:
+            rows.append(Row('e:inv', 'empty', '', '(空)'))
+        book = getattr(g, 'crafting', None)
+        recipes = []
+        if book is not None:
+            try:
+                recipes = list(book.craftable())
+            except Exception:
+                recipes = []
+        for i, r in enumerate(recipes, 1):
+            name = getattr(r, 'name', None) or (r.get('name') if isinstance(r, dict) else str(r))
+            rows.append(Row(f"c:{name}", 'recipe', f"c{i}", f"c{i}  {name}"))
+        if not recipes:
+            rows.append(Row('e:craft', 'empty', '', '(暂无可合成配方)'))
+        return rows
+
+
+class ResourceViewModel(_RowsModel):
+    """场景资源区：每个资源一行（rN 令牌 + 去色名称）。"""
+
+    def build(self) -> List[Row]:
+        rows: List[Row] = []
+        for i, r in enumerate(list(getattr(self.game, 'resources', None) or []), 1):
+            try:
+                text = C.strip(str(r))
+            except Exception:
+                text = str(getattr(r, 'name', r))
+            rows.append(Row(_obj_id(r, 'r'), 'resource', f"r{i}", text, 1, str(getattr(r, 'item_type', '') or '')))
+        return rows
+
+
+class EquipmentViewModel(_RowsModel):
+    """装备对话框网格：背包中通过 accept(item) 过滤的堆叠，一格一行（文本为物品名，带稀有度）。
+
+    accept 为空时取所有 EquipmentItem。行 id 与 InventoryViewModel 相同（按堆叠对象），
+    令牌 iN 为背包位置，`index_of(row_id)` 给出 1-based 背包索引。
+    """
+
+    def __init__(self, accept: Optional[Callable[[Any], bool]] = None) -> None:
+        super().__init__()
+        self.accept = accept
+
+    def build(self) -> List[Row]:
+        inv = getattr(getattr(self.game, 'player', None), 'inventory', None)
+        if inv is None:
+            return []
+        accept = self.accept
+        if accept is None:
+            from src.systems.inventory import EquipmentItem
+            accept = lambda it: isinstance(it, EquipmentItem)  # noqa: E731
+        rows: List[Row] = []
+        for i, slot in enumerate(inv.slots, 1):
+            it = slot.item
+            if not accept(it):
+                continue
+            rows.append(Row(_obj_id(slot, 's'), 'item', f"i{i}", str(getattr(it, 'name', it)),
+                            int(getattr(slot, 'quantity', 1) or 0), 'equipment',
+                            str(getattr(it, 'rarity', '') or 'common').lower()))
+        return rows
+
+    def index_of(self, row_id: str) -> Optional[int]:
+        tok = self.token_of(row_id)
+        try:
+            return int(tok[1:]) if tok else None
+        except ValueError:
+            return None
+
+    def item_of(self, row_id: str) -> Any:
+        """行对应的物品对象（提示/预览按需读取，不随行缓存）。"""
+        idx = self.index_of(row_id)
+        try:
+            return self.game.player.inventory.slots[idx - 1].item if idx else None
+        except Exception:
+            return None
+
+
+def apply_to_list(changes: List[Change], insert, update, remove) -> None:
+    """把变更序列依次交给界面列表的 insert(i, row) / update(i, row) / remove(i) 回调。"""
+    for op, i, row in changes:
+        if op == 'insert':
+            insert(i, row)
+        elif op == 'update':
+            update(i, row)
+        else:
+            remove(i)
+
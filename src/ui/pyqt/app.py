@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from typing import Optional, Any
+from typing import Optional, Any, TYPE_CHECKING
 
-from .qt_compat import QtWidgets  # type: ignore
+from .qt_compat import QtWidgets, QtCore  # type: ignore
 
-from src.game_modes.pve_controller import SimplePvEController
 from src.ui.targeting.fsm import TargetingEngine
+from src.ui.command_executor import CommandExecutor
 from src import settings as S
-from src import settings as S
+
+if TYPE_CHECKING:  # 游戏引擎在开局时才导入
+    from src.game_modes.pve_controller import SimplePvEController
+
+
+class _CmdWaker(QtCore.QObject):
+    """Cross-thread wake-up: emitted by the executor worker, delivered queued on the UI thread."""
+
+    ready = QtCore.pyqtSignal()
 
 
 class GameQtApp:
@@ -15,6 +23,7 @@ class GameQtApp:
 
     - Owns controller and top-level selection/targeting state placeholders
     - Provides `_send` to normalize commands compatible with the controller
+    - Runs interactive commands on a background executor via `submit`
     - Hosts references used by views (e.g., selected indexes, highlight styles)
     """
 
@@ -67,6 +76,12 @@ class GameQtApp:
         # Targeting engine (shared with Tk semantics)
         self.target_engine = TargetingEngine(self)
 
+        # Background command executor: worker finishes -> queued signal -> poll() on the UI thread
+        self._waker = _CmdWaker()
+        self.executor = CommandExecutor(wake=self._waker.ready.emit, on_busy=self._set_busy,
+                                        on_error=self._cmd_error)
+        self._waker.ready.connect(self.executor.poll)
+
     # --- selection helpers (semantics parity) ---
     def begin_skill(self, m_index: int, name: str):
         self.selected_member_index = m_index
@@ -74,8 +89,7 @@ class GameQtApp:
         src = f"m{m_index}"
         need_exec = self.target_engine.begin(src, name)
         if need_exec:
-            out = self._send(f"skill {name} {src}")
-            self.after_cmd(out)
+            self.submit(f"skill {name} {src}")
             self.clear_selection()
             return
         # else: let UI highlight candidates and show popup
@@ -89,11 +103,10 @@ class GameQtApp:
         if getattr(self, 'target_engine', None) and self.target_engine.is_ready():
             selected = self.target_engine.get_selected()
         if name in (None, 'attack') and selected:
-            out = self._send(f"a {src} {selected[0]}")
+            self.submit(f"a {src} {selected[0]}")
         else:
             parts = ["skill", name or '', src] + selected
-            out = self._send(" ".join([p for p in parts if p]))
-        self.after_cmd(out)
+            self.submit(" ".join([p for p in parts if p]))
         self.clear_selection()
 
     def cancel_skill(self):
@@ -140,8 +153,7 @@ class GameQtApp:
             if idx is None:
                 return
             token = f"m{m_index}"
-            out = self._send(f"eq i{idx} {token}")
-            self.after_cmd(out)
+            self.submit(f"eq i{idx} {token}")
             return
         # has item -> unequip；若左手为双手武器且点击右手，映射为卸下左手（与 Tk 行为一致）
         token = f"m{m_index}"
@@ -155,8 +167,7 @@ class GameQtApp:
         except Exception:
             pass
         slot = {'left': 'left', 'right': 'right', 'armor': 'armor'}.get(effective, effective)
-        out = self._send(f"uneq {token} {slot}")
-        self.after_cmd(out)
+        self.submit(f"uneq {token} {slot}")
 
     # --- after command ---
     def after_cmd(self, _out):
@@ -205,15 +216,14 @@ class GameQtApp:
     # --- controller lifecycle ---
     def start_game(self) -> None:
         if self.controller is None:
+            from src.game_modes.pve_controller import SimplePvEController
             self.controller = SimplePvEController(player_name=self.player_name, initial_scene=self.initial_scene)
 
     # --- command bridge (compatible mapping) ---
-    def _send(self, cmd: str) -> Any:
-        if not self.controller:
-            return []
+    def _map_cmd(self, cmd: str) -> str:
         parts = (cmd or '').split()
         if not parts:
-            return []
+            return ''
         alias = {
             'attack': 'a', 'atk': 'a', 'a': 'a',
             'equip': 'equip', 'eq': 'equip',
@@ -229,7 +239,51 @@ class GameQtApp:
             's': 's',
         }
         mapped = alias.get(parts[0].lower(), parts[0].lower())
-        mapped_cmd = ' '.join([mapped] + parts[1:])
-        return self.controller._process_command(mapped_cmd)
+        return ' '.join([mapped] + parts[1:])
+
+    def _send(self, cmd: str) -> Any:
+        """Synchronous send on the UI thread (holds the executor's game lock)."""
+        if not self.controller:
+            return []
+        mapped_cmd = self._map_cmd(cmd)
+        if not mapped_cmd:
+            return []
+        return self.executor.run_sync(lambda: self.controller._process_command(mapped_cmd))
+
+    def submit(self, cmd: str, done=None) -> bool:
+        """Run a command on the executor; `done(out)` (default `after_cmd`) runs on the UI thread.
+
+        Returns False when the command is empty or another command is still running.
+        """
+        ctrl = self.controller
+        mapped_cmd = self._map_cmd(cmd)
+        if not ctrl or not mapped_cmd:
+            return False
+        ok = self.executor.submit(lambda: ctrl._process_command(mapped_cmd),
+                                  done if done is not None else self.after_cmd, label=mapped_cmd)
+        if ok and self.executor.busy:
+            QtCore.QTimer.singleShot(self.executor.busy_ms, self.executor.check_busy)
+        return ok
+
+    def _set_busy(self, on: bool) -> None:
+        """Input-disabled state for commands slower than the executor threshold."""
+        win = getattr(self, '_window_ref', None)
+        try:
+            if win is not None:
+                win.setEnabled(not on)
+            if on:
+                QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+            else:
+                QtWidgets.QApplication.restoreOverrideCursor()
+        except Exception:
+            pass
+
+    def _cmd_error(self, exc: BaseException, label: str = '') -> None:
+        win = getattr(self, '_window_ref', None)
+        try:
+            if win is not None:
+                win.log.append({'type': 'error', 'text': f"命令执行错误{('[' + label + ']') if label else ''}: {exc}"})
+        except Exception:
+            pass
 
 
@@ -5,41 +5,157 @@ from typing import Optional, List
 from ..qt_compat import QtWidgets, QtCore, QtGui  # type: ignore
 
 
-class _GridCanvas(QtWidgets.QWidget):
-    """带方格背景的容器，用于呈现背包网格。
+class _GridView(QtWidgets.QListView):
+    """带方格背景的虚拟网格（IconMode 列表视图）。
 
-    - cell: 每个格子的像素尺寸（正方形）。
+    - cell: 每个格子的像素尺寸（正方形），即 gridSize。
     - bg: 背景填充颜色。
-    - line: 网格线颜色。
-    子控件（按钮）会叠加在方格背景之上。
+    - line: 网格线颜色（随滚动偏移绘制）。
+    只有可见格子会经由委托绘制；物品数量只影响模型行数，不再创建控件。
     """
     def __init__(self, cell: int = 72, bg: str = "#f9f9fb", line: str = "#e5e7eb", parent=None):
         super().__init__(parent)
         self._cell = int(max(16, cell))
         self._bg = str(bg)
         self._line = str(line)
+        self.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.setFlow(QtWidgets.QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setMovement(QtWidgets.QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(0)
+        self.setGridSize(QtCore.QSize(self._cell, self._cell))
+        self.setMouseTracking(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        try:
+            # 防止回车经由列表触发对话框默认按钮
+            self.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
+        except Exception:
+            pass
 
     def paintEvent(self, event):
-        w = self.width(); h = self.height()
-        p = QtGui.QPainter(self)
+        vp = self.viewport()
+        w = vp.width(); h = vp.height()
+        p = QtGui.QPainter(vp)
         try:
-            p.fillRect(self.rect(), QtGui.QColor(self._bg))
+            p.fillRect(vp.rect(), QtGui.QColor(self._bg))
             pen = QtGui.QPen(QtGui.QColor(self._line))
             pen.setWidth(1)
             p.setPen(pen)
             step = self._cell
             # 竖线
-            x = 0
+            x = -(self.horizontalOffset() % step)
             while x <= w:
                 p.drawLine(x, 0, x, h)
                 x += step
             # 横线
-            y = 0
+            y = -(self.verticalOffset() % step)
             while y <= h:
                 p.drawLine(0, y, w, y)
                 y += step
         finally:
             p.end()
+        super().paintEvent(event)
+
+
+ROW_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+
+
+class _EquipmentListModel(QtCore.QAbstractListModel):
+    """装备网格的数据模型：行来自 EquipmentViewModel，变更逐行转为 insert/remove/dataChanged。"""
+
+    def __init__(self, vm, tip_of, parent=None):
+        super().__init__(parent)
+        self._vm = vm
+        self._tip_of = tip_of
+        self._rows: list = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        row = self._rows[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return row.text
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            # 提示按需生成（仅悬浮的格子）
+            return self._tip_of(self._vm.item_of(row.id))
+        if role == ROW_ROLE:
+            return row
+        return None
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+
+    def sync(self) -> None:
+        """从视图模型拉取变更并逐行应用。"""
+        from src.ui.inventory_model import apply_to_list
+        apply_to_list(self._vm.refresh(), self._insert, self._update, self._remove)
+
+    def _insert(self, i: int, row) -> None:
+        self.beginInsertRows(QtCore.QModelIndex(), i, i)
+        self._rows.insert(i, row)
+        self.endInsertRows()
+
+    def _update(self, i: int, row) -> None:
+        self._rows[i] = row
+        idx = self.index(i)
+        self.dataChanged.emit(idx, idx)
+
+    def _remove(self, i: int) -> None:
+        self.beginRemoveRows(QtCore.QModelIndex(), i, i)
+        del self._rows[i]
+        self.endRemoveRows()
+
+
+class _RarityDelegate(QtWidgets.QStyledItemDelegate):
+    """格子绘制：按稀有度描边，选中态加粗边框并加深背景，悬浮态浅色背景。"""
+
+    def __init__(self, color_of, cell: int, parent=None):
+        super().__init__(parent)
+        self._color_of = color_of
+        self._cell = int(cell)
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(self._cell, self._cell)
+
+    def paint(self, painter, option, index):
+        row = index.data(ROW_ROLE)
+        if row is None:
+            return
+        state = option.state
+        selected = bool(state & QtWidgets.QStyle.StateFlag.State_Selected)
+        hover = bool(state & QtWidgets.QStyle.StateFlag.State_MouseOver)
+        r = QtCore.QRectF(option.rect).adjusted(3, 3, -3, -3)
+        painter.save()
+        try:
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
+            pen = QtGui.QPen(QtGui.QColor(self._color_of(row.rarity)))
+            pen.setWidth(3 if selected else 2)
+            painter.setPen(pen)
+            if selected:
+                painter.setBrush(QtGui.QColor(0, 0, 0, 15))
+            elif hover:
+                painter.setBrush(QtGui.QColor(0, 0, 0, 10))
+            else:
+                painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(r, 4, 4)
+            painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+            text = row.text + (f" x{row.qty}" if row.qty > 1 else "")
+            painter.drawText(r.adjusted(3, 3, -3, -3),
+                             int(QtCore.Qt.AlignmentFlag.AlignCenter) | int(QtCore.Qt.TextFlag.TextWordWrap),
+                             text)
+        finally:
+            painter.restore()
 
 
 class EquipmentDialog(QtWidgets.QDialog):
@@ -47,6 +163,7 @@ class EquipmentDialog(QtWidgets.QDialog):
 
     - 左侧：槽位信息与“卸下”按钮（操作后不关闭）。
     - 右侧：背包中“所有装备类物品”的滚动网格；点击即装备到合适槽位，不关闭。
+      网格为模型/视图实现（只绘制可见格子），背包 `inventory_changed` 时逐格增删改。
     - 提示：悬浮展示名称、攻防、技能与描述。
 
     确定：返回最近一次点击的背包 1-based 索引；取消或未选择返回 None。
@@ -60,10 +177,7 @@ class EquipmentDialog(QtWidgets.QDialog):
         self.setWindowTitle("装备管理：点击右侧任意装备自动穿戴")
         self.setModal(True)
         # 状态
-        self._index_map: List[int] = []
         self._chosen: Optional[int] = None
-        self._selected_btn: Optional[QtWidgets.QPushButton] = None
-        self._btn_by_idx: dict[int, QtWidgets.QPushButton] = {}
         # 左侧槽位与按钮引用
         self._lbl_lh: Optional[QtWidgets.QLabel] = None
         self._lbl_ar: Optional[QtWidgets.QLabel] = None
@@ -71,12 +185,19 @@ class EquipmentDialog(QtWidgets.QDialog):
         self._btn_ul: Optional[QtWidgets.QPushButton] = None
         self._btn_ua: Optional[QtWidgets.QPushButton] = None
         self._btn_ur: Optional[QtWidgets.QPushButton] = None
-        # 右侧区域引用
-        self._right_scroll: Optional[QtWidgets.QScrollArea] = None
-        self._grid_wrap: Optional[QtWidgets.QWidget] = None
-        self._grid_layout: Optional[QtWidgets.QGridLayout] = None
+        # 右侧网格：视图模型（行 id 稳定）-> 列表模型 -> 视图
+        from src.ui.inventory_model import EquipmentViewModel
+        self._vm = EquipmentViewModel()
+        self._grid_view: Optional[_GridView] = None
+        self._grid_model: Optional[_EquipmentListModel] = None
         # 构建 UI
         self._build_ui()
+        # 背包变化（包括对话框外的拾取/丢弃）时增量刷新网格
+        try:
+            from src.core.events import subscribe_ui
+            subscribe_ui('inventory_changed', self._on_inventory_changed)
+        except Exception:
+            pass
 
     # --- helpers ---
     def _member_and_eq(self):
@@ -158,17 +279,22 @@ class EquipmentDialog(QtWidgets.QDialog):
     def _unequip(self, slot: str):
         try:
             token = f"m{self.m_index}"
-            out = self.app_ctx._send(f"uneq {token} {slot}")
+            # 后台执行；落地时刷新主窗口（after_cmd）与对话框左右两侧，不自动关闭
+            self.app_ctx.submit(f"uneq {token} {slot}", done=self._after_unequip)
+        except Exception:
+            pass
+
+    def _after_unequip(self, out) -> None:
+        try:
             # 仅刷新主窗口，不依赖父级控件存在性
             self.app_ctx.after_cmd(out)
         except Exception:
             pass
-        # 不自动关闭；刷新
         self._refresh_left()
         self._refresh_right_grid()
         # 父级可能是 MainWindow；若是卡片，刷新由 after_cmd 统一处理
 
-    def _choose(self, idx1: int, btn: QtWidgets.QPushButton):
+    def _choose(self, idx1: int):
         """点击背包物品：立即执行装备，刷新左右两侧与角色卡，窗口不关闭。"""
         self._chosen = idx1  # 记录最近选择
         # 执行装备
@@ -187,7 +313,8 @@ class EquipmentDialog(QtWidgets.QDialog):
                 except Exception:
                     member = None
                 if name and member is not None:
-                    inv.use_item(name, 1, player=player, target=member)
+                    # 界面线程直接改动背包：持有执行器的游戏锁（单写者）
+                    self.app_ctx.executor.run_sync(lambda: inv.use_item(name, 1, player=player, target=member))
                     # 全局刷新（主窗口/战场/背包）
                     try:
                         self.app_ctx.after_cmd([])
@@ -195,22 +322,30 @@ class EquipmentDialog(QtWidgets.QDialog):
                         pass
         except Exception:
             pass
-        # UI：高亮与刷新
+        # UI：刷新（选中态由视图的选择模型维护）
+        self._refresh_left()
+        self._refresh_right_grid()
+        # 父级刷新由 after_cmd 负责
+
+    def _on_grid_clicked(self, index) -> None:
         try:
-            if self._selected_btn is not None:
-                self._selected_btn.setProperty('selected', False)
-                self._apply_btn_style(self._selected_btn)
+            row = index.data(ROW_ROLE)
+            idx1 = self._vm.index_of(row.id) if row is not None else None
         except Exception:
-            pass
-        self._selected_btn = btn
+            idx1 = None
+        if idx1:
+            self._choose(idx1)
+
+    def _on_inventory_changed(self, _evt: str, _payload: dict) -> None:
+        self._refresh_right_grid()
+
+    def done(self, r) -> None:
         try:
-            btn.setProperty('selected', True)
-            self._apply_btn_style(btn)
+            from src.core.events import unsubscribe
+            unsubscribe('inventory_changed', self._on_inventory_changed)
         except Exception:
             pass
-        self._refresh_left()
-        self._refresh_right_grid()
-        # 父级刷新由 after_cmd 负责
+        super().done(r)
 
     def get_result(self) -> Optional[int]:
         ok = (self.exec() == QtWidgets.QDialog.DialogCode.Accepted)
@@ -318,63 +453,27 @@ class EquipmentDialog(QtWidgets.QDialog):
         l.addWidget(self._btn_ur, 2, 2)
         v.addWidget(top)
 
-        # 下：背包网格（滚动+方格背景）
-        bottom_wrap = QtWidgets.QScrollArea()
-        bottom_wrap.setWidgetResizable(True)
-        try:
-            bottom_wrap.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
-        except Exception:
-            pass
-        try:
-            bottom_wrap.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            bottom_wrap.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        except Exception:
-            pass
-        # 移除默认外框并清零 viewport 边距，避免首行/首列偏移
-        try:
-            bottom_wrap.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-            bottom_wrap.setViewportMargins(0, 0, 0, 0)
-        except Exception:
-            pass
-        self._right_scroll = bottom_wrap
-        # 用自定义网格底板提供格子背景
-        grid_bg = _GridCanvas(cell=int(gcfg.get('cell', 72)), bg=str(gcfg.get('bg', '#f9f9fb')), line=str(gcfg.get('line', '#e5e7eb')))
-        # 清零容器自身边距，避免与绘制的格线错位
-        try:
-            grid_bg.setContentsMargins(0, 0, 0, 0)
-        except Exception:
-            pass
-        grid_bg.setLayout(QtWidgets.QGridLayout())
-        self._grid_wrap = grid_bg
-        self._grid_layout = grid_bg.layout()
+        # 下：背包网格（虚拟网格 + 方格背景）
         try:
-            # 强制网格起点为左上角
-            self._grid_layout.setOriginCorner(QtCore.Qt.Corner.TopLeftCorner)
-            self._grid_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
+            cell = int(gcfg.get('cell', 72))
+            cols = int(gcfg.get('cols', 6))
         except Exception:
-            pass
-        # 再次确保容器与布局无边距
-        try:
-            self._grid_wrap.setContentsMargins(0, 0, 0, 0)
-            self._grid_layout.setContentsMargins(0, 0, 0, 0)
+            cell, cols = 72, 6
+        view = _GridView(cell=cell, bg=str(gcfg.get('bg', '#f9f9fb')), line=str(gcfg.get('line', '#e5e7eb')))
+        model = _EquipmentListModel(self._vm, self._fmt_tip, view)
+        view.setModel(model)
+        view.setItemDelegate(_RarityDelegate(self._rarity_color, cell, view))
+        try:
+            # 列数上限（可视宽度不足时随窗口减少）
+            view.setMaximumWidth(max(1, cols) * cell + view.verticalScrollBar().sizeHint().width())
         except Exception:
             pass
-        # 记录格子规格
-        try:
-            self._grid_cell = int(gcfg.get('cell', 72))
-            self._grid_cols = int(gcfg.get('cols', 6))
-        except Exception:
-            self._grid_cell, self._grid_cols = 72, 6
-        # 初始实际列数（随后根据 viewport 宽度动态调整）
-        self._grid_actual_cols = self._grid_cols
-        try:
-            bottom_wrap.viewport().installEventFilter(self)
-        except Exception:
-            pass
-        # 初始构建网格
+        view.clicked.connect(self._on_grid_clicked)
+        self._grid_view = view
+        self._grid_model = model
+        # 初始填充
         self._rebuild_right_grid()
-        bottom_wrap.setWidget(grid_bg)
-        v.addWidget(bottom_wrap, 1)
+        v.addWidget(view, 1)
 
         # 底部按钮
         btns = QtWidgets.QDialogButtonBox(
@@ -384,128 +483,27 @@ class EquipmentDialog(QtWidgets.QDialog):
         btns.accepted.connect(self.accept)
         btns.rejected.connect(self.reject)
 
-    def _clear_layout(self, layout: QtWidgets.QLayout):
-        try:
-            while layout.count():
-                item = layout.takeAt(0)
-                w = item.widget()
-                if w is not None:
-                    w.setParent(None)
-                    w.deleteLater()
-                elif item.layout() is not None:
-                    self._clear_layout(item.layout())
-        except Exception:
-            pass
-
     def _rebuild_right_grid(self):
-        """重建右侧背包网格（显示所有装备类物品，点击即时装备）。"""
-        if not self._right_scroll:
+        """重新绑定数据来源并全量填充网格（打开时调用；之后走 _refresh_right_grid 增量更新）。"""
+        game = getattr(getattr(self.app_ctx, 'controller', None), 'game', None)
+        if self._grid_model is None:
             return
-        wrap = self._grid_wrap
-        grid = self._grid_layout
-        if wrap is None:
-            wrap = QtWidgets.QWidget()
-            self._grid_wrap = wrap
-        if grid is None:
-            grid = QtWidgets.QGridLayout(wrap)
-            self._grid_layout = grid
-        # 清空旧内容
-        self._clear_layout(grid)
-        # 紧贴方格背景，取消间距并左上对齐
-        try:
-            if hasattr(grid, 'setOriginCorner'):
-                grid.setOriginCorner(QtCore.Qt.Corner.TopLeftCorner)
-            grid.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
-            grid.setContentsMargins(0, 0, 0, 0)
-            grid.setSpacing(0)
-            grid.setHorizontalSpacing(0)
-            grid.setVerticalSpacing(0)
-        except Exception:
-            pass
-        try:
-            self._grid_wrap.setContentsMargins(0, 0, 0, 0)
-        except Exception:
-            pass
-        # 重置索引映射
-        self._index_map = []
-        self._btn_by_idx = {}
-        # 数据源
-        inv_owner = getattr(getattr(getattr(self.app_ctx, 'controller', None), 'game', None), 'player', None)
-        inv = getattr(inv_owner, 'inventory', None)
-        row = col = 0
-        cell = int(getattr(self, '_grid_cell', 72))
-        cols = int(getattr(self, '_grid_actual_cols', getattr(self, '_grid_cols', 6)))
-        total = 0
-        if inv is not None:
-            # 展示所有“装备类”物品，不再按槽位过滤；点击后由 use_item/装备系统决定落位
-            try:
-                from src.systems.inventory import EquipmentItem  # 基类
-            except Exception:
-                EquipmentItem = tuple()  # type: ignore
-            for idx, slot in enumerate(list(getattr(inv, 'slots', []) or []), 1):
-                it = getattr(slot, 'item', None)
-                # 仅显示装备（武器/盾牌/盔甲），隐藏消耗品/素材
-                try:
-                    if not isinstance(it, EquipmentItem):
-                        continue
-                except Exception:
-                    # 基类不可用时，退化为属性判断
-                    if not hasattr(it, 'slot_type'):
-                        continue
-                self._index_map.append(idx)
-                rarity = str(getattr(it, 'rarity', 'common') or 'common').lower()
-                color = self._rarity_color(rarity)
-                btn = QtWidgets.QPushButton(getattr(it, 'name', f"i{idx}"))
-                # 防止物品按钮触发对话框默认 Accept
-                try:
-                    btn.setAutoDefault(False)
-                    btn.setDefault(False)
-                    btn.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
-                except Exception:
-                    pass
-                btn.setToolTip(self._fmt_tip(it))
-                btn.setProperty('rarity_color', color)
-                self._apply_btn_style(btn)
-                try:
-                    btn.setFixedSize(cell, cell)
-                except Exception:
-                    pass
-                btn.clicked.connect(lambda _=False, i_idx=idx, b=btn: self._choose(i_idx, b))
-                self._btn_by_idx[idx] = btn
-                grid.addWidget(btn, row, col)
-                col += 1
-                total += 1
-                if col >= cols:
-                    col, row = 0, row + 1
-        # 计算并设置网格底板的固定尺寸（避免出现半格）
-        try:
-            rows = max(1, (total + cols - 1) // cols)
-            w = cols * cell
-            h = rows * cell
-            self._grid_wrap.setFixedSize(w, h)
-        except Exception:
-            pass
-        self._right_scroll.setWidget(wrap)
+        if self._vm.set_game(game):
+            self._grid_model.clear()
+        self._grid_model.sync()
 
-    def eventFilter(self, obj, event):
-        # 当滚动区域的可视宽度变化时，重新计算列数，避免出现半格
+    def _refresh_right_grid(self):
+        """刷新右侧网格：仅对变化的格子增删改。"""
+        if self._grid_model is None:
+            return
         try:
-            if self._right_scroll and obj is self._right_scroll.viewport():
-                if event.type() == QtCore.QEvent.Type.Resize:
-                    vw = max(1, obj.width())
-                    cell = int(getattr(self, '_grid_cell', 72))
-                    max_cols = int(getattr(self, '_grid_cols', 6))
-                    cols = max(1, min(max_cols, vw // cell))
-                    if cols != int(getattr(self, '_grid_actual_cols', max_cols)):
-                        self._grid_actual_cols = cols
-                        self._rebuild_right_grid()
+            game = getattr(getattr(self.app_ctx, 'controller', None), 'game', None)
+            if game is not self._vm.game:
+                self._rebuild_right_grid()
+            else:
+                self._grid_model.sync()
         except Exception:
             pass
-        return super().eventFilter(obj, event)
-
-    def _refresh_right_grid(self):
-        """刷新右侧网格（重建）。"""
-        self._rebuild_right_grid()
 
     def _refresh_parent_card(self):
         """尝试刷新父级卡片（若父组件提供 refresh(model) 接口）。"""
@@ -516,28 +514,6 @@ class EquipmentDialog(QtWidgets.QDialog):
         except Exception:
             pass
 
-    def _apply_btn_style(self, btn: QtWidgets.QPushButton):
-        """应用物品按钮样式：按稀有度描边，选中态加深背景/边框。"""
-        try:
-            color = btn.property('rarity_color') or '#BDBDBD'
-            selected = bool(btn.property('selected')) or btn.isChecked()
-        except Exception:
-            color, selected = '#BDBDBD', False
-        if selected:
-            ss = (
-                f"QPushButton{{border:3px solid {color}; padding:2px; border-radius:4px; background: rgba(0,0,0,0.06);}}"
-                f" QPushButton:hover{{background: rgba(0,0,0,0.08);}}"
-            )
-        else:
-            ss = (
-                f"QPushButton{{border:2px solid {color}; padding:3px; border-radius:4px;}}"
-                f" QPushButton:hover{{background: rgba(0,0,0,0.04);}}"
-            )
-        try:
-            btn.setStyleSheet(ss)
-        except Exception:
-            pass
-
     def _refresh_left(self):
         """刷新左侧槽位标签与卸下按钮禁用状态。"""
         _m, eq = self._member_and_eq()
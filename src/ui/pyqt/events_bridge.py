@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Callable, List, Tuple
 
 try:
-    from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event  # type: ignore
+    from src.core.events import subscribe_ui as subscribe_event, unsubscribe as unsubscribe_event  # type: ignore
 except Exception:  # pragma: no cover
     def subscribe_event(*_a, **_k):  # type: ignore
         return None
@@ -18,6 +18,8 @@ class EventsBridge:
         self.app_ctx = app_ctx
         self.window = window
         self._subs: List[Tuple[str, Callable]] = []
+        self._tr = None      # SceneTransition while a scene switch is in progress
+        self._tr_timer = None
 
     def mount(self):
         if self._subs:
@@ -30,18 +32,15 @@ class EventsBridge:
                 owner = None
             if not owner:
                 return
-            # determine side by membership
+            # determine side via the game's entity registry (O(1))
             try:
-                game = self.app_ctx.controller.game
-                is_enemy = owner in (getattr(game, 'enemies', []) or [])
-                is_ally = owner in (getattr(getattr(game, 'player', None), 'board', []) or [])
+                from src.core.entity_registry import side_of
+                side = side_of(self.app_ctx.controller.game, owner)
             except Exception:
-                is_enemy = False; is_ally = False
+                side = None
             try:
-                if is_enemy:
-                    self.window.battlefield.refresh_model(owner, is_enemy=True)
-                if is_ally:
-                    self.window.battlefield.refresh_model(owner, is_enemy=False)
+                if side is not None:
+                    self.window.battlefield.refresh_model(owner, is_enemy=(side == 'enemy'))
             except Exception:
                 pass
         for name in ('equipment_changed','stamina_changed','hp_changed'):
@@ -57,11 +56,10 @@ class EventsBridge:
                 return
             kind = 'heal' if evt.endswith('healed') else 'damage'
             try:
-                game = self.app_ctx.controller.game
-                if owner in (getattr(game, 'enemies', []) or []):
-                    self.window.battlefield.flash_card(owner, is_enemy=True, kind=kind)
-                elif owner in (getattr(getattr(game, 'player', None), 'board', []) or []):
-                    self.window.battlefield.flash_card(owner, is_enemy=False, kind=kind)
+                from src.core.entity_registry import side_of
+                side = side_of(self.app_ctx.controller.game, owner)
+                if side is not None:
+                    self.window.battlefield.flash_card(owner, is_enemy=(side == 'enemy'), kind=kind)
             except Exception:
                 pass
         for name in ('enemy_damaged','card_damaged','card_healed'):
@@ -76,32 +74,72 @@ class EventsBridge:
         for name in ('resource_changed','inventory_changed','resource_added','resource_removed','resources_cleared','resources_reset','resources_changed'):
             self._subs.append((name, subscribe_event(name, _on_res_inv)))
 
-        # scene changed -> overlay + rebuild/refresh
+        # scene loading/changed -> overlay with progress; refresh as soon as the scene is loaded
+        # and the minimum display time (death/float animations) has passed
+        self._subs.append(('scene_loading', subscribe_event('scene_loading', self._on_scene_loading)))
+
         def _on_scene_changed(_evt, payload):
+            tr = self._begin_transition()
+            if tr is not None:
+                p = payload or {}
+                tr.mark_loaded(p.get('scene_title') or p.get('scene_path'))
+                self._tick_transition()
+        self._subs.append(('scene_changed', subscribe_event('scene_changed', _on_scene_changed)))
+
+    # --- scene transition ---
+    def _on_scene_loading(self, _evt, payload):
+        tr = self._begin_transition()
+        if tr is not None:
+            tr.progress(payload)
+            self._tick_transition()
+
+    def _begin_transition(self):
+        if self._tr is not None:
+            return self._tr
+        try:
+            from src.ui.scene_transition import SceneTransition
+            from ..qt_compat import QtCore
+            self._tr = SceneTransition()
+            self.window.show_scene_overlay()
+            timer = QtCore.QTimer(self.window)
+            timer.setInterval(int(getattr(self.app_ctx, '_overlay_fade_interval', 16)))
+            timer.timeout.connect(self._tick_transition)
+            timer.start()
+            self._tr_timer = timer
+        except Exception:
+            self._tr = None
+        return self._tr
+
+    def _tick_transition(self):
+        tr = self._tr
+        if tr is None:
+            return
+        try:
+            self.window.set_scene_progress(tr.text(), tr.fraction())
+        except Exception:
+            pass
+        if not tr.ready():
+            return
+        self._tr = None
+        try:
+            self._tr_timer and self._tr_timer.stop()
+        except Exception:
+            pass
+        self._tr_timer = None
+        try:
+            self.window.refresh_all()
+        finally:
             try:
-                self.window.show_scene_overlay()
+                self.window.hide_scene_overlay()
             except Exception:
                 pass
-            # allow small delay then refresh and hide overlay
-            try:
-                from ..qt_compat import QtCore
-                def do_refresh():
-                    try:
-                        self.window.refresh_all()
-                    finally:
-                        try:
-                            self.window.hide_scene_overlay()
-                        except Exception:
-                            pass
-                QtCore.QTimer.singleShot(250, do_refresh)
-            except Exception:
-                try:
-                    self.window.refresh_all(); self.window.hide_scene_overlay()
-                except Exception:
-                    pass
-        self._subs.append(('scene_changed', subscribe_event('scene_changed', _on_scene_changed)))
 
     def unmount(self):
+        try:
+            self._tr_timer and self._tr_timer.stop()
+        except Exception:
+            pass
+        self._tr = self._tr_timer = None
         for evt, cb in (self._subs or []):
             try:
                 unsubscribe_event(evt, cb)
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import Optional
 
-from .qt_compat import QtWidgets, QtCore  # type: ignore
+from .qt_compat import QtWidgets, QtCore, QtGui  # type: ignore
+from src.core import perf as P
 
 from .app import GameQtApp
 from .views.battlefield_view import BattlefieldView
@@ -34,6 +35,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_menu.setFixedHeight(24)
         top.addWidget(self.lbl_scene)
         top.addStretch(1)
+        # 工具菜单：性能浮层/计时导出/主线程采样分析
+        self.btn_tools = QtWidgets.QToolButton()
+        self.btn_tools.setText("工具")
+        self.btn_tools.setFixedHeight(24)
+        self.btn_tools.setPopupMode(QtWidgets.QToolButton.ToolButtonPopupMode.InstantPopup)
+        tools = QtWidgets.QMenu(self.btn_tools)
+        tools.addAction("性能浮层 (F3)", self.toggle_perf_overlay)
+        tools.addAction("导出计时 JSON (Ctrl+F3)", self.dump_perf)
+        tools.addSeparator()
+        tools.addAction("采样分析 10 秒", lambda: self.prof_cmd('prof start 10'))
+        tools.addAction("开始采样分析", lambda: self.prof_cmd('prof start'))
+        tools.addAction("停止采样并保存", lambda: self.prof_cmd('prof stop'))
+        self.btn_tools.setMenu(tools)
+        top.addWidget(self.btn_tools)
         top.addWidget(self.btn_menu)
         vbox.addLayout(top)
 
@@ -105,10 +120,31 @@ class MainWindow(QtWidgets.QMainWindow):
         self._overlay = QtWidgets.QWidget(self)
         self._overlay.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
         self._overlay.setStyleSheet("background: rgba(20,20,20,0.6);")
+        # loading progress shown on the overlay (text + bar; bar is busy-style while total is unknown)
+        self._overlay_label = QtWidgets.QLabel("正在切换场景…", self._overlay)
+        self._overlay_label.setStyleSheet("background: transparent; color: white; font-size: 16px; font-weight: bold;")
+        self._overlay_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._overlay_bar = QtWidgets.QProgressBar(self._overlay)
+        self._overlay_bar.setTextVisible(False)
+        self._overlay_bar.setFixedSize(260, 10)
         self._overlay.hide()
         self._overlay.raise_()
         self.resizeEvent = self._wrap_resize(self.resizeEvent)
 
+        # 性能浮层（F3 显示/隐藏，Ctrl+F3 导出 JSON）
+        self._perf_label = QtWidgets.QLabel(self)
+        self._perf_label.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self._perf_label.setStyleSheet("background: rgba(0,0,0,0.7); color: #b8f5b0; font-family: Consolas, monospace; font-size: 11px; padding: 6px;")
+        self._perf_label.hide()
+        self._perf_timer = QtCore.QTimer(self)
+        self._perf_timer.timeout.connect(self._tick_perf_overlay)
+        try:
+            P.configure_from_settings()
+            QtGui.QShortcut(QtGui.QKeySequence("F3"), self, activated=self.toggle_perf_overlay)
+            QtGui.QShortcut(QtGui.QKeySequence("Ctrl+F3"), self, activated=self.dump_perf)
+        except Exception:
+            pass
+
         self.refresh_all()
     
 
@@ -128,6 +164,7 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.information(self, "提示", f"返回主菜单失败: {e}")
 
     # --- render helpers ---
+    @P.timed('render', 'refresh_all')
     def refresh_all(self):
         g = getattr(self.app_ctx.controller, 'game', None)
         if g is not None:
@@ -149,19 +186,92 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
+    # --- perf overlay ---
+    def toggle_perf_overlay(self):
+        """显示/隐藏性能浮层；显示时开启计时，隐藏时按 settings perf.enabled 决定是否继续计时。"""
+        if self._perf_label.isVisible():
+            self._perf_label.hide()
+            self._perf_timer.stop()
+            P.enable(bool(P.config().get('enabled', False)))
+            return
+        P.enable(True)
+        try:
+            interval = int(P.config().get('overlay_ms', 500))
+        except Exception:
+            interval = 500
+        self._perf_timer.setInterval(max(100, interval))
+        self._perf_timer.start()
+        self._tick_perf_overlay()
+        self._perf_label.show()
+        self._perf_label.raise_()
+
+    def _tick_perf_overlay(self):
+        try:
+            self._perf_label.setText('\n'.join(P.overlay_lines()))
+            self._perf_label.adjustSize()
+            self._perf_label.move(max(0, self.width() - self._perf_label.width() - 8), 36)
+            self._perf_label.raise_()
+        except Exception:
+            pass
+
+    def dump_perf(self):
+        try:
+            path = P.dump()
+            self.log.append({'type': 'info', 'text': f'性能数据已导出: {path}'})
+        except Exception as e:
+            self.log.append({'type': 'error', 'text': f'性能数据导出失败: {e}'})
+
+    def prof_cmd(self, cmd: str):
+        """经控制器执行 prof 命令并把结果写入日志；定时采样在到时后回报结果文件。"""
+        try:
+            out = self.app_ctx._send(cmd)
+            msgs = out[0] if isinstance(out, tuple) else out
+            for m in msgs or []:
+                for line in str(m).splitlines():
+                    self.log.append({'type': 'info', 'text': line})
+        except Exception as e:
+            self.log.append({'type': 'error', 'text': f'{cmd} 失败: {e}'})
+            return
+        parts = cmd.split()
+        if len(parts) >= 3 and parts[1] == 'start':
+            try:
+                QtCore.QTimer.singleShot(int(float(parts[2]) * 1000) + 300, lambda: self.prof_cmd('prof status'))
+            except Exception:
+                pass
+
     # --- overlay helpers ---
     def _wrap_resize(self, orig):
         def _wrapped(event):
             try:
                 self._overlay.setGeometry(self.rect())
+                self._layout_overlay()
             except Exception:
                 pass
             return orig(event)
         return _wrapped
 
+    def _layout_overlay(self):
+        r = self._overlay.rect()
+        self._overlay_label.setGeometry(0, r.height() // 2 - 30, r.width(), 30)
+        self._overlay_bar.move((r.width() - self._overlay_bar.width()) // 2, r.height() // 2 + 8)
+
+    def set_scene_progress(self, text: str, fraction=None):
+        """Update overlay text/bar; fraction None -> busy indicator."""
+        try:
+            self._overlay_label.setText(text)
+            if fraction is None:
+                self._overlay_bar.setRange(0, 0)
+            else:
+                self._overlay_bar.setRange(0, 100)
+                self._overlay_bar.setValue(int(fraction * 100))
+        except Exception:
+            pass
+
     def show_scene_overlay(self):
         try:
             self._overlay.setGeometry(self.rect())
+            self._layout_overlay()
+            self.set_scene_progress("正在切换场景…")
             self._overlay.setWindowOpacity(0.0)
             self._overlay.show()
             self._overlay.raise_()
@@ -123,28 +123,11 @@ class MenuWindow(QtWidgets.QMainWindow):
             self._update_profile()
 
     def _list_saves(self):
-        items = []
         try:
-            udir = CFG.user_data_dir()
-            for fn in os.listdir(udir):
-                if not (fn.startswith('save_') and fn.endswith('.json')):
-                    continue
-                path = os.path.join(udir, fn)
-                name = None
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        name = (data.get('player') or {}).get('name')
-                except Exception:
-                    pass
-                if not name:
-                    base = os.path.splitext(fn)[0]
-                    name = base.replace('save_', '')
-                label = f"{name}  ({fn})"
-                items.append({'name': name, 'path': path, 'label': label})
+            from src.core.save_state import SaveManager
+            return SaveManager.list_saves()
         except Exception:
-            pass
-        return items
+            return []
 
     def _menu_choose_save(self):
         dlg = QtWidgets.QDialog(self)
@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional
 
 from ..qt_compat import QtWidgets, QtCore  # type: ignore
 from ..widgets.card import CardWidget
+from src.core import perf as P
 
 
 class BattlefieldView(QtWidgets.QWidget):
@@ -13,6 +14,7 @@ class BattlefieldView(QtWidgets.QWidget):
     - Show allies/enemies from controller game
     - Click selection callback to app_ctx (updates selected indexes)
     - Basic highlight via stylesheets could be layered in later
+    - Above `ui.battlefield.aggregate_above` units a side shows a scrolling list grouped by name
     """
 
     COLS = 3
@@ -84,13 +86,14 @@ class BattlefieldView(QtWidgets.QWidget):
         self.grp_enemies.setLayout(_en_v)
 
     # --- public ---
+    @P.timed('render', 'battlefield')
     def render_from_game(self, game):
         try:
-            self._allies = list(getattr(getattr(game, 'player', None), 'board', []) or [])[:15]
+            self._allies = list(getattr(getattr(game, 'player', None), 'board', []) or [])
         except Exception:
             self._allies = []
         try:
-            self._enemies = list(getattr(game, 'enemies', []) or [])[:15]
+            self._enemies = list(getattr(game, 'enemies', []) or [])
         except Exception:
             self._enemies = []
         self._render_side(False)
@@ -112,6 +115,10 @@ class BattlefieldView(QtWidgets.QWidget):
                 w.deleteLater()
 
         items = self._enemies if is_enemy else self._allies
+        from src.ui.battlefield_model import aggregate_above
+        if len(items) > aggregate_above():
+            grid.addWidget(self._create_group_list(items, is_enemy), 0, 0)
+            return
         cols = self.COLS
         for idx, tok in enumerate(items):
             row = idx // cols
@@ -132,6 +139,25 @@ class BattlefieldView(QtWidgets.QWidget):
         except Exception:
             pass
 
+    def _create_group_list(self, items: List[object], is_enemy: bool) -> QtWidgets.QListWidget:
+        """Grouped rows (name ×N, attack, HP); clicking selects the group's first alive unit."""
+        from src.ui.battlefield_model import aggregate, group_text
+        groups = aggregate(items)
+        lst = QtWidgets.QListWidget()
+        lst.setMinimumWidth(self.COLS * int(getattr(self.app_ctx, 'CARD_W', 92)))
+        lst.setMinimumHeight(3 * int(getattr(self.app_ctx, 'CARD_H', 112)))
+        for g in groups:
+            lst.addItem(group_text(g))
+        def _clicked(_item=None):
+            row = lst.currentRow()
+            if 0 <= row < len(groups):
+                g = groups[row]
+                idx = g.first_alive or g.first
+                if idx:
+                    self._on_click(idx, is_enemy, lst)
+        lst.itemClicked.connect(_clicked)
+        return lst
+
     def _create_card(self, token: object, index1: int, is_enemy: bool) -> QtWidgets.QFrame:
         card = CardWidget(self.app_ctx, token, index1, is_enemy=is_enemy)
         card.setFixedSize(self.app_ctx.CARD_W, self.app_ctx.CARD_H)
@@ -210,21 +236,30 @@ class BattlefieldView(QtWidgets.QWidget):
                 apply(card, self.app_ctx.HL['cand_ally_border'], self.app_ctx.HL['cand_ally_bg'])
 
     # --- targeted refresh & feedback ---
-    def refresh_model(self, model: object, *, is_enemy: bool):
+    def _index_of(self, model: object, is_enemy: bool) -> Optional[int]:
+        """1-based position of model on the rendered side; registry lookup, verified against the snapshot."""
         items = self._enemies if is_enemy else self._allies
+        reg = getattr(getattr(getattr(self.app_ctx, 'controller', None), 'game', None), 'registry', None)
+        if reg is not None:
+            idx = reg.index_of(model)
+            if idx is not None and idx <= len(items) and items[idx - 1] is model:
+                return idx
         try:
-            idx = items.index(model) + 1
+            return items.index(model) + 1
         except ValueError:
+            return None
+
+    def refresh_model(self, model: object, *, is_enemy: bool):
+        idx = self._index_of(model, is_enemy)
+        if idx is None:
             return
         card = (self._enemy_cards if is_enemy else self._ally_cards).get(idx)
         if isinstance(card, CardWidget):
             card.refresh(model)
 
     def flash_card(self, model: object, *, is_enemy: bool, kind: str = 'damage'):
-        items = self._enemies if is_enemy else self._allies
-        try:
-            idx = items.index(model) + 1
-        except ValueError:
+        idx = self._index_of(model, is_enemy)
+        if idx is None:
             return
         card = (self._enemy_cards if is_enemy else self._ally_cards).get(idx)
         if not card:
@@ -3,8 +3,6 @@ from __future__ import annotations
 from typing import Optional
 
 from ..qt_compat import QtWidgets, QtCore
-from src import app_config as CFG
-import json
 
 
 class OperationsPopup(QtWidgets.QFrame):
@@ -125,20 +123,13 @@ class OperationsPopup(QtWidgets.QFrame):
         return out
 
     def _load_skill_catalog(self):
-        try:
-            p = CFG.skills_catalog_path()
-            with open(p, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if isinstance(data, dict) and isinstance(data.get('skills'), list):
-                return {rec.get('id'): rec for rec in data['skills'] if isinstance(rec, dict) and rec.get('id')}
-        except Exception:
-            return {}
-        return {}
+        from src.systems.skill_registry import get_registry
+        return get_registry().catalog()
 
     def _has_stamina_for(self, sid: str, cost_default: int = 1) -> bool:
         try:
-            from src import settings as S
-            cost = int(S.get_skill_cost(sid, cost_default))
+            from src.systems.skill_registry import get_registry
+            cost = get_registry().cost(sid, cost_default)
             board = self.app_ctx.controller.game.player.board
             m = board[self.member_index - 1]
             return int(getattr(m, 'stamina', 0)) >= cost
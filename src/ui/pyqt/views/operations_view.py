@@ -20,6 +20,7 @@ class OperationsRow:
         h.addStretch(1)
 
     def _run(self, cmd: str):
-        self.app_ctx._send(cmd)
+        # background execution; UI refresh is event-driven as before
+        self.app_ctx.submit(cmd, done=lambda _out: None)
 
 
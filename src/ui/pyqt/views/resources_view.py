@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from typing import Optional
 
-from ..qt_compat import QtWidgets  # type: ignore
+from ..qt_compat import QtWidgets, QtGui  # type: ignore
 
 from src import app_config as CFG
+from src.core import perf as P
+from src.ui.inventory_model import InventoryViewModel, ResourceViewModel, apply_to_list
 
 
 class ResourcesView:
@@ -20,74 +22,87 @@ class ResourcesView:
         self._vlist.setSpacing(4)
         v.addWidget(self._container)
         self._inv: Optional[QtWidgets.QListWidget] = None
+        # 视图模型：直接读取背包/配方簿/场景资源，产出逐行变更
+        self._inv_vm = InventoryViewModel()
+        self._res_vm = ResourceViewModel()
+        self._res_btns: list = []
+        self._empty: Optional[QtWidgets.QLabel] = None
 
     def bind_inventory(self, inv: QtWidgets.QListWidget) -> None:
         self._inv = inv
+        self._inv_vm.set_game(None)
 
+    def _game(self):
+        return getattr(self.app_ctx.controller, 'game', None)
+
+    @P.timed('render', 'resources')
     def render(self) -> None:
-        g = getattr(self.app_ctx.controller, 'game', None)
+        """按视图模型的逐行变更增删/改写资源按钮（布局末尾保留一个伸缩项）。"""
+        g = self._game()
         if not g:
             return
-        try:
-            state = g.get_state()
-            resources = state.get('resources', [])
-        except Exception:
-            resources = []
-
-        # Clear existing buttons
-        while self._vlist.count():
-            item = self._vlist.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.deleteLater()
-
-        if not resources:
-            lbl = QtWidgets.QLabel("(空)")
-            lbl.setStyleSheet("color:#888;")
-            self._vlist.addWidget(lbl)
+        vm = self._res_vm
+        if vm.set_game(g):
+            while self._vlist.count():
+                item = self._vlist.takeAt(0)
+                w = item.widget()
+                if w is not None:
+                    w.deleteLater()
+            self._res_btns = []
+            self._empty = QtWidgets.QLabel("(空)")
+            self._empty.setStyleSheet("color:#888;")
+            self._vlist.addWidget(self._empty)
             self._vlist.addStretch(1)
-            return
 
-        for i, r in enumerate(resources, start=1):
-            name = self._fmt_res_text(r)
-            btn = QtWidgets.QPushButton(name)
+        def insert(i, row):
+            btn = QtWidgets.QPushButton(row.text)
             btn.setFixedHeight(26)
-            btn.clicked.connect(lambda _=False, idx=i: self._pick_resource(idx))
-            self._vlist.addWidget(btn)
-        self._vlist.addStretch(1)
+            btn.clicked.connect(lambda _=False, rid=row.id: self._pick_row(rid))
+            # 布局顺序：占位标签、按钮...、伸缩项
+            self._vlist.insertWidget(1 + i, btn)
+            self._res_btns.insert(i, btn)
+
+        def update(i, row):
+            self._res_btns[i].setText(row.text)
+
+        def remove(i):
+            btn = self._res_btns.pop(i)
+            self._vlist.removeWidget(btn)
+            btn.deleteLater()
+
+        apply_to_list(vm.refresh(), insert, update, remove)
+        self._empty.setVisible(not self._res_btns)
+
+    def _pick_row(self, row_id: str) -> None:
+        tok = self._res_vm.token_of(row_id)
+        if tok:
+            self._pick_resource(int(tok[1:]))
 
+    @P.timed('render', 'inventory')
     def render_inventory(self) -> None:
-        if not self._inv:
+        """按视图模型的逐行变更插入/改写/删除背包列表项。"""
+        lst = self._inv
+        if not lst:
             return
-        try:
-            text = self.app_ctx.controller._section_inventory()
-        except Exception:
-            text = ''
-        self._inv.clear()
-        for line in (text or '').splitlines():
-            s = (line or '').strip().rstrip()
-            if not s:
-                continue
-            if s.endswith('):') or s.endswith(':'):
-                continue
-            self._inv.addItem(s)
+        vm = self._inv_vm
+        if vm.set_game(self._game()):
+            lst.clear()
+
+        def insert(i, row):
+            lst.insertItem(i, row.text)
+            if row.kind == 'empty':
+                lst.item(i).setForeground(QtGui.QColor('#888888'))
+
+        def update(i, row):
+            lst.item(i).setText(row.text)
+
+        apply_to_list(vm.refresh(), insert, update, lambda i: lst.takeItem(i))
 
     def _pick_resource(self, idx: int) -> None:
-        self.app_ctx._send(f"t r{idx}")
-        # partial refresh
+        # partial refresh once the background command has landed
+        self.app_ctx.submit(f"t r{idx}", done=lambda _out: self._refresh_after_pick())
+
+    def _refresh_after_pick(self) -> None:
         self.render()
         self.render_inventory()
 
-    def _fmt_res_text(self, r) -> str:
-        try:
-            if isinstance(r, dict):
-                name = r.get('name') or r.get('title') or str(r)
-                rtype = r.get('type')
-            else:
-                name = str(r)
-                rtype = None
-        except Exception:
-            name, rtype = str(r), None
-        return f"{name}" + (f" ({rtype})" if rtype else "")
-
-
@@ -0,0 +1,85 @@
+"""场景切换进度（Tk 与 PyQt 共用）
+
+切换不再固定等待 `delay_ms`：遮罩出现后，新场景在后台加载（命令执行器线程），遮罩上显示加载进度；
+已开始的死亡/飘字动画照常播放，等到“最短展示时间”和“加载完成”两者都满足时立即换上新场景：
+
+    tr = SceneTransition()            # 最短展示时间取 settings ui.tk.scene_transition.min_ms
+    tr.progress(payload)              # scene_loading 事件：{scene_path, done, total}
+    tr.mark_loaded(title)             # scene_changed 事件 / 后台开局完成
+    if tr.ready():                    # 界面定时器里检查（Tk after / Qt QTimer）
+        ...                           # 拆旧 UI、重建、隐藏遮罩
+    tr.text()                         # '正在加载场景… 12/40' / '正在进入：高地营地'
+
+加载时间短于最短展示时间时按最短时间切换；加载更久时在加载完成的下一次检查即切换。
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+DEFAULT_MIN_MS = 400
+
+
+def min_ms() -> int:
+    try:
+        from src import settings as S
+        st = ((S.current().ui.get('tk') or {}).get('scene_transition') or {})
+        return max(0, int(st.get('min_ms', st.get('delay_ms', DEFAULT_MIN_MS))))
+    except Exception:
+        return DEFAULT_MIN_MS
+
+
+class SceneTransition:
+    def __init__(self, min_ms_: Optional[int] = None, loaded: bool = False) -> None:
+        self.t0 = time.perf_counter()
+        self.min_ms = min_ms() if min_ms_ is None else max(0, int(min_ms_))
+        self.loaded = loaded
+        self.done = 0
+        self.total = 0
+        self.scene: Optional[str] = None
+        self.title: Optional[str] = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def remaining_ms(self) -> int:
+        """距最短展示时间结束的毫秒数（已满足为 0）。"""
+        return max(0, int(self.min_ms - self.elapsed_ms()))
+
+    def progress(self, payload: Optional[dict]) -> None:
+        p = payload or {}
+        try:
+            self.done = int(p.get('done', self.done) or 0)
+            self.total = int(p.get('total', self.total) or 0)
+        except Exception:
+            pass
+        if p.get('scene_path'):
+            self.scene = str(p.get('scene_path'))
+
+    def mark_loaded(self, title: Optional[str] = None) -> None:
+        self.loaded = True
+        if title:
+            self.title = str(title)
+        if self.total:
+            self.done = self.total
+
+    def fraction(self) -> Optional[float]:
+        """加载进度 0..1；未知总量时为 None（界面显示为不确定进度）。"""
+        if self.loaded:
+            return 1.0
+        if self.total > 0:
+            return min(1.0, self.done / float(self.total))
+        return None
+
+    def ready(self) -> bool:
+        return self.loaded and self.elapsed_ms() >= self.min_ms
+
+    def text(self) -> str:
+        if self.loaded:
+            return f"正在进入：{self.title}" if self.title else "正在切换场景…"
+        if self.total > 0:
+            return f"正在加载场景… {self.done}/{self.total}"
+        return "正在加载场景…"
+
+
+__all__ = ['SceneTransition', 'min_ms', 'DEFAULT_MIN_MS']
@@ -98,6 +98,13 @@ def src_int_gte_tgt_int(app, src_token: str, tgt_token: str) -> bool:
         return False
 
 def _resolve_token(app, token: str) -> Any:
+    game = app.controller.game
+    reg = getattr(game, 'registry', None)
+    if reg is not None:
+        ent = reg.resolve(token)
+        if ent is None:
+            raise ValueError('bad token')
+        return ent
     if token.startswith('e'):
         i = int(token[1:]) - 1
         return app.controller.game.enemies[i]
@@ -3,9 +3,7 @@ Can be overridden or provided dynamically from backend later.
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from src import app_config as CFG
 from typing import Callable, List, Optional, Dict, Any
-import os, json
 
 @dataclass
 class SkillTargetSpec:
@@ -18,29 +16,74 @@ class SkillTargetSpec:
     fallback: str = 'cancel'   # 'random' | 'cancel' | 'prompt'
     predicates: List[str] = field(default_factory=list)
 
+class _SpecTable(dict):
+    """Spec table that overlays registry specs on first read (not at import time).
+
+    Building the registry parses skills_catalog.json; deferring it keeps module import cheap
+    on the startup path.
+    """
+
+    _loaded = False
+
+    def _ensure(self) -> None:
+        if not self._loaded:
+            self._loaded = True
+            ovr = _load_overrides()
+            if ovr:
+                dict.update(self, ovr)
+
+    def __getitem__(self, key):
+        self._ensure()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._ensure()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        self._ensure()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._ensure()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._ensure()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._ensure()
+        return dict.keys(self)
+
+    def values(self):
+        self._ensure()
+        return dict.values(self)
+
+    def items(self):
+        self._ensure()
+        return dict.items(self)
+
+
 # Default specs; backend may provide authoritative ones.
-DEFAULT_SPECS: Dict[str, SkillTargetSpec] = {
+DEFAULT_SPECS: Dict[str, SkillTargetSpec] = _SpecTable({
     'attack': SkillTargetSpec(team='enemy', select='single', min_targets=1, max_targets=1, predicates=['is_alive','can_be_attacked']),
     'basic_heal': SkillTargetSpec(team='ally', select='single', min_targets=1, max_targets=1, excludes_self=True, predicates=['is_alive','is_wounded']),
     'drain': SkillTargetSpec(team='enemy', select='single', min_targets=1, max_targets=1, predicates=['is_alive','can_be_attacked']),
     'taunt': SkillTargetSpec(team='self', select='none'),
     'sweep': SkillTargetSpec(team='enemy', select='aoe', predicates=['is_alive','can_be_attacked']),
     'arcane_missiles': SkillTargetSpec(team='enemy', select='single', min_targets=0, max_targets=1, allow_random=True, predicates=['is_alive','can_be_attacked']),
-}
+})
 
-# Attempt to overlay from external catalog if present
+# Overlay target specs from the unified skill registry (built from the external catalog)
 def _load_overrides() -> Dict[str, SkillTargetSpec]:
     try:
-        p = CFG.skills_catalog_path()
-        with open(p, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        from src.systems.skill_registry import get_registry
         out: Dict[str, SkillTargetSpec] = {}
-        for rec in (data.get('skills') or []):
-            if not isinstance(rec, dict):
-                continue
-            sid = rec.get('id')
-            spec = rec.get('spec') or {}
-            if not sid or not isinstance(spec, dict):
+        for d in get_registry().all():
+            sid = d.id
+            spec = d.spec or {}
+            if not spec or not isinstance(spec, dict):
                 continue
             out[sid] = SkillTargetSpec(
                 team=spec.get('team','enemy'),
@@ -56,7 +99,3 @@ def _load_overrides() -> Dict[str, SkillTargetSpec]:
     except Exception:
         return {}
 
-_OVR = _load_overrides()
-if _OVR:
-    DEFAULT_SPECS.update(_OVR)
-
@@ -14,29 +14,31 @@ from src import app_config as CFG
 import json
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from src.game_modes.pve_controller import SimplePvEController
 from .. import colors as C
 from . import ui_utils as U
-from .dialogs.equipment_dialog import EquipmentDialog
 from . import animations as ANIM
 from .views import EnemiesView, AlliesView, ResourcesView, OperationsView
 from .views.battlefield_view import BattlefieldView
 from .widgets.log_pane import LogPane
-from src.ui.targeting.specs import DEFAULT_SPECS, SkillTargetSpec
 from src.ui.targeting.fsm import TargetingEngine
 from .controllers.selection_controller import SelectionController
 # Inline 选择：不使用弹窗选择器
-from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event
+from src.core.events import subscribe_ui as subscribe_event, unsubscribe as unsubscribe_event
 # --- new: runtime settings ---
 from src import settings as S
+from src.core import perf as P
+from src.ui.command_executor import CommandExecutor
 
 try:
 	from main import load_config, save_config, discover_packs, _pick_default_main  # type: ignore
 except Exception:  # pragma: no cover
 	load_config = save_config = discover_packs = _pick_default_main = None  # type: ignore
 
+if TYPE_CHECKING:  # 游戏引擎在开局时才导入，菜单出现前不加载
+	from src.game_modes.pve_controller import SimplePvEController
+
 
 class GameTkApp:
 	# ---------------------------------------------------------------------------
@@ -50,7 +52,8 @@ class GameTkApp:
 	# - _send: 统一命令入口, 兼容旧动词(a/eq/uneq/t/u/craft/back/end/skill等)后转发控制器。
 
 	# 事件(来自模型/控制器)
-	# - _on_event_scene_changed: 场景切换; 进入 UI 抑制窗口 -> 清理选择态 -> 播放过渡层 -> 延后重建视图。
+	# - _on_event_scene_loading/_on_event_scene_changed: 场景切换; 进入 UI 抑制窗口 -> 清理选择态 -> 过渡层显示加载进度 -> 就绪后重建视图。
+	# - _begin_scene_transition/_tick_scene_transition/_swap_scene: 过渡计时（淡入/进度/就绪检查）与切换时刻的重建。
 
 	# 菜单/主界面
 	# - _build_menu: 主菜单 UI(开始/改名/选择地图组/刷新/退出)。
@@ -73,9 +76,11 @@ class GameTkApp:
 	# - _append_info/_append_log: 统一写入战斗日志(支持结构化 dict)。
 	# - _selected_index/_pick_resource: 列表选择与资源拾取(局部刷新)。
 	# - _run_cmd/_after_cmd: 运行控制器命令并落地日志/状态快照。
+	# - _toggle_perf_overlay/_dump_perf: F3 性能浮层 / Ctrl+F3 导出计时 JSON。
+	# - _prof_cmd: 工具菜单的采样分析（prof start/stop），结果写入日志目录。
 
 	# 生命周期
-	# - _start_game: 进入游戏模式, 绑定视图上下文, 输出初始状态并全量刷新。
+	# - _start_game: 进入游戏模式; 控制器与首个场景在命令线程创建/加载, 过渡层显示进度, 就绪后绑定视图并全量刷新。
 	# - _back_to_menu: 返回主菜单, 卸载视图并清理。
 	# - run/_on_close: 进入 Tk 主循环/关闭前取消订阅与销毁窗口。
 	# - run_tk: 外部启动入口函数(脚本/打包共用)。
@@ -119,9 +124,24 @@ class GameTkApp:
 		try:
 			S.apply_console_theme()
 			S.apply_to_tk_app(self)
+			# 可选热重载：主线程定时检查用户配置文件，变化后重新应用
+			if S.current().hot_reload:
+				self.root.after(S.current().hot_reload_ms, self._poll_settings)
+		except Exception:
+			pass
+		# 性能浮层：F3 显示/隐藏，Ctrl+F3 导出 JSON（settings perf.enabled 时启动即计时）
+		self._perf_label = None
+		self._perf_after = None
+		try:
+			P.configure_from_settings()
+			self.root.bind('<F3>', lambda _e: self._toggle_perf_overlay())
+			self.root.bind('<Control-F3>', lambda _e: self._dump_perf())
 		except Exception:
 			pass
 
+		# 后台命令执行器：技能结算/场景切换/存档与日志写入不阻塞界面；超过阈值才显示忙碌
+		self.executor = CommandExecutor(on_busy=self._set_busy, on_error=self._log_exception)
+
 		# 启动事件驱动的被动系统（幂等）
 		try:
 			from src.systems import passives_system as PS
@@ -143,9 +163,14 @@ class GameTkApp:
 		self._pending_resource_refresh = False
 		self._pending_ops_refresh = False
 
-		# 订阅核心事件（场景变更）+ 挂载视图单例订阅其自有事件
+		# 场景切换过渡（SceneTransition；None 表示未在切换）
+		self._scene_tr = None
+		self._scene_on_ready = None
+
+		# 订阅核心事件（场景加载/变更）+ 挂载视图单例订阅其自有事件
 		self._event_handlers = []
 		try:
+			self._event_handlers.append(('scene_loading', subscribe_event('scene_loading', self._on_event_scene_loading)))
 			self._event_handlers.append(('scene_changed', subscribe_event('scene_changed', self._on_event_scene_changed)))
 		except Exception:
 			pass
@@ -217,16 +242,11 @@ class GameTkApp:
 		except Exception as e:
 			self._log_exception(e, '_reset_highlights')
 
-	def _send(self, cmd: str):
-		"""Normalize higher-level command names to controller tokens and send.
-
-		This preserves backward compatibility with existing controller verbs.
-		"""
-		if not self.controller:
-			return [], {}
-		parts = cmd.split()
+	def _map_cmd(self, cmd: str) -> str:
+		"""把界面使用的命令别名映射为控制器命令词；空命令返回空串。"""
+		parts = (cmd or '').split()
 		if not parts:
-			return [], {}
+			return ''
 		verb = parts[0].lower()
 		rest = parts[1:]
 		alias = {
@@ -244,22 +264,104 @@ class GameTkApp:
 			's': 's',
 		}
 		mapped = alias.get(verb, verb)
-		mapped_cmd = ' '.join([mapped] + rest)
+		return ' '.join([mapped] + rest)
+
+	def _send(self, cmd: str):
+		"""Normalize higher-level command names to controller tokens and send.
+
+		Runs synchronously on the UI thread (holding the executor's game lock);
+		interactive commands go through `_submit` instead.
+		"""
+		if not self.controller:
+			return [], {}
+		mapped_cmd = self._map_cmd(cmd)
+		if not mapped_cmd:
+			return [], {}
 		try:
-			out = self.controller._process_command(mapped_cmd)
-			return out
+			return self.executor.run_sync(lambda: self.controller._process_command(mapped_cmd))
 		except Exception as e:
 			self._log_exception(e, f'_send {mapped_cmd}')
 			return [], {}
 
+	def _submit(self, cmd: str, then=None, land=None) -> bool:
+		"""后台执行命令：控制器处理与日志文件写入在执行器线程完成，结果回到界面线程落地。
+
+		land(out) 替代默认落地（`_after_cmd`）；then() 在落地之后调用（恢复高亮等）。
+		已有命令在执行时忽略本次提交并返回 False。
+		"""
+		if not self.controller:
+			return False
+		mapped_cmd = self._map_cmd(cmd)
+		if not mapped_cmd:
+			return False
+		ctrl = self.controller
+		persist = land is None
+
+		def work():
+			out = ctrl._process_command(mapped_cmd)
+			err = self._persist_cmd_log(self._first_out(out), ctrl) if persist else None
+			return out, err
+
+		def done(res):
+			out, err = res
+			if err is not None:
+				self._log_exception(err, '_after_cmd_log')
+			if land is not None:
+				land(out)
+			else:
+				self._after_cmd(self._first_out(out), persisted=True)
+			if then is not None:
+				then()
+
+		if not self.executor.submit(work, done, label=mapped_cmd):
+			return False
+		self._watch_cmd()
+		return True
+
+	def _watch_cmd(self):
+		"""命令提交后：开始轮询结果，并在超过忙碌阈值时禁用输入。"""
+		ex = self.executor
+		if ex.busy:
+			self.root.after(ex.poll_ms, self._poll_cmds)
+			self.root.after(ex.busy_ms, ex.check_busy)
+
+	def _poll_cmds(self):
+		"""轮询执行器：落地已完成的命令，仍在执行则继续轮询。"""
+		try:
+			if self.executor.poll():
+				self.root.after(self.executor.poll_ms, self._poll_cmds)
+		except Exception as e:
+			self._log_exception(e, '_poll_cmds')
+
+	def _set_busy(self, on: bool):
+		"""慢命令期间禁用游戏区输入（tk busy 遮罩 + 等待光标）。"""
+		try:
+			w = str(self.frame_game)
+			if on:
+				self.root.tk.call('tk', 'busy', 'hold', w, '-cursor', 'watch')
+			else:
+				self.root.tk.call('tk', 'busy', 'forget', w)
+		except Exception:
+			try:
+				self.root.configure(cursor='watch' if on else '')
+			except Exception:
+				pass
+
+	@staticmethod
+	def _first_out(out):
+		try:
+			return out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
+		except Exception:
+			return out
+
 
 
 
 
 	# -------- Event handlers --------
 	def _on_event_scene_changed(self, _evt: str, payload: dict):
-		"""场景切换事件: 进入 UI 抑制期, 稍后全量刷新并清理选择/目标状态."""
-		# 场景切换: 立即更新标题与状态; 稍作延时让死亡/伤害浮字有机会展示, 然后再全量刷新。
+		"""场景切换事件: 进入 UI 抑制期, 新场景就绪且最短展示时间已到时重建子 UI 并清理选择/目标状态."""
+		# 场景切换: 立即更新标题与状态; 旧 UI 保留到切换时刻, 让死亡/伤害浮字继续播放。
 		try:
 			# 进入抑制窗口：期间的 UI 刷新请求被合并，待窗口结束后一次性处理
 			self._suspend_ui_updates = True
@@ -296,43 +398,102 @@ class GameTkApp:
 					pass
 		except Exception:
 			pass
-		# 杀掉所有子 UI（容器内容与订阅），播放切换动画占位
+		# 显示过渡层（若 scene_loading 已先行显示则沿用），新场景已由命令线程加载完成
 		try:
-			# 在展示过渡层前确保操作弹窗已隐藏，避免闪烁
-			ops = (getattr(self, 'views', {}) or {}).get('ops')
-			if ops and hasattr(ops, 'hide_popup'):
-				ops.hide_popup(force=True)
-			self._show_scene_transition()
-			self._teardown_children()
+			self._begin_scene_transition()
+			tr = self._scene_tr
+			if tr is not None:
+				tr.mark_loaded(payload.get('scene_title') or payload.get('scene_path'))
+		except Exception:
+			pass
+
+	def _on_event_scene_loading(self, _evt: str, payload: dict):
+		"""场景加载进度（命令执行期间提前送达）：显示过渡层并更新进度。"""
+		try:
+			self._begin_scene_transition()
+			if self._scene_tr is not None:
+				self._scene_tr.progress(payload)
+		except Exception:
+			pass
+
+	def _begin_scene_transition(self, on_ready=None):
+		"""进入场景切换：抑制 UI 刷新、显示过渡层，并启动过渡计时（淡入/进度/就绪检查共用一个定时器）。
+
+		on_ready 替代默认的就绪处理（`_swap_scene`）；已在切换中时沿用当前过渡。
+		"""
+		from src.ui.scene_transition import SceneTransition
+		if getattr(self, '_scene_tr', None) is not None:
+			if on_ready is not None:
+				self._scene_on_ready = on_ready
+			return
+		# 进入抑制窗口：期间的 UI 刷新请求被合并，待切换后一次性处理
+		self._suspend_ui_updates = True
+		self._scene_tr = SceneTransition()
+		self._scene_on_ready = on_ready
+		self._show_scene_transition()
+		self._tick_scene_transition()
+
+	def _tick_scene_transition(self):
+		"""过渡计时：推进淡入、刷新进度文字；新场景就绪且最短展示时间已到即切换。"""
+		tr = getattr(self, '_scene_tr', None)
+		if tr is None:
+			return
+		interval = int(getattr(self, '_overlay_fade_interval', 16))
+		try:
+			ov = getattr(self, '_scene_overlay', None)
+			if ov is not None:
+				target = float(getattr(self, '_overlay_target_alpha', 0.8))
+				step = float(getattr(self, '_overlay_fade_step', 0.1))
+				a = float(ov.attributes('-alpha'))
+				if a < target:
+					ov.attributes('-alpha', min(target, a + step))
+			self._update_scene_progress(tr)
 		except Exception:
 			pass
-		# 延迟再刷新，让死亡浮字短暂呈现
-		def _do_full():
+		if tr.ready():
+			self._scene_tr = None
+			cb = getattr(self, '_scene_on_ready', None) or self._swap_scene
+			self._scene_on_ready = None
 			try:
-				# 结束抑制窗口，重建子 UI
+				cb()
+			except Exception as e:
+				self._log_exception(e, 'scene_swap')
 				self._suspend_ui_updates = False
-				setattr(self, '_pending_battlefield_refresh', False)
-				# 重新绑定视图上下文并重建子 UI（视图自行订阅/渲染）
-				try:
-					self._bind_views_context()
-					self._build_children()
-					# 子 UI 重建后，先进行一次全量刷新，确保战场与资源数据已填充
-					try:
-						self.refresh_all(skip_info_log=True)
-					except Exception:
-						pass
-					# 等内容准备就绪后再移除过渡层，避免短暂空白闪烁
-					self._hide_scene_transition()
-				except Exception:
-					pass
+				self._hide_scene_transition()
+			return
+		# 仅剩最短展示时间时按剩余时间等待；淡入未完成或仍在加载时按淡入间隔推进
+		wait = interval
+		try:
+			ov = getattr(self, '_scene_overlay', None)
+			faded = ov is None or float(ov.attributes('-alpha')) >= float(getattr(self, '_overlay_target_alpha', 0.8))
+			if tr.loaded and faded:
+				wait = max(1, tr.remaining_ms())
+		except Exception:
+			pass
+		self.root.after(wait, self._tick_scene_transition)
+
+	def _swap_scene(self):
+		"""切换时刻：拆旧子 UI（含其订阅），重新绑定上下文并重建，全量刷新后移除过渡层。"""
+		try:
+			self._teardown_children()
+		except Exception:
+			pass
+		# 结束抑制窗口，重建子 UI
+		self._suspend_ui_updates = False
+		setattr(self, '_pending_battlefield_refresh', False)
+		# 重新绑定视图上下文并重建子 UI（视图自行订阅/渲染）
+		try:
+			self._bind_views_context()
+			self._build_children()
+			# 子 UI 重建后，先进行一次全量刷新，确保战场与资源数据已填充
+			try:
+				self.refresh_all(skip_info_log=True)
 			except Exception:
-				# 容错：若失败则静默
 				pass
-		try:
-			delay_ms = int(getattr(self, '_scene_switch_delay_ms', 250))
-			self.root.after(delay_ms, _do_full)
 		except Exception:
-			_do_full()
+			pass
+		# 等内容准备就绪后再移除过渡层，避免短暂空白闪烁
+		self._hide_scene_transition()
 
 
 	# -------- Menu --------
@@ -459,30 +620,12 @@ class GameTkApp:
 		ttk.Button(btns, text="取消", command=win.destroy).pack(side=tk.RIGHT, expand=True, fill=tk.X)
 
 	def _list_saves(self) -> list[dict]:
-		"""扫描用户目录中的存档文件，返回 [{name, path, label}]。"""
-		items: list[dict] = []
-		try:
-			udir = CFG.user_data_dir()
-			for fn in os.listdir(udir):
-				if not (fn.startswith('save_') and fn.endswith('.json')):
-					continue
-				path = os.path.join(udir, fn)
-				name = None
-				try:
-					with open(path, 'r', encoding='utf-8') as f:
-						data = json.load(f)
-						name = (data.get('player') or {}).get('name')
-				except Exception:
-					pass
-				if not name:
-					# 从文件名推断
-					base = os.path.splitext(fn)[0]
-					name = base.replace('save_', '')
-				label = f"{name}  ({fn})"
-				items.append({'name': name, 'path': path, 'label': label})
+		"""列出已有存档，返回 [{name, path, label}]（JSON 文件或 SQLite 存档库，见 SaveManager.list_saves）。"""
+		try:
+			from src.core.save_state import SaveManager
+			return SaveManager.list_saves()
 		except Exception:
-			pass
-		return items
+			return []
 
 	def _menu_choose_save(self):
 		"""弹出存档选择/新建对话框，并更新当前玩家名称。"""
@@ -563,6 +706,20 @@ class GameTkApp:
 				self.style = None
 		ttk.Label(top, textvariable=self.scene_var, font=("Segoe UI", 10, "bold")).pack(side=tk.LEFT)
 		ttk.Button(top, text="主菜单", command=self._back_to_menu, style="Tiny.TButton").pack(side=tk.RIGHT)
+		# 工具菜单：性能浮层/计时导出/主线程采样分析
+		try:
+			mb = ttk.Menubutton(top, text="工具")
+			tools = tk.Menu(mb, tearoff=0)
+			tools.add_command(label="性能浮层 (F3)", command=self._toggle_perf_overlay)
+			tools.add_command(label="导出计时 JSON (Ctrl+F3)", command=self._dump_perf)
+			tools.add_separator()
+			tools.add_command(label="采样分析 10 秒", command=lambda: self._prof_cmd('prof start 10'))
+			tools.add_command(label="开始采样分析", command=lambda: self._prof_cmd('prof start'))
+			tools.add_command(label="停止采样并保存", command=lambda: self._prof_cmd('prof stop'))
+			mb['menu'] = tools
+			mb.pack(side=tk.RIGHT, padx=(0, 4))
+		except Exception:
+			pass
 
 		# 顶部：战场区（镜像排列：右友方、左敌方），由 BattlefieldView 托管
 		arena = ttk.Frame(parent)
@@ -674,6 +831,7 @@ class GameTkApp:
 		# Allies/EnemiesView 已为占位实现，此处不再 attach 专用容器
 
 	# -------- Render --------
+	@P.timed('render', 'refresh_all')
 	def refresh_all(self, skip_info_log: bool = False):
 		"""已废弃：刷新交由子 UI 决定；此处仅做兼容性触发，直接让视图渲染自身。"""
 		if self.mode != 'game' or not self.controller:
@@ -711,13 +869,8 @@ class GameTkApp:
 		src = f"m{m_index}"
 		need_exec = self.target_engine.begin(src, name)
 		if need_exec:
-			# 无需目标（self/aoe），直接执行
-			out = self._send(f"skill {name} {src}")
-			try:
-				resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-			except Exception:
-				resp = out
-			self._after_cmd(resp)
+			# 无需目标（self/aoe），直接执行（后台结算，完成后由 _after_cmd 落地）
+			self._submit(f"skill {name} {src}")
 			# 立即清理目标会话与技能选择，避免阻塞后续点击
 			try:
 				self.selection.clear_all()
@@ -765,21 +918,17 @@ class GameTkApp:
 				selected = [self.skill_target_token]
 			# attack/heal 的直达命令
 			if name in (None, 'attack') and selected:
-				out = self._send(f"a {src} {selected[0]}")
+				cmd = f"a {src} {selected[0]}"
 			elif name == 'basic_heal' and selected:
 				# 走通用技能通道，控制器实现为 skill basic_heal mN mK
-				out = self._send(" ".join(["skill", "basic_heal", src, selected[0]]))
+				cmd = " ".join(["skill", "basic_heal", src, selected[0]])
 			else:
 				# 通用 skill
 				if selected:
-					out = self._send(" ".join(["skill", name or "", src] + selected).strip())
+					cmd = " ".join(["skill", name or "", src] + selected).strip()
 				else:
-					out = self._send(f"skill {name} {src}")
-			try:
-				resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-			except Exception:
-				resp = out
-			self._after_cmd(resp)
+					cmd = f"skill {name} {src}"
+			self._submit(cmd)
 		finally:
 			try:
 				self.selection.clear_all()
@@ -800,6 +949,79 @@ class GameTkApp:
 			except Exception:
 				pass
 
+	def _poll_settings(self):
+		"""热重载：配置版本变化时重新应用主题/尺寸/调色板并刷新界面。"""
+		try:
+			if S.check_reload():
+				S.apply_console_theme()
+				S.apply_to_tk_app(self)
+				if getattr(self, 'controller', None) is not None:
+					self.refresh_all(skip_info_log=True)
+		except Exception:
+			pass
+		try:
+			if S.current().hot_reload:
+				self.root.after(S.current().hot_reload_ms, self._poll_settings)
+		except Exception:
+			pass
+
+	def _toggle_perf_overlay(self):
+		"""显示/隐藏性能浮层；显示时开启计时，隐藏时按 settings perf.enabled 决定是否继续计时。"""
+		if self._perf_label is not None:
+			try:
+				if self._perf_after:
+					self.root.after_cancel(self._perf_after)
+				self._perf_label.destroy()
+			except Exception:
+				pass
+			self._perf_label = self._perf_after = None
+			P.enable(bool(P.config().get('enabled', False)))
+			return
+		P.enable(True)
+		try:
+			self._perf_label = tk.Label(self.root, justify='left', anchor='nw', bg='#111111', fg='#b8f5b0',
+				font=('Consolas', 9), padx=6, pady=4)
+			self._perf_label.place(relx=1.0, x=-8, y=36, anchor='ne')
+			self._tick_perf_overlay()
+		except Exception as e:
+			self._log_exception(e, 'perf overlay')
+
+	def _tick_perf_overlay(self):
+		lbl = self._perf_label
+		if lbl is None:
+			return
+		try:
+			lbl.configure(text='\n'.join(P.overlay_lines()))
+			lbl.lift()
+			self._perf_after = self.root.after(max(100, int(P.config().get('overlay_ms', 500))), self._tick_perf_overlay)
+		except Exception:
+			self._perf_after = None
+
+	def _dump_perf(self):
+		try:
+			path = P.dump()
+			self._append_log({'type': 'info', 'text': f'性能数据已导出: {path}'})
+		except Exception as e:
+			self._log_exception(e, 'perf dump')
+
+	def _prof_cmd(self, cmd: str):
+		"""经控制器执行 prof 命令并把结果写入日志；定时采样在到时后回报结果文件。"""
+		try:
+			out = self._send(cmd)
+			msgs = out[0] if isinstance(out, tuple) else out
+			for m in msgs or []:
+				for line in str(m).splitlines():
+					self._append_log({'type': 'info', 'text': line})
+		except Exception as e:
+			self._log_exception(e, cmd)
+			return
+		parts = cmd.split()
+		if len(parts) >= 3 and parts[1] == 'start':
+			try:
+				self.root.after(int(float(parts[2]) * 1000) + 300, lambda: self._prof_cmd('prof status'))
+			except Exception:
+				pass
+
 	def _update_target_highlights(self):
 		"""根据 TargetingEngine 的候选/已选，在卡片与敌人卡上应用高亮，不触发整页刷新。"""
 		try:
@@ -903,19 +1125,8 @@ class GameTkApp:
 				pass
 			slot = {'left': 'left', 'right': 'right', 'armor': 'armor'}.get(effective, effective)
 			token = f"m{m_index}"
-			out = self._send(f"uneq {token} {slot}")
-			try:
-				resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-			except Exception:
-				resp = out
-			self._after_cmd(resp)
-			# 命令执行后会清除高亮，这里恢复当前成员的选中高亮
-			try:
-				self.selected_member_index = m_index
-				if hasattr(self, 'selection') and hasattr(self.selection, 'reapply_highlights'):
-					self.selection.reapply_highlights()
-			except Exception:
-				pass
+			# 命令落地后会清除高亮，完成后恢复当前成员的选中高亮
+			self._submit(f"uneq {token} {slot}", then=lambda: self._reselect_member(m_index))
 		elif choice is False:
 			self._open_equip_dialog(m_index, slot_key)
 		else:
@@ -924,6 +1135,7 @@ class GameTkApp:
 	def _open_equip_dialog(self, m_index: int, slot_key: str):
 		"""打开装备管理对话框并根据返回结果发送装备指令。"""
 		# 使用新对话框实现，拿到结果后发起装备命令
+		from .dialogs.equipment_dialog import EquipmentDialog
 		dlg = EquipmentDialog(self, self.root, m_index, slot_key)
 		res = dlg.show()
 		if res is None:
@@ -936,13 +1148,11 @@ class GameTkApp:
 				pass
 			return
 		token = f"m{m_index}"
-		out = self._send(f"eq i{res} {token}")
-		try:
-			resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-		except Exception:
-			resp = out
-		self._after_cmd(resp)
-		# 恢复当前成员的选中高亮
+		# 完成后恢复当前成员的选中高亮
+		self._submit(f"eq i{res} {token}", then=lambda: self._reselect_member(m_index))
+
+	def _reselect_member(self, m_index: int):
+		"""命令落地（清除高亮）后恢复指定成员的选中高亮。"""
 		try:
 			self.selected_member_index = m_index
 			if hasattr(self, 'selection') and hasattr(self.selection, 'reapply_highlights'):
@@ -1013,13 +1223,14 @@ class GameTkApp:
 
 	def _pick_resource(self, idx: int):
 		"""轻量拾取资源：仅更新资源/背包与日志，不触发整页刷新。"""
-		out = self._send(f"t r{idx}")
-		try:
-			resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-		except Exception:
-			resp = out
-		# 仅写入持久日志文件
-		try:
+		ctrl = self.controller
+		if not ctrl:
+			return
+
+		def work():
+			out = ctrl._process_command(self._map_cmd(f"t r{idx}"))
+			resp = self._first_out(out)
+			# 仅写入持久日志文件（执行器线程内完成）
 			import os as _os
 			_logdir = CFG.log_dir()
 			_os.makedirs(_logdir, exist_ok=True)
@@ -1031,8 +1242,16 @@ class GameTkApp:
 						f.write(json.dumps(line, ensure_ascii=False) + "\n")
 					else:
 						f.write(str(line) + "\n")
-		except Exception as e:
+
+		def failed(e):
 			self._log_exception(e, '_pick_resource_log')
+			self._after_pick_resource()
+
+		if self.executor.submit(work, lambda _r: self._after_pick_resource(), error=failed, label='take'):
+			self._watch_cmd()
+
+	def _after_pick_resource(self):
+		"""拾取落地：局部刷新资源/背包并追加日志。"""
 		# 局部刷新：资源按钮与背包列表（委托 ResourcesView）
 		try:
 			v = self.views.get('resources')
@@ -1052,32 +1271,33 @@ class GameTkApp:
 
 
 	def _run_cmd(self, cmd: str):
-		"""直接运行控制器命令字符串，并统一追加到日志。"""
+		"""后台运行控制器命令字符串，完成后统一追加到日志。"""
 		if not self.controller:
 			return
-		out = self._send(cmd)
-		try:
-			resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-		except Exception:
-			resp = out
-		self._after_cmd(resp)
+		self._submit(cmd)
 
-	def _after_cmd(self, out_lines: list[str]):
-		"""命令执行后的统一落地：写日志文件与 UI，重置高亮与必要的局部刷新。"""
-		# 规范化输入：支持字符串/列表/元组，避免把字符串当可迭代逐字符写入导致卡顿
+	@staticmethod
+	def _cmd_lines(out_lines) -> list:
+		"""规范化命令输出：支持字符串/列表/元组，避免把字符串当可迭代逐字符写入导致卡顿"""
 		try:
 			if isinstance(out_lines, str):
-				lines = out_lines.splitlines() or [out_lines]
-			elif isinstance(out_lines, (list, tuple)):
-				lines = list(out_lines)
-			elif out_lines is None:
-				lines = []
-			else:
-				lines = [str(out_lines)]
+				return out_lines.splitlines() or [out_lines]
+			if isinstance(out_lines, (list, tuple)):
+				return list(out_lines)
+			if out_lines is None:
+				return []
+			return [str(out_lines)]
 		except Exception:
-			lines = []
-		# Tk 信息区不再逐行回显命令输出；改为统一展示 s5/s3
-		# append to persistent log file (cross-platform) and log widget
+			return []
+
+	def _persist_cmd_log(self, out_lines, ctrl=None):
+		"""把命令输出与游戏结构化日志追加到 game.log（可在执行器线程调用，不触碰界面）。
+
+		返回写入时的异常（无异常为 None），由界面线程记录。
+		"""
+		lines = self._cmd_lines(out_lines)
+		ctrl = ctrl or self.controller
+		# append to persistent log file (cross-platform)
 		try:
 			logdir = CFG.log_dir()
 			os.makedirs(logdir, exist_ok=True)
@@ -1098,7 +1318,7 @@ class GameTkApp:
 							pass
 				# consume game structured logs (e.g., DND to_hit/damage) -> only persist to file
 				try:
-					logs = self.controller.game.pop_logs()
+					logs = ctrl.game.pop_logs()
 					for L in logs:
 						try:
 							f.write(json.dumps(L, ensure_ascii=False) + "\n")
@@ -1107,7 +1327,19 @@ class GameTkApp:
 				except Exception:
 					pass
 		except Exception as e:
-			self._log_exception(e, '_after_cmd_log')
+			return e
+		return None
+
+	def _after_cmd(self, out_lines: list[str], persisted: bool = False):
+		"""命令执行后的统一落地：写日志文件与 UI，重置高亮与必要的局部刷新。
+
+		persisted 为真表示日志文件已由执行器线程写入（`_submit`）。
+		"""
+		# Tk 信息区不再逐行回显命令输出；改为统一展示 s5/s3
+		if not persisted:
+			err = self._persist_cmd_log(out_lines)
+			if err is not None:
+				self._log_exception(err, '_after_cmd_log')
 		# UI：把本次信息区细节附加到最新历史行之后
 		try:
 			self._append_action_log()
@@ -1145,38 +1377,75 @@ class GameTkApp:
 
 	# -------- Mode --------
 	def _start_game(self, player_name: str, initial_scene: Optional[str]):
-		"""进入游戏模式：创建控制器、绑定视图上下文、输出初始状态并全量刷新。"""
-		self.controller = SimplePvEController(player_name=player_name, initial_scene=initial_scene)
+		"""进入游戏模式：控制器与首个场景在命令线程创建/加载（过渡层显示进度），就绪后绑定视图上下文并全量刷新。"""
+		from src.game_modes.pve_controller import SimplePvEController
 		self.frame_menu.pack_forget()
 		self.frame_game.pack(fill=tk.BOTH, expand=True)
 		self.mode = 'game'
-		# 让视图持有 game 引用（直接绑定场景/实体），减少 app 层转发
+
+		def work():
+			ctrl = SimplePvEController(player_name=player_name, initial_scene=initial_scene)
+			self._write_scene_runtime(ctrl, player_name, initial_scene)
+			return ctrl
+
+		def done(ctrl):
+			if self.mode != 'game':
+				return
+			self.controller = ctrl
+			tr = getattr(self, '_scene_tr', None)
+			if tr is not None:
+				tr.mark_loaded(getattr(ctrl.game, 'current_scene_title', None))
+			else:
+				self._enter_game()
+
+		def failed(e):
+			self._scene_tr = None
+			self._suspend_ui_updates = False
+			self._log_exception(e, '_start_game')
+			self._back_to_menu()
+
+		self._begin_scene_transition(on_ready=self._enter_game)
+		if self.executor.submit(work, done, error=failed, label='start'):
+			self._watch_cmd()
+		else:
+			failed(RuntimeError('上一条命令仍在执行'))
+
+	def _enter_game(self):
+		"""首个场景就绪：让视图持有 game 引用（直接绑定场景/实体），全量刷新并移除过渡层。"""
+		self._suspend_ui_updates = False
+		if self.controller is None:
+			self._hide_scene_transition()
+			return
 		try:
 			self._bind_views_context()
 		except Exception:
 			pass
 		# 启动时不再打印信息区/历史区标题块，避免噪声
 		self.refresh_all(skip_info_log=True)
+		self._hide_scene_transition()
+
+	def _write_scene_runtime(self, ctrl, player_name: str, initial_scene: Optional[str]):
+		"""把开局状态写入 user_data_dir()/scene_runtime.txt（排查用；在命令线程执行）。"""
 		try:
 			path = os.path.join(CFG.user_data_dir(), 'scene_runtime.txt')
 			with open(path, 'w', encoding='utf-8') as f:
 				f.write(f"player_name: {player_name}\n")
 				f.write(f"initial_scene: {initial_scene}\n")
 				try:
-					f.write(f"current_scene: {self.controller.game.current_scene}\n")
+					f.write(f"current_scene: {ctrl.game.current_scene}\n")
 				except Exception:
 					f.write("current_scene: <error>\n")
 				try:
-					f.write(f"current_scene_title: {self.controller.game.current_scene_title}\n")
+					f.write(f"current_scene_title: {ctrl.game.current_scene_title}\n")
 				except Exception:
 					f.write("current_scene_title: <error>\n")
 				try:
 					f.write("--- full view ---\n")
-					f.write(self.controller._render_full_view() + "\n")
+					f.write(ctrl._render_full_view() + "\n")
 				except Exception:
 					f.write("<could not render full view>\n")
 				try:
-					logs = self.controller.game.pop_logs()
+					logs = ctrl.game.pop_logs()
 					f.write("--- logs ---\n")
 					for L in logs:
 						f.write(str(L) + "\n")
@@ -1194,6 +1463,9 @@ class GameTkApp:
 				ops.hide_popup(force=True)
 		except Exception:
 			pass
+		self._scene_tr = None
+		self._scene_on_ready = None
+		self._suspend_ui_updates = False
 		try:
 			self._hide_scene_transition()
 		except Exception:
@@ -1290,7 +1562,7 @@ class GameTkApp:
 			pass
 
 	def _show_scene_transition(self):
-		"""显示场景切换覆盖层（简单淡入）。"""
+		"""显示场景切换覆盖层（加载进度文字 + 进度条）；淡入由 `_tick_scene_transition` 推进。"""
 		try:
 			if hasattr(self, '_scene_overlay') and getattr(self, '_scene_overlay') is not None:
 				return
@@ -1306,8 +1578,12 @@ class GameTkApp:
 			ov.geometry(f"{self.root.winfo_width()}x{self.root.winfo_height()}+{self.root.winfo_rootx()}+{self.root.winfo_rooty()}")
 			frm = ttk.Frame(ov)
 			frm.pack(fill=tk.BOTH, expand=True)
-			lbl = ttk.Label(frm, text="正在切换场景…", font=("Segoe UI", 14, "bold"))
+			self._scene_progress_var = tk.StringVar(value="正在切换场景…")
+			lbl = ttk.Label(frm, textvariable=self._scene_progress_var, font=("Segoe UI", 14, "bold"))
 			lbl.place(relx=0.5, rely=0.5, anchor='center')
+			bar = ttk.Progressbar(frm, orient='horizontal', mode='indeterminate', length=260, maximum=100)
+			bar.place(relx=0.5, rely=0.5, y=32, anchor='center')
+			self._scene_progress_bar = bar
 			setattr(self, '_scene_overlay', ov)
 			# 随主窗口移动/缩放时同步覆盖层尺寸
 			def _sync_overlay_geometry(_e=None):
@@ -1320,23 +1596,34 @@ class GameTkApp:
 				setattr(self, '_scene_overlay_bind_id', bind_id)
 			except Exception:
 				setattr(self, '_scene_overlay_bind_id', None)
-			# 使用可配置的淡入参数
-			interval = int(getattr(self, '_overlay_fade_interval', 16))
-			step = float(getattr(self, '_overlay_fade_step', 0.1))
-			target = float(getattr(self, '_overlay_target_alpha', 0.8))
-			def fade_in(a: float = 0.0):
-				try:
-					if a >= target:
-						ov.attributes('-alpha', target)
-						return
-					ov.attributes('-alpha', a)
-					self.root.after(interval, lambda: fade_in(a + step))
-				except Exception:
-					pass
-			fade_in()
+			# 无过渡计时（直接调用）时立即显示到目标透明度
+			if getattr(self, '_scene_tr', None) is None:
+				ov.attributes('-alpha', float(getattr(self, '_overlay_target_alpha', 0.8)))
 		except Exception:
 			setattr(self, '_scene_overlay', None)
 
+	def _update_scene_progress(self, tr):
+		"""按过渡状态刷新覆盖层文字与进度条（总量未知时为滚动进度条）。"""
+		try:
+			self._scene_progress_var.set(tr.text())
+		except Exception:
+			pass
+		bar = getattr(self, '_scene_progress_bar', None)
+		if bar is None:
+			return
+		try:
+			frac = tr.fraction()
+			if frac is None:
+				if str(bar.cget('mode')) != 'indeterminate':
+					bar.configure(mode='indeterminate')
+				bar.step(4)
+			else:
+				if str(bar.cget('mode')) != 'determinate':
+					bar.configure(mode='determinate')
+				bar['value'] = frac * 100
+		except Exception:
+			pass
+
 	def _hide_scene_transition(self):
 		"""隐藏场景切换覆盖层。"""
 		ov = getattr(self, '_scene_overlay', None)
@@ -1355,6 +1642,7 @@ class GameTkApp:
 		except Exception:
 			pass
 		setattr(self, '_scene_overlay', None)
+		self._scene_progress_bar = None
 	def run(self):
 		"""启动 Tk 主循环并挂接关闭处理。"""
 		self.root.minsize(980, 700)
@@ -1362,6 +1650,14 @@ class GameTkApp:
 			self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 		except Exception:
 			pass
+		# --profile-startup：首帧绘制完成后输出启动报告（未启用时为空操作）
+		try:
+			from src import startup_profile as SP
+			if SP.enabled():
+				SP.mark('mainloop')
+				self.root.after_idle(SP.first_frame)
+		except Exception:
+			pass
 		self.root.mainloop()
 
 	def _on_close(self):
@@ -1381,6 +1677,10 @@ class GameTkApp:
 					unsubscribe_event(evt, cb)
 				except Exception:
 					pass
+			try:
+				self.executor.shutdown()
+			except Exception:
+				pass
 			# 强制隐藏顶层窗口（过渡层/操作弹窗/tooltip）避免 Tcl 命令残留
 			try:
 				ops = (getattr(self, 'views', {}) or {}).get('ops')
@@ -7,12 +7,8 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Any
 from . import ui_utils as U
-from src import app_config as CFG
-from src import settings as S
-import json, os
 
 
-_SKILL_CATALOG_CACHE: dict[str, dict] | None = None
 
 
 def compute_ac_for_model(app, m: Any, *, is_enemy: bool = False) -> int:
@@ -68,20 +64,9 @@ def compute_ac_for_model(app, m: Any, *, is_enemy: bool = False) -> int:
 
 
 def _skill_catalog() -> dict[str, dict]:
-    global _SKILL_CATALOG_CACHE
-    if _SKILL_CATALOG_CACHE is not None:
-        return _SKILL_CATALOG_CACHE
-    try:
-        p = CFG.skills_catalog_path()
-        with open(p, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if isinstance(data, dict) and isinstance(data.get('skills'), list):
-            _SKILL_CATALOG_CACHE = { rec.get('id'): rec for rec in data['skills'] if isinstance(rec, dict) and rec.get('id') }
-        else:
-            _SKILL_CATALOG_CACHE = {}
-    except Exception:
-        _SKILL_CATALOG_CACHE = {}
-    return _SKILL_CATALOG_CACHE
+    """技能目录（id -> 记录），来自统一技能注册表。"""
+    from src.systems.skill_registry import get_registry
+    return get_registry().catalog()
 
 
 def equipment_tooltip(item, label: str, *, is_enemy: bool | None = None, app=None) -> str:
@@ -131,7 +116,8 @@ def equipment_tooltip(item, label: str, *, is_enemy: bool | None = None, app=Non
             nm = rec.get('name_cn') or rec.get('name_en') or rid
             cost = 0
             try:
-                cost = int(getattr(S, 'get_skill_cost')(rid, 1))
+                from src.systems.skill_registry import get_registry
+                cost = get_registry().cost(rid, 1)
             except Exception:
                 cost = 1
             desc = rec.get('desc')
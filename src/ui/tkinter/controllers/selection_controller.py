@@ -109,14 +109,18 @@ class SelectionController:
             if need_exec:
                 # self/aoe or fallback(no candidates): try execute directly
                 try:
-                    out = self.app._send(f"skill {name} {src}")
-                    # app may have _after_cmd to handle rendering/log
-                    if hasattr(self.app, '_after_cmd'):
-                        try:
-                            resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
-                        except Exception:
-                            resp = out
-                        self.app._after_cmd(resp)
+                    if hasattr(self.app, '_submit'):
+                        # background execution; app lands the result via _after_cmd
+                        self.app._submit(f"skill {name} {src}")
+                    else:
+                        out = self.app._send(f"skill {name} {src}")
+                        # app may have _after_cmd to handle rendering/log
+                        if hasattr(self.app, '_after_cmd'):
+                            try:
+                                resp = out[0] if isinstance(out, (list, tuple)) and len(out) > 0 else out
+                            except Exception:
+                                resp = out
+                            self.app._after_cmd(resp)
                 finally:
                     self.clear_all()
                     try:
@@ -7,6 +7,9 @@ from typing import Optional
 class EquipmentDialog:
     """Modal dialog to pick an equipment for a member and slot.
     Returns the chosen inventory index (1-based) or None.
+
+    Candidates are shown in a canvas-based virtual grid (rarity borders, only visible cells
+    drawn); `inventory_changed` while the dialog is open updates individual cells.
     """
     def __init__(self, app, parent, m_index: int, slot_key: str):
         self.app = app
@@ -14,7 +17,7 @@ class EquipmentDialog:
         self.m_index = m_index
         self.slot_key = slot_key
         self.result: Optional[int] = None
-        self._index_map: list[int] = []
+        self._selected: Optional[str] = None
 
     def _fits_slot_and_ok(self, it, eq) -> bool:
         try:
@@ -57,6 +60,19 @@ class EquipmentDialog:
         flag_str = (" [" + ", ".join(flags) + "]") if flags else ""
         return f"{getattr(it, 'name', str(it))}{stat_str}{flag_str}"
 
+    def _rarity_color(self, rarity: str) -> str:
+        pal = ((getattr(self.app, '_equipment_cfg', {}) or {}).get('rarity_colors', {}) or {})
+        if not pal:
+            pal = {'common': '#BDBDBD', 'uncommon': '#4CAF50', 'rare': '#2196F3', 'epic': '#9C27B0', 'legendary': '#FF9800'}
+        return pal.get((rarity or 'common').lower(), '#BDBDBD')
+
+    def _member_eq(self):
+        try:
+            m = self.app.controller.game.player.board[self.m_index - 1]
+            return getattr(m, 'equipment', None)
+        except Exception:
+            return None
+
     def show(self) -> Optional[int]:
         top = tk.Toplevel(self.parent)
         top.title("选择装备")
@@ -77,46 +93,61 @@ class EquipmentDialog:
         ttk.Label(frm, text=f"为 m{self.m_index} 选择装备到 [{self.slot_key}]::").pack(anchor=tk.W)
         tip_var = tk.StringVar(value="")
         ttk.Label(frm, textvariable=tip_var, foreground="#666").pack(anchor=tk.W)
-        lb = tk.Listbox(frm, height=12)
-        lb.pack(fill=tk.BOTH, expand=True, pady=6)
+        from src.ui.inventory_model import EquipmentViewModel
+        from ..widgets.virtual_grid import VirtualGrid
+        gcfg = dict((getattr(self.app, '_equipment_cfg', {}) or {}).get('grid', {}) or {})
+        # 候选按槽位过滤（装备状态实时读取，卸下/换装后过滤结果随之变化）
+        vm = EquipmentViewModel(accept=lambda it: self._fits_slot_and_ok(it, self._member_eq()))
+        vm.set_game(self.app.controller.game)
+
+        def base_tip() -> str:
+            eq = self._member_eq()
+            if self.slot_key == 'right' and eq and getattr(eq, 'left_hand', None) and getattr(eq.left_hand, 'is_two_handed', False):
+                return '当前持双手武器，右手不可装备'
+            return '' if grid.rows else '暂无可装备的物品'
+
+        def on_hover(row):
+            it = vm.item_of(row.id) if row is not None else None
+            tip_var.set(self._fmt_label(it) if it is not None else base_tip())
+
+        def on_select(row):
+            self._selected = row.id
+            update_preview()
+
+        grid = VirtualGrid(frm, cell=int(gcfg.get('cell', 72)), cols=int(gcfg.get('cols', 6)),
+                           bg=str(gcfg.get('bg', '#f9f9fb')), line=str(gcfg.get('line', '#e5e7eb')),
+                           color_of=self._rarity_color, on_select=on_select,
+                           on_activate=lambda _row: do_confirm(), on_hover=on_hover)
+        grid.frame.pack(fill=tk.BOTH, expand=True, pady=6)
+        vm.refresh()
+        grid.set_rows(vm.rows)
         preview_var = tk.StringVar(value="")
         ttk.Label(frm, textvariable=preview_var, foreground="#0a0").pack(anchor=tk.W, pady=(0, 4))
+        tip_var.set(base_tip())
 
-        inv = self.app.controller.game.player.inventory
-        try:
-            m = self.app.controller.game.player.board[self.m_index - 1]
-            eq = getattr(m, 'equipment', None)
-        except Exception:
-            m = None
-            eq = None
-
-        blocked_msg = None
-        if self.slot_key == 'right' and eq and getattr(eq, 'left_hand', None) and getattr(eq.left_hand, 'is_two_handed', False):
-            blocked_msg = '当前持双手武器，右手不可装备'
-        for idx, slot in enumerate(inv.slots, 1):
-            it = slot.item
-            if self._fits_slot_and_ok(it, eq):
-                lb.insert(tk.END, f"i{idx}  {self._fmt_label(it)}")
-                self._index_map.append(idx)
-        if blocked_msg:
-            tip_var.set(blocked_msg)
-        elif not self._index_map:
-            tip_var.set('暂无可装备的物品')
+        def on_inventory_changed(_evt, _payload):
+            try:
+                grid.apply(vm.refresh())
+                if grid.selected_id is None:
+                    self._selected = None
+                    update_preview()
+                tip_var.set(base_tip())
+            except Exception:
+                pass
+
+        from src.core.events import subscribe_ui, unsubscribe
+        subscribe_ui('inventory_changed', on_inventory_changed)
+        top.bind('<Destroy>', lambda e: unsubscribe('inventory_changed', on_inventory_changed) if e.widget is top else None)
 
         def fmt_delta(v: int) -> str:
             return f"+{v}" if v > 0 else (f"{v}" if v < 0 else "±0")
 
         def update_preview(evt=None):
-            if not self._index_map:
-                preview_var.set("")
-                return
-            sel = lb.curselection()
-            if not sel:
+            it = vm.item_of(self._selected) if self._selected else None
+            if it is None:
                 preview_var.set("")
                 return
             try:
-                i_idx = self._index_map[sel[0]]
-                it = inv.slots[i_idx - 1].item
                 m = self.app.controller.game.player.board[self.m_index - 1]
                 eq = getattr(m, 'equipment', None)
                 cur_eq_atk = int(eq.get_total_attack() if eq else 0)
@@ -146,13 +177,11 @@ class EquipmentDialog:
             except Exception:
                 preview_var.set("")
 
-        lb.bind('<<ListboxSelect>>', update_preview)
-
         def do_confirm(evt=None):
-            sel = lb.curselection()
-            if not sel:
+            idx = vm.index_of(self._selected) if self._selected else None
+            if not idx:
                 return
-            self.result = self._index_map[sel[0]]
+            self.result = idx
             try:
                 top.destroy()
             except Exception:
@@ -165,7 +194,6 @@ class EquipmentDialog:
             except Exception:
                 pass
 
-        lb.bind('<Double-Button-1>', do_confirm)
         btns = ttk.Frame(frm)
         btns.pack(fill=tk.X)
         ttk.Button(btns, text="确认装备", command=do_confirm).pack(side=tk.LEFT)
@@ -6,8 +6,9 @@ from tkinter import ttk
 from typing import Dict, List, Optional, Any
 from .. import cards as Cards
 from .. import animations as ANIM
+from src.core import perf as P
 try:
-    from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event
+    from src.core.events import subscribe_ui as subscribe_event, unsubscribe as unsubscribe_event
 except Exception:  # pragma: no cover
     def subscribe_event(*_a, **_k):  # type: ignore
         return None
@@ -19,7 +20,8 @@ class BattlefieldView:
     """A mirrored battlefield container with flow-compact grids for allies (right) and enemies (left).
 
     Features:
-    - Flow-compact grid (3 columns, up to 5 rows) per side.
+    - Flow-compact grid (3 columns) per side; above `ui.battlefield.aggregate_above` units a side
+      switches to a scrolling list grouped by name (see src.ui.battlefield_model).
     - Mirrored alignment: allies right-aligned per row, enemies left-aligned.
     - Dynamic add/remove tokens; slide-to-anchor reposition animation; shake feedback.
     - Responsive anchors: cards follow on container resize.
@@ -74,6 +76,9 @@ class BattlefieldView:
         self._export_enemy_wraps: Optional[Dict[int, tk.Frame]] = None
         # event subscriptions
         self._subs: List[Any] = []
+        # aggregated mode per side: (frame, listbox, groups); pending coalesced refresh ids
+        self._agg: Dict[str, Any] = {'ally': None, 'enemy': None}
+        self._agg_after: Dict[str, Any] = {'ally': None, 'enemy': None}
 
     # --- public API ---
     def attach(self, container: tk.Frame):
@@ -92,11 +97,11 @@ class BattlefieldView:
         self._export_enemy_wraps = enemy_map
 
     def set_allies(self, items: List[object]):
-        self._allies = list(items or [])[:15]
+        self._allies = list(items or [])
         self._render_side(is_enemy=False)
 
     def set_enemies(self, items: List[object]):
-        self._enemies = list(items or [])[:15]
+        self._enemies = list(items or [])
         self._render_side(is_enemy=True)
 
     def add(self, is_enemy: bool, token: object, index: Optional[int] = None):
@@ -167,6 +172,8 @@ class BattlefieldView:
                         ch.destroy()
                 except Exception:
                     pass
+            for side in ('ally', 'enemy'):
+                self._drop_aggregate(side)
             # clear sequences and side snapshots
             self._allies = []
             self._enemies = []
@@ -238,9 +245,10 @@ class BattlefieldView:
                     owner = None
                 if owner is None:
                     return
-                # 判断在哪一侧
-                is_enemy = owner in self._enemies
-                is_ally = owner in self._allies
+                # 判断在哪一侧（实体注册表 O(1) 查询）
+                side = self._side_of(owner)
+                is_enemy = side == 'enemy'
+                is_ally = side == 'ally'
                 try:
                     if is_ally:
                         self._refresh_one(owner, is_enemy=False)
@@ -285,7 +293,7 @@ class BattlefieldView:
                     card, amount = None, 0
                 if not card:
                     return
-                if card not in self._allies:
+                if self._side_of(card) != 'ally':
                     return
                 wrap = self._ally_wraps.get(card)
                 if wrap:
@@ -364,7 +372,11 @@ class BattlefieldView:
                     amount = int((payload or {}).get('amount', 0))
                 except Exception:
                     enemy, amount = None, 0
-                if not enemy or enemy not in self._enemies:
+                if self._agg['enemy'] is not None:
+                    # 聚合模式：不逐个查找卡片，合并为一次列表刷新
+                    self._schedule_aggregate(True)
+                    return
+                if not enemy or self._side_of(enemy) != 'enemy':
                     return
                 wrap = self._enemy_wraps.get(enemy)
                 if wrap:
@@ -407,10 +419,31 @@ class BattlefieldView:
                             pass
                     self.remove(True, enemy)
             self._subs.append(('enemy_died', subscribe_event('enemy_died', _on_enemy_died)))
+
+            # 群体技能批量阵亡：一次事件携带全部单位
+            def _on_enemies_died(evt, payload):
+                p = payload or {}
+                for enemy in list(p.get('enemies') or []):
+                    _on_enemy_died(evt, {'enemy': enemy, 'scene_changed': p.get('scene_changed', False)})
+            self._subs.append(('enemies_died', subscribe_event('enemies_died', _on_enemies_died)))
         except Exception:
             self._subs = []
 
+    def _side_of(self, token: object) -> Optional[str]:
+        """'enemy' | 'ally' | None, via the game's entity registry; falls back to the rendered lists."""
+        game = getattr(getattr(self.app, 'controller', None), 'game', None)
+        if getattr(game, 'registry', None) is not None:
+            return game.registry.side_of(token)
+        if token in self._enemies:
+            return 'enemy'
+        if token in self._allies:
+            return 'ally'
+        return None
+
     def _refresh_one(self, token: object, *, is_enemy: bool):
+        if self._agg['enemy' if is_enemy else 'ally'] is not None:
+            self._schedule_aggregate(is_enemy)
+            return
         wraps = self._enemy_wraps if is_enemy else self._ally_wraps
         w = wraps.get(token)
         if not w:
@@ -433,6 +466,7 @@ class BattlefieldView:
             except Exception:
                 pass
 
+    @P.timed('render', 'battlefield')
     def _render_side(self, is_enemy: bool):
         panel = self._enemy_panel if is_enemy else self._ally_panel
         overlay = self._enemy_overlay if is_enemy else self._ally_overlay
@@ -441,6 +475,12 @@ class BattlefieldView:
         wraps = (self._enemy_wraps if is_enemy else self._ally_wraps)
         if not (panel and overlay and grid_holder):
             return
+        side = 'enemy' if is_enemy else 'ally'
+        if len(items) > self._aggregate_above():
+            self._schedule_aggregate(is_enemy)
+            return
+        if self._agg[side] is not None:
+            self._drop_aggregate(side)
 
         # Capture old positions (overlay-relative) for slide animation
         old_pos = {}
@@ -464,7 +504,7 @@ class BattlefieldView:
         # Build/Reuse anchors (mirrored per side) without destroying existing rows to reduce flicker
         cols = self.COLS
         total = len(items)
-        rows = min(5, max(1, math.ceil(total / cols)))
+        rows = max(1, math.ceil(total / cols))
         anchors_by_idx: Dict[int, tk.Frame] = {}
 
         existing_rows = list(grid_holder.winfo_children())
@@ -633,7 +673,6 @@ class BattlefieldView:
                     _final_place()
 
         # store side snapshot and bind (once) to isolated reposition handler
-        side = 'enemy' if is_enemy else 'ally'
         self._side_state[side] = {
             'overlay': overlay,
             'panel': panel,
@@ -685,6 +724,118 @@ class BattlefieldView:
             except Exception:
                 pass
 
+    # --- aggregated mode (large battles) ---
+    def _aggregate_above(self) -> int:
+        from src.ui.battlefield_model import aggregate_above
+        return aggregate_above()
+
+    def _schedule_aggregate(self, is_enemy: bool):
+        """Coalesce aggregated-list refreshes (damage/death events arrive per unit)."""
+        side = 'enemy' if is_enemy else 'ally'
+        if self._agg_after[side] is not None:
+            return
+        try:
+            self._agg_after[side] = self.root.after(30, lambda: self._render_aggregate(is_enemy))
+        except Exception:
+            self._render_aggregate(is_enemy)
+
+    @P.timed('render', 'battlefield_agg')
+    def _render_aggregate(self, is_enemy: bool):
+        from src.ui.battlefield_model import aggregate, group_text
+        side = 'enemy' if is_enemy else 'ally'
+        self._agg_after[side] = None
+        items = self._enemies if is_enemy else self._allies
+        if len(items) <= self._aggregate_above():
+            self._render_side(is_enemy)
+            return
+        st = self._agg[side]
+        if st is None:
+            st = self._enter_aggregate(is_enemy)
+            if st is None:
+                return
+        _frame, lb, _groups = st
+        groups = aggregate(items)
+        try:
+            top = lb.yview()[0]
+            sel = lb.curselection()
+            lb.delete(0, tk.END)
+            for g in groups:
+                lb.insert(tk.END, group_text(g))
+                if not g.alive:
+                    lb.itemconfigure(tk.END, foreground='#999999')
+            if sel and sel[0] < len(groups):
+                lb.selection_set(sel[0])
+            lb.yview_moveto(top)
+        except Exception:
+            pass
+        self._agg[side] = (_frame, lb, groups)
+
+    def _enter_aggregate(self, is_enemy: bool):
+        """Tear down the card grid of a side and cover its panel with a grouped list."""
+        side = 'enemy' if is_enemy else 'ally'
+        panel = self._enemy_panel if is_enemy else self._ally_panel
+        grid_holder = self._enemy_grid if is_enemy else self._ally_grid
+        wraps = self._enemy_wraps if is_enemy else self._ally_wraps
+        if panel is None:
+            return None
+        for w in list(wraps.values()):
+            try:
+                w.destroy()
+            except Exception:
+                pass
+        wraps.clear()
+        try:
+            ((self._export_enemy_wraps if is_enemy else self._export_ally_wraps) or {}).clear()
+        except Exception:
+            pass
+        try:
+            for ch in list(grid_holder.winfo_children()):
+                ch.pack_forget()
+        except Exception:
+            pass
+        self._side_state[side] = {}
+        frame = ttk.Frame(panel)
+        lb = tk.Listbox(frame, activestyle='none', exportselection=False, font=("Segoe UI", 10))
+        sb = ttk.Scrollbar(frame, orient='vertical', command=lb.yview)
+        lb.configure(yscrollcommand=sb.set)
+        lb.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        sb.pack(side=tk.RIGHT, fill=tk.Y)
+        frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+        frame.lift()
+
+        def _on_select(_e=None, enemy=is_enemy, key=side):
+            try:
+                st = self._agg[key]
+                sel = lb.curselection()
+                if not st or not sel:
+                    return
+                g = st[2][sel[0]]
+                idx = g.first_alive or g.first
+                cb = self._on_enemy_click if enemy else self._on_ally_click
+                if idx and callable(cb):
+                    cb(idx)
+            except Exception:
+                pass
+        lb.bind('<<ListboxSelect>>', _on_select)
+        self._agg[side] = (frame, lb, [])
+        return self._agg[side]
+
+    def _drop_aggregate(self, side: str):
+        st = self._agg.get(side)
+        self._agg[side] = None
+        aid = self._agg_after.get(side)
+        self._agg_after[side] = None
+        if aid is not None:
+            try:
+                self.root.after_cancel(aid)
+            except Exception:
+                pass
+        if st is not None:
+            try:
+                st[0].destroy()
+            except Exception:
+                pass
+
     def _reposition_side(self, side: str):
         st = self._side_state.get(side) or {}
         overlay = st.get('overlay')
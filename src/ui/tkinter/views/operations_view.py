@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-import json
 from typing import Callable
 
 import tkinter as tk
 from tkinter import ttk
 
-from src import app_config as CFG
+from src.systems.skill_registry import get_registry
 from .. import ui_utils as U
+from src.core import perf as P
 
 try:
-    from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event
+    from src.core.events import subscribe_ui as subscribe_event, unsubscribe as unsubscribe_event
 except Exception:  # pragma: no cover
     def subscribe_event(*_a, **_k):  # type: ignore
         return None
@@ -18,23 +18,9 @@ except Exception:  # pragma: no cover
         return None
 
 
-_SKILL_CATALOG_CACHE = None
-
 def _load_skill_catalog():
-    global _SKILL_CATALOG_CACHE
-    if _SKILL_CATALOG_CACHE is not None:
-        return _SKILL_CATALOG_CACHE
-    try:
-        p = CFG.skills_catalog_path()
-        with open(p, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if isinstance(data, dict) and isinstance(data.get('skills'), list):
-            _SKILL_CATALOG_CACHE = { rec.get('id'): rec for rec in data['skills'] if isinstance(rec, dict) and rec.get('id') }
-            return _SKILL_CATALOG_CACHE
-    except Exception:
-        pass
-    _SKILL_CATALOG_CACHE = {}
-    return _SKILL_CATALOG_CACHE
+    """技能目录（id -> 记录），来自统一技能注册表。"""
+    return get_registry().catalog()
 
 
 class OperationsView:
@@ -146,6 +132,7 @@ class OperationsView:
             pass
 
     # --- rendering ---
+    @P.timed('render', 'operations')
     def render(self, container):
         # popup-only 模式：若未提供底部容器则直接返回，避免事件回调触发异常
         if not container:
@@ -196,8 +183,7 @@ class OperationsView:
         try:
             board = self.app.controller.game.player.board
             m = board[sel - 1]
-            from src import settings as S
-            atk_cost = int(getattr(S, 'get_skill_cost')('attack', 1))
+            atk_cost = get_registry().cost('attack', 1)
             if int(getattr(m, 'stamina', 0)) < atk_cost:
                 atk_btn.config(state=tk.DISABLED)
             U.attach_tooltip_deep(atk_btn, lambda c=atk_cost: f"需要体力 {c}")
@@ -231,22 +217,7 @@ class OperationsView:
                     except Exception:
                         prof = None
                 if prof:
-                    try:
-                        p = CFG.profession_skills_path()
-                        with open(p, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        if isinstance(data, dict):
-                            cand = data.get(str(prof).lower())
-                            if isinstance(cand, list) and cand:
-                                skills = list(cand)
-                    except Exception:
-                        fallback = {
-                            'warrior': ['sweep','drain'],
-                            'mage': ['arcane_missiles'],
-                            'tank': ['taunt'],
-                            'priest': ['basic_heal'],
-                        }
-                        skills = list(fallback.get(str(prof).lower(), []))
+                    skills = get_registry().skills_for_profession(prof)
         except Exception:
             skills = []
         if skills:
@@ -273,8 +244,7 @@ class OperationsView:
                 # cost & enable state
                 cost = 1
                 try:
-                    from src import settings as S
-                    cost = int(getattr(S, 'get_skill_cost')(sid or text, 1))
+                    cost = get_registry().cost(sid or text, 1)
                 except Exception:
                     pass
                 b = ttk.Button(ops, text=f"{text}", command=_make_cmd(), style="Tiny.TButton")
@@ -402,8 +372,7 @@ class OperationsView:
         atk_cost = 1
         stamina = 0
         try:
-            from src import settings as S
-            atk_cost = int(S.get_skill_cost('attack', 1))
+            atk_cost = get_registry().cost('attack', 1)
             board = self.app.controller.game.player.board
             m = board[m_index - 1]
             stamina = int(getattr(m, 'stamina', 0))
@@ -455,22 +424,7 @@ class OperationsView:
                     except Exception:
                         prof = None
                 if prof:
-                    try:
-                        p = CFG.profession_skills_path()
-                        with open(p, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        if isinstance(data, dict):
-                            cand = data.get(str(prof).lower())
-                            if isinstance(cand, list) and cand:
-                                skills = list(cand)
-                    except Exception:
-                        fallback = {
-                            'warrior': ['sweep','drain'],
-                            'mage': ['arcane_missiles'],
-                            'tank': ['taunt'],
-                            'priest': ['basic_heal'],
-                        }
-                        skills = list(fallback.get(str(prof).lower(), []))
+                    skills = get_registry().skills_for_profession(prof)
         except Exception:
             skills = []
         if skills:
@@ -488,8 +442,7 @@ class OperationsView:
                 text = label or (sid or str(sk))
                 cost = 1
                 try:
-                    from src import settings as S
-                    cost = int(S.get_skill_cost(sid or text, 1))
+                    cost = get_registry().cost(sid or text, 1)
                 except Exception:
                     pass
                 # 技能提示：体力 + 描述
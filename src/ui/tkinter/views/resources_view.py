@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import Any, Callable, Optional
 
 from tkinter import ttk
-from .. import ui_utils as U
+from src.core import perf as P
+from src.ui.inventory_model import InventoryViewModel, ResourceViewModel, apply_to_list
 
 try:
-    from src.core.events import subscribe as subscribe_event, unsubscribe as unsubscribe_event
+    from src.core.events import subscribe_ui as subscribe_event, unsubscribe as unsubscribe_event
 except Exception:  # pragma: no cover
     def subscribe_event(*_a, **_k):  # type: ignore
         return None
@@ -17,6 +18,9 @@ except Exception:  # pragma: no cover
 class ResourcesView:
     """Owns resource/inventory related events and updates side pane.
 
+    Rows come from InventoryViewModel/ResourceViewModel (stable row ids); only the
+    rows reported as inserted/updated/removed are touched on each refresh.
+
     Subscribes to resource_changed, inventory_changed and the ObservableList
     variants (resource_added/removed/resources_*). It calls app._render_resources()
     and app._render_operations() as needed.
@@ -28,6 +32,11 @@ class ResourcesView:
         self._res_container = None
         self._inv_listbox = None
         self.game = None
+        # 视图模型：直接读取背包/配方簿/场景资源，产出逐行变更
+        self._inv_vm = InventoryViewModel()
+        self._res_vm = ResourceViewModel()
+        self._res_btns: list = []
+        self._res_empty = None
 
     def set_context(self, game):
         """让视图直接持有 game 引用（可选）。"""
@@ -37,9 +46,22 @@ class ResourcesView:
         """将资源按钮容器与背包 Listbox 交给视图托管。"""
         self._res_container = res_container
         self._inv_listbox = inv_listbox
-
+        # 新容器：下一次渲染全量填充
+        self._res_btns = []
+        self._res_empty = None
+        self._res_vm.set_game(None)
+        self._inv_vm.set_game(None)
+
+    def _game(self):
+        g = self.game
+        if g is None:
+            ctrl = getattr(self.app, 'controller', None)
+            g = getattr(ctrl, 'game', None) if ctrl else None
+        return g
+
+    @P.timed('render', 'resources')
     def render(self):
-        """渲染资源按钮区域。"""
+        """渲染资源按钮区域：按视图模型的逐行变更增删/改写按钮。"""
         if getattr(self.app, '_suspend_ui_updates', False):
             # 若在抑制窗口，交由 app 合并标记；视图不主动冲刷
             setattr(self.app, '_pending_resource_refresh', True)
@@ -48,92 +70,76 @@ class ResourcesView:
         c = self._res_container
         if c is None:
             return
-        # 采集资源
-        try:
-            s = self.app.controller.game.get_state()
-            res = s.get('resources', [])
-        except Exception:
-            res = []
-
-        def fmt_resource(r) -> str:
-            try:
-                if isinstance(r, dict):
-                    name = r.get('name') or r.get('title') or str(r)
-                    rtype = r.get('type')
-                else:
-                    name = str(r)
-                    rtype = None
-            except Exception:
-                name = str(r)
-                rtype = None
-            try:
-                clean = U.clean_ansi(name)
-            except Exception:
-                clean = name
-            return f"{clean}" + (f" ({rtype})" if rtype else "")
-
-        target_texts = [fmt_resource(r) for r in res]
-
-        # 仅保留按钮子项
-        children = [w for w in c.winfo_children() if isinstance(w, ttk.Button)]
-
-        def ensure_placeholder(show: bool):
+        vm = self._res_vm
+        if vm.set_game(self._game()) or any(not w.winfo_exists() for w in self._res_btns):
             for w in list(c.winfo_children()):
-                if not isinstance(w, ttk.Button):
-                    try:
-                        w.destroy()
-                    except Exception:
-                        pass
-            if show:
-                ttk.Label(c, text="(空)", foreground="#888").pack(anchor='w')
-
-        if not target_texts:
-            for btn in children:
                 try:
-                    btn.destroy()
+                    w.destroy()
                 except Exception:
                     pass
-            ensure_placeholder(True)
-            return
+            self._res_btns = []
+            self._res_empty = None
+            vm.rows = []
+
+        def insert(i, row):
+            btn = ttk.Button(c, text=row.text, width=18, style="Tiny.TButton",
+                             command=lambda rid=row.id: self._pick_row(rid))
+            if i < len(self._res_btns):
+                btn.pack(side='top', anchor='w', padx=2, pady=2, before=self._res_btns[i])
+            else:
+                btn.pack(side='top', anchor='w', padx=2, pady=2)
+            self._res_btns.insert(i, btn)
 
-        ensure_placeholder(False)
+        def update(i, row):
+            self._res_btns[i].configure(text=row.text)
 
-        if len(children) < len(target_texts):
-            for _ in range(len(target_texts) - len(children)):
-                btn = ttk.Button(c, text="", width=18, style="Tiny.TButton")
-                btn.pack(side='top', anchor='w', padx=2, pady=2)
-                children.append(btn)
-        elif len(children) > len(target_texts):
-            for btn in children[len(target_texts):]:
-                try:
-                    btn.destroy()
-                except Exception:
-                    pass
-            children = children[:len(target_texts)]
+        def remove(i):
+            self._res_btns.pop(i).destroy()
 
-        for i, (btn, text) in enumerate(zip(children, target_texts), start=1):
+        try:
+            apply_to_list(vm.refresh(), insert, update, remove)
+        except Exception:
+            pass
+        # 空列表占位
+        if not self._res_btns and self._res_empty is None:
+            self._res_empty = ttk.Label(c, text="(空)", foreground="#888")
+            self._res_empty.pack(anchor='w')
+        elif self._res_btns and self._res_empty is not None:
             try:
-                if btn.cget('text') != text:
-                    btn.configure(text=text)
-                btn.configure(command=(lambda idx=i: self.app._pick_resource(idx)))
+                self._res_empty.destroy()
             except Exception:
                 pass
+            self._res_empty = None
 
+    def _pick_row(self, row_id: str):
+        tok = self._res_vm.token_of(row_id)
+        if tok:
+            self.app._pick_resource(int(tok[1:]))
+
+    @P.timed('render', 'inventory')
     def render_inventory(self):
-        """仅刷新背包列表（不重绘卡片/场景）。"""
+        """仅刷新背包列表：按视图模型的逐行变更插入/改写/删除 Listbox 行。"""
         lb = self._inv_listbox
         if lb is None:
             return
-        try:
-            text = self.app.controller._section_inventory() if self.app.controller else ''
+        vm = self._inv_vm
+        if vm.set_game(self._game()):
             lb.delete(0, 'end')
-            for line in (text or '').splitlines():
-                s = (line or '').strip().rstrip()
-                if not s:
-                    continue
-                if s.endswith('):') or s.endswith(':'):
-                    continue
-                lb.insert('end', s)
+
+        def insert(i, row):
+            lb.insert(i, row.text)
+            if row.kind == 'empty':
+                lb.itemconfigure(i, foreground='#888')
+
+        def update(i, row):
+            sel = i in lb.curselection()
+            lb.delete(i)
+            insert(i, row)
+            if sel:
+                lb.selection_set(i)
+
+        try:
+            apply_to_list(vm.refresh(), insert, update, lambda i: lb.delete(i))
         except Exception:
             pass
 
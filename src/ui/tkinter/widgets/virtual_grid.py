@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class VirtualGrid:
+    """Canvas-based virtual grid of square cells (one per Row from src.ui.inventory_model).
+
+    Only the cells inside the visible viewport own canvas items; scrolling re-binds the
+    pooled items to the new positions. `apply(changes)` takes the insert/update/remove
+    list produced by a view model's refresh() and redraws only the affected cells.
+    """
+
+    def __init__(self, parent: tk.Widget, *, cell: int = 72, cols: int = 6, rows_visible: int = 4,
+                 bg: str = "#f9f9fb", line: str = "#e5e7eb",
+                 color_of: Optional[Callable[[str], str]] = None,
+                 on_select: Optional[Callable[[object], None]] = None,
+                 on_activate: Optional[Callable[[object], None]] = None,
+                 on_hover: Optional[Callable[[object], None]] = None):
+        self.cell = int(max(16, cell))
+        self.max_cols = max(1, int(cols))
+        self.cols = self.max_cols
+        self.line = line
+        self.color_of = color_of or (lambda _r: '#BDBDBD')
+        self.on_select = on_select
+        self.on_activate = on_activate
+        self.on_hover = on_hover
+        self.rows: List[object] = []
+        self.selected_id: Optional[str] = None
+        self._hover_id: Optional[str] = None
+        # 位置 -> (边框 id, 文本 id)；仅可见格子持有
+        self._cells: Dict[int, Tuple[int, int]] = {}
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, width=self.cols * self.cell, height=max(1, rows_visible) * self.cell,
+                                bg=bg, highlightthickness=0, borderwidth=0)
+        self.sb = ttk.Scrollbar(self.frame, orient='vertical', command=self._yview)
+        self.canvas.configure(yscrollcommand=self.sb.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.sb.pack(side=tk.RIGHT, fill=tk.Y)
+        c = self.canvas
+        c.bind('<Configure>', self._on_configure)
+        c.bind('<Button-1>', self._on_click)
+        c.bind('<Double-Button-1>', self._on_double)
+        c.bind('<Motion>', self._on_motion)
+        c.bind('<Leave>', lambda _e: self._set_hover(None))
+        c.bind('<MouseWheel>', lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        c.bind('<Button-4>', lambda _e: self._scroll(-1))
+        c.bind('<Button-5>', lambda _e: self._scroll(1))
+
+    # --- data ---
+    def set_rows(self, rows: List[object]) -> None:
+        self.rows = list(rows)
+        self._relayout()
+
+    def apply(self, changes) -> None:
+        """按顺序应用 (op, index, row) 变更；只重绘受影响且可见的格子。"""
+        if not changes:
+            return
+        first_shift: Optional[int] = None
+        dirty = set()
+        for op, i, row in changes:
+            if op == 'insert':
+                self.rows.insert(i, row)
+                first_shift = i if first_shift is None else min(first_shift, i)
+            elif op == 'remove':
+                del self.rows[i]
+                first_shift = i if first_shift is None else min(first_shift, i)
+            else:
+                self.rows[i] = row
+                dirty.add(i)
+        if self.selected_id is not None and all(getattr(r, 'id', None) != self.selected_id for r in self.rows):
+            self.selected_id = None
+        self._update_scrollregion()
+        lo, hi = self._visible_range()
+        if first_shift is not None:
+            dirty.update(range(max(lo, first_shift), hi))
+        for i in dirty:
+            if lo <= i < hi:
+                self._draw_cell(i)
+        # 行数减少时回收末尾多出的格子
+        for i in [k for k in self._cells if k >= len(self.rows)]:
+            self._drop_cell(i)
+
+    def index_of_id(self, row_id: Optional[str]) -> Optional[int]:
+        for i, r in enumerate(self.rows):
+            if getattr(r, 'id', None) == row_id:
+                return i
+        return None
+
+    def select(self, row_id: Optional[str]) -> None:
+        old = self.index_of_id(self.selected_id)
+        self.selected_id = row_id
+        for i in (old, self.index_of_id(row_id)):
+            if i is not None and i in self._cells:
+                self._draw_cell(i)
+
+    # --- geometry ---
+    def _rows_total(self) -> int:
+        return max(1, (len(self.rows) + self.cols - 1) // self.cols)
+
+    def _update_scrollregion(self) -> None:
+        self.canvas.configure(scrollregion=(0, 0, self.cols * self.cell, self._rows_total() * self.cell))
+
+    def _visible_range(self) -> Tuple[int, int]:
+        c = self.canvas
+        top = int(c.canvasy(0))
+        h = max(self.cell, c.winfo_height())
+        r0 = max(0, top // self.cell)
+        r1 = (top + h) // self.cell + 1
+        return r0 * self.cols, min(len(self.rows), r1 * self.cols)
+
+    def _pos_at(self, x: int, y: int) -> Optional[int]:
+        cx, cy = int(self.canvas.canvasx(x)), int(self.canvas.canvasy(y))
+        col = cx // self.cell
+        if col < 0 or col >= self.cols or cy < 0:
+            return None
+        i = (cy // self.cell) * self.cols + col
+        return i if 0 <= i < len(self.rows) else None
+
+    def _relayout(self) -> None:
+        for i in list(self._cells):
+            self._drop_cell(i)
+        self._update_scrollregion()
+        self._redraw()
+
+    def _redraw(self) -> None:
+        """绘制可见区域：网格线 + 可见格子；离开视口的格子回收。"""
+        c = self.canvas
+        lo, hi = self._visible_range()
+        for i in [k for k in self._cells if not (lo <= k < hi)]:
+            self._drop_cell(i)
+        c.delete('grid')
+        top = int(c.canvasy(0))
+        h = max(self.cell, c.winfo_height())
+        y0 = (top // self.cell) * self.cell
+        w = self.cols * self.cell
+        y = y0
+        while y <= top + h:
+            c.create_line(0, y, w, y, fill=self.line, tags=('grid',))
+            y += self.cell
+        for col in range(self.cols + 1):
+            x = col * self.cell
+            c.create_line(x, y0, x, top + h, fill=self.line, tags=('grid',))
+        c.tag_lower('grid')
+        for i in range(lo, hi):
+            self._draw_cell(i)
+
+    def _draw_cell(self, i: int) -> None:
+        if not (0 <= i < len(self.rows)):
+            self._drop_cell(i)
+            return
+        row = self.rows[i]
+        c = self.canvas
+        s = self.cell
+        x, y = (i % self.cols) * s, (i // self.cols) * s
+        rid = getattr(row, 'id', None)
+        selected = rid is not None and rid == self.selected_id
+        hover = rid is not None and rid == self._hover_id
+        fill = '#e6e6e8' if selected else ('#efeff1' if hover else '')
+        qty = int(getattr(row, 'qty', 1) or 0)
+        text = str(getattr(row, 'text', row)) + (f" x{qty}" if qty > 1 else '')
+        ids = self._cells.get(i)
+        if ids is None:
+            rect = c.create_rectangle(0, 0, 0, 0)
+            label = c.create_text(0, 0, justify='center', font=("Segoe UI", 9))
+            ids = self._cells[i] = (rect, label)
+        rect, label = ids
+        c.coords(rect, x + 3, y + 3, x + s - 3, y + s - 3)
+        c.itemconfigure(rect, outline=self.color_of(getattr(row, 'rarity', '')), width=3 if selected else 2, fill=fill)
+        c.coords(label, x + s / 2, y + s / 2)
+        c.itemconfigure(label, text=text, width=s - 10)
+
+    def _drop_cell(self, i: int) -> None:
+        ids = self._cells.pop(i, None)
+        if ids:
+            self.canvas.delete(*ids)
+
+    # --- events ---
+    def _on_configure(self, e) -> None:
+        cols = max(1, min(self.max_cols, int(e.width) // self.cell))
+        if cols != self.cols:
+            self.cols = cols
+            self._relayout()
+        else:
+            self._redraw()
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._redraw()
+
+    def _scroll(self, units: int) -> None:
+        self.canvas.yview_scroll(units, 'units')
+        self._redraw()
+
+    def _row_at(self, e):
+        i = self._pos_at(e.x, e.y)
+        return self.rows[i] if i is not None else None
+
+    def _on_click(self, e) -> None:
+        row = self._row_at(e)
+        if row is None:
+            return
+        self.select(getattr(row, 'id', None))
+        if self.on_select:
+            self.on_select(row)
+
+    def _on_double(self, e) -> None:
+        row = self._row_at(e)
+        if row is not None and self.on_activate:
+            self.on_activate(row)
+
+    def _on_motion(self, e) -> None:
+        row = self._row_at(e)
+        self._set_hover(getattr(row, 'id', None) if row is not None else None)
+
+    def _set_hover(self, row_id: Optional[str]) -> None:
+        if row_id == self._hover_id:
+            return
+        old = self.index_of_id(self._hover_id)
+        self._hover_id = row_id
+        new = self.index_of_id(row_id)
+        for i in (old, new):
+            if i is not None and i in self._cells:
+                self._draw_cell(i)
+        if self.on_hover:
+            self.on_hover(self.rows[new] if new is not None else None)
@@ -1,8 +1,12 @@
-from src.ui.tkinter import run_tk
-from src import app_config as CFG
 import sys
 import os
 
+# --profile-startup 需在导入界面/引擎模块之前启用，才能统计到它们的导入耗时
+from src import startup_profile as SP
+SP.enable_from_argv(sys.argv)
+
+from src import app_config as CFG
+
 
 def _write_startup_marker():
     try:
@@ -45,4 +49,7 @@ if __name__ == "__main__":
     # 默认从主菜单启动；仅当命令行显式传入场景路径/ID 时才直接进入游戏
     cli_scene = sys.argv[1] if len(sys.argv) > 1 else None
     # 说明：不再自动探测 default_scene.json，以避免误入关卡而看不到主菜单
+    # Tk 界面栈在此处才导入（游戏引擎更晚，开局时才加载）
+    from src.ui.tkinter import run_tk
+    SP.mark('ui_imported')
     run_tk(player_name="玩家", initial_scene=cli_scene)
@@ -0,0 +1,439 @@
+"""引擎热点基准测试（微基准 + 宏基准）
+
+用法：
+    python tools/bench.py                          # 运行全部，打印表格并写 bench_results.json
+    python tools/bench.py -k skill --quick         # 只跑名称含 skill 的项，迭代次数减少
+    python tools/bench.py --out r.json --save-baseline tools/bench_baseline.json
+    python tools/bench.py --baseline tools/bench_baseline.json --threshold 0.15
+        # 对比基线：中位数变慢超过 15% 的项标记为回归，存在回归时退出码为 1
+
+覆盖：
+- attack_enemy：默认场景，敌人生命调高防止死亡/切场景；
+- use_skill:<id>：注册表中每个有实现的技能（含 DSL 编译技能），按目标规格选择 e1/m2；
+- load_scene:<包/场景>：所有场景包中的每个场景文件；
+- save:<后端>：带 200 个场景进度的存档，binary/json/sqlite 三种后端；
+- events.publish:<N>：N 个订阅者的事件扇出；
+- observable_list：ObservableList 的 append/pop（带 on_add/on_remove 事件）。
+- --memory：按类型批量创建实体/物品（tracemalloc），输出每个实例的平均占用（字节），写入结果的 memory 分区。
+- --no-log：关闭战斗日志（与 headless 模拟相同），对比日志记录本身的开销。
+
+每项在计时前以固定种子重置 random，单次调用单独计时（准备工作不计入），输出中位数/最小/p95（微秒）。
+运行时把 HOME 指向临时目录，存档与配置不影响真实用户数据。
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# 隔离用户目录（需在导入 src 之前设置）
+_HOME = tempfile.mkdtemp(prefix='pyhs-bench-')
+atexit.register(shutil.rmtree, _HOME, True)
+os.environ['HOME'] = _HOME
+os.environ['USERPROFILE'] = _HOME
+os.environ['LOCALAPPDATA'] = _HOME
+
+SEED = 1234
+BIG_HP = 10 ** 9
+LOG_ON = True
+
+
+class Bench:
+    """一个基准项：prep() 在每次调用前执行（不计时），op() 为被测调用。"""
+
+    def __init__(self, name: str, setup: Callable[[], Any], op: Callable[[Any], Any],
+                 prep: Optional[Callable[[Any], Any]] = None, n: int = 200):
+        self.name = name
+        self.setup = setup
+        self.op = op
+        self.prep = prep
+        self.n = n
+
+
+@contextlib.contextmanager
+def _quiet():
+    # 引擎会 print 装备/日志信息，计时期间丢弃
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _run(b: Bench, scale: float) -> Dict[str, Any]:
+    n = max(5, int(b.n * scale))
+    random.seed(SEED)
+    with _quiet():
+        state = b.setup()
+        # 预热
+        for _ in range(min(5, n)):
+            if b.prep:
+                b.prep(state)
+            b.op(state)
+        random.seed(SEED)
+        samples: List[float] = []
+        perf = time.perf_counter_ns
+        for _ in range(n):
+            if b.prep:
+                b.prep(state)
+            t0 = perf()
+            b.op(state)
+            samples.append((perf() - t0) / 1000.0)
+    samples.sort()
+    return {
+        'n': n,
+        'median_us': round(statistics.median(samples), 3),
+        'min_us': round(samples[0], 3),
+        'p95_us': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+# --- 游戏构建 ---
+def _new_game(scene: Optional[str] = None):
+    from src.game_modes.simple_pve_game import SimplePvEGame
+    g = SimplePvEGame('bench')
+    g.profile = None
+    g.combat_log.enabled = LOG_ON
+    if scene:
+        g.load_scene(scene)
+    return g
+
+
+def _harden(g) -> None:
+    """敌我双方生命调高、体力回满，保证每次调用都在同一局面下结算。"""
+    for u in list(g.enemies) + list(g.player.board):
+        try:
+            u.max_hp = BIG_HP
+            u.hp = BIG_HP
+        except Exception:
+            pass
+    _refill(g)
+
+
+def _refill(g) -> None:
+    for m in g.player.board:
+        m.stamina = max(getattr(m, 'stamina_max', 3), 99)
+        m.can_attack = True
+
+
+def _ready_game():
+    g = _new_game()
+    g.start_turn()
+    _harden(g)
+    return g
+
+
+def _ensure_units(g) -> None:
+    # 技能可能移除单位（处决/转化等）：局面被破坏时重建（不计时）
+    if not g.enemies or len(g.player.board) < 2:
+        g.load_scene(g.current_scene)
+        g.start_turn()
+        _harden(g)
+    else:
+        for e in g.enemies:
+            if e.hp < BIG_HP // 2:
+                e.hp = BIG_HP
+        _refill(g)
+
+
+# --- 基准项 ---
+def bench_attack() -> List[Bench]:
+    def prep(g):
+        _ensure_units(g)
+    return [Bench('attack_enemy', _ready_game, lambda g: g.attack_enemy(0, 0), prep, n=500)]
+
+
+def bench_skills() -> List[Bench]:
+    from src.game_modes import simple_pve_game  # noqa: F401  (须先于 systems 导入)
+    from src.systems.skill_registry import get_registry
+    out: List[Bench] = []
+    for d in get_registry().all():
+        if d.impl is None or d.id == 'attack':
+            continue
+        team = str((d.spec or {}).get('team', 'enemy'))
+        select = str((d.spec or {}).get('select', 'single'))
+        if select in ('none', 'aoe'):
+            tok = None
+        elif team == 'ally':
+            tok = 'm2'
+        elif team == 'self':
+            tok = None
+        else:
+            tok = 'e1'
+        sid = d.id
+        out.append(Bench(f'use_skill:{sid}', _ready_game,
+                         lambda g, _s=sid, _t=tok: g.use_skill(_s, 1, _t), _ensure_units, n=200))
+    return out
+
+
+def _scene_files() -> List[Tuple[str, str]]:
+    from src import app_config as CFG
+    seen: Dict[str, str] = {}
+    for root in CFG.scenes_roots():
+        for dirpath, _dirs, files in os.walk(root):
+            for fn in sorted(files):
+                if not fn.endswith('.json') or fn in ('pack.json', 'recipes.json'):
+                    continue
+                path = os.path.join(dirpath, fn)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except Exception:
+                    continue
+                if not isinstance(data, dict) or not any(k in data for k in ('enemies', 'board', 'resources')):
+                    continue
+                rel = os.path.relpath(path, root).replace(os.sep, '/')
+                seen.setdefault(rel, path)
+    return sorted(seen.items())
+
+
+def bench_scenes() -> List[Bench]:
+    out: List[Bench] = []
+    for rel, path in _scene_files():
+        out.append(Bench(f'load_scene:{rel}', _new_game, lambda g, _p=path: g.load_scene(_p), n=50))
+    return out
+
+
+def _fake_progress(n_scenes: int = 200) -> Dict[str, Any]:
+    rnd = random.Random(SEED)
+    names = ['哥布林', '骷髅', '狼', '史莱姆', '强盗', '蝙蝠']
+    scenes = {}
+    for i in range(n_scenes):
+        scenes[f'/bench/scenes/pack_{i // 20}/scene_{i}.json'] = {
+            'enemies_killed': {f'{rnd.choice(names)}|{rnd.randint(1, 5)}|{rnd.randint(5, 30)}': rnd.randint(1, 3) for _ in range(4)},
+            'resources_collected': {f'药草|material|{rnd.randint(0, 3)}': 1},
+        }
+    return scenes
+
+
+def bench_save() -> List[Bench]:
+    from src import settings as S
+    from src import app_config as CFG
+    from src.core.save_state import SaveManager
+
+    def setup_for(backend):
+        def setup():
+            with open(CFG.user_config_path(), 'w', encoding='utf-8') as f:
+                json.dump({'saves': {'backend': backend}}, f)
+            S.reload()
+            # 经 load() 构建：sqlite 后端的库句柄只在 load() 中挂接
+            mgr = SaveManager.load('bench_' + backend)
+            mgr.data['scenes'] = _fake_progress()
+            mgr.data['inventory'] = [{'name': f'物品{i}', 'type': 'material', 'qty': i + 1} for i in range(30)]
+            if backend == 'sqlite':
+                from src.core import profile_store as PS
+                db = os.path.join(CFG.user_data_dir(), PS.DB_NAME)
+                assert mgr._store is not None, 'sqlite 后端未挂接存档库'
+                mgr.save()
+                assert os.path.isfile(db) and not os.path.exists(mgr.compact_path), 'sqlite 基准写入了存档文件'
+            return mgr
+        return setup
+
+    def touch(mgr):
+        # 每次保存前改动背包一项：sqlite 后端只写变化的分区，未改动时 save() 几乎不写库
+        mgr.data['inventory'][0]['qty'] += 1
+
+    return [Bench(f'save:{b}', setup_for(b), lambda m: m.save(), prep=touch, n=100)
+            for b in ('binary', 'json', 'sqlite')]
+
+
+def bench_events() -> List[Bench]:
+    from src.core.events import publish, subscribe
+    out: List[Bench] = []
+    for k in (1, 10, 100):
+        evt = f'bench_evt_{k}'
+
+        def setup(_k=k, _e=evt):
+            for _ in range(_k):
+                subscribe(_e, lambda _n, _p: None)
+            return {'x': 1}
+        out.append(Bench(f'events.publish:{k}', setup, lambda p, _e=evt: publish(_e, p), n=2000))
+    return out
+
+
+def bench_observable() -> List[Bench]:
+    from src.core.zone import ObservableList
+
+    def setup():
+        return ObservableList(range(15), on_add='bench_zone_add', on_remove='bench_zone_remove', on_change='bench_zone_change')
+
+    def op(lst):
+        lst.append(1)
+        lst.pop()
+    return [Bench('observable_list', setup, op, n=2000)]
+
+
+# --- 内存占用 ---
+def _memory_kinds() -> List[Tuple[str, Callable[[int], Any]]]:
+    from src.game_modes.entities import Enemy, ResourceItem
+    from src.core.cards import NormalCard
+    from src.systems.inventory import ItemStack, MaterialItem
+    from src.systems.equipment_system import WeaponItem
+
+    def card_equipped(i):
+        c = NormalCard(3, 10, name=f'随从{i}', tags=['warrior'])
+        c.equipment.equip(WeaponItem('钢剑', attack=4))
+        return c
+    return [
+        ('Enemy', lambda i: Enemy(f'敌人{i}', 3, 10)),
+        ('NormalCard', lambda i: NormalCard(3, 10, name=f'随从{i}')),
+        ('NormalCard+equip', card_equipped),
+        ('ResourceItem', lambda i: ResourceItem(f'药草{i}', 'material', 1)),
+        ('WeaponItem', lambda i: WeaponItem(f'剑{i}', attack=2)),
+        ('ItemStack', lambda i: ItemStack(MaterialItem(f'木材{i}'), 3)),
+    ]
+
+
+def memory_footprint(n: int = 2000) -> Dict[str, Any]:
+    """每种实体/物品创建 n 个，返回 {类型: {bytes_per, n}}（含其拥有的容器与装备系统，不含驻留字符串）。"""
+    import gc
+    import tracemalloc
+    out: Dict[str, Any] = {}
+    with _quiet():
+        for name, make in _memory_kinds():
+            make(0)  # 预热：导入与缓存不计入
+            gc.collect()
+            tracemalloc.start()
+            base = tracemalloc.take_snapshot()
+            keep = [make(i) for i in range(n)]
+            snap = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            total = sum(st.size_diff for st in snap.compare_to(base, 'filename'))
+            # 名称字符串按实例各分配一次（两种实现相同），不计入
+            names = sum(sys.getsizeof(getattr(o, 'name', None) or getattr(getattr(o, 'item', None), 'name', '')) for o in keep)
+            out[name] = {'n': n, 'bytes_per': round((total - names - sys.getsizeof(keep)) / n, 1)}
+            del keep
+    return out
+
+
+GROUPS = [bench_attack, bench_skills, bench_scenes, bench_save, bench_events, bench_observable]
+
+
+def collect(pattern: Optional[str]) -> List[Bench]:
+    out: List[Bench] = []
+    with _quiet():
+        for g in GROUPS:
+            out.extend(g())
+    if pattern:
+        out = [b for b in out if pattern in b.name]
+    return out
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    rows = []
+    base = (baseline or {}).get('results') or {}
+    for name, r in results.items():
+        b = base.get(name)
+        if not b or not b.get('median_us'):
+            rows.append({'name': name, 'status': 'new'})
+            continue
+        ratio = r['median_us'] / b['median_us']
+        status = 'regressed' if ratio > 1 + threshold else ('improved' if ratio < 1 - threshold else 'ok')
+        rows.append({'name': name, 'status': status, 'ratio': round(ratio, 3),
+                     'baseline_us': b['median_us'], 'median_us': r['median_us']})
+    return rows
+
+
+def _git_rev() -> str:
+    try:
+        import subprocess
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=str(ROOT),
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ''
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='PYHS 引擎基准测试')
+    ap.add_argument('-k', dest='pattern', help='只运行名称包含该子串的项')
+    ap.add_argument('--quick', action='store_true', help='迭代次数降为 1/5')
+    ap.add_argument('--out', default='bench_results.json', help='结果 JSON 路径')
+    ap.add_argument('--baseline', help='对比的基线 JSON')
+    ap.add_argument('--threshold', type=float, default=0.15, help='回归阈值（中位数变慢比例，默认 0.15）')
+    ap.add_argument('--save-baseline', help='同时把结果写为基线文件')
+    ap.add_argument('--list', action='store_true', help='只列出基准项')
+    ap.add_argument('--memory', action='store_true', help='同时测量每个实体/物品的内存占用')
+    ap.add_argument('--no-log', action='store_true', help='关闭战斗日志（headless 模式）')
+    args = ap.parse_args(argv)
+    global LOG_ON
+    LOG_ON = not args.no_log
+
+    benches = collect(args.pattern)
+    if args.list:
+        for b in benches:
+            print(b.name)
+        return 0
+    scale = 0.2 if args.quick else 1.0
+    results: Dict[str, Any] = {}
+    width = max((len(b.name) for b in benches), default=10)
+    print(f"{'name':<{width}}  {'median_us':>11}  {'min_us':>10}  {'p95_us':>10}  {'n':>5}")
+    for b in benches:
+        try:
+            r = _run(b, scale)
+        except Exception as e:
+            print(f"{b.name:<{width}}  失败: {e}")
+            continue
+        results[b.name] = r
+        print(f"{b.name:<{width}}  {r['median_us']:>11.2f}  {r['min_us']:>10.2f}  {r['p95_us']:>10.2f}  {r['n']:>5}")
+
+    memory: Dict[str, Any] = {}
+    if args.memory:
+        memory = memory_footprint(400 if args.quick else 2000)
+        print()
+        print(f"{'memory':<{width}}  {'bytes/obj':>11}")
+        for name, r in memory.items():
+            print(f"{name:<{width}}  {r['bytes_per']:>11.1f}")
+
+    doc = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'git': _git_rev(),
+            'seed': SEED,
+            'quick': bool(args.quick),
+            'log': LOG_ON,
+        },
+        'results': results,
+    }
+    if memory:
+        doc['memory'] = memory
+    code = 0
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except Exception as e:
+            print(f'读取基线失败: {e}')
+            baseline = {}
+        rows = compare(results, baseline, args.threshold)
+        doc['comparison'] = {'baseline': args.baseline, 'threshold': args.threshold, 'rows': rows}
+        bad = [r for r in rows if r['status'] == 'regressed']
+        print()
+        for r in rows:
+            if r['status'] in ('regressed', 'improved'):
+                print(f"{r['status']:>9}  {r['name']}  {r['baseline_us']:.2f} -> {r['median_us']:.2f} us (x{r['ratio']})")
+        print(f"对比基线：{len(bad)} 项回归（阈值 {args.threshold:.0%}），共 {len(rows)} 项")
+        if bad:
+            code = 1
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())